@@ -0,0 +1,81 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.config import settings
+from app.database import Base, create_db_engine
+import app.models  # noqa: F401  (registers all tables on Base.metadata)
+from app.fulltext import FULLTEXT_TABLES
+from app.migrations import sqlite_foreign_keys_disabled
+
+# Alembic Config object, giving access to values in alembic.ini
+config = context.config
+
+# Set up loggers from alembic.ini, unless the app is running migrations itself
+if config.config_file_name is not None and config.attributes.get("configure_logging", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Full-text index objects (FTS5 tables and their shadow tables) are managed by hand
+FULLTEXT_TABLE_PREFIXES = tuple(spec["fts"] for spec in FULLTEXT_TABLES.values())
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """Keep autogenerate from proposing to drop the full-text index tables."""
+    if type_ == "table" and name.startswith(FULLTEXT_TABLE_PREFIXES):
+        return False
+    if type_ == "column" and name == "search_vector":
+        return False
+    if type_ == "index" and name and name.endswith("_search_vector"):
+        return False
+    return True
+
+
+def run_migrations_offline() -> None:
+    """Emit migration SQL to stdout without connecting to the database."""
+    context.configure(
+        url=settings.database_url,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=settings.database_url.startswith("sqlite"),
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations on a live connection (shared by app startup when provided)."""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_with_connection(connection)
+        return
+
+    connectable = create_db_engine(settings.database_url)
+    try:
+        with connectable.connect() as connection, sqlite_foreign_keys_disabled(connection):
+            _run_with_connection(connection)
+    finally:
+        connectable.dispose()
+
+
+def _run_with_connection(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        # SQLite cannot ALTER most things in place; batch mode recreates tables
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,111 @@
+"""full-text search indexes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 23:05:12.418230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# SQLite FTS5 tables and their sync triggers as of this revision (app/fulltext.py)
+SQLITE_FULLTEXT_DDL = {
+    'contracts': [
+        'CREATE VIRTUAL TABLE IF NOT EXISTS contracts_fts USING fts5(entity_id, title, description, skills, '
+        "tokenize = 'porter unicode61 remove_diacritics 2')",
+        'CREATE TRIGGER IF NOT EXISTS contracts_fts_insert AFTER INSERT ON contracts BEGIN INSERT INTO '
+        'contracts_fts (entity_id, title, description, skills) VALUES (new.id, new.title, new.description, '
+        "(SELECT group_concat(value, ' ') FROM json_each(new.requirements, '$.skills'))); END",
+        'CREATE TRIGGER IF NOT EXISTS contracts_fts_update AFTER UPDATE OF title, description, requirements '
+        'ON contracts BEGIN DELETE FROM contracts_fts WHERE contracts_fts MATCH (\'entity_id:"\' || old.id || '
+        '\'"\'); INSERT INTO contracts_fts (entity_id, title, description, skills) VALUES (new.id, new.title, '
+        "new.description, (SELECT group_concat(value, ' ') FROM json_each(new.requirements, '$.skills'))); "
+        'END',
+        'CREATE TRIGGER IF NOT EXISTS contracts_fts_delete AFTER DELETE ON contracts BEGIN DELETE FROM '
+        'contracts_fts WHERE contracts_fts MATCH (\'entity_id:"\' || old.id || \'"\'); END',
+    ],
+    'job_posts': [
+        'CREATE VIRTUAL TABLE IF NOT EXISTS job_posts_fts USING fts5(entity_id, title, description, '
+        "category, skills, tokenize = 'porter unicode61 remove_diacritics 2')",
+        'CREATE TRIGGER IF NOT EXISTS job_posts_fts_insert AFTER INSERT ON job_posts BEGIN INSERT INTO '
+        'job_posts_fts (entity_id, title, description, category, skills) VALUES (new.id, new.title, '
+        "new.description, new.category, (SELECT group_concat(value, ' ') FROM json_each(new.requirements, "
+        "'$.skills'))); END",
+        'CREATE TRIGGER IF NOT EXISTS job_posts_fts_update AFTER UPDATE OF title, description, category, '
+        'requirements ON job_posts BEGIN DELETE FROM job_posts_fts WHERE job_posts_fts MATCH (\'entity_id:"\' '
+        '|| old.id || \'"\'); INSERT INTO job_posts_fts (entity_id, title, description, category, skills) '
+        "VALUES (new.id, new.title, new.description, new.category, (SELECT group_concat(value, ' ') FROM "
+        "json_each(new.requirements, '$.skills'))); END",
+        'CREATE TRIGGER IF NOT EXISTS job_posts_fts_delete AFTER DELETE ON job_posts BEGIN DELETE FROM '
+        'job_posts_fts WHERE job_posts_fts MATCH (\'entity_id:"\' || old.id || \'"\'); END',
+    ],
+}
+# Index every existing row
+SQLITE_FULLTEXT_BACKFILL = {
+    'contracts': (
+        'INSERT INTO contracts_fts (entity_id, title, description, skills) SELECT id, contracts.title, '
+        "contracts.description, (SELECT group_concat(value, ' ') FROM json_each(contracts.requirements, "
+        "'$.skills')) FROM contracts"
+    ),
+    'job_posts': (
+        'INSERT INTO job_posts_fts (entity_id, title, description, category, skills) SELECT id, '
+        "job_posts.title, job_posts.description, job_posts.category, (SELECT group_concat(value, ' ') FROM "
+        "json_each(job_posts.requirements, '$.skills')) FROM job_posts"
+    ),
+}
+# Postgres: generated, weighted tsvector column with a GIN index
+POSTGRES_FULLTEXT_DDL = {
+    'contracts': [
+        'ALTER TABLE contracts ADD COLUMN search_vector tsvector GENERATED ALWAYS AS '
+        "(setweight(to_tsvector('english', coalesce(title, '')), 'A') || setweight(to_tsvector('english', "
+        "coalesce(description, '')), 'D') || setweight(to_tsvector('english', "
+        "coalesce(requirements->>'skills', '')), 'B')) STORED",
+        'CREATE INDEX ix_contracts_search_vector ON contracts USING gin (search_vector)',
+    ],
+    'job_posts': [
+        'ALTER TABLE job_posts ADD COLUMN search_vector tsvector GENERATED ALWAYS AS '
+        "(setweight(to_tsvector('english', coalesce(title, '')), 'A') || setweight(to_tsvector('english', "
+        "coalesce(description, '')), 'D') || setweight(to_tsvector('english', coalesce(category, '')), 'C') "
+        "|| setweight(to_tsvector('english', coalesce(requirements->>'skills', '')), 'B')) STORED",
+        'CREATE INDEX ix_job_posts_search_vector ON job_posts USING gin (search_vector)',
+    ],
+}
+
+# FTS5 table per indexed table, dropped on downgrade
+FULLTEXT_TABLES = {'contracts': 'contracts_fts', 'job_posts': 'job_posts_fts'}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for table_name in FULLTEXT_TABLES:
+        if dialect == "sqlite":
+            for statement in SQLITE_FULLTEXT_DDL[table_name]:
+                op.execute(statement)
+            op.execute(SQLITE_FULLTEXT_BACKFILL[table_name])
+        elif dialect == "postgresql":
+            # Generated column: Postgres fills it for existing and future rows
+            for statement in POSTGRES_FULLTEXT_DDL[table_name]:
+                op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for table_name, fts in FULLTEXT_TABLES.items():
+        if dialect == "sqlite":
+            for suffix in ("insert", "update", "delete"):
+                op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {fts}")
+        elif dialect == "postgresql":
+            op.execute(f"DROP INDEX IF EXISTS ix_{table_name}_search_vector")
+            op.execute(f"ALTER TABLE {table_name} DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,321 @@
+"""pincode geo index
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 22:45:09.888384
+
+"""
+import csv
+import io
+from typing import Any, Dict, List, Optional, Tuple, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app/reference/pincodes.csv as of this revision
+PINCODES_CSV = """\
+pincode,office,district,state,latitude,longitude
+400001,Mumbai GPO,Mumbai,Maharashtra,18.9388,72.8354
+400011,Jacob Circle,Mumbai,Maharashtra,18.9826,72.8258
+400014,Dadar,Mumbai,Maharashtra,19.0178,72.8478
+400050,Bandra West,Mumbai,Maharashtra,19.0596,72.8295
+400053,Andheri West,Mumbai,Maharashtra,19.1364,72.8296
+400069,Andheri East,Mumbai,Maharashtra,19.1154,72.8550
+400070,Kurla,Mumbai,Maharashtra,19.0726,72.8845
+400080,Mulund West,Mumbai,Maharashtra,19.1726,72.9425
+400092,Borivali West,Mumbai,Maharashtra,19.2307,72.8567
+400101,Kandivali East,Mumbai,Maharashtra,19.2058,72.8746
+400703,Vashi,Mumbai,Maharashtra,19.0771,72.9986
+110001,Connaught Place,Delhi,Delhi,28.6315,77.2167
+110006,Chandni Chowk,Delhi,Delhi,28.6506,77.2303
+110016,Hauz Khas,Delhi,Delhi,28.5494,77.2001
+110019,Kalkaji,Delhi,Delhi,28.5400,77.2590
+110025,Okhla,Delhi,Delhi,28.5617,77.2802
+110030,Mehrauli,Delhi,Delhi,28.5180,77.1784
+110044,Badarpur,Delhi,Delhi,28.4984,77.3004
+110051,Krishna Nagar,Delhi,Delhi,28.6562,77.2820
+110058,Janakpuri,Delhi,Delhi,28.6219,77.0878
+110085,Rohini,Delhi,Delhi,28.7383,77.0822
+110092,Laxmi Nagar,Delhi,Delhi,28.6301,77.2770
+560001,Bangalore GPO,Bangalore,Karnataka,12.9757,77.6055
+560002,Bangalore City,Bangalore,Karnataka,12.9667,77.5833
+560004,Basavanagudi,Bangalore,Karnataka,12.9422,77.5737
+560008,HAL II Stage,Bangalore,Karnataka,12.9719,77.6412
+560010,Rajajinagar,Bangalore,Karnataka,12.9911,77.5544
+560011,Jayanagar,Bangalore,Karnataka,12.9308,77.5838
+560025,Richmond Town,Bangalore,Karnataka,12.9619,77.6001
+560034,Koramangala,Bangalore,Karnataka,12.9352,77.6245
+560037,Marathahalli,Bangalore,Karnataka,12.9569,77.7011
+560066,Whitefield,Bangalore,Karnataka,12.9698,77.7500
+560068,Bommanahalli,Bangalore,Karnataka,12.9089,77.6239
+560076,Bannerghatta Road,Bangalore,Karnataka,12.8885,77.5971
+560078,JP Nagar,Bangalore,Karnataka,12.9063,77.5857
+560100,Electronic City,Bangalore,Karnataka,12.8452,77.6602
+500001,Hyderabad GPO,Hyderabad,Telangana,17.3930,78.4730
+500003,Secunderabad,Hyderabad,Telangana,17.4399,78.4983
+500008,Tolichowki,Hyderabad,Telangana,17.3950,78.4100
+500016,Begumpet,Hyderabad,Telangana,17.4447,78.4664
+500032,Gachibowli,Hyderabad,Telangana,17.4401,78.3489
+500034,Banjara Hills,Hyderabad,Telangana,17.4126,78.4482
+500060,Dilsukhnagar,Hyderabad,Telangana,17.3688,78.5247
+500072,Kukatpally,Hyderabad,Telangana,17.4849,78.4138
+500081,Madhapur,Hyderabad,Telangana,17.4483,78.3915
+380001,Ahmedabad GPO,Ahmedabad,Gujarat,23.0258,72.5873
+380008,Maninagar,Ahmedabad,Gujarat,23.0000,72.6000
+380009,Navrangpura,Ahmedabad,Gujarat,23.0365,72.5611
+380013,Naranpura,Ahmedabad,Gujarat,23.0607,72.5544
+380015,Satellite,Ahmedabad,Gujarat,23.0300,72.5170
+380054,Bodakdev,Ahmedabad,Gujarat,23.0396,72.5067
+380061,Ghatlodia,Ahmedabad,Gujarat,23.0740,72.5370
+600001,Chennai GPO,Chennai,Tamil Nadu,13.0900,80.2880
+600004,Mylapore,Chennai,Tamil Nadu,13.0339,80.2619
+600017,T Nagar,Chennai,Tamil Nadu,13.0418,80.2341
+600020,Adyar,Chennai,Tamil Nadu,13.0012,80.2565
+600032,Guindy,Chennai,Tamil Nadu,13.0067,80.2206
+600040,Anna Nagar,Chennai,Tamil Nadu,13.0850,80.2101
+600042,Velachery,Chennai,Tamil Nadu,12.9815,80.2180
+600096,Perungudi,Chennai,Tamil Nadu,12.9654,80.2461
+600119,Sholinganallur,Chennai,Tamil Nadu,12.9010,80.2279
+700001,Kolkata GPO,Kolkata,West Bengal,22.5726,88.3510
+700004,Shyambazar,Kolkata,West Bengal,22.6010,88.3730
+700016,Park Street,Kolkata,West Bengal,22.5530,88.3520
+700019,Ballygunge,Kolkata,West Bengal,22.5280,88.3650
+700029,Dhakuria,Kolkata,West Bengal,22.5140,88.3690
+700032,Jadavpur,Kolkata,West Bengal,22.4990,88.3710
+700064,Salt Lake,Kolkata,West Bengal,22.5867,88.4171
+700091,Salt Lake Sector V,Kolkata,West Bengal,22.5760,88.4330
+700156,New Town,Kolkata,West Bengal,22.5958,88.4795
+411001,Pune GPO,Pune,Maharashtra,18.5167,73.8767
+411004,Deccan Gymkhana,Pune,Maharashtra,18.5089,73.8322
+411005,Shivajinagar,Pune,Maharashtra,18.5308,73.8475
+411014,Viman Nagar,Pune,Maharashtra,18.5679,73.9143
+411018,Pimpri,Pune,Maharashtra,18.6298,73.7997
+411028,Hadapsar,Pune,Maharashtra,18.5089,73.9260
+411038,Kothrud,Pune,Maharashtra,18.5074,73.8077
+411057,Hinjewadi,Pune,Maharashtra,18.5913,73.7389
+395001,Nanpura,Surat,Gujarat,21.1860,72.8150
+395004,Katargam,Surat,Gujarat,21.2290,72.8250
+395006,Varachha,Surat,Gujarat,21.2125,72.8551
+395007,Athwa Lines,Surat,Gujarat,21.1790,72.8080
+395009,Adajan,Surat,Gujarat,21.1959,72.7933
+302001,Jaipur GPO,Jaipur,Rajasthan,26.9196,75.8008
+302004,Raja Park,Jaipur,Rajasthan,26.8944,75.8302
+302012,Jhotwara,Jaipur,Rajasthan,26.9530,75.7420
+302017,Malviya Nagar,Jaipur,Rajasthan,26.8549,75.8243
+302020,Mansarovar,Jaipur,Rajasthan,26.8505,75.7628
+302021,Vaishali Nagar,Jaipur,Rajasthan,26.9110,75.7430
+226001,Lucknow GPO,Lucknow,Uttar Pradesh,26.8500,80.9490
+226003,Chowk,Lucknow,Uttar Pradesh,26.8700,80.9100
+226005,Alambagh,Lucknow,Uttar Pradesh,26.8150,80.9050
+226010,Gomti Nagar,Lucknow,Uttar Pradesh,26.8500,81.0000
+226016,Indira Nagar,Lucknow,Uttar Pradesh,26.8840,81.0000
+226020,Aliganj,Lucknow,Uttar Pradesh,26.8950,80.9430
+800001,Patna GPO,Patna,Bihar,25.6093,85.1376
+800004,Patna City,Patna,Bihar,25.5940,85.2360
+800013,Boring Road,Patna,Bihar,25.6150,85.1150
+800014,Patliputra Colony,Patna,Bihar,25.6260,85.0960
+800020,Kankarbagh,Patna,Bihar,25.5940,85.1640
+462001,Bhopal GPO,Bhopal,Madhya Pradesh,23.2599,77.4126
+462003,TT Nagar,Bhopal,Madhya Pradesh,23.2350,77.3950
+462016,Arera Colony,Bhopal,Madhya Pradesh,23.2160,77.4320
+462023,Govindpura,Bhopal,Madhya Pradesh,23.2570,77.4620
+462042,Kolar Road,Bhopal,Madhya Pradesh,23.1800,77.4200
+452001,Indore GPO,Indore,Madhya Pradesh,22.7179,75.8547
+452005,Palasia,Indore,Madhya Pradesh,22.7240,75.8860
+452009,Bhawarkuan,Indore,Madhya Pradesh,22.6930,75.8680
+452010,Vijay Nagar,Indore,Madhya Pradesh,22.7533,75.8937
+452018,Sukhliya,Indore,Madhya Pradesh,22.7650,75.8730
+682001,Fort Kochi,Kochi,Kerala,9.9658,76.2421
+682016,Ernakulam South,Kochi,Kerala,9.9680,76.2890
+682018,Ernakulam North,Kochi,Kerala,9.9816,76.2999
+682020,Kadavanthra,Kochi,Kerala,9.9660,76.3000
+682024,Edappally,Kochi,Kerala,10.0261,76.3083
+682030,Kakkanad,Kochi,Kerala,10.0159,76.3419
+695001,Thiruvananthapuram GPO,Thiruvananthapuram,Kerala,8.5070,76.9550
+695004,Pattom,Thiruvananthapuram,Kerala,8.5210,76.9420
+695010,Sasthamangalam,Thiruvananthapuram,Kerala,8.5130,76.9700
+695014,Thycaud,Thiruvananthapuram,Kerala,8.4930,76.9630
+695581,Kazhakoottam,Thiruvananthapuram,Kerala,8.5581,76.8800
+641001,Coimbatore GPO,Coimbatore,Tamil Nadu,10.9925,76.9614
+641002,RS Puram,Coimbatore,Tamil Nadu,11.0078,76.9498
+641004,Peelamedu,Coimbatore,Tamil Nadu,11.0260,77.0170
+641012,Gandhipuram,Coimbatore,Tamil Nadu,11.0168,76.9683
+641035,Saravanampatti,Coimbatore,Tamil Nadu,11.0800,76.9970
+570001,Mysore GPO,Mysore,Karnataka,12.3080,76.6530
+570004,Jayalakshmipuram,Mysore,Karnataka,12.3200,76.6300
+570008,Kuvempunagar,Mysore,Karnataka,12.2850,76.6300
+570017,Hebbal Industrial Area,Mysore,Karnataka,12.3500,76.6100
+570023,Vijayanagar,Mysore,Karnataka,12.3300,76.6000
+160017,Sector 17,Chandigarh,Chandigarh,30.7410,76.7820
+160022,Sector 22,Chandigarh,Chandigarh,30.7320,76.7730
+160036,Sector 36,Chandigarh,Chandigarh,30.7230,76.7580
+160047,Sector 47,Chandigarh,Chandigarh,30.6960,76.7540
+160101,Mani Majra,Chandigarh,Chandigarh,30.7250,76.8310
+751001,Bhubaneswar GPO,Bhubaneswar,Odisha,20.2440,85.8340
+751007,Saheed Nagar,Bhubaneswar,Odisha,20.2890,85.8440
+751010,Rasulgarh,Bhubaneswar,Odisha,20.2890,85.8600
+751012,Nayapalli,Bhubaneswar,Odisha,20.2960,85.8170
+751024,Patia,Bhubaneswar,Odisha,20.3530,85.8190
+"""
+
+GEOHASH_PRECISION = 6
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# SQLite full-text tables and triggers (app/fulltext.py as of this revision), recreated
+# after a downgrade rebuilds the tables
+SQLITE_FULLTEXT_DDL = {
+    'contracts': [
+        'CREATE VIRTUAL TABLE IF NOT EXISTS contracts_fts USING fts5(entity_id, title, description, skills, '
+        "tokenize = 'porter unicode61 remove_diacritics 2')",
+        'CREATE TRIGGER IF NOT EXISTS contracts_fts_insert AFTER INSERT ON contracts BEGIN INSERT INTO '
+        'contracts_fts (entity_id, title, description, skills) VALUES (new.id, new.title, new.description, '
+        "(SELECT group_concat(value, ' ') FROM json_each(new.requirements, '$.skills'))); END",
+        'CREATE TRIGGER IF NOT EXISTS contracts_fts_update AFTER UPDATE OF title, description, requirements '
+        'ON contracts BEGIN DELETE FROM contracts_fts WHERE contracts_fts MATCH (\'entity_id:"\' || old.id || '
+        '\'"\'); INSERT INTO contracts_fts (entity_id, title, description, skills) VALUES (new.id, new.title, '
+        "new.description, (SELECT group_concat(value, ' ') FROM json_each(new.requirements, '$.skills'))); "
+        'END',
+        'CREATE TRIGGER IF NOT EXISTS contracts_fts_delete AFTER DELETE ON contracts BEGIN DELETE FROM '
+        'contracts_fts WHERE contracts_fts MATCH (\'entity_id:"\' || old.id || \'"\'); END',
+    ],
+    'job_posts': [
+        'CREATE VIRTUAL TABLE IF NOT EXISTS job_posts_fts USING fts5(entity_id, title, description, '
+        "category, skills, tokenize = 'porter unicode61 remove_diacritics 2')",
+        'CREATE TRIGGER IF NOT EXISTS job_posts_fts_insert AFTER INSERT ON job_posts BEGIN INSERT INTO '
+        'job_posts_fts (entity_id, title, description, category, skills) VALUES (new.id, new.title, '
+        "new.description, new.category, (SELECT group_concat(value, ' ') FROM json_each(new.requirements, "
+        "'$.skills'))); END",
+        'CREATE TRIGGER IF NOT EXISTS job_posts_fts_update AFTER UPDATE OF title, description, category, '
+        'requirements ON job_posts BEGIN DELETE FROM job_posts_fts WHERE job_posts_fts MATCH (\'entity_id:"\' '
+        '|| old.id || \'"\'); INSERT INTO job_posts_fts (entity_id, title, description, category, skills) '
+        "VALUES (new.id, new.title, new.description, new.category, (SELECT group_concat(value, ' ') FROM "
+        "json_each(new.requirements, '$.skills'))); END",
+        'CREATE TRIGGER IF NOT EXISTS job_posts_fts_delete AFTER DELETE ON job_posts BEGIN DELETE FROM '
+        'job_posts_fts WHERE job_posts_fts MATCH (\'entity_id:"\' || old.id || \'"\'); END',
+    ],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('pincode_locations',
+    sa.Column('pincode', sa.String(), nullable=False),
+    sa.Column('office', sa.String(), nullable=False),
+    sa.Column('district', sa.String(), nullable=False),
+    sa.Column('state', sa.String(), nullable=False),
+    sa.Column('latitude', sa.Float(), nullable=False),
+    sa.Column('longitude', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('pincode')
+    )
+    with op.batch_alter_table('contracts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('latitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('longitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('geohash', sa.String(), nullable=True))
+        batch_op.create_index('ix_contracts_status_geohash', ['status', 'geohash'], unique=False)
+
+    with op.batch_alter_table('job_posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('latitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('longitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('geohash', sa.String(), nullable=True))
+        batch_op.create_index('ix_job_posts_status_geohash', ['status', 'geohash'], unique=False)
+
+    # ### end Alembic commands ###
+    pincodes = sa.table('pincode_locations',
+        sa.column('pincode', sa.String), sa.column('office', sa.String),
+        sa.column('district', sa.String), sa.column('state', sa.String),
+        sa.column('latitude', sa.Float), sa.column('longitude', sa.Float),
+    )
+    op.bulk_insert(pincodes, load_pincode_dataset())
+    _backfill('contracts')
+    _backfill('job_posts')
+
+
+def load_pincode_dataset() -> List[Dict[str, Any]]:
+    return [
+        {**row, 'latitude': float(row['latitude']), 'longitude': float(row['longitude'])}
+        for row in csv.DictReader(io.StringIO(PINCODES_CSV))
+    ]
+
+
+def resolve_pincode(pincode: Any, rows: List[Dict[str, Any]]) -> Optional[Tuple[float, float]]:
+    """Coordinates for a pincode, falling back to its sorting district's centroid."""
+    pincode = str(pincode).strip()
+    if len(pincode) != 6 or not pincode.isdigit():
+        return None
+    for row in rows:
+        if row['pincode'] == pincode:
+            return row['latitude'], row['longitude']
+    district = [row for row in rows if row['pincode'][:3] == pincode[:3]]
+    if not district:
+        return None
+    return (sum(row['latitude'] for row in district) / len(district),
+            sum(row['longitude'] for row in district) / len(district))
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def _backfill(table_name: str) -> None:
+    """Resolve coordinates once per distinct pincode and update the matching rows."""
+    bind = op.get_bind()
+    table = sa.table(table_name,
+        sa.column('location_pincode', sa.String), sa.column('latitude', sa.Float),
+        sa.column('longitude', sa.Float), sa.column('geohash', sa.String),
+    )
+    dataset = load_pincode_dataset()
+    rows = bind.execute(sa.select(table.c.location_pincode).where(table.c.location_pincode.isnot(None)).distinct())
+    for (pincode,) in rows.fetchall():
+        point = resolve_pincode(pincode, dataset)
+        if point is not None:
+            bind.execute(table.update().where(table.c.location_pincode == pincode).values(
+                latitude=point[0], longitude=point[1], geohash=geohash_encode(*point)
+            ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('job_posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_posts_status_geohash')
+        batch_op.drop_column('geohash')
+        batch_op.drop_column('longitude')
+        batch_op.drop_column('latitude')
+
+    with op.batch_alter_table('contracts', schema=None) as batch_op:
+        batch_op.drop_index('ix_contracts_status_geohash')
+        batch_op.drop_column('geohash')
+        batch_op.drop_column('longitude')
+        batch_op.drop_column('latitude')
+
+    op.drop_table('pincode_locations')
+    # ### end Alembic commands ###
+    # Dropping columns rebuilds the tables on SQLite, which loses the full-text triggers
+    if op.get_bind().dialect.name == 'sqlite':
+        for table_name in ('contracts', 'job_posts'):
+            for statement in SQLITE_FULLTEXT_DDL[table_name]:
+                op.execute(statement)
@@ -0,0 +1,178 @@
+"""minimum wage rates
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 00:41:27.518203
+
+"""
+import csv
+import io
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app/reference/minimum_wages.csv as of this revision; later notifications are loaded
+# with update_minimum_wages.py, not by editing this copy
+MINIMUM_WAGES_CSV = """\
+state,category,rate,rate_type,effective_from,notification
+Maharashtra,unskilled,450,daily,2024-07-01,MH/2024-07
+Maharashtra,semi-skilled,475,daily,2024-07-01,MH/2024-07
+Maharashtra,skilled,505,daily,2024-07-01,MH/2024-07
+Maharashtra,highly-skilled,540,daily,2024-07-01,MH/2024-07
+Delhi,unskilled,18066,monthly,2024-10-01,DL/2024-10
+Delhi,semi-skilled,19929,monthly,2024-10-01,DL/2024-10
+Delhi,skilled,21917,monthly,2024-10-01,DL/2024-10
+Delhi,highly-skilled,23836,monthly,2024-10-01,DL/2024-10
+Karnataka,unskilled,14000,monthly,2024-04-01,KA/2024-04
+Karnataka,semi-skilled,15500,monthly,2024-04-01,KA/2024-04
+Karnataka,skilled,17000,monthly,2024-04-01,KA/2024-04
+Karnataka,highly-skilled,18500,monthly,2024-04-01,KA/2024-04
+Telangana,unskilled,420,daily,2024-04-01,TS/2024-04
+Telangana,semi-skilled,450,daily,2024-04-01,TS/2024-04
+Telangana,skilled,490,daily,2024-04-01,TS/2024-04
+Telangana,highly-skilled,530,daily,2024-04-01,TS/2024-04
+Gujarat,unskilled,435,daily,2024-10-01,GJ/2024-10
+Gujarat,semi-skilled,445,daily,2024-10-01,GJ/2024-10
+Gujarat,skilled,460,daily,2024-10-01,GJ/2024-10
+Gujarat,highly-skilled,475,daily,2024-10-01,GJ/2024-10
+Tamil Nadu,unskilled,12000,monthly,2024-04-01,TN/2024-04
+Tamil Nadu,semi-skilled,12600,monthly,2024-04-01,TN/2024-04
+Tamil Nadu,skilled,13300,monthly,2024-04-01,TN/2024-04
+Tamil Nadu,highly-skilled,14000,monthly,2024-04-01,TN/2024-04
+West Bengal,unskilled,440,daily,2024-07-01,WB/2024-07
+West Bengal,semi-skilled,485,daily,2024-07-01,WB/2024-07
+West Bengal,skilled,535,daily,2024-07-01,WB/2024-07
+West Bengal,highly-skilled,590,daily,2024-07-01,WB/2024-07
+Rajasthan,unskilled,285,daily,2024-07-01,RJ/2024-07
+Rajasthan,semi-skilled,297,daily,2024-07-01,RJ/2024-07
+Rajasthan,skilled,309,daily,2024-07-01,RJ/2024-07
+Rajasthan,highly-skilled,359,daily,2024-07-01,RJ/2024-07
+Uttar Pradesh,unskilled,10701,monthly,2024-10-01,UP/2024-10
+Uttar Pradesh,semi-skilled,11772,monthly,2024-10-01,UP/2024-10
+Uttar Pradesh,skilled,13186,monthly,2024-10-01,UP/2024-10
+Uttar Pradesh,highly-skilled,14500,monthly,2024-10-01,UP/2024-10
+Bihar,unskilled,412,daily,2024-10-01,BR/2024-10
+Bihar,semi-skilled,428,daily,2024-10-01,BR/2024-10
+Bihar,skilled,522,daily,2024-10-01,BR/2024-10
+Bihar,highly-skilled,637,daily,2024-10-01,BR/2024-10
+Madhya Pradesh,unskilled,11450,monthly,2024-10-01,MP/2024-10
+Madhya Pradesh,semi-skilled,12300,monthly,2024-10-01,MP/2024-10
+Madhya Pradesh,skilled,13900,monthly,2024-10-01,MP/2024-10
+Madhya Pradesh,highly-skilled,15200,monthly,2024-10-01,MP/2024-10
+Kerala,unskilled,700,daily,2024-04-01,KL/2024-04
+Kerala,semi-skilled,740,daily,2024-04-01,KL/2024-04
+Kerala,skilled,780,daily,2024-04-01,KL/2024-04
+Kerala,highly-skilled,830,daily,2024-04-01,KL/2024-04
+Chandigarh,unskilled,470,daily,2024-10-01,CH/2024-10
+Chandigarh,semi-skilled,490,daily,2024-10-01,CH/2024-10
+Chandigarh,skilled,515,daily,2024-10-01,CH/2024-10
+Chandigarh,highly-skilled,540,daily,2024-10-01,CH/2024-10
+Odisha,unskilled,450,daily,2024-10-01,OD/2024-10
+Odisha,semi-skilled,500,daily,2024-10-01,OD/2024-10
+Odisha,skilled,550,daily,2024-10-01,OD/2024-10
+Odisha,highly-skilled,600,daily,2024-10-01,OD/2024-10
+"""
+
+# SQLite full-text tables and triggers (app/fulltext.py as of this revision), recreated
+# after a downgrade rebuilds the tables
+SQLITE_FULLTEXT_DDL = {
+    'contracts': [
+        'CREATE VIRTUAL TABLE IF NOT EXISTS contracts_fts USING fts5(entity_id, title, description, skills, '
+        "tokenize = 'porter unicode61 remove_diacritics 2')",
+        'CREATE TRIGGER IF NOT EXISTS contracts_fts_insert AFTER INSERT ON contracts BEGIN INSERT INTO '
+        'contracts_fts (entity_id, title, description, skills) VALUES (new.id, new.title, new.description, '
+        "(SELECT group_concat(value, ' ') FROM json_each(new.requirements, '$.skills'))); END",
+        'CREATE TRIGGER IF NOT EXISTS contracts_fts_update AFTER UPDATE OF title, description, requirements '
+        'ON contracts BEGIN DELETE FROM contracts_fts WHERE contracts_fts MATCH (\'entity_id:"\' || old.id || '
+        '\'"\'); INSERT INTO contracts_fts (entity_id, title, description, skills) VALUES (new.id, new.title, '
+        "new.description, (SELECT group_concat(value, ' ') FROM json_each(new.requirements, '$.skills'))); "
+        'END',
+        'CREATE TRIGGER IF NOT EXISTS contracts_fts_delete AFTER DELETE ON contracts BEGIN DELETE FROM '
+        'contracts_fts WHERE contracts_fts MATCH (\'entity_id:"\' || old.id || \'"\'); END',
+    ],
+    'job_posts': [
+        'CREATE VIRTUAL TABLE IF NOT EXISTS job_posts_fts USING fts5(entity_id, title, description, '
+        "category, skills, tokenize = 'porter unicode61 remove_diacritics 2')",
+        'CREATE TRIGGER IF NOT EXISTS job_posts_fts_insert AFTER INSERT ON job_posts BEGIN INSERT INTO '
+        'job_posts_fts (entity_id, title, description, category, skills) VALUES (new.id, new.title, '
+        "new.description, new.category, (SELECT group_concat(value, ' ') FROM json_each(new.requirements, "
+        "'$.skills'))); END",
+        'CREATE TRIGGER IF NOT EXISTS job_posts_fts_update AFTER UPDATE OF title, description, category, '
+        'requirements ON job_posts BEGIN DELETE FROM job_posts_fts WHERE job_posts_fts MATCH (\'entity_id:"\' '
+        '|| old.id || \'"\'); INSERT INTO job_posts_fts (entity_id, title, description, category, skills) '
+        "VALUES (new.id, new.title, new.description, new.category, (SELECT group_concat(value, ' ') FROM "
+        "json_each(new.requirements, '$.skills'))); END",
+        'CREATE TRIGGER IF NOT EXISTS job_posts_fts_delete AFTER DELETE ON job_posts BEGIN DELETE FROM '
+        'job_posts_fts WHERE job_posts_fts MATCH (\'entity_id:"\' || old.id || \'"\'); END',
+    ],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('minimum_wage_rates',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('state', sa.String(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('rate', sa.Float(), nullable=False),
+    sa.Column('rate_type', sa.String(), nullable=False),
+    sa.Column('effective_from', sa.Date(), nullable=False),
+    sa.Column('notification', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('minimum_wage_rates', schema=None) as batch_op:
+        batch_op.create_index('ix_minimum_wage_rates_state_category', ['state', 'category', 'effective_from'], unique=False)
+
+    with op.batch_alter_table('contracts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('minimum_wage_version', sa.String(), nullable=True))
+
+    with op.batch_alter_table('job_posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('is_minimum_wage_compliant', sa.Boolean(), nullable=True))
+        batch_op.add_column(sa.Column('minimum_wage_version', sa.String(), nullable=True))
+
+    # ### end Alembic commands ###
+    rates = sa.table('minimum_wage_rates',
+        sa.column('state', sa.String), sa.column('category', sa.String),
+        sa.column('rate', sa.Float), sa.column('rate_type', sa.String),
+        sa.column('effective_from', sa.Date), sa.column('notification', sa.String),
+    )
+    op.bulk_insert(rates, [
+        {**row, 'state': row['state'].strip().lower(), 'rate': float(row['rate']),
+         'effective_from': date.fromisoformat(row['effective_from'])}
+        for row in csv.DictReader(io.StringIO(MINIMUM_WAGES_CSV))
+    ])
+    # Existing listings are checked by the background re-evaluation on the next start,
+    # which picks up every row without a minimum_wage_version
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('job_posts', schema=None) as batch_op:
+        batch_op.drop_column('minimum_wage_version')
+        batch_op.drop_column('is_minimum_wage_compliant')
+
+    with op.batch_alter_table('contracts', schema=None) as batch_op:
+        batch_op.drop_column('minimum_wage_version')
+
+    with op.batch_alter_table('minimum_wage_rates', schema=None) as batch_op:
+        batch_op.drop_index('ix_minimum_wage_rates_state_category')
+
+    op.drop_table('minimum_wage_rates')
+    # ### end Alembic commands ###
+    # Dropping columns rebuilds the tables on SQLite, which loses the full-text triggers
+    if op.get_bind().dialect.name == 'sqlite':
+        for table_name in ('contracts', 'job_posts'):
+            for statement in SQLITE_FULLTEXT_DDL[table_name]:
+                op.execute(statement)
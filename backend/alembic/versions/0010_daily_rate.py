@@ -0,0 +1,160 @@
+"""daily rate
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 03:02:41.117204
+
+"""
+from typing import Any, Optional, Sequence, Union
+
+import re
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rate normalization as of this revision (app/search_fields.py), kept here so the
+# backfill does not change when the app's helpers do
+DAYS_PER_RATE = {'hourly': 1 / 8, 'daily': 1, 'weekly': 6, 'monthly': 26}
+DAYS_PER_PERIOD = {'day': 1, 'week': 6, 'month': 26, 'year': 312}
+WORKING_DAYS_PER_WEEK = 6
+_DURATION = re.compile(r'(\d+(?:\.\d+)?)\s*(day|week|month|year)')
+
+# SQLite full-text triggers, recreated after a downgrade rebuilds the tables
+SQLITE_FULLTEXT_TRIGGERS = {
+    'contracts': [
+        "CREATE TRIGGER IF NOT EXISTS contracts_fts_insert AFTER INSERT ON contracts BEGIN "
+        "INSERT INTO contracts_fts (entity_id, title, description, skills) VALUES (new.id, new.title, new.description, "
+        "(SELECT group_concat(value, ' ') FROM json_each(new.requirements, '$.skills'))); END",
+        "CREATE TRIGGER IF NOT EXISTS contracts_fts_update AFTER UPDATE OF title, description, requirements ON contracts BEGIN "
+        "DELETE FROM contracts_fts WHERE contracts_fts MATCH ('entity_id:\"' || old.id || '\"'); "
+        "INSERT INTO contracts_fts (entity_id, title, description, skills) VALUES (new.id, new.title, new.description, "
+        "(SELECT group_concat(value, ' ') FROM json_each(new.requirements, '$.skills'))); END",
+        "CREATE TRIGGER IF NOT EXISTS contracts_fts_delete AFTER DELETE ON contracts BEGIN "
+        "DELETE FROM contracts_fts WHERE contracts_fts MATCH ('entity_id:\"' || old.id || '\"'); END",
+    ],
+    'job_posts': [
+        "CREATE TRIGGER IF NOT EXISTS job_posts_fts_insert AFTER INSERT ON job_posts BEGIN "
+        "INSERT INTO job_posts_fts (entity_id, title, description, category, skills) VALUES (new.id, new.title, "
+        "new.description, new.category, (SELECT group_concat(value, ' ') FROM json_each(new.requirements, '$.skills'))); END",
+        "CREATE TRIGGER IF NOT EXISTS job_posts_fts_update AFTER UPDATE OF title, description, category, requirements "
+        "ON job_posts BEGIN DELETE FROM job_posts_fts WHERE job_posts_fts MATCH ('entity_id:\"' || old.id || '\"'); "
+        "INSERT INTO job_posts_fts (entity_id, title, description, category, skills) VALUES (new.id, new.title, "
+        "new.description, new.category, (SELECT group_concat(value, ' ') FROM json_each(new.requirements, '$.skills'))); END",
+        "CREATE TRIGGER IF NOT EXISTS job_posts_fts_delete AFTER DELETE ON job_posts BEGIN "
+        "DELETE FROM job_posts_fts WHERE job_posts_fts MATCH ('entity_id:\"' || old.id || '\"'); END",
+    ],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('contracts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('daily_rate', sa.Float(), nullable=True))
+        batch_op.drop_index(batch_op.f('ix_contracts_status_city_rate'))
+        batch_op.drop_index(batch_op.f('ix_contracts_status_rate'))
+        batch_op.drop_index(batch_op.f('ix_contracts_status_state_rate'))
+        batch_op.create_index('ix_contracts_status_city_daily_rate', ['status', 'location_city', 'daily_rate'], unique=False)
+        batch_op.create_index('ix_contracts_status_daily_rate', ['status', 'daily_rate'], unique=False)
+        batch_op.create_index('ix_contracts_status_state_daily_rate', ['status', 'location_state', 'daily_rate'], unique=False)
+
+    with op.batch_alter_table('job_posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('daily_rate', sa.Float(), nullable=True))
+        batch_op.drop_index(batch_op.f('ix_job_posts_status_city_rate'))
+        batch_op.drop_index(batch_op.f('ix_job_posts_status_rate'))
+        batch_op.drop_index(batch_op.f('ix_job_posts_status_state_rate'))
+        batch_op.create_index('ix_job_posts_status_city_daily_rate', ['status', 'location_city', 'daily_rate'], unique=False)
+        batch_op.create_index('ix_job_posts_status_daily_rate', ['status', 'daily_rate'], unique=False)
+        batch_op.create_index('ix_job_posts_status_state_daily_rate', ['status', 'location_state', 'daily_rate'], unique=False)
+
+    # ### end Alembic commands ###
+    _backfill('contracts')
+    _backfill('job_posts')
+
+
+def _get(data: Any, *keys: str) -> Any:
+    if not isinstance(data, dict):
+        return None
+    for key in keys:
+        if data.get(key) not in (None, ''):
+            return data[key]
+    return None
+
+
+def _date(value: Any) -> Optional[date]:
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def daily_rate(payment: Any, work_details: Any) -> Optional[float]:
+    """Pay per working day; a fixed price is spread over the job's working days."""
+    try:
+        rate = float(_get(payment, 'rate'))
+    except (TypeError, ValueError):
+        return None
+    rate_type = str(_get(payment, 'rate_type', 'rateType') or '').strip().lower()
+    if rate_type != 'fixed':
+        return rate / DAYS_PER_RATE[rate_type] if rate_type in DAYS_PER_RATE else None
+    start = _date(_get(work_details, 'start_date', 'startDate'))
+    end = _date(_get(work_details, 'end_date', 'endDate'))
+    days = None
+    if start and end and end > start:
+        days = (end - start).days * WORKING_DAYS_PER_WEEK / 7
+    else:
+        match = _DURATION.search(str(_get(work_details, 'duration') or '').lower())
+        if match:
+            days = float(match.group(1)) * DAYS_PER_PERIOD[match.group(2)]
+    return rate / days if days else None
+
+
+def _backfill(table_name: str) -> None:
+    """Fill daily_rate from the existing payment and work_details JSON."""
+    bind = op.get_bind()
+    table = sa.table(table_name,
+        sa.column('id', sa.String), sa.column('payment', sa.JSON),
+        sa.column('work_details', sa.JSON), sa.column('daily_rate', sa.Float),
+    )
+    rows = bind.execute(sa.select(table.c.id, table.c.payment, table.c.work_details)).fetchall()
+    for row in rows:
+        value = daily_rate(row.payment, row.work_details)
+        if value is not None:
+            bind.execute(table.update().where(table.c.id == row.id).values(daily_rate=value))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('job_posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_posts_status_state_daily_rate')
+        batch_op.drop_index('ix_job_posts_status_daily_rate')
+        batch_op.drop_index('ix_job_posts_status_city_daily_rate')
+        batch_op.create_index(batch_op.f('ix_job_posts_status_state_rate'), ['status', 'location_state', 'pay_rate'], unique=False)
+        batch_op.create_index(batch_op.f('ix_job_posts_status_rate'), ['status', 'pay_rate'], unique=False)
+        batch_op.create_index(batch_op.f('ix_job_posts_status_city_rate'), ['status', 'location_city', 'pay_rate'], unique=False)
+        batch_op.drop_column('daily_rate')
+
+    with op.batch_alter_table('contracts', schema=None) as batch_op:
+        batch_op.drop_index('ix_contracts_status_state_daily_rate')
+        batch_op.drop_index('ix_contracts_status_daily_rate')
+        batch_op.drop_index('ix_contracts_status_city_daily_rate')
+        batch_op.create_index(batch_op.f('ix_contracts_status_state_rate'), ['status', 'location_state', 'pay_rate'], unique=False)
+        batch_op.create_index(batch_op.f('ix_contracts_status_rate'), ['status', 'pay_rate'], unique=False)
+        batch_op.create_index(batch_op.f('ix_contracts_status_city_rate'), ['status', 'location_city', 'pay_rate'], unique=False)
+        batch_op.drop_column('daily_rate')
+
+    # ### end Alembic commands ###
+    # Dropping columns rebuilds the tables on SQLite, which loses the full-text triggers
+    if op.get_bind().dialect.name == 'sqlite':
+        for statements in SQLITE_FULLTEXT_TRIGGERS.values():
+            for statement in statements:
+                op.execute(statement)
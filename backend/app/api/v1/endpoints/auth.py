@@ -1,30 +1,33 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from datetime import timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from app.database import get_db
 from app.models import User, Employer
 from app.schemas import (
     UserCreate, UserLogin, UserResponse, EmployerCreate, EmployerResponse,
-    Token, ApiResponse
+    Token, ApiResponse, PasswordChange, TokenData
 )
 from app.auth import (
-    authenticate_user, create_access_token, get_password_hash, get_user_type
+    ACCESS_TOKEN_LIFETIME, authenticate_user, create_access_token, hash_password, get_user_type
 )
-from app.dependencies import get_current_user
+from app.cache import entity_cache
+from app.dependencies import get_current_user, get_current_token
+from app.hashing import password_hasher
+from app.tokens import token_revocations
 from typing import Union
 
 router = APIRouter()
 
 @router.post("/register/worker", response_model=ApiResponse)
-async def register_worker(user: UserCreate, db: Session = Depends(get_db)):
+async def register_worker(user: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new worker."""
     
     # Check if user already exists
     existing_user = None
     if user.email:
-        existing_user = db.query(User).filter(User.email == user.email).first()
+        existing_user = await db.scalar(select(User).where(User.email == user.email))
     if not existing_user and user.phone:
-        existing_user = db.query(User).filter(User.phone == user.phone).first()
+        existing_user = await db.scalar(select(User).where(User.phone == user.phone))
     
     if existing_user:
         raise HTTPException(
@@ -33,7 +36,7 @@ async def register_worker(user: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Hash password
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await hash_password(user.password)
     
     # Create user
     db_user = User(
@@ -49,25 +52,25 @@ async def register_worker(user: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return ApiResponse(
         success=True,
-        data=UserResponse.from_orm(db_user),
+        data=UserResponse.model_validate(db_user),
         message="Worker registered successfully"
     )
 
 @router.post("/register/employer", response_model=ApiResponse)
-async def register_employer(employer: EmployerCreate, db: Session = Depends(get_db)):
+async def register_employer(employer: EmployerCreate, db: AsyncSession = Depends(get_db)):
     """Register a new employer."""
     
     # Check if employer already exists
     existing_employer = None
     if employer.email:
-        existing_employer = db.query(Employer).filter(Employer.email == employer.email).first()
+        existing_employer = await db.scalar(select(Employer).where(Employer.email == employer.email))
     if not existing_employer and employer.phone:
-        existing_employer = db.query(Employer).filter(Employer.phone == employer.phone).first()
+        existing_employer = await db.scalar(select(Employer).where(Employer.phone == employer.phone))
     
     if existing_employer:
         raise HTTPException(
@@ -76,7 +79,7 @@ async def register_employer(employer: EmployerCreate, db: Session = Depends(get_
         )
     
     # Hash password
-    hashed_password = get_password_hash(employer.password)
+    hashed_password = await hash_password(employer.password)
     
     # Create employer
     db_employer = Employer(
@@ -91,20 +94,20 @@ async def register_employer(employer: EmployerCreate, db: Session = Depends(get_
     )
     
     db.add(db_employer)
-    db.commit()
-    db.refresh(db_employer)
+    await db.commit()
+    await db.refresh(db_employer)
     
     return ApiResponse(
         success=True,
-        data=EmployerResponse.from_orm(db_employer),
+        data=EmployerResponse.model_validate(db_employer),
         message="Employer registered successfully"
     )
 
 @router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     """Login for both workers and employers."""
     
-    user = authenticate_user(db, user_credentials.phone_or_email, user_credentials.password)
+    user = await authenticate_user(db, user_credentials.phone_or_email, user_credentials.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -112,13 +115,12 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token_expires = timedelta(days=7)  # 7 days instead of 30 minutes
+    user_type = get_user_type(user)
     access_token = create_access_token(
-        data={"sub": user.id}, expires_delta=access_token_expires
+        data={"sub": user.id, "type": user_type}, expires_delta=ACCESS_TOKEN_LIFETIME
     )
     
-    user_type = get_user_type(user)
-    user_data = UserResponse.from_orm(user) if user_type == "worker" else EmployerResponse.from_orm(user)
+    user_data = UserResponse.model_validate(user) if user_type == "worker" else EmployerResponse.model_validate(user)
     
     return {
         "access_token": access_token,
@@ -132,7 +134,7 @@ async def get_current_user_info(current_user: Union[User, Employer] = Depends(ge
     """Get current user information."""
     
     user_type = get_user_type(current_user)
-    user_data = UserResponse.from_orm(current_user) if user_type == "worker" else EmployerResponse.from_orm(current_user)
+    user_data = UserResponse.model_validate(current_user) if user_type == "worker" else EmployerResponse.model_validate(current_user)
     
     return ApiResponse(
         success=True,
@@ -144,9 +146,38 @@ async def get_current_user_info(current_user: Union[User, Employer] = Depends(ge
     )
 
 @router.post("/logout", response_model=ApiResponse)
-async def logout(current_user: Union[User, Employer] = Depends(get_current_user)):
-    """Logout user (client should remove token)."""
+async def logout(token: TokenData = Depends(get_current_token), db: AsyncSession = Depends(get_db)):
+    """Logout user: the token is revoked server-side and rejected from now on."""
+    await token_revocations.revoke_token(db, token)
     return ApiResponse(
         success=True,
         message="Logged out successfully"
+    )
+
+@router.post("/change-password", response_model=ApiResponse)
+async def change_password(
+    change: PasswordChange,
+    current_user: Union[User, Employer] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Change password. Every token issued before now is revoked; a fresh one is returned."""
+    
+    valid, _ = await password_hasher.verify_and_update(change.current_password, current_user.password_hash)
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Current password is incorrect"
+        )
+    
+    current_user.password_hash = await hash_password(change.new_password)
+    await token_revocations.revoke_account(db, current_user.id)  # commits the new hash too
+    await entity_cache.invalidate(type(current_user), current_user.id)
+    
+    access_token = create_access_token(
+        data={"sub": current_user.id, "type": get_user_type(current_user)}, expires_delta=ACCESS_TOKEN_LIFETIME
+    )
+    return ApiResponse(
+        success=True,
+        data={"access_token": access_token, "token_type": "bearer"},
+        message="Password changed successfully"
     )
\ No newline at end of file
@@ -1,21 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Union
+from contextlib import aclosing
+from app.database import get_db, AsyncSessionLocal
 from app.models import ChatMessage, User, Contract
 from app.schemas import (
     ChatMessageCreate, ChatMessageResponse, ApiResponse, PaginatedResponse, JobAnalysisChatCreate
 )
+from app.pagination import paginate
+from app.conditional import conditional_response, page_validators, request_variant
+from app.serialization import validate_rows
+from app.streaming import event_stream_response, sse_event
 from app.dependencies import get_current_user, get_current_worker
-from app.services.gemini_service import gemini_service
-import re
+from app.services.gemini_service import gemini_service, unless_disconnected, ClientDisconnected
+from app.services.conversation_service import conversation_service
+from app.llm_cache import CachedAnswer
+from app.job_metrics import analyze_job
+from app.conversation import AI_SENDER, ConversationContext, is_follow_up
+from app.intents import CONTRACT, JOBS, RIGHTS, Intent, classify, intent_router, template_answer
 
 router = APIRouter()
 
 @router.post("/", response_model=ApiResponse)
 async def send_chat_message(
+    request: Request,
     message: ChatMessageCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_worker)
 ):
     """Send a chat message to AI assistant."""
@@ -27,68 +38,46 @@ async def send_chat_message(
     print(f"Message content: {message.message}")
     print(f"==================")
     
-    # Ensure the message is from the current user
-    if message.sender_id != current_user.id:
-        print(f"ERROR: Sender ID mismatch. Message sender: {message.sender_id}, Current user: {current_user.id}")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Cannot send message on behalf of another user"
-        )
-    
-    # Save user message
-    user_message = ChatMessage(
-        sender_id=message.sender_id,
-        receiver_id=message.receiver_id,
-        message=message.message,
-        message_type=message.message_type,
-        contract_id=message.contract_id
-    )
-    
-    db.add(user_message)
-    db.commit()
-    db.refresh(user_message)
+    # Ensure the message is from the current user, then save it
+    _ensure_own_message(message, current_user)
+    user_message = await _save_user_message(db, message)
     
     # Generate AI response
-    user_data = {
-        "name": current_user.name,
-        "area_of_expertise": current_user.area_of_expertise,
-        "location": current_user.location,
-        "preferences": current_user.preferences,
-        "experience": current_user.experience
-    }
+    user_data = _worker_profile(current_user)
+    # Greetings, help and the menu come from templates; other intents go to their Gemini method
+    route = await _route(db, message, user_message)
     
     try:
-        ai_response_text = await gemini_service.general_assistance(user_data, message.message)
+        ai_response_text = await unless_disconnected(
+            request, generate_ai_response(route, message.message, user_data, current_user.id)
+        )
+    except ClientDisconnected:
+        return Response(status_code=499)  # nobody is waiting for the answer
     except Exception as e:
         print(f"Gemini API Error: {e}")
         ai_response_text = "I'm having trouble connecting to the AI service right now. Please try again in a moment."
     
     # Save AI response
-    ai_message = ChatMessage(
-        sender_id="ai-assistant",
-        receiver_id=current_user.id,
-        message=ai_response_text,
-        message_type="text",
-        contract_id=message.contract_id
-    )
-    
-    db.add(ai_message)
-    db.commit()
-    db.refresh(ai_message)
+    ai_message = await _save_ai_message(db, user_message, ai_response_text)
+    if not route.intent.templated:  # greetings and the menu wait to be folded in with the next exchange
+        conversation_service.remember(current_user.id, message.contract_id)
     
     return ApiResponse(
         success=True,
         data={
-            "user_message": ChatMessageResponse.from_orm(user_message),
-            "ai_response": ChatMessageResponse.from_orm(ai_message)
+            "user_message": ChatMessageResponse.model_validate(user_message),
+            "ai_response": ChatMessageResponse.model_validate(ai_message),
+            "cached": isinstance(ai_response_text, CachedAnswer),  # served from the answer cache
+            "intent": route.intent.name
         },
         message="Messages sent and received successfully"
     )
 
 @router.post("/job-analysis", response_model=ApiResponse)
 async def send_job_analysis_message(
+    request: Request,
     message: JobAnalysisChatCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_worker)
 ):
     """Send a chat message for job analysis with job and user context."""
@@ -100,248 +89,355 @@ async def send_job_analysis_message(
     print(f"User data provided: {message.user_data is not None}")
     print(f"================================")
     
-    # Ensure the message is from the current user
-    if message.sender_id != current_user.id:
-        print(f"ERROR: Sender ID mismatch. Message sender: {message.sender_id}, Current user: {current_user.id}")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Cannot send message on behalf of another user"
-        )
-    
-    # Save user message
-    user_message = ChatMessage(
-        sender_id=message.sender_id,
-        receiver_id=message.receiver_id,
-        message=message.message,
-        message_type=message.message_type,
-        contract_id=message.contract_id
-    )
-    
-    db.add(user_message)
-    db.commit()
-    db.refresh(user_message)
+    # Ensure the message is from the current user, then save it
+    _ensure_own_message(message, current_user)
+    user_message = await _save_user_message(db, message)
     
     # Prepare user data (use provided data or fetch from current user)
-    user_data = message.user_data or {
-        "id": current_user.id,
-        "name": current_user.name,
-        "area_of_expertise": current_user.area_of_expertise,
-        "location": current_user.location,
-        "preferences": current_user.preferences,
-        "experience": current_user.experience
-    }
+    user_data = message.user_data or _worker_profile(current_user)
+    
+    # Skills match, wage, fairness and commute are computed locally; Gemini writes the recommendation
+    metrics = analyze_job(message.job_data, user_data) if message.job_data else None
     
     # Generate AI response using job analysis
+    route = None
     try:
         if message.job_data:
             # Use specialized job analysis if job data is provided
-            ai_response_text = await gemini_service.analyze_job_opportunity(
+            ai_response_text = await unless_disconnected(request, gemini_service.analyze_job_opportunity(
                 message.job_data, 
                 user_data, 
-                message.message
-            )
+                message.message,
+                user_id=current_user.id,
+                metrics=metrics
+            ))
         else:
-            # Fall back to general assistance if no job data
-            ai_response_text = await gemini_service.general_assistance(user_data, message.message)
+            # Without job data the message is answered like any other chat message
+            route = await _route(db, message, user_message)
+            ai_response_text = await unless_disconnected(
+                request, generate_ai_response(route, message.message, user_data, current_user.id)
+            )
             
+    except ClientDisconnected:
+        return Response(status_code=499)  # nobody is waiting for the answer
     except Exception as e:
         print(f"Gemini API Error: {e}")
         ai_response_text = "I'm having trouble analyzing this job opportunity right now. Please try again in a moment."
     
     # Save AI response
-    ai_message = ChatMessage(
-        sender_id="ai-assistant",
-        receiver_id=current_user.id,
-        message=ai_response_text,
-        message_type="text",
-        contract_id=message.contract_id
-    )
-    
-    db.add(ai_message)
-    db.commit()
-    db.refresh(ai_message)
+    ai_message = await _save_ai_message(db, user_message, ai_response_text)
+    if route is None or not route.intent.templated:
+        conversation_service.remember(current_user.id, message.contract_id)
     
     return ApiResponse(
         success=True,
         data={
-            "user_message": ChatMessageResponse.from_orm(user_message),
-            "ai_response": ChatMessageResponse.from_orm(ai_message)
+            "user_message": ChatMessageResponse.model_validate(user_message),
+            "ai_response": ChatMessageResponse.model_validate(ai_message),
+            "cached": isinstance(ai_response_text, CachedAnswer),  # served from the answer cache
+            "metrics": metrics,
+            "intent": route.intent.name if route else None
         },
         message="Job analysis completed successfully"
     )
 
-@router.get("/", response_model=PaginatedResponse)
+def _ensure_own_message(message: Union[ChatMessageCreate, JobAnalysisChatCreate], current_user: User) -> None:
+    if message.sender_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Cannot send message on behalf of another user"
+        )
+
+async def _save_user_message(db: AsyncSession, message: Union[ChatMessageCreate, JobAnalysisChatCreate]) -> ChatMessage:
+    user_message = ChatMessage(
+        sender_id=message.sender_id,
+        receiver_id=message.receiver_id,
+        message=message.message,
+        message_type=message.message_type,
+        contract_id=message.contract_id
+    )
+    db.add(user_message)
+    await db.commit()
+    await db.refresh(user_message)
+    return user_message
+
+async def _save_ai_message(db: AsyncSession, user_message: ChatMessage, text: str) -> ChatMessage:
+    """The assistant's answer to ``user_message``, in the same chat."""
+    ai_message = ChatMessage(
+        sender_id=AI_SENDER,
+        receiver_id=user_message.sender_id,
+        message=text,
+        message_type="text",
+        contract_id=user_message.contract_id
+    )
+    db.add(ai_message)
+    await db.commit()
+    await db.refresh(ai_message)
+    return ai_message
+
+def _worker_profile(user: User) -> dict:
+    return {
+        "id": user.id,
+        "name": user.name,
+        "area_of_expertise": user.area_of_expertise,
+        "location": user.location,
+        "preferences": user.preferences,
+        "experience": user.experience
+    }
+
+class ChatRoute(NamedTuple):
+    """How a chat message is answered (see generate_ai_response)."""
+    intent: Intent
+    conversation: Optional[ConversationContext] = None  # for general assistance
+    contract: Optional[Dict[str, Any]] = None  # for a question about the chat's contract
+
+async def _contract_data(db: AsyncSession, contract_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    contract = await db.get(Contract, contract_id) if contract_id else None
+    if contract is None:
+        return None
+    return {
+        "title": contract.title,
+        "description": contract.description,
+        "payment": contract.payment,
+        "work_details": contract.work_details
+    }
+
+async def _route(db: AsyncSession, message: Union[ChatMessageCreate, JobAnalysisChatCreate],
+                 user_message: ChatMessage) -> ChatRoute:
+    """Intent of a message and what answering it needs: unless a template answers it, the
+    conversation so far (a rolling summary plus the latest turns, within a fixed token
+    budget), and the contract for a contract question. Read before any answer streams."""
+    intent = classify(message.message, has_contract=bool(message.contract_id))
+    if intent.templated:
+        return ChatRoute(intent_router.route(intent))
+    conversation = await conversation_service.context(db, message.sender_id, message.contract_id,
+                                                      exclude_id=user_message.id)
+    follow_up = conversation is not None and is_follow_up(message.message)
+    contract = await _contract_data(db, message.contract_id) if intent.name == CONTRACT else None
+    intent = intent_router.route(intent, follow_up=follow_up, contract_found=contract is not None)
+    return ChatRoute(intent, conversation, contract)
+
+async def generate_ai_response(route: ChatRoute, user_message: str, user_data: Dict[str, Any], user_id: str) -> str:
+    """Answer a chat message by its intent (see app/intents.py): a template for greetings,
+    help and the menu, else the Gemini method for contracts, jobs, rights or anything else."""
+    
+    intent = route.intent
+    if intent.templated:
+        return template_answer(intent, user_data)
+    if intent.name == CONTRACT:
+        return await gemini_service.analyze_contract_terms(route.contract, user_data, user_id=user_id)
+    if intent.name == JOBS:
+        return await gemini_service.get_job_recommendations(user_data, user_message, user_id=user_id)
+    if intent.name == RIGHTS:
+        return await gemini_service.get_rights_assistance(user_data, user_message, user_id=user_id)
+    return await gemini_service.general_assistance(user_data, user_message, user_id=user_id,
+                                                   conversation=route.conversation)
+
+async def stream_ai_response(route: ChatRoute, user_message: str, user_data: Dict[str, Any],
+                             user_id: str) -> AsyncIterator[str]:
+    """``generate_ai_response``, streamed; a template answer comes as a single chunk."""
+    
+    intent = route.intent
+    if intent.templated:
+        yield template_answer(intent, user_data)
+        return
+    if intent.name == CONTRACT:
+        chunks = gemini_service.stream_contract_terms(route.contract, user_data, user_id=user_id)
+    elif intent.name == JOBS:
+        chunks = gemini_service.stream_job_recommendations(user_data, user_message, user_id=user_id)
+    elif intent.name == RIGHTS:
+        chunks = gemini_service.stream_rights_assistance(user_data, user_message, user_id=user_id)
+    else:
+        chunks = gemini_service.stream_general_assistance(user_data, user_message, user_id=user_id,
+                                                          conversation=route.conversation)
+    async with aclosing(chunks):
+        async for chunk in chunks:
+            yield chunk
+
+async def stream_ai_answer(user_message: ChatMessage, chunks: AsyncIterator[str], fallback: str,
+                          extra: Optional[Dict[str, Any]] = None, remember: bool = True) -> AsyncIterator[bytes]:
+    """SSE events for an answer generated chunk by chunk; the answer is saved once complete
+    (and, if ``remember``, the conversation's summary updated in the background).
+    
+    Events: ``user_message`` (the saved message), ``delta`` ({"text"} as it arrives) and
+    ``done`` ({"ai_response", "cached"} plus ``extra``, the saved answer). If the client disconnects the
+    Gemini call is cancelled and nothing more is saved.
+    """
+    yield sse_event("user_message", ChatMessageResponse.model_validate(user_message).model_dump(mode="json"))
+    
+    parts = []
+    cached = False
+    async with aclosing(chunks):
+        try:
+            async for chunk in chunks:
+                cached = isinstance(chunk, CachedAnswer)
+                parts.append(chunk)
+                yield sse_event("delta", {"text": chunk})
+        except Exception as e:
+            print(f"Gemini API Error: {e}")
+            # Same fallback as the non-streaming endpoints, after whatever was already shown
+            tail = f"\n\n{fallback}" if parts else fallback
+            parts.append(tail)
+            yield sse_event("delta", {"text": tail})
+    
+    # The request's session may already be closed once the response has started
+    async with AsyncSessionLocal() as db:
+        ai_message = await _save_ai_message(db, user_message, "".join(parts))
+    if remember:
+        conversation_service.remember(user_message.sender_id, user_message.contract_id)
+    
+    yield sse_event("done", {
+        "ai_response": ChatMessageResponse.model_validate(ai_message).model_dump(mode="json"),
+        "cached": cached,
+        **(extra or {}),
+    })
+
+@router.post("/stream")
+async def stream_chat_message(
+    message: ChatMessageCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_worker)
+):
+    """Send a chat message; the AI answer streams back as Server-Sent Events (see stream_ai_answer)."""
+    
+    _ensure_own_message(message, current_user)
+    user_message = await _save_user_message(db, message)
+    
+    route = await _route(db, message, user_message)
+    chunks = stream_ai_response(route, message.message, _worker_profile(current_user), current_user.id)
+    return event_stream_response(stream_ai_answer(
+        user_message, chunks, "I'm having trouble connecting to the AI service right now. Please try again in a moment.",
+        extra={"intent": route.intent.name}, remember=not route.intent.templated
+    ))
+
+@router.post("/job-analysis/stream")
+async def stream_job_analysis_message(
+    message: JobAnalysisChatCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_worker)
+):
+    """Job analysis chat with the answer streamed as Server-Sent Events (see stream_ai_answer)."""
+    
+    _ensure_own_message(message, current_user)
+    user_message = await _save_user_message(db, message)
+    
+    user_data = message.user_data or _worker_profile(current_user)
+    metrics = None
+    extra = None
+    remember = True
+    if message.job_data:
+        metrics = analyze_job(message.job_data, user_data)
+        extra = {"metrics": metrics}
+        chunks = gemini_service.stream_job_analysis(message.job_data, user_data, message.message,
+                                                    user_id=current_user.id, metrics=metrics)
+    else:
+        route = await _route(db, message, user_message)
+        extra = {"intent": route.intent.name}
+        remember = not route.intent.templated
+        chunks = stream_ai_response(route, message.message, user_data, current_user.id)
+    return event_stream_response(stream_ai_answer(
+        user_message, chunks, "I'm having trouble analyzing this job opportunity right now. Please try again in a moment.",
+        extra=extra, remember=remember
+    ))
+
+@router.get("/", response_model=PaginatedResponse[ChatMessageResponse])
 async def get_chat_messages(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
+    include_total: bool = Query(False),
     contract_id: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_worker)
 ):
     """Get chat messages for the current user."""
     
-    query = db.query(ChatMessage).filter(
+    query = select(ChatMessage).where(
         ChatMessage.sender_id == current_user.id
     )
     
     if contract_id:
-        query = query.filter(ChatMessage.contract_id == contract_id)
+        query = query.where(ChatMessage.contract_id == contract_id)
     
-    query = query.order_by(ChatMessage.timestamp.desc())
+    # Keyset pagination (exact total only when requested)
+    messages, pagination, next_cursor = await paginate(
+        db, query, ChatMessage.timestamp, ChatMessage.id, limit,
+        cursor=cursor, page=page, descending=True, include_total=include_total
+    )
     
-    # Pagination
-    total = query.count()
-    messages = query.offset((page - 1) * limit).limit(limit).all()
+    not_modified = conditional_response(request, response, page_validators(
+        request_variant(request, current_user.id, pagination=pagination, next_cursor=next_cursor), messages
+    ), use_modified_since=False)
+    if not_modified:
+        return not_modified
     
-    return PaginatedResponse(
+    return PaginatedResponse[ChatMessageResponse](
         success=True,
-        data=[ChatMessageResponse.from_orm(message) for message in messages],
-        pagination={
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "total_pages": (total + limit - 1) // limit
-        }
+        data=validate_rows(ChatMessageResponse, messages),
+        pagination=pagination,
+        next_cursor=next_cursor
     )
 
-@router.get("/conversation", response_model=PaginatedResponse)
+@router.get("/conversation", response_model=PaginatedResponse[ChatMessageResponse])
 async def get_conversation(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
+    include_total: bool = Query(False),
     contract_id: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_worker)
 ):
     """Get conversation (both user and AI messages) for the current user."""
     
-    query = db.query(ChatMessage).filter(
+    query = select(ChatMessage).where(
         (ChatMessage.sender_id == current_user.id) |
         (ChatMessage.receiver_id == current_user.id)
     )
     
     if contract_id:
-        query = query.filter(ChatMessage.contract_id == contract_id)
+        query = query.where(ChatMessage.contract_id == contract_id)
     
-    query = query.order_by(ChatMessage.timestamp.asc())
+    # Keyset pagination (exact total only when requested)
+    messages, pagination, next_cursor = await paginate(
+        db, query, ChatMessage.timestamp, ChatMessage.id, limit,
+        cursor=cursor, page=page, descending=False, include_total=include_total
+    )
     
-    # Pagination
-    total = query.count()
-    messages = query.offset((page - 1) * limit).limit(limit).all()
+    not_modified = conditional_response(request, response, page_validators(
+        request_variant(request, current_user.id, pagination=pagination, next_cursor=next_cursor), messages
+    ), use_modified_since=False)
+    if not_modified:
+        return not_modified
     
-    return PaginatedResponse(
+    return PaginatedResponse[ChatMessageResponse](
         success=True,
-        data=[ChatMessageResponse.from_orm(message) for message in messages],
-        pagination={
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "total_pages": (total + limit - 1) // limit
-        }
+        data=validate_rows(ChatMessageResponse, messages),
+        pagination=pagination,
+        next_cursor=next_cursor
     )
 
-async def generate_ai_response(
-    user_message: str, 
-    user: User, 
-    contract_id: Optional[str], 
-    db: Session
-) -> str:
-    """Generate AI response based on user message and context."""
-    
-    # Prepare user data for AI
-    user_data = {
-        "name": user.name,
-        "area_of_expertise": user.area_of_expertise,
-        "location": user.location,
-        "preferences": user.preferences,
-        "experience": user.experience
-    }
-    
-    # Detect intent from user message
-    message_lower = user_message.lower()
-    
-    # Job-related keywords
-    job_keywords = [
-        "job", "work", "employment", "opportunity", "hiring", "looking for work",
-        "find job", "job search", "employment opportunity", "work available",
-        "jobs near me", "construction work", "carpenter", "plumber", "electrician"
-    ]
-    
-    # Rights-related keywords
-    rights_keywords = [
-        "rights", "law", "legal", "minimum wage", "payment", "salary", "wage",
-        "government scheme", "subsidy", "mgnrega", "esi", "pf", "provident fund",
-        "labor law", "working hours", "overtime", "safety", "compensation",
-        "dispute", "complaint", "exploitation", "unfair"
-    ]
-    
-    # Contract analysis keywords
-    contract_keywords = [
-        "contract", "agreement", "terms", "conditions", "fair", "analyze",
-        "understand", "explain", "review"
-    ]
-    
-    try:
-        # Check if user is asking about a specific contract
-        if contract_id and any(keyword in message_lower for keyword in contract_keywords):
-            contract = db.query(Contract).filter(Contract.id == contract_id).first()
-            if contract:
-                contract_data = {
-                    "title": contract.title,
-                    "description": contract.description,
-                    "payment": contract.payment,
-                    "work_details": contract.work_details
-                }
-                return await gemini_service.analyze_contract_terms(contract_data, user_data)
-        
-        # Check for job-related queries
-        elif any(keyword in message_lower for keyword in job_keywords):
-            return await gemini_service.get_job_recommendations(user_data, user_message)
-        
-        # Check for rights-related queries
-        elif any(keyword in message_lower for keyword in rights_keywords):
-            return await gemini_service.get_rights_assistance(user_data, user_message)
-        
-        # General assistance
-        else:
-            return await gemini_service.general_assistance(user_data, user_message)
-            
-    except Exception as e:
-        print(f"Gemini AI Error: {e}")
-        # Simple fallback responses instead of generic error
-        message_lower = user_message.lower()
-        
-        if any(word in message_lower for word in ['hello', 'hi', 'hey', 'good morning', 'good evening']):
-            return f"Hello {user.name}! 👋 I'm your AI assistant. I can help you with job search, understanding your rights, contract analysis, and work logging. What would you like to know about?"
-        
-        elif any(word in message_lower for word in ['job', 'work', 'employment']):
-            return f"I can help you find suitable jobs! Based on your expertise in {', '.join(user.area_of_expertise)}, I can recommend opportunities in your area. Would you like me to help you search for jobs or review contract terms?"
-        
-        elif any(word in message_lower for word in ['payment', 'money', 'salary', 'wage']):
-            return f"For payment tracking and wage information:\n\n• Check if jobs meet minimum wage requirements\n• Track your payments and work hours\n• Understand your payment rights\n• Get help with payment disputes\n\nWhat specific payment question do you have?"
-        
-        elif any(word in message_lower for word in ['rights', 'legal', 'law']):
-            return f"Your worker rights include:\n\n• Fair wages and timely payments\n• Safe working conditions\n• Right to file complaints\n• Access to government schemes\n\nI can provide specific information about labor laws in {user.location.get('state', 'your state')}. What would you like to know?"
-        
-        else:
-            return f"Thanks for your message! I'm here to help with:\n\n🔍 **Job Search** - Find work opportunities\n⚖️ **Worker Rights** - Know your legal protections\n💰 **Payment Tracking** - Monitor wages and payments\n📋 **Contract Help** - Understand job terms\n\nWhat can I assist you with today?"
-
 @router.post("/mark-read", response_model=ApiResponse)
 async def mark_messages_read(
     message_ids: List[str],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_worker)
 ):
     """Mark messages as read."""
     
-    messages = db.query(ChatMessage).filter(
+    messages = (await db.scalars(select(ChatMessage).where(
         ChatMessage.id.in_(message_ids),
         ChatMessage.receiver_id == current_user.id
-    ).all()
+    ))).all()
     
     for message in messages:
         message.is_read = True
     
-    db.commit()
+    await db.commit()
     
     return ApiResponse(
         success=True,
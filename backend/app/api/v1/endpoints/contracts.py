@@ -1,22 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_, or_
 from typing import List, Optional
 from app.database import get_db
-from app.models import Contract, User, Employer
+from app.models import Contract, ContractSkill, User, Employer
 from app.schemas import (
     ContractCreate, ContractUpdate, ContractResponse, ApiResponse, PaginatedResponse,
-    ContractFilters, SearchQuery
+    ContractFilters, SearchQuery, ContractSearchResult, SearchHighlight
 )
+from app.pagination import paginate, paginate_rows
+from app.loading import load_related, CONTRACT_RESPONSE_RELATIONS
+from app.cache import entity_cache
+from app.conditional import conditional_response, entity_validators, page_validators, request_variant
+from app.serialization import validate_rows
+from app.fulltext import parse_search_terms, apply_fulltext
+from app.geo import search_origin, search_radius, apply_radius, distance_sq_expr, distances_km
 from app.dependencies import get_current_user, get_current_worker, get_current_employer
+from app.search_fields import normalize_text, parse_skill_filter
 from typing import Union
 
 router = APIRouter()
 
-@router.post("/", response_model=ApiResponse)
+@router.post("/", response_model=ApiResponse[ContractResponse])
 async def create_contract(
     contract: ContractCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Employer = Depends(get_current_employer)
 ):
     """Create a new contract (employers only)."""
@@ -38,40 +46,45 @@ async def create_contract(
     )
     
     db.add(db_contract)
-    db.commit()
-    db.refresh(db_contract)
+    await db.commit()
+    await db.refresh(db_contract)
+    await load_related(db, [db_contract], *CONTRACT_RESPONSE_RELATIONS)
     
-    return ApiResponse(
+    return ApiResponse[ContractResponse](
         success=True,
-        data=ContractResponse.from_orm(db_contract),
+        data=ContractResponse.model_validate(db_contract),
         message="Contract created successfully"
     )
 
-@router.get("/", response_model=PaginatedResponse)
+@router.get("/", response_model=PaginatedResponse[ContractResponse])
 async def get_contracts(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    include_total: bool = Query(False),
     status: Optional[str] = Query(None),
     employer_id: Optional[str] = Query(None),
     worker_id: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Union[User, Employer] = Depends(get_current_user)
 ):
     """Get contracts with filtering and pagination."""
     
-    query = db.query(Contract)
+    query = select(Contract)
     
     # Apply filters
     if status:
-        query = query.filter(Contract.status == status)
+        query = query.where(Contract.status == status)
     if employer_id:
-        query = query.filter(Contract.employer_id == employer_id)
+        query = query.where(Contract.employer_id == employer_id)
     if worker_id:
-        query = query.filter(Contract.accepted_by == worker_id)
+        query = query.where(Contract.accepted_by == worker_id)
     
     # If user is a worker, show only their contracts or available ones
     if isinstance(current_user, User):
-        query = query.filter(
+        query = query.where(
             or_(
                 Contract.accepted_by == current_user.id,
                 Contract.status == "available"
@@ -79,32 +92,147 @@ async def get_contracts(
         )
     # If user is an employer, show only their contracts
     elif isinstance(current_user, Employer):
-        query = query.filter(Contract.employer_id == current_user.id)
+        query = query.where(Contract.employer_id == current_user.id)
     
-    # Pagination
-    total = query.count()
-    contracts = query.offset((page - 1) * limit).limit(limit).all()
+    # Keyset pagination (exact total only when requested)
+    contracts, pagination, next_cursor = await paginate(
+        db, query, Contract.created_at, Contract.id, limit,
+        cursor=cursor, page=page, descending=True, include_total=include_total
+    )
+    
+    await load_related(db, contracts, *CONTRACT_RESPONSE_RELATIONS)
+    not_modified = conditional_response(request, response, page_validators(
+        request_variant(request, current_user.id, pagination=pagination, next_cursor=next_cursor),
+        contracts, [contract.employer for contract in contracts], [contract.worker for contract in contracts]
+    ), use_modified_since=False)
+    if not_modified:
+        return not_modified
     
-    return PaginatedResponse(
+    return PaginatedResponse[ContractResponse](
         success=True,
-        data=[ContractResponse.from_orm(contract) for contract in contracts],
-        pagination={
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "total_pages": (total + limit - 1) // limit
-        }
+        data=validate_rows(ContractResponse, contracts),
+        pagination=pagination,
+        next_cursor=next_cursor
     )
 
-@router.get("/{contract_id}", response_model=ApiResponse)
+@router.get("/search", response_model=PaginatedResponse[ContractSearchResult])
+async def search_contracts(
+    keywords: str = Query(""),
+    location_city: Optional[str] = Query(None),
+    location_state: Optional[str] = Query(None),
+    max_distance: Optional[float] = Query(None, gt=0),  # km
+    near_pincode: Optional[str] = Query(None),
+    nearby: bool = Query(False),  # workers: limit to their max_travel_distance
+    min_rate: Optional[float] = Query(None),  # per working day, whatever the rate type
+    max_rate: Optional[float] = Query(None),
+    rate_type: Optional[str] = Query(None),
+    skills: Optional[str] = Query(None),  # comma-separated
+    sort_by: str = Query("relevance"),  # relevance, date, payment or distance
+    sort_order: str = Query("desc"),
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    include_total: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+    current_user: Union[User, Employer] = Depends(get_current_user)
+):
+    """Search contracts with filters.
+
+    Declared before /{contract_id} so the path is not captured as a contract id.
+    """
+    
+    query = select(Contract).where(Contract.status == "available")
+    
+    # Apply text search (full-text index, every keyword matched as a prefix)
+    terms = parse_search_terms(keywords)
+    rank = None
+    if terms:
+        query, rank, title_highlight, snippet = apply_fulltext(query, Contract, terms, db.bind.dialect.name)
+        query = query.add_columns(
+            rank.label("rank"), title_highlight.label("title_highlight"), snippet.label("snippet")
+        )
+    
+    # Apply location filters
+    if location_city:
+        query = query.where(Contract.location_city == normalize_text(location_city))
+    if location_state:
+        query = query.where(Contract.location_state == normalize_text(location_state))
+    
+    # Apply distance filter (around near_pincode, else the user's own pincode)
+    radius = search_radius(max_distance, nearby, current_user)
+    origin = None
+    if near_pincode or radius is not None or sort_by == "distance":
+        origin = search_origin(near_pincode, current_user)
+        if origin is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Unknown pincode; pass a valid near_pincode to search by distance"
+            )
+        if radius is not None:
+            query = apply_radius(query, Contract, origin, radius)
+    
+    # Apply payment filters
+    if min_rate is not None:
+        query = query.where(Contract.daily_rate >= min_rate)
+    if max_rate is not None:
+        query = query.where(Contract.daily_rate <= max_rate)
+    if rate_type:
+        query = query.where(Contract.pay_rate_type == normalize_text(rate_type))
+    
+    # Apply skills filter (any of the requested skills)
+    skill_list = parse_skill_filter(skills)
+    if skill_list:
+        query = query.where(Contract.id.in_(
+            select(ContractSkill.contract_id).where(ContractSkill.skill.in_(skill_list))
+        ))
+    
+    # Apply sorting
+    if sort_by == "date":
+        if sort_order == "desc":
+            query = query.order_by(Contract.created_at.desc())
+        else:
+            query = query.order_by(Contract.created_at.asc())
+    elif sort_by == "payment":
+        if sort_order == "desc":
+            query = query.order_by(Contract.daily_rate.desc().nulls_last(), Contract.created_at.desc())
+        else:
+            query = query.order_by(Contract.daily_rate.asc().nulls_last(), Contract.created_at.desc())
+    elif sort_by == "distance":
+        query = query.order_by(distance_sq_expr(Contract, origin).asc().nulls_last(), Contract.created_at.desc())
+    elif rank is not None:  # relevance
+        query = query.order_by(rank, Contract.created_at.desc())
+    else:
+        query = query.order_by(Contract.created_at.desc())
+    
+    # Pagination (relevance order has no cursor, so this one stays page-based)
+    rows, pagination = await paginate_rows(db, query, limit, page=page, include_total=include_total)
+    await load_related(db, [row[0] for row in rows], *CONTRACT_RESPONSE_RELATIONS)
+    
+    # Exact distances for the page only
+    distances = distances_km(origin, [row[0] for row in rows]) if origin else [None] * len(rows)
+    
+    results = validate_rows(ContractSearchResult, [row[0] for row in rows])
+    for result, row, distance in zip(results, rows, distances):
+        result.distance_km = distance
+        if terms:
+            result.highlight = SearchHighlight(rank=row.rank, title=row.title_highlight, snippet=row.snippet)
+    
+    return PaginatedResponse[ContractSearchResult](
+        success=True,
+        data=results,
+        pagination=pagination
+    )
+
+@router.get("/{contract_id}", response_model=ApiResponse[ContractResponse])
 async def get_contract(
     contract_id: str,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
     current_user: Union[User, Employer] = Depends(get_current_user)
 ):
     """Get a specific contract by ID."""
     
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
+    contract = await entity_cache.get(db, Contract, contract_id)
     if not contract:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -125,22 +253,29 @@ async def get_contract(
                 detail="Not authorized to view this contract"
             )
     
-    return ApiResponse(
+    await load_related(db, [contract], *CONTRACT_RESPONSE_RELATIONS)
+    not_modified = conditional_response(
+        request, response, entity_validators(contract, contract.employer, contract.worker)
+    )
+    if not_modified:
+        return not_modified
+    
+    return ApiResponse[ContractResponse](
         success=True,
-        data=ContractResponse.from_orm(contract),
+        data=ContractResponse.model_validate(contract),
         message="Contract retrieved successfully"
     )
 
-@router.put("/{contract_id}", response_model=ApiResponse)
+@router.put("/{contract_id}", response_model=ApiResponse[ContractResponse])
 async def update_contract(
     contract_id: str,
     contract_update: ContractUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Employer = Depends(get_current_employer)
 ):
     """Update a contract (employers only)."""
     
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
+    contract = await db.get(Contract, contract_id)
     if not contract:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -159,24 +294,26 @@ async def update_contract(
     for field, value in update_data.items():
         setattr(contract, field, value)
     
-    db.commit()
-    db.refresh(contract)
+    await db.commit()
+    await entity_cache.invalidate(Contract, contract_id)
+    await db.refresh(contract)
+    await load_related(db, [contract], *CONTRACT_RESPONSE_RELATIONS)
     
-    return ApiResponse(
+    return ApiResponse[ContractResponse](
         success=True,
-        data=ContractResponse.from_orm(contract),
+        data=ContractResponse.model_validate(contract),
         message="Contract updated successfully"
     )
 
-@router.post("/{contract_id}/accept", response_model=ApiResponse)
+@router.post("/{contract_id}/accept", response_model=ApiResponse[ContractResponse])
 async def accept_contract(
     contract_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_worker)
 ):
     """Accept a contract (workers only)."""
     
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
+    contract = await db.get(Contract, contract_id)
     if not contract:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -211,24 +348,26 @@ async def accept_contract(
         "pendingAmount": 0
     }
     
-    db.commit()
-    db.refresh(contract)
+    await db.commit()
+    await entity_cache.invalidate(Contract, contract_id)
+    await db.refresh(contract)
+    await load_related(db, [contract], *CONTRACT_RESPONSE_RELATIONS)
     
-    return ApiResponse(
+    return ApiResponse[ContractResponse](
         success=True,
-        data=ContractResponse.from_orm(contract),
+        data=ContractResponse.model_validate(contract),
         message="Contract accepted successfully"
     )
 
-@router.post("/{contract_id}/cancel", response_model=ApiResponse)
+@router.post("/{contract_id}/cancel", response_model=ApiResponse[ContractResponse])
 async def cancel_contract(
     contract_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Union[User, Employer] = Depends(get_current_user)
 ):
     """Cancel a contract."""
     
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
+    contract = await db.get(Contract, contract_id)
     if not contract:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -256,84 +395,13 @@ async def cancel_contract(
         )
     
     contract.status = "cancelled"
-    db.commit()
-    db.refresh(contract)
+    await db.commit()
+    await entity_cache.invalidate(Contract, contract_id)
+    await db.refresh(contract)
+    await load_related(db, [contract], *CONTRACT_RESPONSE_RELATIONS)
     
-    return ApiResponse(
+    return ApiResponse[ContractResponse](
         success=True,
-        data=ContractResponse.from_orm(contract),
+        data=ContractResponse.model_validate(contract),
         message="Contract cancelled successfully"
     )
-
-@router.get("/search", response_model=PaginatedResponse)
-async def search_contracts(
-    keywords: str = Query(""),
-    location_city: Optional[str] = Query(None),
-    location_state: Optional[str] = Query(None),
-    max_distance: Optional[int] = Query(None),
-    min_rate: Optional[float] = Query(None),
-    max_rate: Optional[float] = Query(None),
-    rate_type: Optional[str] = Query(None),
-    skills: Optional[str] = Query(None),  # comma-separated
-    sort_by: str = Query("relevance"),
-    sort_order: str = Query("desc"),
-    page: int = Query(1, ge=1),
-    limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: Union[User, Employer] = Depends(get_current_user)
-):
-    """Search contracts with filters."""
-    
-    query = db.query(Contract).filter(Contract.status == "available")
-    
-    # Apply text search
-    if keywords:
-        query = query.filter(
-            or_(
-                Contract.title.contains(keywords),
-                Contract.description.contains(keywords)
-            )
-        )
-    
-    # Apply location filters
-    if location_city or location_state:
-        # This would need more sophisticated JSON querying in production
-        pass
-    
-    # Apply payment filters
-    if min_rate or max_rate or rate_type:
-        # This would need JSON querying for payment field
-        pass
-    
-    # Apply skills filter
-    if skills:
-        skill_list = [s.strip() for s in skills.split(",")]
-        # This would need JSON array querying for requirements.skills
-        pass
-    
-    # Apply sorting
-    if sort_by == "date":
-        if sort_order == "desc":
-            query = query.order_by(Contract.created_at.desc())
-        else:
-            query = query.order_by(Contract.created_at.asc())
-    elif sort_by == "payment":
-        # Would need to sort by payment.rate
-        pass
-    else:  # relevance or default
-        query = query.order_by(Contract.created_at.desc())
-    
-    # Pagination
-    total = query.count()
-    contracts = query.offset((page - 1) * limit).limit(limit).all()
-    
-    return PaginatedResponse(
-        success=True,
-        data=[ContractResponse.from_orm(contract) for contract in contracts],
-        pagination={
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "total_pages": (total + limit - 1) // limit
-        }
-    )
\ No newline at end of file
@@ -1,22 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, or_
 from typing import List, Optional
 from app.database import get_db
-from app.models import JobPost, ContractApplication, User, Employer
+from app.models import JobPost, JobPostSkill, ContractApplication, User, Employer
 from app.schemas import (
     JobPostCreate, JobPostUpdate, JobPostResponse, ApiResponse, PaginatedResponse,
-    ContractApplicationCreate, ContractApplicationUpdate, ContractApplicationResponse
+    ContractApplicationCreate, ContractApplicationUpdate, ContractApplicationResponse,
+    JobPostSearchResult, SearchHighlight, RecommendedJob, JobMatch
 )
+from app.pagination import paginate, paginate_rows
+from app.loading import load_related, JOB_POST_RESPONSE_RELATIONS
+from app.cache import entity_cache, query_cache, json_page_response
+from app.conditional import (
+    conditional_response, entity_validators, page_validators, request_variant,
+    validator_headers, is_not_modified, not_modified_response
+)
+from app.serialization import validate_rows
+from app.fulltext import parse_search_terms, apply_fulltext
+from app.geo import search_origin, search_radius, apply_radius, distance_sq_expr, distances_km
+from app.services.matching_service import matching_service
 from app.dependencies import get_current_user, get_current_worker, get_current_employer
+from app.search_fields import normalize_text, parse_skill_filter
 from typing import Union
 
 router = APIRouter()
 
-@router.post("/", response_model=ApiResponse)
+@router.post("/", response_model=ApiResponse[JobPostResponse])
 async def create_job_post(
     job_post: JobPostCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Employer = Depends(get_current_employer)
 ):
     """Create a new job post (employers only)."""
@@ -39,68 +52,299 @@ async def create_job_post(
     )
     
     db.add(db_job_post)
-    db.commit()
-    db.refresh(db_job_post)
+    await db.commit()
+    await db.refresh(db_job_post)
+    await load_related(db, [db_job_post], *JOB_POST_RESPONSE_RELATIONS)
     
-    return ApiResponse(
+    return ApiResponse[JobPostResponse](
         success=True,
-        data=JobPostResponse.from_orm(db_job_post),
+        data=JobPostResponse.model_validate(db_job_post),
         message="Job post created successfully"
     )
 
-@router.get("/", response_model=PaginatedResponse)
+@router.get("/", response_model=PaginatedResponse[Union[JobPostSearchResult, JobPostResponse]])
 async def get_job_posts(
+    request: Request,
+    cursor: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    include_total: bool = Query(False),
     status: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
     employer_id: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    location_city: Optional[str] = Query(None),
+    location_state: Optional[str] = Query(None),
+    min_rate: Optional[float] = Query(None),  # per working day, whatever the rate type
+    max_rate: Optional[float] = Query(None),
+    rate_type: Optional[str] = Query(None),
+    skills: Optional[str] = Query(None),  # comma-separated
+    keywords: Optional[str] = Query(None),
+    max_distance: Optional[float] = Query(None, gt=0),  # km
+    near_pincode: Optional[str] = Query(None),
+    nearby: bool = Query(False),  # workers: limit to their max_travel_distance
+    sort_by: str = Query("date"),  # date or distance
+    db: AsyncSession = Depends(get_db),
     current_user: Union[User, Employer] = Depends(get_current_user)
 ):
-    """Get job posts with filtering and pagination."""
+    """Get job posts with filtering and pagination.
+    
+    Pages are cached as serialized bytes until a job post or employer is written, and
+    carry an ETag over the page's rows for conditional requests.
+    """
     
-    query = db.query(JobPost)
+    query = select(JobPost)
+    
+    # Keyword filter only; newest first is kept (see /search for relevance order)
+    terms = parse_search_terms(keywords)
+    if terms:
+        query = apply_fulltext(query, JobPost, terms, db.bind.dialect.name)[0]
     
     # Apply filters
     if status:
-        query = query.filter(JobPost.status == status)
+        query = query.where(JobPost.status == status)
     if category:
-        query = query.filter(JobPost.category == category)
+        query = query.where(JobPost.category == category)
     if employer_id:
-        query = query.filter(JobPost.employer_id == employer_id)
+        query = query.where(JobPost.employer_id == employer_id)
+    if location_city:
+        query = query.where(JobPost.location_city == normalize_text(location_city))
+    if location_state:
+        query = query.where(JobPost.location_state == normalize_text(location_state))
+    if min_rate is not None:
+        query = query.where(JobPost.daily_rate >= min_rate)
+    if max_rate is not None:
+        query = query.where(JobPost.daily_rate <= max_rate)
+    if rate_type:
+        query = query.where(JobPost.pay_rate_type == normalize_text(rate_type))
+    skill_list = parse_skill_filter(skills)
+    if skill_list:
+        query = query.where(JobPost.id.in_(
+            select(JobPostSkill.job_id).where(JobPostSkill.skill.in_(skill_list))
+        ))
     
     # If user is a worker, show only published jobs
     if isinstance(current_user, User):
-        query = query.filter(JobPost.status == "published")
+        query = query.where(JobPost.status == "published")
     # If user is an employer, show only their jobs
     elif isinstance(current_user, Employer):
-        query = query.filter(JobPost.employer_id == current_user.id)
+        query = query.where(JobPost.employer_id == current_user.id)
+    
+    # Distance filter (around near_pincode, else the user's own pincode)
+    radius = search_radius(max_distance, nearby, current_user)
+    origin = None
+    if near_pincode or radius is not None or sort_by == "distance":
+        origin = search_origin(near_pincode, current_user)
+        if origin is None:
+            raise HTTPException(
+                status_code=400,
+                detail="Unknown pincode; pass a valid near_pincode to search by distance"
+            )
+        if radius is not None:
+            query = apply_radius(query, JobPost, origin, radius)
+    
+    # Workers all see the same published listings; employers only their own
+    listing = {
+        "scope": current_user.id if isinstance(current_user, Employer) else "workers",
+        "status": status, "category": category, "employer_id": employer_id,
+        "location_city": normalize_text(location_city), "location_state": normalize_text(location_state),
+        "min_rate": min_rate, "max_rate": max_rate, "rate_type": normalize_text(rate_type),
+        "skills": sorted(skill_list), "terms": sorted(terms), "origin": origin, "radius": radius,
+        "sort_by": "distance" if sort_by == "distance" else "date",
+        "cursor": cursor, "page": page, "limit": limit, "include_total": include_total,
+    }
+    cache_key = await query_cache.key("jobs", ("job_posts", "employers"), listing)
+    cached = await query_cache.get(cache_key)
+    if cached is not None:
+        body, headers = cached
+        if is_not_modified(request, headers.get("ETag", "")):
+            return not_modified_response(headers)
+        return json_page_response(body, hit=True, headers=headers)
+    
+    next_cursor = None
+    if sort_by == "distance":
+        # Nearest first has no cursor, so this ordering is page-based
+        query = query.order_by(distance_sq_expr(JobPost, origin).asc().nulls_last(), JobPost.created_at.desc())
+        rows, pagination = await paginate_rows(db, query, limit, page=page, include_total=include_total)
+        job_posts = [row[0] for row in rows]
+    else:
+        # Keyset pagination (exact total only when requested)
+        job_posts, pagination, next_cursor = await paginate(
+            db, query, JobPost.created_at, JobPost.id, limit,
+            cursor=cursor, page=page, descending=True, include_total=include_total
+        )
+    
+    await load_related(db, job_posts, *JOB_POST_RESPONSE_RELATIONS)
+    validators = page_validators(
+        {**listing, "pagination": pagination, "next_cursor": next_cursor},
+        job_posts, [job_post.employer for job_post in job_posts]
+    )
+    headers = validator_headers(validators)
+    if is_not_modified(request, validators[0]):
+        return not_modified_response(headers)
+    
+    if origin is None:
+        data = validate_rows(JobPostResponse, job_posts)
+    else:
+        data = validate_rows(JobPostSearchResult, job_posts)
+        for result, distance in zip(data, distances_km(origin, job_posts)):
+            result.distance_km = distance
+    
+    body = PaginatedResponse[Union[JobPostSearchResult, JobPostResponse]](
+        success=True,
+        data=data,
+        pagination=pagination,
+        next_cursor=next_cursor
+    ).model_dump_json(by_alias=True).encode()
+    await query_cache.set(cache_key, body, headers)
+    return json_page_response(body, hit=False, headers=headers)
+
+@router.get("/search", response_model=PaginatedResponse[JobPostSearchResult])
+async def search_job_posts(
+    keywords: str = Query(""),
+    category: Optional[str] = Query(None),
+    location_city: Optional[str] = Query(None),
+    location_state: Optional[str] = Query(None),
+    min_rate: Optional[float] = Query(None),  # per working day, whatever the rate type
+    max_rate: Optional[float] = Query(None),
+    rate_type: Optional[str] = Query(None),
+    skills: Optional[str] = Query(None),  # comma-separated
+    max_distance: Optional[float] = Query(None, gt=0),  # km
+    near_pincode: Optional[str] = Query(None),
+    nearby: bool = Query(False),  # workers: limit to their max_travel_distance
+    sort_by: str = Query("relevance"),  # relevance or distance
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    include_total: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+    current_user: Union[User, Employer] = Depends(get_current_user)
+):
+    """Search job posts by keywords, most relevant first, with highlighted matches."""
+    
+    query = select(JobPost)
     
-    # Pagination
-    total = query.count()
-    job_posts = query.offset((page - 1) * limit).limit(limit).all()
+    terms = parse_search_terms(keywords)
+    rank = None
+    if terms:
+        query, rank, title_highlight, snippet = apply_fulltext(query, JobPost, terms, db.bind.dialect.name)
+        query = query.add_columns(
+            rank.label("rank"), title_highlight.label("title_highlight"), snippet.label("snippet")
+        )
     
-    return PaginatedResponse(
+    # Apply filters
+    if category:
+        query = query.where(JobPost.category == category)
+    if location_city:
+        query = query.where(JobPost.location_city == normalize_text(location_city))
+    if location_state:
+        query = query.where(JobPost.location_state == normalize_text(location_state))
+    if min_rate is not None:
+        query = query.where(JobPost.daily_rate >= min_rate)
+    if max_rate is not None:
+        query = query.where(JobPost.daily_rate <= max_rate)
+    if rate_type:
+        query = query.where(JobPost.pay_rate_type == normalize_text(rate_type))
+    skill_list = parse_skill_filter(skills)
+    if skill_list:
+        query = query.where(JobPost.id.in_(
+            select(JobPostSkill.job_id).where(JobPostSkill.skill.in_(skill_list))
+        ))
+    
+    # Same visibility rules as the job list
+    if isinstance(current_user, User):
+        query = query.where(JobPost.status == "published")
+    elif isinstance(current_user, Employer):
+        query = query.where(JobPost.employer_id == current_user.id)
+    
+    # Distance filter (around near_pincode, else the user's own pincode)
+    radius = search_radius(max_distance, nearby, current_user)
+    origin = None
+    if near_pincode or radius is not None or sort_by == "distance":
+        origin = search_origin(near_pincode, current_user)
+        if origin is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Unknown pincode; pass a valid near_pincode to search by distance"
+            )
+        if radius is not None:
+            query = apply_radius(query, JobPost, origin, radius)
+    
+    if sort_by == "distance":
+        query = query.order_by(distance_sq_expr(JobPost, origin).asc().nulls_last(), JobPost.created_at.desc())
+    elif rank is not None:
+        query = query.order_by(rank, JobPost.created_at.desc())
+    else:
+        query = query.order_by(JobPost.created_at.desc())
+    
+    rows, pagination = await paginate_rows(db, query, limit, page=page, include_total=include_total)
+    await load_related(db, [row[0] for row in rows], *JOB_POST_RESPONSE_RELATIONS)
+    
+    # Exact distances for the page only
+    distances = distances_km(origin, [row[0] for row in rows]) if origin else [None] * len(rows)
+    
+    results = validate_rows(JobPostSearchResult, [row[0] for row in rows])
+    for result, row, distance in zip(results, rows, distances):
+        result.distance_km = distance
+        if terms:
+            result.highlight = SearchHighlight(rank=row.rank, title=row.title_highlight, snippet=row.snippet)
+    
+    return PaginatedResponse[JobPostSearchResult](
         success=True,
-        data=[JobPostResponse.from_orm(job_post) for job_post in job_posts],
-        pagination={
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "total_pages": (total + limit - 1) // limit
+        data=results,
+        pagination=pagination
+    )
+
+@router.get("/recommended", response_model=ApiResponse[List[RecommendedJob]])
+async def get_recommended_jobs(
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_worker)
+):
+    """Best matching published jobs for the worker, scored by the local matching engine.
+
+    Jobs the worker already applied to are left out.
+    """
+    
+    await matching_service.ensure_index(db)
+    applied = await db.scalars(
+        select(ContractApplication.job_id).where(ContractApplication.worker_id == current_user.id)
+    )
+    # Spare candidates cover jobs closed or deleted by another process since the index was built
+    matches = matching_service.recommend(current_user, limit * 2, exclude=set(applied.all()))
+    
+    job_ids = [job_id for job_id, _ in matches]
+    job_posts = {}
+    if job_ids:
+        job_posts = {
+            job.id: job for job in await db.scalars(select(JobPost).where(JobPost.id.in_(job_ids)))
+            if job.status == "published"
         }
+    stale = [job_id for job_id in job_ids if job_id not in job_posts]
+    if stale:
+        matching_service.apply_changes({job_id: None for job_id in stale})
+    
+    matches = [(job_posts[job_id], match) for job_id, match in matches if job_id in job_posts][:limit]
+    await load_related(db, [job_post for job_post, _ in matches], *JOB_POST_RESPONSE_RELATIONS)
+    results = validate_rows(RecommendedJob, [job_post for job_post, _ in matches])
+    for result, (_, match) in zip(results, matches):
+        result.match = JobMatch(**match)
+    
+    return ApiResponse[List[RecommendedJob]](
+        success=True,
+        data=results,
+        message=f"Found {len(results)} recommended jobs"
     )
 
-@router.get("/{job_id}", response_model=ApiResponse)
+@router.get("/{job_id}", response_model=ApiResponse[JobPostResponse])
 async def get_job_post(
     job_id: str,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
     current_user: Union[User, Employer] = Depends(get_current_user)
 ):
     """Get a specific job post by ID."""
     
-    job_post = db.query(JobPost).filter(JobPost.id == job_id).first()
+    job_post = await entity_cache.get(db, JobPost, job_id)
     if not job_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -121,22 +365,27 @@ async def get_job_post(
                 detail="Not authorized to view this job post"
             )
     
-    return ApiResponse(
+    await load_related(db, [job_post], *JOB_POST_RESPONSE_RELATIONS)
+    not_modified = conditional_response(request, response, entity_validators(job_post, job_post.employer))
+    if not_modified:
+        return not_modified
+    
+    return ApiResponse[JobPostResponse](
         success=True,
-        data=JobPostResponse.from_orm(job_post),
+        data=JobPostResponse.model_validate(job_post),
         message="Job post retrieved successfully"
     )
 
-@router.put("/{job_id}", response_model=ApiResponse)
+@router.put("/{job_id}", response_model=ApiResponse[JobPostResponse])
 async def update_job_post(
     job_id: str,
     job_update: JobPostUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Employer = Depends(get_current_employer)
 ):
     """Update a job post (employers only)."""
     
-    job_post = db.query(JobPost).filter(JobPost.id == job_id).first()
+    job_post = await db.get(JobPost, job_id)
     if not job_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -155,24 +404,26 @@ async def update_job_post(
     for field, value in update_data.items():
         setattr(job_post, field, value)
     
-    db.commit()
-    db.refresh(job_post)
+    await db.commit()
+    await entity_cache.invalidate(JobPost, job_id)
+    await db.refresh(job_post)
+    await load_related(db, [job_post], *JOB_POST_RESPONSE_RELATIONS)
     
-    return ApiResponse(
+    return ApiResponse[JobPostResponse](
         success=True,
-        data=JobPostResponse.from_orm(job_post),
+        data=JobPostResponse.model_validate(job_post),
         message="Job post updated successfully"
     )
 
 @router.delete("/{job_id}", response_model=ApiResponse)
 async def delete_job_post(
     job_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Employer = Depends(get_current_employer)
 ):
     """Delete a job post (employers only)."""
     
-    job_post = db.query(JobPost).filter(JobPost.id == job_id).first()
+    job_post = await db.get(JobPost, job_id)
     if not job_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -186,8 +437,9 @@ async def delete_job_post(
             detail="Not authorized to delete this job post"
         )
     
-    db.delete(job_post)
-    db.commit()
+    await db.delete(job_post)
+    await db.commit()
+    await entity_cache.invalidate(JobPost, job_id)
     
     return ApiResponse(
         success=True,
@@ -195,16 +447,16 @@ async def delete_job_post(
     )
 
 # Application endpoints
-@router.post("/{job_id}/apply", response_model=ApiResponse)
+@router.post("/{job_id}/apply", response_model=ApiResponse[ContractApplicationResponse])
 async def apply_to_job(
     job_id: str,
     application: ContractApplicationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_worker)
 ):
     """Apply to a job post (workers only)."""
     
-    job_post = db.query(JobPost).filter(JobPost.id == job_id).first()
+    job_post = await entity_cache.get(db, JobPost, job_id)
     if not job_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -218,12 +470,12 @@ async def apply_to_job(
         )
     
     # Check if worker already applied
-    existing_application = db.query(ContractApplication).filter(
+    existing_application = await db.scalar(select(ContractApplication).where(
         and_(
             ContractApplication.job_id == job_id,
             ContractApplication.worker_id == current_user.id
         )
-    ).first()
+    ))
     
     if existing_application:
         raise HTTPException(
@@ -250,27 +502,31 @@ async def apply_to_job(
     )
     
     db.add(db_application)
-    db.commit()
-    db.refresh(db_application)
+    await db.commit()
+    await db.refresh(db_application)
     
-    return ApiResponse(
+    return ApiResponse[ContractApplicationResponse](
         success=True,
-        data=ContractApplicationResponse.from_orm(db_application),
+        data=ContractApplicationResponse.model_validate(db_application),
         message="Application submitted successfully"
     )
 
-@router.get("/{job_id}/applications", response_model=PaginatedResponse)
+@router.get("/{job_id}/applications", response_model=PaginatedResponse[ContractApplicationResponse])
 async def get_job_applications(
+    request: Request,
+    response: Response,
     job_id: str,
+    cursor: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    include_total: bool = Query(False),
     status: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Employer = Depends(get_current_employer)
 ):
     """Get applications for a job post (employers only)."""
     
-    job_post = db.query(JobPost).filter(JobPost.id == job_id).first()
+    job_post = await entity_cache.get(db, JobPost, job_id)
     if not job_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -284,36 +540,40 @@ async def get_job_applications(
             detail="Not authorized to view applications for this job"
         )
     
-    query = db.query(ContractApplication).filter(ContractApplication.job_id == job_id)
+    query = select(ContractApplication).where(ContractApplication.job_id == job_id)
     
     if status:
-        query = query.filter(ContractApplication.status == status)
+        query = query.where(ContractApplication.status == status)
+    
+    # Keyset pagination (exact total only when requested)
+    applications, pagination, next_cursor = await paginate(
+        db, query, ContractApplication.applied_at, ContractApplication.id, limit,
+        cursor=cursor, page=page, descending=True, include_total=include_total
+    )
     
-    # Pagination
-    total = query.count()
-    applications = query.offset((page - 1) * limit).limit(limit).all()
+    not_modified = conditional_response(request, response, page_validators(
+        request_variant(request, current_user.id, pagination=pagination, next_cursor=next_cursor), applications
+    ), use_modified_since=False)
+    if not_modified:
+        return not_modified
     
-    return PaginatedResponse(
+    return PaginatedResponse[ContractApplicationResponse](
         success=True,
-        data=[ContractApplicationResponse.from_orm(app) for app in applications],
-        pagination={
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "total_pages": (total + limit - 1) // limit
-        }
+        data=validate_rows(ContractApplicationResponse, applications),
+        pagination=pagination,
+        next_cursor=next_cursor
     )
 
-@router.put("/applications/{application_id}", response_model=ApiResponse)
+@router.put("/applications/{application_id}", response_model=ApiResponse[ContractApplicationResponse])
 async def update_application(
     application_id: str,
     application_update: ContractApplicationUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Employer = Depends(get_current_employer)
 ):
     """Update an application status (employers only)."""
     
-    application = db.query(ContractApplication).filter(ContractApplication.id == application_id).first()
+    application = await db.get(ContractApplication, application_id)
     if not application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -321,7 +581,7 @@ async def update_application(
         )
     
     # Check if employer owns the job post
-    job_post = db.query(JobPost).filter(JobPost.id == application.job_id).first()
+    job_post = await entity_cache.get(db, JobPost, application.job_id)
     if not job_post or job_post.employer_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -333,11 +593,11 @@ async def update_application(
     for field, value in update_data.items():
         setattr(application, field, value)
     
-    db.commit()
-    db.refresh(application)
+    await db.commit()
+    await db.refresh(application)
     
-    return ApiResponse(
+    return ApiResponse[ContractApplicationResponse](
         success=True,
-        data=ContractApplicationResponse.from_orm(application),
+        data=ContractApplicationResponse.model_validate(application),
         message="Application updated successfully"
     )
\ No newline at end of file
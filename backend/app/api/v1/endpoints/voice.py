@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from fastapi.responses import Response
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 import tempfile
 import os
@@ -20,7 +20,7 @@ router = APIRouter()
 async def speech_to_text(
     audio: UploadFile = File(...),
     language: str = Form("hi"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_worker)
 ):
     """Convert speech to text using Whisper."""
@@ -70,7 +70,7 @@ async def speech_to_text(
 async def text_to_speech(
     text: str = Form(...),
     language: str = Form("hi"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_worker)
 ):
     """Convert text to speech using gTTS."""
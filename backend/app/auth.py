@@ -1,23 +1,38 @@
+import hashlib
+import time
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.cache import entity_cache
 from app.config import settings
-from app.models import User, Employer
+from app.hashing import password_hasher
+from app.models import User, Employer, Identity
 from app.schemas import TokenData
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Account type -> model, as stored in the identity directory and the JWT "type" claim
+ACCOUNT_MODELS = {"worker": User, "employer": Employer}
+
+# Lifetime of the tokens issued at login; also how long an account-wide revocation is kept
+ACCESS_TOKEN_LIFETIME = timedelta(days=7)
+
+# Password hashing (cost factor from settings.bcrypt_rounds)
+pwd_context = password_hasher.context
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against its hash."""
+    """Verify a plain password against its hash (blocking; for scripts)."""
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    """Hash a password."""
+    """Hash a password (blocking; for scripts)."""
     return pwd_context.hash(password)
 
+async def hash_password(password: str) -> str:
+    """Hash a password on the bcrypt pool, keeping the event loop free."""
+    return await password_hasher.hash(password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -25,7 +40,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
-    to_encode.update({"exp": expire})
+    # Fractional "iat" so a token issued right after a password change outlives its cutoff
+    to_encode.update({"exp": expire, "iat": time.time(), "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
@@ -36,41 +52,61 @@ def verify_token(token: str, credentials_exception) -> TokenData:
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
-        token_data = TokenData(id=user_id)
+        token_data = TokenData(
+            id=user_id,
+            user_type=payload.get("type"),
+            # Tokens from before revocation support have no jti: revoke them by digest
+            jti=payload.get("jti") or hashlib.sha256(token.encode()).hexdigest()[:32],
+            issued_at=payload.get("iat", 0),
+            expires_at=payload.get("exp"),
+        )
         return token_data
     except JWTError:
         raise credentials_exception
 
-def authenticate_user(db: Session, phone_or_email: str, password: str) -> Union[User, Employer, None]:
+async def authenticate_user(db: AsyncSession, phone_or_email: str, password: str) -> Union[User, Employer, None]:
     """Authenticate a user (worker or employer) by phone/email and password."""
     
-    # Try to find user first
-    user = None
-    if "@" in phone_or_email:
-        # Email
-        user = db.query(User).filter(User.email == phone_or_email).first()
-        if not user:
-            user = db.query(Employer).filter(Employer.email == phone_or_email).first()
-    else:
-        # Phone
-        user = db.query(User).filter(User.phone == phone_or_email).first()
-        if not user:
-            user = db.query(Employer).filter(Employer.phone == phone_or_email).first()
+    # One indexed lookup in the identity directory tells us which table holds the account
+    column = Identity.email if "@" in phone_or_email else Identity.phone
+    identity = await db.scalar(
+        select(Identity)
+        .where(column == phone_or_email)
+        .order_by((Identity.account_type == "worker").desc())  # workers win, as before
+        .limit(1)
+    )
+    if not identity:
+        return None
     
+    user = await db.get(ACCOUNT_MODELS[identity.account_type], identity.id)
     if not user:
         return None
     
-    if not verify_password(password, user.password_hash):
+    valid, new_hash = await password_hasher.verify_and_update(password, user.password_hash)
+    if not valid:
         return None
     
+    # Stored at an old cost factor: upgrade it now that we have the plain password
+    if new_hash is not None:
+        user.password_hash = new_hash
+        await db.commit()
+        await entity_cache.invalidate(type(user), user.id)
+    
     return user
 
-def get_user_by_id(db: Session, user_id: str) -> Union[User, Employer, None]:
-    """Get user (worker or employer) by ID."""
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        user = db.query(Employer).filter(Employer.id == user_id).first()
-    return user
+async def get_user_by_id(db: AsyncSession, user_id: str, user_type: Optional[str] = None) -> Union[User, Employer, None]:
+    """Get user (worker or employer) by ID.
+    
+    With ``user_type`` (from the token) this is a single primary-key lookup, usually
+    served by the entity cache; otherwise the identity directory resolves the account
+    type first.
+    """
+    if user_type not in ACCOUNT_MODELS:
+        identity = await db.get(Identity, user_id)
+        if not identity:
+            return None
+        user_type = identity.account_type
+    return await entity_cache.get(db, ACCOUNT_MODELS[user_type], user_id)
 
 def get_user_type(user: Union[User, Employer]) -> str:
     """Get the type of user (worker or employer)."""
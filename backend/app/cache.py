@@ -0,0 +1,442 @@
+"""
+Caching
+In-process LRU with TTL, a minimal Redis-protocol client for a shared tier, the
+entity cache that fronts primary-key lookups of job posts, contracts and accounts,
+and the query cache of serialized list pages invalidated by per-table versions.
+"""
+
+import asyncio
+import hashlib
+import time
+from itertools import chain
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+from urllib.parse import urlparse
+from fastapi import Response
+from sqlalchemy import DateTime, event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+from app.config import settings
+from app.serialization import json_dumps, json_loads
+
+class LRUCache:
+    """Size-bounded LRU with a per-entry TTL (bytes values, except the token cache's)."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None) -> None:
+        self._entries[key] = (time.monotonic() + (ttl_seconds or self.ttl_seconds), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+class RedisBackend:
+    """Shared cache tier speaking RESP (GET / MGET / SET EX / DEL / INCRBY) to Redis or anything compatible.
+
+    One connection per event loop, commands serialized by a lock. The cache must never
+    fail a request: errors and timeouts count as misses and the tier is skipped for
+    ``retry_seconds`` before reconnecting.
+    """
+
+    def __init__(self, url: str, timeout: float = 0.5, retry_seconds: float = 5.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.database = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self.retry_seconds = retry_seconds
+        self.errors = 0
+        self._retry_at = 0.0
+        self._loop = None
+        self._lock = None
+        self._reader = None
+        self._writer = None
+
+    @staticmethod
+    def _encode(*args: Any) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("connection closed")
+        kind, payload = line[:1], line[1:-2]
+        if kind in (b"+", b":"):
+            return int(payload) if kind == b":" else payload
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            return (await self._reader.readexactly(length + 2))[:-2]
+        if kind == b"*":
+            return [await self._read_reply() for _ in range(int(payload))]
+        raise ConnectionError(payload.decode(errors="replace"))  # "-ERR ..."
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            self._writer.write(self._encode("AUTH", self.password))
+            await self._read_reply()
+        if self.database:
+            self._writer.write(self._encode("SELECT", self.database))
+            await self._read_reply()
+
+    def _disconnect(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def _execute(self, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._lock, self._writer = loop, asyncio.Lock(), None
+        async with self._lock:
+            if self._writer is None:
+                await self._connect()
+            self._writer.write(self._encode(*args))
+            return await self._read_reply()
+
+    async def command(self, *args: Any) -> Any:
+        if time.monotonic() < self._retry_at:
+            return None
+        try:
+            return await asyncio.wait_for(self._execute(*args), self.timeout)
+        except (OSError, ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            self.errors += 1
+            self._retry_at = time.monotonic() + self.retry_seconds
+            self._disconnect()
+            return None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.command("GET", key)
+
+    async def mget(self, *keys: str) -> Optional[list]:
+        """Values of ``keys`` (None for missing ones); None when the tier is unavailable."""
+        return await self.command("MGET", *keys)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        await self.command("SET", key, value, "EX", max(1, int(ttl_seconds)))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.command("DEL", *keys)
+
+    async def incr(self, key: str, amount: int = 1) -> Optional[int]:
+        """New value of a counter (``amount=0`` reads it); None when the tier is unavailable."""
+        return await self.command("INCRBY", key, amount)
+
+def create_shared_backend(url: Optional[str]) -> Optional[RedisBackend]:
+    """Shared tier for ``redis://`` URLs, or None to run with the local tier only."""
+    if not url:
+        return None
+    if urlparse(url).scheme != "redis":
+        raise ValueError(f"Unsupported cache URL scheme: {url}")
+    return RedisBackend(url, timeout=settings.cache_timeout_seconds)
+
+class EntityCache:
+    """Read-through cache of ORM rows by primary key.
+
+    Rows are stored as column snapshots (JSON) and merged back into the caller's
+    session without a query, so cached and freshly loaded objects behave the same.
+    Endpoints that change a cached row call ``invalidate`` after committing; the TTL
+    bounds staleness from writers that do not (scripts, other services).
+    """
+
+    def __init__(self, local: LRUCache, shared: Optional[RedisBackend] = None, ttl_seconds: float = 60,
+                 enabled: bool = True):
+        self.local = local
+        self.shared = shared
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self._datetime_columns: Dict[type, Tuple[str, ...]] = {}
+
+    @staticmethod
+    def _key(model, key: Any) -> str:
+        return f"entity:{model.__tablename__}:{key}"
+
+    def _count(self, counter: Dict[str, int], model) -> None:
+        counter[model.__tablename__] = counter.get(model.__tablename__, 0) + 1
+
+    def _snapshot(self, obj: Any) -> Optional[bytes]:
+        state = inspect(obj)
+        if state.expired_attributes or state.modified:
+            return None
+        columns = state.mapper.column_attrs
+        if any(attr.key not in state.dict for attr in columns):
+            return None
+        return json_dumps({attr.key: state.dict[attr.key] for attr in columns}).encode()
+
+    def _restore(self, model, data: bytes) -> Any:
+        values = json_loads(data)
+        if model not in self._datetime_columns:
+            self._datetime_columns[model] = tuple(
+                attr.key for attr in inspect(model).column_attrs if isinstance(attr.columns[0].type, DateTime)
+            )
+        for name in self._datetime_columns[model]:
+            if values.get(name) is not None:
+                values[name] = datetime.fromisoformat(values[name])
+        obj = inspect(model).class_manager.new_instance()
+        for name, value in values.items():
+            set_committed_value(obj, name, value)
+        make_transient_to_detached(obj)
+        return obj
+
+    async def _lookup(self, cache_key: str) -> Optional[bytes]:
+        data = self.local.get(cache_key)
+        if data is None and self.shared is not None:
+            data = await self.shared.get(cache_key)
+            if data is not None:
+                self.local.set(cache_key, data)
+        return data
+
+    async def get(self, db, model, key: Any) -> Any:
+        """``db.get(model, key)``, served from the cache when possible."""
+        if not self.enabled or key is None:
+            return await db.get(model, key)
+        in_session = db.identity_map.get(identity_key(model, key))
+        if in_session is not None and not inspect(in_session).expired_attributes:
+            return in_session
+
+        cache_key = self._key(model, key)
+        data = await self._lookup(cache_key)
+        if data is not None:
+            self._count(self.hits, model)
+            return await db.merge(self._restore(model, data), load=False)
+
+        self._count(self.misses, model)
+        obj = await db.get(model, key)
+        data = self._snapshot(obj) if obj is not None else None
+        if data is not None:
+            self.local.set(cache_key, data)
+            if self.shared is not None:
+                await self.shared.set(cache_key, data, self.ttl_seconds)
+        return obj
+
+    async def invalidate(self, model, *keys: Any) -> None:
+        """Drop rows from both tiers; call after the change is committed."""
+        cache_keys = [self._key(model, key) for key in keys]
+        self.local.delete(*cache_keys)
+        if self.shared is not None:
+            await self.shared.delete(*cache_keys)
+
+    def clear(self) -> None:
+        self.local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per table, for monitoring."""
+        tables = sorted(set(self.hits) | set(self.misses))
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        return {
+            "enabled": self.enabled,
+            "backend": "local+redis" if self.shared is not None else "local",
+            "entries": len(self.local),
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+            "shared_errors": self.shared.errors if self.shared is not None else 0,
+            "tables": {
+                table: {"hits": self.hits.get(table, 0), "misses": self.misses.get(table, 0)} for table in tables
+            },
+        }
+
+class TableVersions:
+    """Per-table write counters; cached results are keyed by the versions they were read at.
+
+    Counters live in the shared tier when there is one (so a write in any process retires
+    every process's entries) and in this process otherwise.
+    """
+
+    def __init__(self, shared: Optional[RedisBackend] = None):
+        self.shared = shared
+        self.local: Dict[str, int] = {}
+        self._tasks: Set[asyncio.Task] = set()  # shared increments in flight, kept until done
+        self.failed_bumps = 0
+
+    @staticmethod
+    def _key(table: str) -> str:
+        return f"version:{table}"
+
+    async def get(self, table: str) -> Optional[int]:
+        """Current version, or None when it cannot be read (the caller skips the cache)."""
+        if self.shared is not None:
+            return await self.shared.incr(self._key(table), 0)
+        return self.local.get(table, 0)
+
+    def bump(self, tables) -> None:
+        for table in tables:
+            self.local[table] = self.local.get(table, 0) + 1
+        if self.shared is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # sync session outside the event loop (scripts)
+            return
+        # Queued ahead of any later version read on this loop's connection
+        for table in tables:
+            task = loop.create_task(self._bump_shared(table))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _bump_shared(self, table: str) -> None:
+        if await self.shared.incr(self._key(table)) is None:
+            self.failed_bumps += 1  # other processes serve their pages for this table until the TTL runs out
+
+    @property
+    def bumps_in_flight(self) -> int:
+        return len(self._tasks)
+
+class QueryCache:
+    """Serialized response pages (with their response headers) keyed by normalized
+    parameters and table versions.
+
+    A write to any table a page was read from bumps its version, so stale pages are
+    never looked up again and age out of the LRU.
+    """
+
+    def __init__(self, local: LRUCache, versions: TableVersions, shared: Optional[RedisBackend] = None,
+                 ttl_seconds: float = 300, enabled: bool = True):
+        self.local = local
+        self.versions = versions
+        self.shared = shared
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+    async def key(self, namespace: str, tables: Tuple[str, ...], params: Dict[str, Any]) -> Optional[str]:
+        """Cache key for ``params`` at the current versions of ``tables``; None to bypass."""
+        if not self.enabled:
+            return None
+        versions = [await self.versions.get(table) for table in tables]
+        if None in versions:
+            return None
+        digest = hashlib.sha1(json_dumps(dict(sorted(params.items()))).encode()).hexdigest()
+        return f"query:{namespace}:{'.'.join(map(str, versions))}:{digest}"
+
+    async def get(self, key: Optional[str]) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        """(body, headers) of a cached page."""
+        if key is None:
+            return None
+        namespace = key.split(":", 2)[1]
+        data = self.local.get(key)
+        if data is None and self.shared is not None:
+            data = await self.shared.get(key)
+            if data is not None:
+                self.local.set(key, data)
+        counter = self.hits if data is not None else self.misses
+        counter[namespace] = counter.get(namespace, 0) + 1
+        if data is None:
+            return None
+        headers, body = data.split(b"\n", 1)
+        return body, json_loads(headers)
+
+    async def set(self, key: Optional[str], body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        if key is None:
+            return
+        data = json_dumps(headers or {}).encode() + b"\n" + body
+        self.local.set(key, data)
+        if self.shared is not None:
+            await self.shared.set(key, data, self.ttl_seconds)
+
+    def clear(self) -> None:
+        self.local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per namespace, for monitoring."""
+        namespaces = sorted(set(self.hits) | set(self.misses))
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        return {
+            "enabled": self.enabled,
+            "entries": len(self.local),
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+            "versions": dict(sorted(self.versions.local.items())),
+            "version_bumps_in_flight": self.versions.bumps_in_flight,
+            "failed_version_bumps": self.versions.failed_bumps,
+            "namespaces": {
+                name: {"hits": self.hits.get(name, 0), "misses": self.misses.get(name, 0)} for name in namespaces
+            },
+        }
+
+def json_page_response(body: bytes, hit: bool, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Pre-serialized JSON body; X-Cache tells clients and load tests whether it was cached."""
+    return Response(
+        content=body, media_type="application/json", headers={**(headers or {}), "X-Cache": "HIT" if hit else "MISS"}
+    )
+
+shared_backend = create_shared_backend(settings.cache_redis_url)
+table_versions = TableVersions(shared_backend)
+
+# With a shared tier the local copy only absorbs bursts: other processes' invalidations
+# reach it when its short TTL runs out
+entity_cache = EntityCache(
+    LRUCache(
+        settings.entity_cache_max_entries,
+        settings.entity_cache_local_ttl_seconds if settings.cache_redis_url else settings.entity_cache_ttl_seconds,
+    ),
+    shared=shared_backend,
+    ttl_seconds=settings.entity_cache_ttl_seconds,
+    enabled=settings.entity_cache_enabled,
+)
+
+# Keys carry the table versions, so the local copy stays exact even with a shared tier
+query_cache = QueryCache(
+    LRUCache(settings.query_cache_max_entries, settings.query_cache_ttl_seconds),
+    table_versions,
+    shared=shared_backend,
+    ttl_seconds=settings.query_cache_ttl_seconds,
+    enabled=settings.query_cache_enabled,
+)
+
+PENDING_TABLES_KEY = "cache_written_tables"
+
+@event.listens_for(Session, "after_flush")
+def collect_written_tables(session, flush_context):
+    """Remember which tables a flush wrote; versions move only if the transaction commits."""
+    tables = {obj.__table__.name for obj in chain(session.new, session.dirty, session.deleted)}
+    if tables:
+        session.info.setdefault(PENDING_TABLES_KEY, set()).update(tables)
+
+@event.listens_for(Session, "after_commit")
+def bump_written_tables(session):
+    tables = session.info.pop(PENDING_TABLES_KEY, None)
+    if tables:
+        table_versions.bump(sorted(tables))
+
+@event.listens_for(Session, "after_rollback")
+def discard_written_tables(session):
+    session.info.pop(PENDING_TABLES_KEY, None)
@@ -0,0 +1,107 @@
+"""
+Conditional requests
+Strong ETag and Last-Modified validators for read endpoints, and the 304 decision
+made before a response body is validated and serialized.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+from fastapi import Request, Response
+from sqlalchemy import inspect
+from app.serialization import json_dumps
+
+Validators = Tuple[str, Optional[datetime]]  # (ETag, Last-Modified)
+
+def _etag(digest) -> str:
+    return f'"{digest.hexdigest()[:32]}"'
+
+def http_date(value: datetime) -> str:
+    """RFC 9110 date; stored timestamps are naive UTC."""
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+def entity_validators(*objects: Any) -> Validators:
+    """ETag from the id and updated_at of an entity and of those embedded in its response."""
+    digest = hashlib.sha1()
+    modified = []
+    for obj in objects:
+        if obj is None:
+            digest.update(b"-;")
+            continue
+        updated_at = obj.updated_at
+        digest.update(f"{obj.__tablename__}:{obj.id}:{updated_at.isoformat() if updated_at else ''};".encode())
+        if updated_at is not None:
+            modified.append(updated_at)
+    return _etag(digest), max(modified, default=None)
+
+def page_validators(variant: Dict[str, Any], *groups: Iterable[Any]) -> Validators:
+    """ETag over every column of the rows on a page (and rows embedded in them).
+
+    ``variant`` holds whatever else shapes the body: the caller, query parameters and
+    pagination. Hashing columns is far cheaper than validating and serializing the
+    page, and works for rows without an updated_at (applications, messages).
+    """
+    digest = hashlib.sha1(json_dumps(variant).encode())
+    modified = []
+    for group in groups:
+        for obj in group:
+            if obj is None:
+                digest.update(b"-;")
+                continue
+            state = inspect(obj)
+            digest.update(json_dumps([state.dict.get(attr.key) for attr in state.mapper.column_attrs]).encode())
+            updated_at = state.dict.get("updated_at")
+            if updated_at is not None:
+                modified.append(updated_at)
+    return _etag(digest), max(modified, default=None)
+
+def validator_headers(validators: Validators) -> Dict[str, str]:
+    etag, last_modified = validators
+    # Bodies depend on the bearer token: private caches only, revalidated on every use
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """If-None-Match wins over If-Modified-Since (RFC 9110 13.2.2)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
+
+def conditional_response(request: Request, response: Response, validators: Validators,
+                         use_modified_since: bool = True) -> Optional[Response]:
+    """A 304 to return instead of the body when the client's copy is current; otherwise
+    sets the validators on ``response`` and returns None.
+
+    Lists pass ``use_modified_since=False``: a row leaving the page does not advance
+    any updated_at, so only the ETag can tell.
+    """
+    etag, last_modified = validators
+    headers = validator_headers(validators)
+    if is_not_modified(request, etag, last_modified if use_modified_since else None):
+        return not_modified_response(headers)
+    response.headers.update(headers)
+    return None
+
+def request_variant(request: Request, account_id: str, **extra: Any) -> Dict[str, Any]:
+    """Page variant for list endpoints: the caller, path and query string, plus ``extra``."""
+    return {
+        "account": account_id, "path": request.url.path,
+        "query": sorted(request.query_params.multi_items()), **extra,
+    }
@@ -7,6 +7,56 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite:///./data/kararai.db"
     
+    # Engine profile: "sqlite", "postgres" or "default" (untuned); inferred from the URL when unset
+    database_profile: Optional[str] = None
+    
+    # SQLite profile tuning
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kb: int = 65536
+    sqlite_mmap_size: int = 268435456  # 256 MB
+    
+    # Postgres profile tuning
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    db_statement_timeout_ms: int = 15000
+    
+    # Job matching index: full rebuild interval (picks up writes from other processes)
+    matching_index_refresh_seconds: int = 300
+    
+    # State minimum wages (see app/minimum_wages.py): how often notified rates are reloaded,
+    # and listings re-checked per transaction when they change
+    minimum_wage_reevaluation_enabled: bool = True
+    minimum_wage_refresh_seconds: int = 300
+    minimum_wage_chunk_size: int = 500
+    
+    # Entity cache for job posts, contracts and accounts by id (see app/cache.py)
+    entity_cache_enabled: bool = True
+    entity_cache_max_entries: int = 10000
+    entity_cache_ttl_seconds: int = 60
+    entity_cache_local_ttl_seconds: int = 5  # local copy's TTL when a shared tier is configured
+    
+    # Query cache of serialized list pages (GET /jobs/), invalidated by table versions
+    query_cache_enabled: bool = True
+    query_cache_max_entries: int = 512
+    query_cache_ttl_seconds: int = 300
+    
+    # Shared cache tier, e.g. redis://localhost:6379/0 (local-only when unset)
+    cache_redis_url: Optional[str] = None
+    cache_timeout_seconds: float = 0.5
+    
+    # Password hashing: bcrypt cost (hashes at another cost are upgraded on the next login)
+    bcrypt_rounds: int = 12
+    password_hash_workers: Optional[int] = None  # concurrent bcrypt threads; default CPU count, max 4
+    password_hash_max_queue: int = 64  # waiting hash/verify calls before 503
+    
+    # Verified-token cache; every hit is still checked against revoked tokens (see app/tokens.py)
+    token_cache_enabled: bool = True
+    token_cache_max_entries: int = 10000
+    token_cache_ttl_seconds: int = 300
+    token_revocation_refresh_seconds: int = 30  # reload revocations made by other processes (without a shared tier)
+    
     # JWT Settings
     secret_key: str = "your-secret-key-change-in-production"
     algorithm: str = "HS256"
@@ -14,6 +64,37 @@ class Settings(BaseSettings):
     
     # Gemini AI
     gemini_api_key: Optional[str] = None
+    gemini_max_concurrency: int = 8  # Gemini calls in flight across all users
+    gemini_per_user_concurrency: int = 1  # a user's further calls wait for the previous one
+    gemini_timeout_seconds: float = 30  # per call, waiting for a slot included
+    
+    # Exact-match cache of Gemini answers (see app/llm_cache.py)
+    llm_cache_enabled: bool = True
+    llm_cache_methods_str: str = Field(
+        default="general_assistance,get_rights_assistance,get_job_recommendations,analyze_job_opportunity,analyze_contract_terms",
+        alias="LLM_CACHE_METHODS",
+    )  # GeminiAIService methods whose answers are cached
+    llm_cache_ttl_seconds: int = 86400
+    llm_cache_max_entries: int = 2000  # in memory
+    llm_cache_persistent: bool = True  # keep answers in a SQLite file across restarts
+    llm_cache_sqlite_path: Optional[str] = None  # default: llm_cache.db next to the SQLite database
+    llm_cache_sqlite_max_entries: int = 50000
+    
+    # Near-duplicate answer cache for paraphrased questions (see app/semantic_cache.py)
+    semantic_cache_enabled: bool = True
+    semantic_cache_methods_str: str = Field(
+        default="general_assistance,get_rights_assistance", alias="SEMANTIC_CACHE_METHODS"
+    )
+    semantic_cache_threshold: float = 0.85  # cosine similarity a cached question needs to be reused
+    semantic_cache_ttl_seconds: int = 86400
+    semantic_cache_max_entries: int = 2000
+    
+    # Conversation memory of the chat assistant: a rolling summary plus the latest turns (see app/conversation.py)
+    conversation_memory_enabled: bool = True
+    conversation_recent_turns: int = 4  # worker/assistant exchanges quoted as they were
+    conversation_token_budget: int = 900  # whole conversation block of a prompt, summary included
+    conversation_summary_tokens: int = 300  # summary's share of the budget
+    conversation_message_tokens: int = 120  # a longer message is cut when quoted
     
     # CORS - handle as comma-separated string
     allowed_origins_str: str = Field(default="http://localhost:5173,http://localhost:3000,http://karar-ai.vercel.app,https://karar-ai.vercel.app", alias="ALLOWED_ORIGINS")
@@ -23,6 +104,14 @@ class Settings(BaseSettings):
         """Convert comma-separated string to list"""
         return [origin.strip() for origin in self.allowed_origins_str.split(",") if origin.strip()]
     
+    @property
+    def llm_cache_methods(self) -> List[str]:
+        return [method.strip() for method in self.llm_cache_methods_str.split(",") if method.strip()]
+    
+    @property
+    def semantic_cache_methods(self) -> List[str]:
+        return [method.strip() for method in self.semantic_cache_methods_str.split(",") if method.strip()]
+    
     class Config:
         env_file = ".env"
 
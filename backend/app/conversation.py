@@ -0,0 +1,106 @@
+"""
+Conversation memory
+Bounded context for the chat assistant: a rolling summary of the earlier conversation
+plus its latest turns, fitted to a fixed token budget however long the conversation runs.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Sequence, Tuple
+from app.llm_cache import normalize_message
+
+AI_SENDER = "ai-assistant"
+WORKER, ASSISTANT = "Worker", "Assistant"
+
+SUMMARY_HEADER = "Earlier in this conversation (summary):"
+RECENT_HEADER = "Latest messages, oldest first:"
+
+# Words that point back at something said before, in English, Hindi and transliterated Hindi
+REFERRING_WORDS = frozenset("""
+it its this that these those they them their he she him his her same above previous earlier before again else
+instead another
+ye yeh woh wo vo voh iska iski iske uska uski uske inka unka isme usme ismein usmein yahi wahi phir pehle
+यह ये वह वो इसका इसकी इसके उसका उसकी उसके इनका उनका इसमें उसमें यही वही फिर पहले
+""".split())
+# A message opening with one of these carries on from the last one
+LEADING_WORDS = frozenset("and but so also aur lekin par toh और लेकिन पर तो".split())
+# ... as does one opening with one of these ("what about the working hours?")
+LEADING_PHRASES = (("what", "about"), ("how", "about"), ("what", "if"), ("aur", "kya"), ("और", "क्या"))
+
+_TOKEN = re.compile(r"[\wऀ-ॿ]+")
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count, about four bytes of UTF-8 per token (most of a token per
+    Devanagari character); close enough to budget a prompt without a tokenizer."""
+    return (len(text.encode("utf-8")) + 3) // 4
+
+def truncate_tokens(text: str, tokens: int) -> str:
+    """Text cut to about ``tokens`` tokens at a word boundary, marked with an ellipsis."""
+    if estimate_tokens(text) <= tokens:
+        return text
+    cut = text.encode("utf-8")[:max(tokens, 1) * 4 - 3].decode("utf-8", "ignore")
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip() + "…"
+
+def speaker(sender_id: str) -> str:
+    return ASSISTANT if sender_id == AI_SENDER else WORKER
+
+def is_follow_up(message: str) -> bool:
+    """Whether a message leans on what was said before it ("is that legal?", "what about
+    Kerala?", "uska form kahan milega"), so its answer depends on the conversation. Only
+    a referring or leading word makes one: a short question ("what is PF?") stands alone."""
+    words = _TOKEN.findall(normalize_message(message))
+    return (bool(words) and words[0] in LEADING_WORDS or tuple(words[:2]) in LEADING_PHRASES
+            or any(word in REFERRING_WORDS for word in words))
+
+@dataclass
+class ConversationContext:
+    """What a prompt quotes of the conversation: the summary, then the latest messages."""
+    summary: str = ""
+    messages: List[str] = field(default_factory=list)  # "Worker: ..." / "Assistant: ...", oldest first
+
+    def __bool__(self) -> bool:
+        return bool(self.summary or self.messages)
+
+    def prompt(self) -> str:
+        parts = []
+        if self.summary:
+            parts.append(f"{SUMMARY_HEADER}\n{self.summary}")
+        if self.messages:
+            parts.append(RECENT_HEADER + "".join(f"\n{line}" for line in self.messages))
+        return "\n\n".join(parts)
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.prompt())
+
+def build_context(summary: str, messages: Sequence[Tuple[str, str]], token_budget: int,
+                  summary_tokens: int, message_tokens: int) -> ConversationContext:
+    """Fit a summary and the latest (speaker, text) messages, oldest first, into the budget.
+
+    The summary keeps its share; each message is cut to ``message_tokens`` and the
+    oldest messages are left out first, so the result never exceeds ``token_budget``.
+    """
+    context = ConversationContext(truncate_tokens(summary.strip(), summary_tokens) if summary.strip() else "")
+    remaining = token_budget - context.tokens - estimate_tokens(RECENT_HEADER) - 1
+    kept = []
+    for who, text in reversed(messages):
+        line = f"{who}: {truncate_tokens(' '.join(text.split()), message_tokens)}"
+        cost = estimate_tokens(line) + 1
+        if cost > remaining:
+            break
+        kept.append(line)
+        remaining -= cost
+    context.messages = kept[::-1]
+    return context
+
+def extractive_summary(summary: str, messages: Sequence[Tuple[str, str]], summary_tokens: int) -> str:
+    """Summary without a model: the earlier summary plus one short line per message
+    folded in (more of the worker's words than of the answers), oldest lines dropped first."""
+    lines = [line for line in summary.splitlines() if line.strip()]
+    for who, text in messages:
+        lines.append(f"- {who}: {truncate_tokens(' '.join(text.split()), 40 if who == WORKER else 25)}")
+    while len(lines) > 1 and estimate_tokens("\n".join(lines)) > summary_tokens:
+        lines.pop(0)
+    return truncate_tokens("\n".join(lines), summary_tokens)
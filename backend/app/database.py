@@ -1,8 +1,11 @@
 import os
-from sqlalchemy import create_engine, MetaData
+from typing import Any, Dict, Optional
+from sqlalchemy import create_engine, event, MetaData
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.serialization import json_dumps, json_loads
 
 # Ensure data directory exists for SQLite
 if "sqlite" in settings.database_url:
@@ -11,15 +14,100 @@ if "sqlite" in settings.database_url:
     if db_dir and not os.path.exists(db_dir):
         os.makedirs(db_dir, exist_ok=True)
 
-# Create engine
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
-)
+ENGINE_PROFILES = ("default", "sqlite", "postgres")
+
+def get_async_database_url(database_url: str) -> str:
+    """Map a sync database URL onto the matching async driver."""
+    if database_url.startswith("sqlite:///"):
+        return database_url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    if database_url.startswith("postgresql://"):
+        return database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if database_url.startswith("postgres://"):
+        return database_url.replace("postgres://", "postgresql+asyncpg://", 1)
+    return database_url
+
+def get_engine_profile(database_url: str, profile: Optional[str] = None) -> str:
+    """Resolve the engine profile name, inferring it from the URL when not configured."""
+    profile = profile or settings.database_profile
+    if profile:
+        if profile not in ENGINE_PROFILES:
+            raise ValueError(f"Unknown database profile '{profile}', expected one of {ENGINE_PROFILES}")
+        return profile
+    if database_url.startswith("sqlite"):
+        return "sqlite"
+    if database_url.startswith("postgres"):
+        return "postgres"
+    return "default"
+
+def get_engine_options(database_url: str, profile: str, is_async: bool = False) -> Dict[str, Any]:
+    """Keyword arguments for create_engine/create_async_engine under a profile."""
+    # JSON columns on every profile: orjson, which also encodes datetimes
+    options: Dict[str, Any] = {"json_serializer": json_dumps, "json_deserializer": json_loads}
+
+    if database_url.startswith("sqlite"):
+        options["connect_args"] = {} if is_async else {"check_same_thread": False}
+    elif profile == "postgres":
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=True
+        )
+        timeout = str(settings.db_statement_timeout_ms)
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+
+    return options
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply the SQLite profile to every new pooled connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kb)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+def create_db_engine(database_url: str, profile: Optional[str] = None):
+    """Create a sync engine configured with the given (or configured) profile."""
+    profile = get_engine_profile(database_url, profile)
+    db_engine = create_engine(database_url, **get_engine_options(database_url, profile))
+    if profile == "sqlite":
+        event.listen(db_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+def create_async_db_engine(database_url: str, profile: Optional[str] = None):
+    """Create an async engine configured with the given (or configured) profile."""
+    profile = get_engine_profile(database_url, profile)
+    async_url = get_async_database_url(database_url)
+    db_engine = create_async_engine(async_url, **get_engine_options(database_url, profile, is_async=True))
+    if profile == "sqlite":
+        event.listen(db_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+# Create engine (used by scripts such as seed_data.py)
+engine = create_db_engine(settings.database_url)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine used by the API so queries never block the event loop
+async_engine = create_async_db_engine(settings.database_url)
+
+# Objects stay usable after commit so responses can be built without reloading
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Create Base class
 Base = declarative_base()
 
@@ -27,9 +115,14 @@ Base = declarative_base()
 metadata = MetaData()
 
 # Dependency to get database session
-def get_db():
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Sync session for scripts and background jobs outside the event loop
+def get_sync_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -1,31 +1,40 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app.auth import verify_token, get_user_by_id, get_user_type
+from app.auth import get_user_by_id
 from app.models import User, Employer
+from app.schemas import TokenData
+from app.tokens import token_cache
 from typing import Union
 
 # Security scheme
 security = HTTPBearer()
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> Union[User, Employer]:
-    """Get the current authenticated user."""
-    credentials_exception = HTTPException(
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+async def get_current_token(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> TokenData:
+    """Claims of the bearer token: verified (or cached) and not revoked."""
+    return await token_cache.verify(db, credentials.credentials, credentials_exception())
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> Union[User, Employer]:
+    """Get the current authenticated user."""
+    token_data = await get_current_token(credentials, db)
     
-    token = credentials.credentials
-    token_data = verify_token(token, credentials_exception)
-    
-    user = get_user_by_id(db, user_id=token_data.id)
+    user = await get_user_by_id(db, user_id=token_data.id, user_type=token_data.user_type)
     if user is None:
-        raise credentials_exception
+        raise credentials_exception()
     
     return user
 
@@ -53,7 +62,7 @@ async def get_current_employer(
 
 async def get_optional_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Union[User, Employer, None]:
     """Get the current user if authenticated, otherwise None."""
     try:
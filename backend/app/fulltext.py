@@ -0,0 +1,123 @@
+"""
+Full-text search
+SQLite FTS5 and Postgres tsvector indexes over contracts and job posts, with
+relevance ranking, prefix matching and highlighted snippets.
+"""
+
+import re
+from typing import List, Optional, Tuple
+from sqlalchemy import literal, literal_column, func, or_
+from sqlalchemy.sql import table, column
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+MAX_SEARCH_TERMS = 8
+
+# Indexed tables: FTS5 table name, searchable columns and their BM25 weights.
+# Each FTS row carries the source row's id in entity_id, which the sync triggers
+# match on (so it has to be indexed) and user queries exclude via a column filter.
+# Category only exists on job posts.
+FULLTEXT_TABLES = {
+    "contracts": {
+        "fts": "contracts_fts",
+        "columns": ("title", "description", "skills"),
+        "weights": (10.0, 3.0, 6.0),
+    },
+    "job_posts": {
+        "fts": "job_posts_fts",
+        "columns": ("title", "description", "category", "skills"),
+        "weights": (10.0, 3.0, 4.0, 6.0),
+    },
+}
+
+# Postgres: tsvector weight class per column (A ranks highest)
+TSVECTOR_WEIGHTS = {"title": "A", "skills": "B", "category": "C", "description": "D"}
+TEXT_SEARCH_CONFIG = "english"
+
+def _column_source(column_name: str, prefix: str) -> str:
+    """SQL expression for an indexed column, given the row alias (new./old./table.)."""
+    if column_name == "skills":
+        return f"(SELECT group_concat(value, ' ') FROM json_each({prefix}requirements, '$.skills'))"
+    return f"{prefix}{column_name}"
+
+def sqlite_fulltext_ddl(table_name: str) -> List[str]:
+    """FTS5 table plus the triggers that keep it in sync with its source table.
+
+    Batch migrations that rebuild the source table drop its triggers; re-run the
+    trigger statements from here afterwards.
+    """
+    spec = FULLTEXT_TABLES[table_name]
+    fts, columns = spec["fts"], spec["columns"]
+    column_list = ", ".join(("entity_id",) + columns)
+    new_values = ", ".join(["new.id"] + [_column_source(c, "new.") for c in columns])
+    delete_old = f"DELETE FROM {fts} WHERE {fts} MATCH ('entity_id:\"' || old.id || '\"');"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"entity_id, {', '.join(columns)}, tokenize = 'porter unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table_name} BEGIN "
+        f"INSERT INTO {fts} ({column_list}) VALUES ({new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {', '.join(c for c in columns if c != 'skills')}, requirements "
+        f"ON {table_name} BEGIN {delete_old} INSERT INTO {fts} ({column_list}) VALUES ({new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table_name} BEGIN {delete_old} END",
+    ]
+
+def sqlite_fulltext_backfill(table_name: str) -> str:
+    """Index every existing row of the source table."""
+    spec = FULLTEXT_TABLES[table_name]
+    sources = ", ".join(["id"] + [_column_source(c, f"{table_name}.") for c in spec["columns"]])
+    return f"INSERT INTO {spec['fts']} (entity_id, {', '.join(spec['columns'])}) SELECT {sources} FROM {table_name}"
+
+def postgres_fulltext_ddl(table_name: str) -> List[str]:
+    """Generated, weighted tsvector column with a GIN index."""
+    parts = []
+    for column_name in FULLTEXT_TABLES[table_name]["columns"]:
+        source = "requirements->>'skills'" if column_name == "skills" else column_name
+        parts.append(
+            f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce({source}, '')), '{TSVECTOR_WEIGHTS[column_name]}')"
+        )
+    return [
+        f"ALTER TABLE {table_name} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({' || '.join(parts)}) STORED",
+        f"CREATE INDEX ix_{table_name}_search_vector ON {table_name} USING gin (search_vector)",
+    ]
+
+def parse_search_terms(keywords: Optional[str]) -> List[str]:
+    """Lower-cased word tokens; anything else is dropped so terms are safe in MATCH/tsquery syntax."""
+    if not keywords:
+        return []
+    return re.findall(r"\w+", keywords.lower())[:MAX_SEARCH_TERMS]
+
+def apply_fulltext(query, model, terms: List[str], dialect_name: str) -> Tuple[object, object, object, object]:
+    """Restrict ``query`` to rows matching every term (as a prefix).
+
+    Returns (query, rank, title_highlight, snippet). Lower rank sorts first on
+    every backend; dialects without a full-text index fall back to LIKE with no
+    ranking or highlights.
+    """
+    table_name = model.__tablename__
+
+    if dialect_name == "sqlite":
+        spec = FULLTEXT_TABLES[table_name]
+        fts_name = spec["fts"]
+        fts = table(fts_name, column("entity_id"))
+        fts_ref = literal_column(fts_name)
+        # Column filter keeps entity_id tokens out of user queries
+        match = "{%s} : (%s)" % (" ".join(spec["columns"]), " ".join(f'"{term}"*' for term in terms))
+        query = query.join(fts, fts.c.entity_id == model.id).where(fts_ref.op("MATCH")(match))
+        rank = func.bm25(fts_ref, 0.0, *spec["weights"])
+        title_highlight = func.highlight(fts_ref, 1, HIGHLIGHT_START, HIGHLIGHT_END)
+        snippet = func.snippet(fts_ref, -1, HIGHLIGHT_START, HIGHLIGHT_END, "…", 16)
+        return query, rank, title_highlight, snippet
+
+    if dialect_name == "postgresql":
+        vector = literal_column(f"{table_name}.search_vector")
+        tsquery = func.to_tsquery(TEXT_SEARCH_CONFIG, " & ".join(f"{term}:*" for term in terms))
+        query = query.where(vector.op("@@")(tsquery))
+        options = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}"
+        rank = -func.ts_rank_cd(vector, tsquery)
+        title_highlight = func.ts_headline(TEXT_SEARCH_CONFIG, model.title, tsquery, f"{options}, HighlightAll=true")
+        snippet = func.ts_headline(TEXT_SEARCH_CONFIG, model.description, tsquery, f"{options}, MaxWords=24, MinWords=8")
+        return query, rank, title_highlight, snippet
+
+    for term in terms:
+        query = query.where(or_(model.title.ilike(f"%{term}%"), model.description.ilike(f"%{term}%")))
+    return query, literal(0), literal(None), literal(None)
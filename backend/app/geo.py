@@ -0,0 +1,164 @@
+"""
+Pincode geo lookup
+Resolves pincodes to coordinates from the bundled reference dataset and builds the
+geohash cell and distance filters used for radius search.
+"""
+
+import csv
+import math
+import os
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import and_, or_
+
+PINCODE_DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reference", "pincodes.csv")
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+GEOHASH_PRECISION = 6  # ~1.2 x 0.6 km cells, finer than a pincode area
+MAX_COVER_CELLS = 16
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# (height, width) of a geohash cell in degrees, by precision
+_CELL_SIZES = {p: (180 / 2 ** ((5 * p) // 2), 360 / 2 ** ((5 * p + 1) // 2)) for p in range(1, 13)}
+
+Coordinates = Tuple[float, float]
+
+@lru_cache(maxsize=1)
+def load_pincode_dataset() -> List[Dict[str, Any]]:
+    """Rows of the bundled pincode -> (latitude, longitude) reference dataset."""
+    with open(PINCODE_DATASET, newline="", encoding="utf-8") as f:
+        return [
+            {**row, "latitude": float(row["latitude"]), "longitude": float(row["longitude"])}
+            for row in csv.DictReader(f)
+        ]
+
+@lru_cache(maxsize=1)
+def _pincode_index() -> Tuple[Dict[str, Coordinates], Dict[str, Coordinates]]:
+    """Exact pincode lookup plus 3-digit prefix (sorting district) centroids."""
+    exact, prefixes = {}, {}
+    for row in load_pincode_dataset():
+        exact[row["pincode"]] = (row["latitude"], row["longitude"])
+        prefixes.setdefault(row["pincode"][:3], []).append((row["latitude"], row["longitude"]))
+    centroids = {
+        prefix: (sum(p[0] for p in points) / len(points), sum(p[1] for p in points) / len(points))
+        for prefix, points in prefixes.items()
+    }
+    return exact, centroids
+
+def resolve_pincode(pincode: Any) -> Optional[Coordinates]:
+    """Coordinates for a pincode, falling back to its sorting district's centroid."""
+    if pincode is None:
+        return None
+    pincode = str(pincode).strip()
+    if len(pincode) != 6 or not pincode.isdigit():
+        return None
+    exact, centroids = _pincode_index()
+    return exact.get(pincode) or centroids.get(pincode[:3])
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+def geo_columns(pincode: Any) -> Dict[str, Any]:
+    """latitude/longitude/geohash column values for a listing's pincode."""
+    point = resolve_pincode(pincode)
+    if point is None:
+        return {"latitude": None, "longitude": None, "geohash": None}
+    return {"latitude": point[0], "longitude": point[1], "geohash": geohash_encode(*point)}
+
+def _steps(low: float, high: float, step: float) -> Iterable[float]:
+    value = low
+    while value < high:
+        yield value
+        value += step
+    yield high
+
+def covering_cells(origin: Coordinates, radius_km: float) -> Optional[List[str]]:
+    """Smallest set of geohash prefixes (at the finest usable precision) covering the radius.
+
+    None when the circle is too large for a handful of cells to help.
+    """
+    latitude, longitude = origin
+    dlat = radius_km / KM_PER_DEGREE
+    dlon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+    south, north = max(latitude - dlat, -90.0), min(latitude + dlat, 90.0)
+    west, east = max(longitude - dlon, -180.0), min(longitude + dlon, 180.0)
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = _CELL_SIZES[precision]
+        if (math.ceil((north - south) / height) + 1) * (math.ceil((east - west) / width) + 1) <= MAX_COVER_CELLS:
+            return sorted({
+                geohash_encode(lat, lon, precision)
+                for lat in _steps(south, north, height)
+                for lon in _steps(west, east, width)
+            })
+    return None
+
+def distance_sq_expr(model, origin: Coordinates):
+    """Squared distance in km^2 as a SQL expression (equirectangular, no trig needed in the DB).
+
+    Accurate to well under 1% at the tens-of-km radii used for travel distance.
+    """
+    latitude, longitude = origin
+    lon_scale = KM_PER_DEGREE * math.cos(math.radians(latitude))
+    dy = (model.latitude - latitude) * KM_PER_DEGREE
+    dx = (model.longitude - longitude) * lon_scale
+    return dy * dy + dx * dx
+
+def apply_radius(query, model, origin: Coordinates, radius_km: float):
+    """Keep rows within radius_km: geohash cell ranges use the index, then the exact circle."""
+    cells = covering_cells(origin, radius_km)
+    if cells is not None:
+        # Each prefix is a contiguous range of the indexed geohash column; the overall
+        # span is a single range the (status, geohash) index can seek on directly
+        query = query.where(
+            model.geohash >= cells[0],
+            model.geohash < cells[-1] + "~",
+            or_(*[and_(model.geohash >= cell, model.geohash < cell + "~") for cell in cells]),
+        )
+    return query.where(distance_sq_expr(model, origin) <= radius_km * radius_km)
+
+def haversine_km(origin: Coordinates, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Great-circle distances from origin to arrays of points (NaN where a point is unknown)."""
+    lat1, lon1 = np.radians(origin[0]), np.radians(origin[1])
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+def distances_km(origin: Coordinates, rows: List[Any]) -> List[Optional[float]]:
+    """Great-circle distance from origin to each row's latitude/longitude, vectorized."""
+    if not rows:
+        return []
+    lat = np.array([r.latitude if r.latitude is not None else np.nan for r in rows], dtype=float)
+    lon = np.array([r.longitude if r.longitude is not None else np.nan for r in rows], dtype=float)
+    return [None if np.isnan(d) else round(float(d), 2) for d in haversine_km(origin, lat, lon)]
+
+def search_origin(near_pincode: Optional[str], account: Any) -> Optional[Coordinates]:
+    """Point to measure distance from: near_pincode if given, else the account's own pincode."""
+    if near_pincode:
+        return resolve_pincode(near_pincode)
+    return resolve_pincode((getattr(account, "location", None) or {}).get("pincode"))
+
+def search_radius(max_distance: Optional[float], nearby: bool, account: Any) -> Optional[float]:
+    """Explicit max_distance, else a worker's preferred max_travel_distance when nearby is set."""
+    if max_distance is not None or not nearby:
+        return max_distance
+    preferences = getattr(account, "preferences", None) or {}
+    return preferences.get("max_travel_distance")
@@ -0,0 +1,106 @@
+"""
+Password hashing
+bcrypt off the event loop: a bounded thread pool (bcrypt releases the GIL) with a
+cap on queued work, a configurable cost factor, and rehash-on-login when it changes.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from app.config import settings
+
+def create_crypt_context(rounds: int) -> CryptContext:
+    """bcrypt at ``rounds``; hashes at any other cost report needs-update."""
+    return CryptContext(
+        schemes=["bcrypt"], deprecated="auto",
+        bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds, bcrypt__max_rounds=rounds,
+    )
+
+class PasswordHasher:
+    """Runs bcrypt on at most ``workers`` threads; at most ``max_queue`` calls wait for one.
+
+    Past the queue limit callers get a 503 instead of piling up behind a login burst.
+    """
+
+    def __init__(self, rounds: int, workers: int, max_queue: int):
+        self.context = create_crypt_context(rounds)
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loop = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.queued = 0
+        self.running = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.busy_seconds = 0.0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._slots = loop, asyncio.Semaphore(self.workers)
+        return self._slots
+
+    async def _run(self, func, *args) -> Any:
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-in requests, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        slots = self._semaphore()
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        try:
+            await slots.acquire()
+        finally:
+            self.queued -= 1
+        self.running += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.busy_seconds += time.perf_counter() - started
+            self.completed += 1
+            self.running -= 1
+            slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """(valid, new hash) - the new hash is set when ``hashed`` uses another cost factor."""
+        valid, new_hash = await self._run(self.context.verify_and_update, password, hashed)
+        if new_hash is not None:
+            self.rehashed += 1
+        return valid, new_hash
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and throughput, for monitoring."""
+        return {
+            "rounds": self.context.handler("bcrypt").default_rounds,
+            "workers": self.workers,
+            "running": self.running,
+            "queued": self.queued,
+            "peak_queued": self.peak_queued,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "avg_ms": round(self.busy_seconds / self.completed * 1000, 1) if self.completed else None,
+        }
+
+password_hasher = PasswordHasher(
+    rounds=settings.bcrypt_rounds,
+    workers=settings.password_hash_workers or min(4, os.cpu_count() or 1),
+    max_queue=settings.password_hash_max_queue,
+)
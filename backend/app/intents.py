@@ -0,0 +1,188 @@
+"""
+Chat intent router
+Classifies a chat message with one compiled keyword pattern (English, Hindi and
+transliterated Hindi) so greetings, help and the menu are answered from templates
+and other messages go to the matching GeminiAIService method.
+"""
+
+import re
+from typing import Any, Dict, List, NamedTuple
+from app.llm_cache import normalize_message
+from app.semantic_cache import language_of
+
+GREETING, THANKS, HELP, MENU = "greeting", "thanks", "help", "menu"
+JOBS, RIGHTS, CONTRACT, GENERAL = "jobs", "rights", "contract", "general"
+
+# Answered from a template, without a model call
+TEMPLATE_INTENTS = (GREETING, THANKS, HELP, MENU)
+# Sent to their own Gemini method; on a tie the earlier one wins
+ROUTED_INTENTS = (CONTRACT, JOBS, RIGHTS)
+
+INTENT_KEYWORDS = {
+    GREETING: ["hi", "hii", "hiii", "hello", "helo", "hey", "good morning", "good afternoon", "good evening",
+               "namaste", "namaskar", "ram ram", "salaam", "salam", "sat sri akal", "vanakkam",
+               "नमस्ते", "नमस्कार", "राम राम", "हेलो", "हैलो"],
+    THANKS: ["thanks", "thank you", "thank u", "thanku", "thx", "dhanyavad", "dhanyawad", "shukriya", "sukriya",
+             "धन्यवाद", "शुक्रिया"],
+    HELP: ["help", "what can you do", "how does this work", "how to use", "how do i use", "madad", "sahayata",
+           "sahayta", "kya kar sakte ho", "kya kar sakte hain", "मदद", "सहायता", "क्या कर सकते हो"],
+    MENU: ["menu", "main menu", "options", "start", "start again", "restart", "मेनू", "विकल्प"],
+    JOBS: ["job", "jobs", "naukri", "naukari", "kaam chahiye", "kaam dhundh", "kaam milega", "find work",
+           "looking for work", "work available", "vacancy", "vacancies", "hiring", "employment", "opportunity",
+           "opportunities", "rozgar", "rojgar", "नौकरी", "काम चाहिए", "रोजगार", "रोज़गार"],
+    RIGHTS: ["rights", "adhikar", "law", "laws", "legal", "kanoon", "kanun", "minimum wage", "wage",
+             "wages", "salary", "payment", "not paid", "unpaid", "mazdoori", "majduri", "vetan", "pf",
+             "provident fund", "epf", "esi", "esic", "mgnrega", "nrega", "scheme", "yojana", "subsidy", "overtime",
+             "working hours", "safety", "compensation", "muavza", "dispute", "complaint", "shikayat",
+             "exploitation", "unfair", "अधिकार", "कानून", "वेतन", "मजदूरी", "मज़दूरी", "योजना", "शिकायत", "पीएफ",
+             "मनरेगा", "ओवरटाइम", "मुआवजा"],
+    CONTRACT: ["contract", "agreement", "terms", "conditions", "clause", "fair", "anubandh", "karar", "shartein",
+               "sharten", "अनुबंध", "करार", "शर्तें", "शर्त"],
+}
+
+# Words that may surround a greeting or a request for the menu without asking anything
+FILLER_WORDS = frozenset("""
+a an the i me my you your can could please pls plz sir madam maam mam ji bhai bhaiya didi dost friend there
+assistant bot karar kararai again ok okay so very much and all to show give need want some is are what do
+mujhe mera meri aap kya hai hain ho batao dikhao chahiye karo kijiye zara
+मुझे मेरा मेरी आप क्या है हैं हो बताओ दिखाओ चाहिए करो कीजिए जी भाई कृपया ज़रा जरा
+""".split())
+MAX_TEMPLATE_WORDS = 8
+
+def trie_pattern(keywords) -> str:
+    """Regex matching any of ``keywords``, with shared prefixes factored out ("wage",
+    "wages" -> "wage(?:s)?") so a position is tried against a trie of them rather than
+    each keyword in turn. Optional tails are greedy, so the longest keyword wins."""
+    trie: Dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def pattern(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return pattern(trie)
+
+_KEYWORD_INTENT = {keyword: intent for intent, keywords in INTENT_KEYWORDS.items() for keyword in keywords}
+# Every keyword of every intent in one compiled pattern, matched as whole words
+_KEYWORDS = re.compile(r"(?<![\wऀ-ॿ])(?:" + trie_pattern(_KEYWORD_INTENT) + r")(?![\wऀ-ॿ])")
+_TOKEN = re.compile(r"[\wऀ-ॿ]+")
+
+class Intent(NamedTuple):
+    name: str
+    language: str  # "hi" for Devanagari messages, "en" otherwise
+    keywords: List[str]  # matched, in order
+
+    @property
+    def templated(self) -> bool:
+        return self.name in TEMPLATE_INTENTS
+
+def classify(message: str, has_contract: bool = False) -> Intent:
+    """Intent of a chat message in one regex pass.
+
+    A template intent needs the message to be nothing but its keywords and filler
+    ("hi", "namaste ji", "show me the menu"); anything more is a question. Questions
+    go to the routed intent with the most keyword hits (contract only when the chat
+    is about a contract), else to general assistance.
+    """
+    text = normalize_message(message)
+    language = language_of(message)
+    keywords = _KEYWORDS.findall(text)
+    hits: Dict[str, int] = {}
+    for keyword in keywords:
+        hits[_KEYWORD_INTENT[keyword]] = hits.get(_KEYWORD_INTENT[keyword], 0) + 1
+
+    if hits and all(intent in TEMPLATE_INTENTS for intent in hits) and \
+            len(_TOKEN.findall(text)) <= MAX_TEMPLATE_WORDS and \
+            all(word in FILLER_WORDS for word in _TOKEN.findall(_KEYWORDS.sub(" ", text))):
+        # The most specific ask wins: "hi, show the menu" gets the menu
+        name = next(intent for intent in (HELP, MENU, THANKS, GREETING) if intent in hits)
+        return Intent(name, language, keywords)
+
+    routed = [intent for intent in ROUTED_INTENTS if hits.get(intent) and (intent != CONTRACT or has_contract)]
+    name = max(routed, key=lambda intent: hits[intent]) if routed else GENERAL
+    return Intent(name, language, keywords)
+
+MENU_TEXT = {
+    "en": ("🔍 **Job Search** - Find work opportunities\n"
+           "⚖️ **Worker Rights** - Know your legal protections\n"
+           "💰 **Payment Tracking** - Monitor wages and payments\n"
+           "📋 **Contract Help** - Understand job terms"),
+    "hi": ("🔍 **काम की तलाश** - आपके पास के काम\n"
+           "⚖️ **मज़दूर के अधिकार** - कानून और सरकारी योजनाएँ\n"
+           "💰 **भुगतान** - मज़दूरी और भुगतान का हिसाब\n"
+           "📋 **अनुबंध** - काम की शर्तें समझें"),
+}
+
+TEMPLATES = {
+    GREETING: {
+        "en": "Hello {name}! 👋 I'm your AI FairWork assistant. I can help with:\n\n{menu}\n\nWhat would you like to know?",
+        "hi": "नमस्ते {name}! 👋 मैं आपका AI FairWork सहायक हूँ। मैं इनमें मदद कर सकता हूँ:\n\n{menu}\n\nआप क्या जानना चाहते हैं?",
+    },
+    THANKS: {
+        "en": "You're welcome, {name}! 😊 Ask me anytime about jobs, wages, your rights or a contract.",
+        "hi": "आपका स्वागत है, {name}! 😊 काम, मज़दूरी, अधिकार या अनुबंध के बारे में कभी भी पूछिए।",
+    },
+    HELP: {
+        "en": ("Here's what I can do for you:\n\n{menu}\n\nTry asking:\n"
+               "• \"Find {skill} jobs near me\"\n"
+               "• \"What is the minimum wage in {state}?\"\n"
+               "• \"How do I register for PF?\"\n"
+               "• \"Is this contract fair?\" (from a contract's chat)"),
+        "hi": ("मैं आपकी इनमें मदद कर सकता हूँ:\n\n{menu}\n\nऐसे पूछिए:\n"
+               "• \"मेरे पास {skill} की नौकरी\"\n"
+               "• \"{state} में न्यूनतम मज़दूरी कितनी है?\"\n"
+               "• \"पीएफ के लिए पंजीकरण कैसे करें?\"\n"
+               "• \"क्या यह अनुबंध ठीक है?\" (अनुबंध की चैट में)"),
+    },
+    MENU: {
+        "en": "I'm here to help with:\n\n{menu}\n\nWhat can I assist you with today?",
+        "hi": "मैं इनमें आपकी मदद के लिए हूँ:\n\n{menu}\n\nआज मैं आपकी क्या मदद करूँ?",
+    },
+}
+
+def template_answer(intent: Intent, user_data: Dict[str, Any]) -> str:
+    """Answer to a greeting, thanks, help or menu message, in the message's script."""
+    location = user_data.get("location") or {}
+    skills = user_data.get("area_of_expertise") or []
+    return TEMPLATES[intent.name][intent.language].format(
+        name=user_data.get("name") or ("Worker" if intent.language == "en" else "जी"),
+        menu=MENU_TEXT[intent.language],
+        skill=skills[0].lower() if skills else ("construction" if intent.language == "en" else "निर्माण"),
+        state=location.get("state") or ("your state" if intent.language == "en" else "आपके राज्य"),
+    )
+
+class IntentRouter:
+    """Counts routed chat messages by intent, for /metrics."""
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+
+    def route(self, intent: Intent, follow_up: bool = False, contract_found: bool = True) -> Intent:
+        """The intent a message is answered by. A jobs or rights follow-up ("is that
+        legal?") stays with general assistance, the one method that sees the conversation,
+        as does a contract question whose contract does not exist. In a contract's chat
+        "this contract" is the chat's own, so a contract question is routed either way."""
+        if follow_up and intent.name in (JOBS, RIGHTS) or intent.name == CONTRACT and not contract_found:
+            intent = intent._replace(name=GENERAL)
+        self.counts[intent.name] = self.counts.get(intent.name, 0) + 1
+        return intent
+
+    def stats(self) -> Dict[str, Any]:
+        total = sum(self.counts.values())
+        templated = sum(self.counts.get(name, 0) for name in TEMPLATE_INTENTS)
+        return {
+            "messages": total,
+            "templated": templated,
+            "templated_ratio": round(templated / total, 3) if total else 0.0,
+            "by_intent": dict(sorted(self.counts.items())),
+        }
+
+# Global intent router instance
+intent_router = IntentRouter()
@@ -0,0 +1,224 @@
+"""
+Job analysis metrics
+Skills match, pay against the worker's minimum, fairness score and commute class,
+computed locally from the job and the worker so the LLM only writes the narrative.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from app.geo import haversine_km, resolve_pincode
+from app.minimum_wages import check_listing
+from app.search_fields import extract_location, extract_rate, extract_rate_type, extract_skills, extract_working_hours
+
+FAIR_WAGE_MULTIPLE = 1.5  # pay at 1.5x the state minimum for the job's skill category earns full wage points
+
+# Points of the 0-10 fairness score
+FAIRNESS_POINTS = {"wage": 6.0, "hours": 2.0, "payment_terms": 2.0}
+STANDARD_SHIFT_HOURS = 8  # longer shifts lose hours points, all of them past OVERLONG_SHIFT_HOURS
+OVERLONG_SHIFT_HOURS = 10
+# Share of the payment-terms points by how often pay arrives; checked in order
+PAYMENT_FREQUENCY = [("daily", 1.0), ("bi-weekly", 0.75), ("biweekly", 0.75), ("fortnight", 0.75),
+                     ("weekly", 1.0), ("monthly", 0.5)]
+FAIRNESS_LABELS = [(8.5, "Excellent"), (7.0, "Good"), (5.0, "Fair"), (0.0, "Poor")]
+
+# (up to km, commute, cost impact)
+COMMUTE_CLASSES = [(5, "Local", "Low"), (20, "Moderate", "Medium"), (float("inf"), "Long distance", "High")]
+
+NAMED_PERIODS = {"morning": (6, 12), "afternoon": (12, 18), "evening": (18, 22), "night": (22, 6)}
+_TIME_PATTERN = re.compile(r"(\d{1,2})(?::\d{2})?\s*([ap])\.?m", re.IGNORECASE)
+
+def _hour(hour: str, meridiem: str) -> int:
+    return int(hour) % 12 + (12 if meridiem.lower() == "p" else 0)
+
+def _mark(mask: np.ndarray, start: int, end: int) -> None:
+    if start == end:
+        mask[:] = True
+    elif start < end:
+        mask[start:end] = True
+    else:  # overnight shift
+        mask[start:] = True
+        mask[:end] = True
+
+def working_hours_mask(texts: Iterable[Optional[str]]) -> Optional[np.ndarray]:
+    """24-hour boolean mask covered by shift descriptions ("9 AM - 6 PM", "Morning", "Flexible")."""
+    mask = np.zeros(24, dtype=bool)
+    for text in texts:
+        if not text:
+            continue
+        lower = text.lower()
+        if "flexible" in lower or "any time" in lower:
+            mask[:] = True
+            continue
+        times = _TIME_PATTERN.findall(lower)
+        if len(times) >= 2:
+            _mark(mask, _hour(*times[0]), _hour(*times[1]))
+            continue
+        for name, (start, end) in NAMED_PERIODS.items():
+            if name in lower:
+                _mark(mask, start, end)
+    return mask if mask.any() else None
+
+@lru_cache(maxsize=1024)
+def shift_hours(working_hours: Optional[str]) -> Optional[int]:
+    """Length of a shift in hours; None when unknown or flexible."""
+    mask = working_hours_mask([working_hours])
+    if mask is None or mask.all():
+        return None
+    return int(mask.sum())
+
+def _first(data: Any, *keys: str) -> Any:
+    """First present value among snake_case/camelCase spellings of a key."""
+    if not isinstance(data, dict):
+        return None
+    for key in keys:
+        value = data.get(key)
+        if value not in (None, "", []):
+            return value
+    return None
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def fairness_label(score: float) -> str:
+    return next(label for floor, label in FAIRNESS_LABELS if score >= floor)
+
+def wage_shares(daily_wage: np.ndarray, minimum: np.ndarray) -> np.ndarray:
+    """Share of the wage points per listing: none below the minimum, all of them at
+    FAIR_WAGE_MULTIPLE times it, half when the daily pay is unknown (NaN)."""
+    with np.errstate(invalid="ignore"):
+        shares = np.clip((daily_wage / minimum - 1) / (FAIR_WAGE_MULTIPLE - 1), 0.0, 1.0)
+    return np.where(np.isnan(daily_wage), 0.5, shares)
+
+def terms_points(payment: Optional[Dict[str, Any]], work_details: Optional[Dict[str, Any]]) -> Tuple[float, Optional[int]]:
+    """Fairness points for shift length and payment terms (the part that does not depend
+    on the pay), with the shift length."""
+    hours = shift_hours(extract_working_hours(work_details))
+    if hours is None:
+        hours_share = 0.5
+    elif hours <= STANDARD_SHIFT_HOURS:
+        hours_share = 1.0
+    else:
+        hours_share = max(0.0, (OVERLONG_SHIFT_HOURS - hours) / (OVERLONG_SHIFT_HOURS - STANDARD_SHIFT_HOURS))
+
+    terms = str(_first(payment, "payment_terms", "paymentTerms") or "").lower()
+    terms_share = next((share for word, share in PAYMENT_FREQUENCY if word in terms), 0.5 if terms else 0.0)
+    return FAIRNESS_POINTS["hours"] * hours_share + FAIRNESS_POINTS["payment_terms"] * terms_share, hours
+
+def fairness_scores(wage: np.ndarray, other_points: np.ndarray) -> np.ndarray:
+    """0-10 scores from wage shares and the remaining points, rounded to one decimal."""
+    return np.round(FAIRNESS_POINTS["wage"] * wage + other_points, 1)
+
+def contract_fairness(payment: Optional[Dict[str, Any]], work_details: Optional[Dict[str, Any]],
+                      requirements: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Minimum-wage compliance and a 0-10 fairness score from pay, shift length and payment terms.
+
+    Pay is checked against the state's minimum for the skill category the required
+    skills fall in (see app/minimum_wages.py). Only the job's own terms count, so the
+    score can be stored on the listing. Unknown parts (pay with no duration, flexible
+    hours) get half their points.
+    """
+    wage = check_listing(payment, work_details, requirements)
+    daily_wage, minimum = wage["daily_wage"], wage["minimum_wage"]
+    points, hours = terms_points(payment, work_details)
+    share = wage_shares(np.array([np.nan if daily_wage is None else daily_wage]), np.array([minimum]))
+    score = float(fairness_scores(share, np.array([points]))[0])
+    return {
+        "daily_wage": round(daily_wage, 2) if daily_wage is not None else None,
+        "minimum_wage": minimum,
+        "skill_category": wage["skill_category"],
+        "is_minimum_wage_compliant": wage["is_minimum_wage_compliant"],
+        "minimum_wage_version": wage["minimum_wage_version"],
+        "fairness_score": score,
+        "fairness_label": fairness_label(score),
+        "shift_hours": hours,
+    }
+
+def _commute(distance_km: Optional[float], job_location: Dict[str, Optional[str]],
+             worker_location: Dict[str, Optional[str]]) -> Optional[tuple]:
+    if distance_km is not None:
+        return next((name, cost) for limit, name, cost in COMMUTE_CLASSES if distance_km <= limit)
+    # No coordinates for one side: fall back to comparing city and state
+    if job_location["city"] and job_location["city"] == worker_location["city"]:
+        return COMMUTE_CLASSES[0][1:]
+    if job_location["state"] and worker_location["state"]:
+        return COMMUTE_CLASSES[1][1:] if job_location["state"] == worker_location["state"] else COMMUTE_CLASSES[2][1:]
+    return None
+
+def analyze_job(job: Dict[str, Any], worker: Dict[str, Any]) -> Dict[str, Any]:
+    """Metrics of a job for a worker. Accepts API (snake_case) and frontend (camelCase) shapes."""
+    requirements = _first(job, "requirements") or {}
+    payment = _first(job, "payment") or {}
+    work_details = _first(job, "work_details", "workDetails") or {}
+    experience = _first(worker, "experience") or {}
+    preferences = _first(worker, "preferences") or {}
+
+    # Skills: a required skill counts when either name contains the other ("mason" / "masonry")
+    required = extract_skills(requirements)
+    worker_skills = extract_skills({"skills": list(_first(worker, "area_of_expertise", "areaOfExpertise") or [])
+                                    + list(_first(experience, "skills") or [])})
+    matched = [skill for skill in required if any(skill in own or own in skill for own in worker_skills)]
+    missing = [skill for skill in required if skill not in matched]
+
+    fairness = contract_fairness(payment, work_details, requirements)
+    del fairness["minimum_wage_version"]  # bookkeeping for stored listings
+    minimum = _number(_first(preferences, "minimum_wage", "minimumWage"))
+    daily_wage = fairness["daily_wage"]
+    wage_percentage = round(daily_wage / minimum * 100, 1) if daily_wage is not None and minimum else None
+
+    job_location = extract_location(work_details)
+    worker_location = extract_location({"location": _first(worker, "location") or {}})
+    origin, target = resolve_pincode(worker_location["pincode"]), resolve_pincode(job_location["pincode"])
+    distance_km = None
+    if origin is not None and target is not None:
+        distance_km = round(float(haversine_km(origin, target[0], target[1])), 1)
+    commute = _commute(distance_km, job_location, worker_location)
+    max_travel = _number(_first(preferences, "max_travel_distance", "maxTravelDistance"))
+
+    return {
+        "skills_required": len(required),
+        "skills_matched": matched,
+        "skills_missing": missing,
+        "skills_match_percentage": round(len(matched) / len(required) * 100, 1) if required else None,
+        "rate": extract_rate(payment),
+        "rate_type": extract_rate_type(payment),
+        "worker_minimum_wage": minimum,
+        "wage_percentage_of_minimum": wage_percentage,
+        **fairness,
+        "distance_km": distance_km,
+        "within_travel_limit": distance_km <= max_travel if distance_km is not None and max_travel else None,
+        "commute": commute[0] if commute else None,
+        "commute_cost": commute[1] if commute else None,
+    }
+
+def _money(amount: Optional[float]) -> str:
+    return f"₹{amount:,.0f}" if amount is not None else "not stated"
+
+def format_metrics(metrics: Dict[str, Any]) -> str:
+    """The numeric sections of a job analysis, as markdown."""
+    lines = []
+    if metrics["skills_required"]:
+        lines.append(f"**🔧 Skills Match:** {metrics['skills_match_percentage']:.0f}% "
+                     f"({len(metrics['skills_matched'])}/{metrics['skills_required']} skills match)")
+        lines.append(f"• ✅ Matching: {', '.join(metrics['skills_matched']) or 'none'}")
+        if metrics["skills_missing"]:
+            lines.append(f"• ❌ Missing: {', '.join(metrics['skills_missing'])}")
+    rate_type = metrics["rate_type"] or "job"
+    lines.append(f"\n**💰 Wage Analysis:** {_money(metrics['rate'])}/{rate_type}"
+                 + (f" (about {_money(metrics['daily_wage'])}/day)" if rate_type != "daily" and metrics["daily_wage"] else ""))
+    if metrics["wage_percentage_of_minimum"] is not None:
+        lines.append(f"• {metrics['wage_percentage_of_minimum']:.0f}% of your minimum "
+                     f"({_money(metrics['worker_minimum_wage'])}/day)")
+    if not metrics["is_minimum_wage_compliant"]:
+        lines.append(f"• ⚠️ Below the {metrics['skill_category']} minimum wage of {_money(metrics['minimum_wage'])}/day")
+    lines.append(f"• Fairness: {metrics['fairness_score']}/10 - {metrics['fairness_label']}")
+    if metrics["commute"]:
+        where = f"{metrics['distance_km']} km from your location" if metrics["distance_km"] is not None else "distance unknown"
+        lines.append(f"\n**📍 Location:** {where}")
+        lines.append(f"• Commute: {metrics['commute']}")
+        lines.append(f"• Cost impact: {metrics['commute_cost']}")
+    return "\n".join(lines)
@@ -0,0 +1,166 @@
+"""
+LLM response cache
+Exact-match cache of Gemini answers: an in-process LRU in front of a SQLite file
+that survives restarts. Answers served from it are marked with CachedAnswer.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+from app.cache import LRUCache
+from app.config import settings
+
+class CachedAnswer(str):
+    """An answer served from the cache rather than generated for this request."""
+    cached = True
+
+def normalize_message(message: str) -> str:
+    """Case, spacing and trailing punctuation do not change what is being asked."""
+    return re.sub(r"\s+", " ", message.casefold()).strip().rstrip("?!.।").strip()
+
+def default_sqlite_path() -> str:
+    """llm_cache.db next to a SQLite database, or under ./data otherwise."""
+    if settings.database_url.startswith("sqlite:///"):
+        database_dir = os.path.dirname(settings.database_url.replace("sqlite:///", "", 1))
+        return os.path.join(database_dir or ".", "llm_cache.db")
+    return os.path.join("data", "llm_cache.db")
+
+class SQLiteAnswerStore:
+    """Answers by key in a SQLite file of their own, so they outlive the process.
+
+    Calls are blocking; LLMResponseCache runs them in a worker thread.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_answers ("
+                "key TEXT PRIMARY KEY, method TEXT NOT NULL, answer TEXT NOT NULL, "
+                "created_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_llm_answers_created_at ON llm_answers (created_at)")
+            self._connection = connection
+        return self._connection
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT answer FROM llm_answers WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, method: str, answer: str, ttl_seconds: float) -> None:
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_answers (key, method, answer, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, method, answer, now, now + ttl_seconds),
+            )
+            self._writes += 1
+            if self._writes % 100 == 0:  # prune now and then, not on every write
+                connection.execute("DELETE FROM llm_answers WHERE expires_at <= ?", (now,))
+                connection.execute(
+                    "DELETE FROM llm_answers WHERE key IN (SELECT key FROM llm_answers "
+                    "ORDER BY created_at DESC LIMIT -1 OFFSET ?)", (self.max_entries,)
+                )
+            connection.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM llm_answers").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM llm_answers")
+            self._connection.commit()
+
+class LLMResponseCache:
+    """Gemini answers keyed by method and a hash of the prompt as built from the
+    normalized message. The prompt holds the template and exactly the profile and
+    job fields the method uses, so a change to either is a new key.
+    """
+
+    def __init__(self, local: LRUCache, store: Optional[SQLiteAnswerStore], ttl_seconds: float,
+                 methods: Iterable[str], enabled: bool = True):
+        self.local = local
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.methods = set(methods)
+        self.enabled = enabled
+        self.hits: Dict[str, int] = {}
+        self.store_hits = 0
+        self.misses: Dict[str, int] = {}
+
+    def key(self, method: str, prompt: str) -> Optional[str]:
+        """Cache key, or None when caching is off for ``method``."""
+        if not self.enabled or method not in self.methods:
+            return None
+        return f"{method}:{hashlib.sha256(prompt.encode()).hexdigest()}"
+
+    async def get(self, key: Optional[str]) -> Optional[CachedAnswer]:
+        if key is None:
+            return None
+        method = key.split(":", 1)[0]
+        answer = self.local.get(key)
+        if answer is None and self.store is not None:
+            answer = await asyncio.to_thread(self.store.get, key)
+            if answer is not None:
+                self.store_hits += 1
+                self.local.set(key, answer)
+        counter = self.hits if answer is not None else self.misses
+        counter[method] = counter.get(method, 0) + 1
+        return CachedAnswer(answer) if answer is not None else None
+
+    async def set(self, key: Optional[str], answer: str) -> None:
+        if key is None or not answer:
+            return
+        self.local.set(key, answer)
+        if self.store is not None:
+            await asyncio.to_thread(self.store.set, key, key.split(":", 1)[0], answer, self.ttl_seconds)
+
+    def clear(self) -> None:
+        self.local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per method, for monitoring."""
+        methods = sorted(set(self.hits) | set(self.misses))
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        return {
+            "enabled": self.enabled,
+            "methods": sorted(self.methods),
+            "entries": len(self.local),
+            "hits": hits,
+            "persistent_hits": self.store_hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+            "by_method": {
+                method: {"hits": self.hits.get(method, 0), "misses": self.misses.get(method, 0)} for method in methods
+            },
+        }
+
+llm_cache = LLMResponseCache(
+    LRUCache(settings.llm_cache_max_entries, settings.llm_cache_ttl_seconds),
+    SQLiteAnswerStore(settings.llm_cache_sqlite_path or default_sqlite_path(), settings.llm_cache_sqlite_max_entries)
+    if settings.llm_cache_persistent else None,
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+    methods=settings.llm_cache_methods,
+    enabled=settings.llm_cache_enabled,
+)
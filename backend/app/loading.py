@@ -0,0 +1,80 @@
+"""
+Related entity loading
+Loading policies for the relationships embedded in responses, and a request-scoped
+batcher that fills them with one IN query per entity type instead of one per row.
+"""
+
+from typing import Any, Dict, Iterable, Sequence, Tuple
+from sqlalchemy import inspect, select
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+from app.models import Contract, JobPost
+
+IN_BATCH_SIZE = 500
+LOADER_KEY = "entity_loader"
+
+# Relationships each response schema embeds (ContractResponse, JobPostResponse and subclasses)
+CONTRACT_RESPONSE_RELATIONS = (Contract.employer, Contract.worker)
+JOB_POST_RESPONSE_RELATIONS = (JobPost.employer,)
+
+class EntityLoader:
+    """DataLoader-style batcher bound to one session.
+
+    Keys requested together are fetched with a single IN query per entity type;
+    entities already in the session (e.g. the authenticated account) or loaded
+    earlier in the request are reused without a query.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._cache: Dict[Tuple[type, Any], Any] = {}
+
+    def _cached(self, model, key) -> Any:
+        obj = self._cache.get((model, key))
+        if obj is None:
+            obj = self.db.identity_map.get(identity_key(model, key))
+            if obj is not None and inspect(obj).expired_attributes:
+                return None
+        return obj
+
+    async def load_many(self, model, keys: Iterable[Any]) -> Dict[Any, Any]:
+        """Entities of ``model`` by primary key; missing keys are left out."""
+        found, missing = {}, []
+        for key in {key for key in keys if key is not None}:
+            obj = self._cached(model, key)
+            if obj is None:
+                missing.append(key)
+            else:
+                found[key] = obj
+        for start in range(0, len(missing), IN_BATCH_SIZE):
+            batch = missing[start:start + IN_BATCH_SIZE]
+            for obj in await self.db.scalars(select(model).where(model.id.in_(batch))):
+                found[obj.id] = obj
+        for key, obj in found.items():
+            self._cache[(model, key)] = obj
+        return found
+
+    async def populate(self, objects: Sequence[Any], *relations) -> None:
+        """Fill many-to-one ``relations`` on ``objects`` without marking them modified."""
+        objects = [obj for obj in objects if obj is not None]
+        for relation in relations:
+            prop = relation.property
+            (foreign_key,) = prop.local_columns
+            pending = [obj for obj in objects if relation.key not in inspect(obj).dict]
+            if not pending:
+                continue
+            attribute = inspect(type(pending[0])).get_property_by_column(foreign_key).key
+            keys = {obj: getattr(obj, attribute) for obj in pending}
+            related = await self.load_many(prop.mapper.class_, keys.values())
+            for obj, key in keys.items():
+                set_committed_value(obj, relation.key, related.get(key))
+
+def entity_loader(db) -> EntityLoader:
+    """The loader for this session (sessions are per request, so the cache is too)."""
+    info = db.sync_session.info
+    if LOADER_KEY not in info:
+        info[LOADER_KEY] = EntityLoader(db)
+    return info[LOADER_KEY]
+
+async def load_related(db, objects: Sequence[Any], *relations) -> None:
+    await entity_loader(db).populate(objects, *relations)
@@ -0,0 +1,76 @@
+"""
+Schema migrations
+Compares the stored schema version with the Alembic head and upgrades when they differ.
+"""
+
+import os
+from contextlib import contextmanager
+from typing import Optional
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from app.database import engine
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Revision matching the tables that Base.metadata.create_all() used to build
+BASELINE_REVISION = "0001"
+
+def get_alembic_config() -> Config:
+    """Alembic config that works regardless of the current working directory."""
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    config.attributes["configure_logging"] = False
+    return config
+
+def get_head_revision(config: Optional[Config] = None) -> str:
+    """Latest revision shipped with the code."""
+    return ScriptDirectory.from_config(config or get_alembic_config()).get_current_head()
+
+def get_current_revision(connection) -> Optional[str]:
+    """Revision stored in the database's alembic_version table, if any."""
+    return MigrationContext.configure(connection).get_current_revision()
+
+@contextmanager
+def sqlite_foreign_keys_disabled(connection):
+    """Suspend SQLite foreign key enforcement while migrations run.
+
+    Batch migrations rebuild tables by copy, drop and rename, which enforced
+    foreign keys reject. The pragma only takes effect outside a transaction, so
+    it is set on the driver connection before any migration statement runs.
+    """
+    is_sqlite = connection.dialect.name == "sqlite"
+    if is_sqlite:
+        connection.connection.driver_connection.execute("PRAGMA foreign_keys=OFF")
+    try:
+        yield connection
+    finally:
+        if is_sqlite:
+            connection.connection.driver_connection.execute("PRAGMA foreign_keys=ON")
+
+def upgrade_database() -> Optional[str]:
+    """Bring the database schema up to the head revision.
+
+    Returns the revision the database was at before upgrading (None for a new database).
+    """
+    config = get_alembic_config()
+    head = get_head_revision(config)
+
+    with engine.connect() as connection, sqlite_foreign_keys_disabled(connection):
+        with connection.begin():
+            current = get_current_revision(connection)
+            if current == head:
+                return current
+
+            config.attributes["connection"] = connection
+            if current is None and inspect(connection).has_table("users"):
+                # Database built by create_all() before migrations existed
+                command.stamp(config, BASELINE_REVISION)
+                current = BASELINE_REVISION
+                print(f"🏷️  Existing schema stamped at revision {BASELINE_REVISION}")
+
+            command.upgrade(config, "head")
+        print(f"✅ Database schema upgraded {current or 'empty'} -> {head}")
+        return current
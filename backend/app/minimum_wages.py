@@ -0,0 +1,168 @@
+"""
+State minimum wages
+Notified minimum wages by state and skill category, held as a NumPy matrix of daily
+rates so the compliance of any number of listings is checked in one vectorized pass.
+"""
+
+import csv
+import os
+import zlib
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import numpy as np
+from app.search_fields import (
+    DAYS_PER_RATE, extract_location, extract_rate, extract_rate_type, extract_skills, extract_working_days,
+    normalize_text
+)
+
+MINIMUM_WAGE_DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reference", "minimum_wages.csv")
+
+NATIONAL_FLOOR_WAGE = 178.0  # ₹/day, national floor-level minimum wage; applies in states without a notification
+
+# Lowest to highest; a job falls in the highest category any of its skills needs
+SKILL_CATEGORIES = ["unskilled", "semi-skilled", "skilled", "highly-skilled"]
+# Words of a skill that place it in a category, checked from the highest; anything else is unskilled
+SKILL_CATEGORY_KEYWORDS = [
+    ("highly-skilled", ["panel installation", "commercial systems", "welding", "heavy vehicle", "modular kitchen",
+                        "texture painting"]),
+    ("skilled", ["mason", "electric", "wiring", "motor repair", "plumb", "pipe fitting", "sanitary", "carpent",
+                 "furniture", "door fitting", "polishing", "painting", "waterproofing", "driv", "machine operation",
+                 "cook", "catering", "cuisine", "cctv", "vehicle maintenance", "landscaping", "tiling"]),
+    ("semi-skilled", ["brick", "concrete", "shuttering", "scaffolding", "foundation", "putty", "security",
+                      "access control", "quality checking", "delivery", "license", "route knowledge", "lawn",
+                      "nursery", "deep cleaning", "maintenance", "plastering"]),
+]
+_CATEGORY_INDEX = {category: i for i, category in enumerate(SKILL_CATEGORIES)}
+UNKNOWN_STATE = "national"
+
+@lru_cache(maxsize=1)
+def load_minimum_wage_dataset() -> List[Dict[str, Any]]:
+    """Rows of the bundled state minimum wage notifications."""
+    with open(MINIMUM_WAGE_DATASET, newline="", encoding="utf-8") as f:
+        return [
+            {**row, "state": normalize_text(row["state"]), "rate": float(row["rate"]),
+             "effective_from": date.fromisoformat(row["effective_from"])}
+            for row in csv.DictReader(f)
+        ]
+
+@lru_cache(maxsize=4096)
+def skill_category(skill: str) -> int:
+    for category, keywords in SKILL_CATEGORY_KEYWORDS:
+        if any(keyword in skill for keyword in keywords):
+            return _CATEGORY_INDEX[category]
+    return 0
+
+def skills_category(skills: Iterable[str]) -> int:
+    """Index into SKILL_CATEGORIES of the highest category among normalized skills."""
+    return max((skill_category(skill) for skill in skills), default=0)
+
+class MinimumWageTable:
+    """Daily minimum wages in force on a date, one row per state plus the national floor.
+
+    Each state's rates carry a version (a checksum of the notified rates), stored on
+    every checked listing so a re-evaluation only touches listings whose state changed.
+    """
+
+    def __init__(self, rows: Iterable[Dict[str, Any]], on: Optional[date] = None):
+        on = on or date.today()
+        in_force: Dict[tuple, Dict[str, Any]] = {}
+        for row in rows:
+            key = (normalize_text(row["state"]), row["category"])
+            if row["effective_from"] <= on and (key not in in_force or
+                                                row["effective_from"] >= in_force[key]["effective_from"]):
+                in_force[key] = row
+        states = sorted({state for state, _ in in_force})
+        self.states = {state: i for i, state in enumerate(states)}
+        self.daily = np.full((len(states) + 1, len(SKILL_CATEGORIES)), NATIONAL_FLOOR_WAGE)
+        self.notifications: Dict[str, List[str]] = {}
+        for (state, category), row in in_force.items():
+            self.daily[self.states[state], _CATEGORY_INDEX[category]] = row["rate"] / DAYS_PER_RATE[row["rate_type"]]
+            self.notifications.setdefault(state, [])
+            if row["notification"] not in self.notifications[state]:
+                self.notifications[state].append(row["notification"])
+        # A category a state did not notify takes the next lower one's rate
+        np.maximum.accumulate(self.daily, axis=1, out=self.daily)
+        self.daily = self.daily.round(2)
+        self.versions = [
+            f"{state}:{zlib.crc32(self.daily[i].tobytes()):08x}" for state, i in [*self.states.items(), (UNKNOWN_STATE, -1)]
+        ]
+        self.version = f"{zlib.crc32(' '.join(self.versions).encode()):08x}"
+
+    def state_rows(self, states: Sequence[Optional[str]]) -> np.ndarray:
+        """Matrix row of each normalized state; the national floor's for unknown ones."""
+        unknown = len(self.states)
+        return np.fromiter((self.states.get(state, unknown) for state in states), dtype=np.intp, count=len(states))
+
+    def minimum(self, state: Optional[str], category: int = 0) -> float:
+        return float(self.daily[self.states.get(state, len(self.states)), category])
+
+    def changed_states(self, other: "MinimumWageTable") -> List[str]:
+        """States whose rates differ from ``other``'s (UNKNOWN_STATE for the national floor)."""
+        old = {version.split(":")[0]: version for version in other.versions}
+        return [version.split(":")[0] for version in self.versions if old.get(version.split(":")[0]) != version]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "states": len(self.states),
+            "notifications": {state: notes for state, notes in sorted(self.notifications.items())},
+        }
+
+def daily_rates(rates: np.ndarray, rate_types: Sequence[Optional[str]], working_days: np.ndarray) -> np.ndarray:
+    """Pay per working day for each listing (NaN when it cannot be told, e.g. fixed with no duration)."""
+    types = np.asarray(rate_types, dtype=object)
+    days = np.full(len(types), np.nan)
+    for rate_type, per in DAYS_PER_RATE.items():
+        days[types == rate_type] = per
+    fixed = types == "fixed"
+    days[fixed] = working_days[fixed]
+    days[days <= 0] = np.nan
+    return np.asarray(rates, dtype=np.float64) / days
+
+def evaluate(table: MinimumWageTable, rates: Sequence[Optional[float]], rate_types: Sequence[Optional[str]],
+             working_days: Sequence[Optional[float]], states: Sequence[Optional[str]],
+             categories: Sequence[int]) -> Dict[str, Any]:
+    """Compliance of many listings at once; unknown pay is not flagged.
+
+    Returns arrays aligned with the inputs: daily_wage, minimum_wage, compliant and
+    version (the table version of each listing's state, to store with the result).
+    """
+    rows = table.state_rows(states)
+    daily = daily_rates(np.array(rates, dtype=np.float64), rate_types, np.array(working_days, dtype=np.float64))
+    minimum = table.daily[rows, np.asarray(categories, dtype=np.intp)]
+    return {
+        "daily_wage": daily,
+        "minimum_wage": minimum,
+        "compliant": ~(daily < minimum),  # NaN compares False either way
+        "version": np.asarray(table.versions, dtype=object)[rows],
+    }
+
+_current = MinimumWageTable(load_minimum_wage_dataset())
+
+def current_table() -> MinimumWageTable:
+    """The table in force in this process (the bundled notifications until the database's are loaded)."""
+    return _current
+
+def set_current_table(table: MinimumWageTable) -> MinimumWageTable:
+    """Swap in a new table; returns the one it replaces."""
+    global _current
+    previous, _current = _current, table
+    return previous
+
+def check_listing(payment: Optional[Dict[str, Any]], work_details: Optional[Dict[str, Any]],
+                  requirements: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Minimum-wage check of one job post or contract against the table in force."""
+    table = current_table()
+    category = skills_category(extract_skills(requirements))
+    state = extract_location(work_details)["state"]
+    result = evaluate(table, [extract_rate(payment)], [extract_rate_type(payment)],
+                      [extract_working_days(work_details)], [state], [category])
+    daily = float(result["daily_wage"][0])
+    return {
+        "daily_wage": None if np.isnan(daily) else daily,
+        "minimum_wage": float(result["minimum_wage"][0]),
+        "skill_category": SKILL_CATEGORIES[category],
+        "is_minimum_wage_compliant": bool(result["compliant"][0]),
+        "minimum_wage_version": result["version"][0],
+    }
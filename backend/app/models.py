@@ -1,11 +1,13 @@
-from sqlalchemy import Column, String, Boolean, Integer, Float, DateTime, Text, ForeignKey, JSON
-from sqlalchemy.orm import relationship
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, String, Boolean, Integer, Float, Date, DateTime, Text, ForeignKey, JSON, Index
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import relationship, Session
 from datetime import datetime
+from app.database import Base
+from app.search_fields import extract_daily_rate, extract_rate, extract_rate_type, extract_location, extract_skills
+from app.geo import geo_columns
+from app.job_metrics import contract_fairness
 import uuid
 
-Base = declarative_base()
-
 def generate_uuid():
     return str(uuid.uuid4())
 
@@ -41,7 +43,7 @@ class User(Base):
     work_logs = relationship("WorkLog", back_populates="worker")
     payment_records_as_worker = relationship("PaymentRecord", foreign_keys="PaymentRecord.worker_id", back_populates="worker")
     applications = relationship("ContractApplication", back_populates="worker")
-    chat_messages = relationship("ChatMessage", foreign_keys="ChatMessage.sender_id", back_populates="sender")
+    chat_messages = relationship("ChatMessage", primaryjoin="User.id == ChatMessage.sender_id", foreign_keys="ChatMessage.sender_id", back_populates="sender")
 
 class Employer(Base):
     __tablename__ = "employers"
@@ -70,8 +72,35 @@ class Employer(Base):
     contracts_as_employer = relationship("Contract", foreign_keys="Contract.employer_id", back_populates="employer")
     payment_records_as_employer = relationship("PaymentRecord", foreign_keys="PaymentRecord.employer_id", back_populates="employer")
 
+class Identity(Base):
+    """Directory of every account so auth lookups hit one indexed table."""
+    __tablename__ = "identities"
+    
+    id = Column(String, primary_key=True)  # users.id or employers.id
+    account_type = Column(String, nullable=False)  # worker, employer
+    email = Column(String, nullable=True, index=True)
+    phone = Column(String, nullable=True, index=True)
+
+class RevokedToken(Base):
+    """Revoked access tokens, by jti, and per-account cutoffs ("account:<id>": every
+    token issued before revoked_at). Rows can go once expires_at passes."""
+    __tablename__ = "revoked_tokens"
+    
+    key = Column(String, primary_key=True)
+    revoked_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
 class Contract(Base):
     __tablename__ = "contracts"
+    __table_args__ = (
+        Index("ix_contracts_status_created", "status", "created_at"),
+        Index("ix_contracts_accepted_by", "accepted_by"),
+        Index("ix_contracts_status_city_daily_rate", "status", "location_city", "daily_rate"),
+        Index("ix_contracts_status_state_daily_rate", "status", "location_state", "daily_rate"),
+        Index("ix_contracts_status_daily_rate", "status", "daily_rate"),
+        Index("ix_contracts_pincode", "location_pincode"),
+        Index("ix_contracts_status_geohash", "status", "geohash"),
+    )
     
     id = Column(String, primary_key=True, default=generate_uuid)
     title = Column(String, nullable=False)
@@ -87,11 +116,23 @@ class Contract(Base):
     # Requirements as JSON
     requirements = Column(JSON, nullable=False)  # {skills, experience, tools}
     
+    # Search columns derived from the JSON above on every write (see sync_search_columns)
+    pay_rate = Column(Float, nullable=True)
+    pay_rate_type = Column(String, nullable=True)
+    daily_rate = Column(Float, nullable=True)  # pay_rate per working day, for rate filters and sorting
+    location_city = Column(String, nullable=True)
+    location_state = Column(String, nullable=True)
+    location_pincode = Column(String, nullable=True)
+    latitude = Column(Float, nullable=True)  # resolved from location_pincode (see app/geo.py)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String, nullable=True)
+    
     status = Column(String, default="available")  # available, accepted, in-progress, completed, cancelled
     accepted_by = Column(String, ForeignKey("users.id"), nullable=True)
     contract_receipt_id = Column(String, nullable=True)
     fairness_score = Column(Float, default=0.0)
     is_minimum_wage_compliant = Column(Boolean, default=True)
+    minimum_wage_version = Column(String, nullable=True)  # state rates it was checked against (see app/minimum_wages.py)
     applicants_count = Column(Integer, default=0)
     
     # Work tracking as JSON
@@ -104,14 +145,24 @@ class Contract(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    employer = relationship("Employer", foreign_keys=[employer_id], back_populates="contracts_as_employer")
-    worker = relationship("User", foreign_keys=[accepted_by], back_populates="contracts_as_worker")
+    # Never loaded implicitly: endpoints that embed them batch-load them (app/loading.py)
+    employer = relationship("Employer", foreign_keys=[employer_id], back_populates="contracts_as_employer", lazy="raise")
+    worker = relationship("User", foreign_keys=[accepted_by], back_populates="contracts_as_worker", lazy="raise")
     work_logs = relationship("WorkLog", back_populates="contract")
     payment_records = relationship("PaymentRecord", back_populates="contract")
     applications = relationship("ContractApplication", foreign_keys="ContractApplication.contract_id_generated", back_populates="generated_contract")
+    skill_rows = relationship("ContractSkill", cascade="all, delete-orphan", passive_deletes=True)
 
 class JobPost(Base):
     __tablename__ = "job_posts"
+    __table_args__ = (
+        Index("ix_job_posts_status_employer_created", "status", "employer_id", "created_at"),
+        Index("ix_job_posts_status_city_daily_rate", "status", "location_city", "daily_rate"),
+        Index("ix_job_posts_status_state_daily_rate", "status", "location_state", "daily_rate"),
+        Index("ix_job_posts_status_daily_rate", "status", "daily_rate"),
+        Index("ix_job_posts_pincode", "location_pincode"),
+        Index("ix_job_posts_status_geohash", "status", "geohash"),
+    )
     
     id = Column(String, primary_key=True, default=generate_uuid)
     employer_id = Column(String, ForeignKey("employers.id"), nullable=False)
@@ -128,16 +179,82 @@ class JobPost(Base):
     # Requirements as JSON
     requirements = Column(JSON, nullable=False)  # {skills, experience, tools, certifications}
     
+    # Search columns derived from the JSON above on every write (see sync_search_columns)
+    pay_rate = Column(Float, nullable=True)
+    pay_rate_type = Column(String, nullable=True)
+    daily_rate = Column(Float, nullable=True)  # pay_rate per working day, for rate filters and sorting
+    location_city = Column(String, nullable=True)
+    location_state = Column(String, nullable=True)
+    location_pincode = Column(String, nullable=True)
+    latitude = Column(Float, nullable=True)  # resolved from location_pincode (see app/geo.py)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String, nullable=True)
+    
+    is_minimum_wage_compliant = Column(Boolean, nullable=True)
+    minimum_wage_version = Column(String, nullable=True)  # state rates it was checked against (see app/minimum_wages.py)
+    
     status = Column(String, default="draft")  # draft, published, closed, filled
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    employer = relationship("Employer", back_populates="job_posts")
+    # Never loaded implicitly: endpoints that embed it batch-load it (app/loading.py)
+    employer = relationship("Employer", back_populates="job_posts", lazy="raise")
     applications = relationship("ContractApplication", back_populates="job_post")
+    skill_rows = relationship("JobPostSkill", cascade="all, delete-orphan", passive_deletes=True)
+
+class ContractSkill(Base):
+    __tablename__ = "contract_skills"
+    __table_args__ = (
+        Index("ix_contract_skills_skill", "skill", "contract_id"),
+    )
+    
+    contract_id = Column(String, ForeignKey("contracts.id", ondelete="CASCADE"), primary_key=True)
+    skill = Column(String, primary_key=True)  # normalized (lower-case) requirements.skills entry
+
+class JobPostSkill(Base):
+    __tablename__ = "job_post_skills"
+    __table_args__ = (
+        Index("ix_job_post_skills_skill", "skill", "job_id"),
+    )
+    
+    job_id = Column(String, ForeignKey("job_posts.id", ondelete="CASCADE"), primary_key=True)
+    skill = Column(String, primary_key=True)  # normalized (lower-case) requirements.skills entry
+
+class PincodeLocation(Base):
+    """Pincode reference coordinates, loaded from app/reference/pincodes.csv."""
+    __tablename__ = "pincode_locations"
+    
+    pincode = Column(String, primary_key=True)
+    office = Column(String, nullable=False)
+    district = Column(String, nullable=False)
+    state = Column(String, nullable=False)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+
+class MinimumWageRate(Base):
+    """Notified state minimum wages by skill category; per state and category the latest
+    effective_from on or before today is in force (see app/minimum_wages.py)."""
+    __tablename__ = "minimum_wage_rates"
+    __table_args__ = (
+        Index("ix_minimum_wage_rates_state_category", "state", "category", "effective_from"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    state = Column(String, nullable=False)  # normalized (lower-case)
+    category = Column(String, nullable=False)  # unskilled, semi-skilled, skilled, highly-skilled
+    rate = Column(Float, nullable=False)
+    rate_type = Column(String, nullable=False)  # hourly, daily, weekly, monthly
+    effective_from = Column(Date, nullable=False)
+    notification = Column(String, nullable=False)  # the state's notification reference
+    created_at = Column(DateTime, default=datetime.utcnow)
 
 class ContractApplication(Base):
     __tablename__ = "contract_applications"
+    __table_args__ = (
+        Index("ix_contract_applications_job_status", "job_id", "status"),
+        Index("uq_contract_applications_job_worker", "job_id", "worker_id", unique=True),
+    )
     
     id = Column(String, primary_key=True, default=generate_uuid)
     job_id = Column(String, ForeignKey("job_posts.id"), nullable=False)
@@ -206,9 +323,13 @@ class PaymentRecord(Base):
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        Index("ix_chat_messages_sender_timestamp", "sender_id", "timestamp"),
+        Index("ix_chat_messages_receiver_timestamp", "receiver_id", "timestamp"),
+    )
     
     id = Column(String, primary_key=True, default=generate_uuid)
-    sender_id = Column(String, ForeignKey("users.id"), nullable=False)
+    sender_id = Column(String, nullable=False)  # user id, or "ai-assistant" for AI replies (so no FK)
     receiver_id = Column(String, nullable=True)  # null for AI chat
     message = Column(Text, nullable=False)
     message_type = Column(String, default="text")  # text, image, document, contract, system
@@ -217,7 +338,26 @@ class ChatMessage(Base):
     contract_id = Column(String, nullable=True)  # if message is related to a specific contract
     
     # Relationships
-    sender = relationship("User", foreign_keys=[sender_id], back_populates="chat_messages")
+    sender = relationship("User", primaryjoin="ChatMessage.sender_id == User.id", foreign_keys=[sender_id], back_populates="chat_messages")
+
+class ChatContext(Base):
+    """Rolling summary of a worker's conversation with the AI assistant, one per contract
+    (and one for chat outside any contract). It covers every message up to
+    summarized_until; the messages after it are quoted as they are (see app/conversation.py)."""
+    __tablename__ = "chat_contexts"
+    __table_args__ = (
+        Index("ix_chat_contexts_user_contract", "user_id", "contract_key", unique=True),
+    )
+    
+    id = Column(String, primary_key=True, default=generate_uuid)
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    contract_key = Column(String, nullable=False, default="")  # contract_id of the messages, "" for general chat
+    summary = Column(Text, nullable=False, default="")
+    summary_tokens = Column(Integer, default=0)
+    summarized_until = Column(DateTime, nullable=True)  # timestamp of the last message folded in
+    summarized_message_id = Column(String, nullable=True)  # and its id (ties on the timestamp)
+    messages_summarized = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class Notification(Base):
     __tablename__ = "notifications"
@@ -232,4 +372,71 @@ class Notification(Base):
     action_url = Column(String, nullable=True)
     data = Column(JSON, nullable=True)  # additional data
     created_at = Column(DateTime, default=datetime.utcnow)
-    expires_at = Column(DateTime, nullable=True)
\ No newline at end of file
+    expires_at = Column(DateTime, nullable=True)
+
+SEARCH_SOURCE_FIELDS = ("payment", "work_details", "requirements")
+
+@event.listens_for(Session, "before_flush")
+def sync_search_columns(session, flush_context, instances):
+    """Keep the typed search columns, skill rows, minimum-wage check and contract fairness in sync
+    with the JSON fields."""
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Contract):
+            skill_model = ContractSkill
+        elif isinstance(obj, JobPost):
+            skill_model = JobPostSkill
+        else:
+            continue
+        
+        state = inspect(obj)
+        if not state.pending and not any(state.attrs[field].history.has_changes() for field in SEARCH_SOURCE_FIELDS):
+            continue
+        
+        location = extract_location(obj.work_details)
+        obj.pay_rate = extract_rate(obj.payment)
+        obj.pay_rate_type = extract_rate_type(obj.payment)
+        obj.daily_rate = extract_daily_rate(obj.payment, obj.work_details)
+        obj.location_city = location["city"]
+        obj.location_state = location["state"]
+        obj.location_pincode = location["pincode"]
+        for field, value in geo_columns(location["pincode"]).items():
+            setattr(obj, field, value)
+        
+        fairness = contract_fairness(obj.payment, obj.work_details, obj.requirements)
+        obj.is_minimum_wage_compliant = fairness["is_minimum_wage_compliant"]
+        obj.minimum_wage_version = fairness["minimum_wage_version"]
+        if skill_model is ContractSkill:
+            obj.fairness_score = fairness["fairness_score"]
+        
+        if state.pending or state.attrs.requirements.history.has_changes():
+            obj.skill_rows = [skill_model(skill=skill) for skill in extract_skills(obj.requirements)]
+
+ACCOUNT_TYPES = {User: "worker", Employer: "employer"}
+
+@event.listens_for(Session, "before_flush")
+def sync_identity_directory(session, flush_context, instances):
+    """Mirror worker/employer id, email and phone into the identity directory."""
+    for obj in list(session.new):
+        if type(obj) in ACCOUNT_TYPES:
+            if obj.id is None:
+                obj.id = generate_uuid()
+            session.add(Identity(id=obj.id, account_type=ACCOUNT_TYPES[type(obj)], email=obj.email, phone=obj.phone))
+    
+    for obj in list(session.dirty):
+        if type(obj) not in ACCOUNT_TYPES:
+            continue
+        state = inspect(obj)
+        if not (state.attrs.email.history.has_changes() or state.attrs.phone.history.has_changes()):
+            continue
+        identity = session.get(Identity, obj.id)
+        if identity is None:
+            session.add(Identity(id=obj.id, account_type=ACCOUNT_TYPES[type(obj)], email=obj.email, phone=obj.phone))
+        else:
+            identity.email = obj.email
+            identity.phone = obj.phone
+    
+    for obj in list(session.deleted):
+        if type(obj) in ACCOUNT_TYPES:
+            identity = session.get(Identity, obj.id)
+            if identity is not None:
+                session.delete(identity)
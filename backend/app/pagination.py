@@ -0,0 +1,114 @@
+"""
+Keyset (cursor) pagination
+Pages are addressed by an opaque cursor holding the (sort value, id) of the last row
+served, so deep pages cost the same as the first one.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import select, func, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+def encode_cursor(sort_value: datetime, row_id: str) -> str:
+    """Opaque, URL-safe cursor for the row after which the next page starts."""
+    payload = json.dumps([sort_value.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of encode_cursor; rejects tampered or malformed cursors with a 400."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(sort_value), str(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+def apply_keyset(query, sort_column, id_column, cursor: Optional[str], descending: bool = True):
+    """Order by (sort_column, id_column) and start after the cursor row, if any."""
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        if descending:
+            query = query.where(or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < row_id)
+            ))
+        else:
+            query = query.where(or_(
+                sort_column > sort_value,
+                and_(sort_column == sort_value, id_column > row_id)
+            ))
+    if descending:
+        return query.order_by(sort_column.desc(), id_column.desc())
+    return query.order_by(sort_column.asc(), id_column.asc())
+
+async def paginate(
+    db: AsyncSession,
+    query,
+    sort_column,
+    id_column,
+    limit: int,
+    cursor: Optional[str] = None,
+    page: int = 1,
+    descending: bool = True,
+    include_total: bool = False
+) -> Tuple[List[Any], Dict[str, Any], Optional[str]]:
+    """Fetch one page of ORM rows.
+
+    Uses the cursor when given; otherwise falls back to ``page`` (OFFSET) for older
+    clients. The exact total is only counted when ``include_total`` is set.
+    Returns (rows, pagination, next_cursor).
+    """
+    pagination: Dict[str, Any] = {"limit": limit}
+
+    if include_total:
+        total = await db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+        pagination["total"] = total
+        pagination["total_pages"] = (total + limit - 1) // limit
+
+    page_query = apply_keyset(query, sort_column, id_column, cursor, descending)
+    if not cursor:
+        pagination["page"] = page
+        if page > 1:
+            page_query = page_query.offset((page - 1) * limit)
+
+    # One extra row tells us whether another page exists without counting
+    rows = (await db.scalars(page_query.limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    pagination["has_more"] = has_more
+
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+    return rows, pagination, next_cursor
+
+async def paginate_rows(
+    db: AsyncSession,
+    query,
+    limit: int,
+    page: int = 1,
+    include_total: bool = False
+) -> Tuple[List[Any], Dict[str, Any]]:
+    """Fetch one OFFSET page of result rows for an already ordered query.
+
+    For orderings a cursor cannot express, such as search relevance. Rows keep
+    every selected column (e.g. the entity plus its rank). Returns (rows, pagination).
+    """
+    pagination: Dict[str, Any] = {"limit": limit, "page": page}
+
+    if include_total:
+        total = await db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+        pagination["total"] = total
+        pagination["total_pages"] = (total + limit - 1) // limit
+
+    rows = (await db.execute(query.offset((page - 1) * limit).limit(limit + 1))).all()
+    pagination["has_more"] = len(rows) > limit
+    return rows[:limit], pagination
@@ -1,8 +1,22 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, EmailStr, field_validator
+from typing import Optional, List, Dict, Any, Generic, TypeVar
 from datetime import datetime
 from enum import Enum
 
+def reuse_embedded(value, handler, info):
+    """Validate an embedded ORM object once per validate_rows() call.
+
+    A page of contracts or job posts usually repeats the same employer; the loader
+    hands out one object per entity, so later rows reuse the first result.
+    """
+    cache = info.context.get("embedded") if info.context else None
+    if cache is None or value is None or isinstance(value, (dict, BaseModel)):
+        return handler(value)
+    key = id(value)
+    if key not in cache:
+        cache[key] = (value, handler(value))  # holds value so its id is not reused
+    return cache[key][1]
+
 # Base schemas
 class LocationBase(BaseModel):
     state: str
@@ -58,6 +72,10 @@ class UserLogin(BaseModel):
     phone_or_email: str
     password: str
 
+class PasswordChange(BaseModel):
+    current_password: str
+    new_password: str
+
 class UserUpdate(BaseModel):
     name: Optional[str] = None
     phone: Optional[str] = None
@@ -140,6 +158,8 @@ class ContractResponse(ContractBase):
     employer: Optional[EmployerResponse] = None
     worker: Optional[UserResponse] = None
 
+    _reuse_embedded = field_validator("employer", "worker", mode="wrap")(reuse_embedded)
+
     class Config:
         from_attributes = True
 
@@ -168,10 +188,13 @@ class JobPostResponse(JobPostBase):
     id: str
     employer_id: str
     status: str
+    is_minimum_wage_compliant: Optional[bool] = None
     created_at: datetime
     updated_at: datetime
     employer: Optional[EmployerResponse] = None
 
+    _reuse_embedded = field_validator("employer", mode="wrap")(reuse_embedded)
+
     class Config:
         from_attributes = True
 
@@ -328,21 +351,55 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     id: Optional[str] = None
+    user_type: Optional[str] = None  # worker or employer; absent in tokens issued before it was added
+    jti: Optional[str] = None  # token id, the revocation key
+    issued_at: float = 0  # epoch seconds; 0 for tokens issued before "iat" was added
+    expires_at: Optional[float] = None
 
 # API Response schemas
-class ApiResponse(BaseModel):
+# Parametrize (e.g. PaginatedResponse[ContractResponse]) so the payload is
+# serialized against its schema; the bare classes accept Any
+DataT = TypeVar("DataT")
+
+class ApiResponse(BaseModel, Generic[DataT]):
     success: bool
-    data: Optional[Any] = None
+    data: Optional[DataT] = None
     message: Optional[str] = None
     error: Optional[str] = None
 
-class PaginatedResponse(BaseModel):
+class PaginatedResponse(BaseModel, Generic[DataT]):
     success: bool
-    data: List[Any]
-    pagination: Dict[str, int]
+    data: List[DataT]
+    pagination: Dict[str, Any]  # limit, has_more, page (offset mode), total/total_pages (when requested)
+    next_cursor: Optional[str] = None  # pass back as ?cursor= to fetch the next page
     message: Optional[str] = None
 
 # Search and Filter schemas
+class SearchHighlight(BaseModel):
+    rank: Optional[float] = None  # lower is more relevant
+    title: Optional[str] = None  # title with matches wrapped in <mark>
+    snippet: Optional[str] = None  # best matching fragment, matches wrapped in <mark>
+
+class ContractSearchResult(ContractResponse):
+    highlight: Optional[SearchHighlight] = None  # only set for keyword searches
+    distance_km: Optional[float] = None  # only set when searching around a pincode
+
+class JobPostSearchResult(JobPostResponse):
+    highlight: Optional[SearchHighlight] = None  # only set for keyword searches
+    distance_km: Optional[float] = None  # only set when searching around a pincode
+
+class JobMatch(BaseModel):
+    score: float  # weighted total, 0-1
+    skill_match: float  # share of the job's required skills the worker has
+    wage_match: float  # daily pay against the worker's minimum wage
+    distance_match: float  # 1 nearby, 0 at twice max_travel_distance
+    hours_match: float  # share of the shift within preferred working hours
+    matched_skills: List[str]
+    distance_km: Optional[float] = None
+
+class RecommendedJob(JobPostResponse):
+    match: Optional[JobMatch] = None
+
 class ContractFilters(BaseModel):
     location: Optional[Dict[str, Any]] = None
     payment: Optional[Dict[str, Any]] = None
@@ -0,0 +1,106 @@
+"""
+Search field extraction
+Pulls the filterable sub-fields out of the payment/work_details/requirements JSON
+so they can be stored in typed, indexed columns.
+"""
+
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+def _get(data: Optional[Dict[str, Any]], *keys: str) -> Any:
+    """First present value among snake_case/camelCase spellings of a key."""
+    if not isinstance(data, dict):
+        return None
+    for key in keys:
+        value = data.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+def normalize_text(value: Any) -> Optional[str]:
+    """Lower-cased, trimmed text used for equality filters."""
+    if value is None:
+        return None
+    text = str(value).strip().lower()
+    return text or None
+
+def extract_rate(payment: Optional[Dict[str, Any]]) -> Optional[float]:
+    rate = _get(payment, "rate")
+    try:
+        return float(rate) if rate is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def extract_rate_type(payment: Optional[Dict[str, Any]]) -> Optional[str]:
+    return normalize_text(_get(payment, "rate_type", "rateType"))
+
+def extract_working_hours(work_details: Optional[Dict[str, Any]]) -> Optional[str]:
+    hours = _get(work_details, "working_hours", "workingHours")
+    return str(hours) if hours is not None else None
+
+# Working days covered by one unit of each rate type; a fixed price covers the job's working days
+DAYS_PER_RATE = {"hourly": 1 / 8, "daily": 1, "weekly": 6, "monthly": 26}
+DAYS_PER_PERIOD = {"day": 1, "week": 6, "month": 26, "year": 312}
+WORKING_DAYS_PER_WEEK = 6
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)\s*(day|week|month|year)")
+
+def _date(value: Any) -> Optional[date]:
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+def extract_working_days(work_details: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Working days a job runs for, from its start/end dates or else its duration ("2 weeks")."""
+    start = _date(_get(work_details, "start_date", "startDate"))
+    end = _date(_get(work_details, "end_date", "endDate"))
+    if start and end and end > start:
+        return (end - start).days * WORKING_DAYS_PER_WEEK / 7
+    match = _DURATION.search(str(_get(work_details, "duration") or "").lower())
+    if match:
+        return float(match.group(1)) * DAYS_PER_PERIOD[match.group(2)]
+    return None
+
+def to_daily_rate(rate: Optional[float], rate_type: Optional[str],
+                  working_days: Optional[float] = None) -> Optional[float]:
+    """Rate expressed per 8-hour working day, comparable with a worker's minimum_wage.
+
+    Fixed prices are spread over ``working_days`` and have no daily equivalent without it.
+    """
+    days = working_days if rate_type == "fixed" else DAYS_PER_RATE.get(rate_type)
+    if rate is None or not days:
+        return None
+    return rate / days
+
+def extract_daily_rate(payment: Optional[Dict[str, Any]],
+                       work_details: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Listing pay per working day, so rates of different types can be filtered and sorted together."""
+    rate_type = extract_rate_type(payment)
+    working_days = extract_working_days(work_details) if rate_type == "fixed" else None
+    return to_daily_rate(extract_rate(payment), rate_type, working_days)
+
+def extract_location(work_details: Optional[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+    location = _get(work_details, "location") or {}
+    pincode = _get(location, "pincode", "pinCode")
+    return {
+        "city": normalize_text(_get(location, "city")),
+        "state": normalize_text(_get(location, "state")),
+        "pincode": str(pincode).strip() if pincode is not None else None,
+    }
+
+def extract_skills(requirements: Optional[Dict[str, Any]]) -> List[str]:
+    """Distinct normalized skills, preserving order."""
+    skills = _get(requirements, "skills") or []
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    normalized = []
+    for skill in skills:
+        skill = normalize_text(skill)
+        if skill and skill not in normalized:
+            normalized.append(skill)
+    return normalized
+
+def parse_skill_filter(skills: Optional[str]) -> List[str]:
+    """Normalize a comma-separated ?skills= query parameter."""
+    return extract_skills({"skills": skills}) if skills else []
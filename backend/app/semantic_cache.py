@@ -0,0 +1,264 @@
+"""
+Semantic answer cache
+Reuses an answer for a paraphrase of a question already answered in the same state
+and language. Questions become hashed n-gram vectors computed locally; the nearest
+cached one is found with a NumPy dot product.
+"""
+
+import re
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import numpy as np
+from app.config import settings
+from app.llm_cache import CachedAnswer, normalize_message
+
+DIMENSIONS = 2048
+
+# Ways of naming the same scheme or law, in English, Hindi and transliterated Hindi
+SYNONYMS = [
+    ("minimum_wage", ["minimum wages", "minimum wage", "min wage", "minimum salary", "minimum mazdoori",
+                      "न्यूनतम वेतन", "न्यूनतम मजदूरी", "न्यूनतम मज़दूरी"]),
+    ("pf", ["employees provident fund", "provident fund", "epfo", "epf", "pf", "भविष्य निधि", "पीएफ"]),
+    ("esi", ["employees state insurance", "esic", "esi", "ईएसआई", "कर्मचारी राज्य बीमा"]),
+    ("mgnrega", ["mahatma gandhi national rural employment guarantee", "mgnrega", "nrega", "narega",
+                 "manrega", "मनरेगा", "नरेगा"]),
+    ("wage", ["wages", "salary", "pay", "mazdoori", "majduri", "vetan", "मजदूरी", "मज़दूरी", "वेतन", "तनख्वाह"]),
+    ("register", ["registration", "registered", "enroll", "enrol", "apply", "panjikaran", "पंजीकरण", "रजिस्टर", "आवेदन"]),
+    ("rights", ["right", "adhikar", "अधिकार"]),
+    ("overtime", ["extra hours", "over time", "ओवरटाइम"]),
+]
+
+STOPWORDS = frozenset("""
+a an the is are was were be been am do does did can could should would will shall may might must i me my mine we
+our you your he she it its they them their this that these those what which who whom whose how when where why
+of to in on at by for from with about as into than then so and or but if not no yes please tell explain know
+want need get give hi hello there any some much many also just
+kya hai hain ka ki ke ko se me mein mera meri mere mujhe hum hamara aap aapka kaise kaisa kab kahan kitna kitni
+kitne batao bataiye bataye hota hoti hote tha thi the ya aur bhi nahi kare karen karein karna karu
+क्या है हैं था थी थे का की के को से में मैं मेरा मेरी मेरे मुझे हम हमारा आप आपका कैसे कब कहाँ कहां कितना कितनी
+कितने बताओ बताइए बताएं होता होती होते या और भी नहीं यह वह करें करना करूं
+""".split())
+# Dropped with the stopwords, but a negated question gets a scope of its own: "my employer
+# did not pay my wages" must never take the answer to "my employer did pay my wages"
+NEGATIONS = frozenset("""
+not no never nothing without dont doesnt didnt cant cannot wont isnt arent wasnt havent hasnt
+nahi nahin nai na mat bina
+नहीं नही ना न मत बिना
+""".split())
+
+# Skill categories of the minimum wage notifications; a question naming one gets a scope of
+# its own, as does one with numbers: "minimum wage for unskilled workers" must never take
+# the answer for skilled workers, nor "overtime for 10 hours" the one for 12
+SKILL_LEVELS = [
+    ("highly-skilled", ["highly skilled", "highly-skilled", "high skilled", "ati kushal", "अति कुशल", "अतिकुशल"]),
+    ("semi-skilled", ["semi skilled", "semi-skilled", "semiskilled", "ardh kushal", "ardhkushal", "अर्ध कुशल",
+                      "अर्ध-कुशल", "अर्धकुशल"]),
+    ("unskilled", ["unskilled", "un-skilled", "akushal", "अकुशल"]),
+    ("skilled", ["skilled", "kushal", "कुशल"]),
+]
+
+_SKILL_LEVEL = {term: level for level, terms in SKILL_LEVELS for term in terms}
+_SKILL_LEVELS = re.compile(r"(?<![\wऀ-ॿ-])(?:" + "|".join(
+    re.escape(term) for term in sorted(_SKILL_LEVEL, key=len, reverse=True)) + r")(?![\wऀ-ॿ-])")
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+_SYNONYM_PATTERNS = [
+    (re.compile(r"(?<![\wऀ-ॿ])(?:" + "|".join(re.escape(term) for term in terms) + r")(?![\wऀ-ॿ])"),
+     canonical)
+    for canonical, terms in SYNONYMS
+]
+_TOKEN = re.compile(r"[\wऀ-ॿ]+")
+_DEVANAGARI = re.compile(r"[ऀ-ॿ]")
+
+def language_of(message: str) -> str:
+    """"hi" for questions in Devanagari, "en" otherwise (including transliterated Hindi)."""
+    return "hi" if _DEVANAGARI.search(message) else "en"
+
+def is_negated(message: str) -> bool:
+    return any(token in NEGATIONS for token in _TOKEN.findall(normalize_message(message).replace("'", "").replace("’", "")))
+
+def qualifiers(message: str) -> Tuple[str, ...]:
+    """Numbers and skill categories a question names, which its answer depends on
+    however close the rest of the wording is."""
+    text = normalize_message(message)
+    found = {_SKILL_LEVEL[term] for term in _SKILL_LEVELS.findall(text)}
+    found.update(f"{float(number):g}" for number in _NUMBER.findall(text))
+    return tuple(sorted(found))
+
+def question_terms(message: str) -> List[str]:
+    """Content words of a question, with synonyms folded onto one term."""
+    text = normalize_message(message)
+    for pattern, canonical in _SYNONYM_PATTERNS:
+        text = pattern.sub(canonical, text)
+    return [token for token in _TOKEN.findall(text) if token not in STOPWORDS]
+
+def embed(message: str) -> Optional[np.ndarray]:
+    """Unit vector of hashed words and character trigrams, or None for a question
+    with no content words. Trigrams make inflections and misspellings land close."""
+    terms = question_terms(message)
+    if not terms:
+        return None
+    vector = np.zeros(DIMENSIONS, dtype=np.float32)
+    for term in terms:
+        vector[zlib.crc32(f"w:{term}".encode()) % DIMENSIONS] += 2.0
+        padded = f"<{term}>"
+        for i in range(len(padded) - 2):
+            vector[zlib.crc32(padded[i:i + 3].encode()) % DIMENSIONS] += 1.0
+    np.log1p(vector, out=vector)  # a repeated term counts for less than twice
+    return vector / np.linalg.norm(vector)
+
+class SemanticQuery(NamedTuple):
+    method: str
+    scope: Tuple  # method, state, language, negated, qualifiers, profile
+    vector: np.ndarray
+    personal: Tuple[str, ...]  # an answer mentioning any of these is not shared
+
+class ScopeIndex:
+    """Question vectors and answers of one scope, as rows of a matrix grown by doubling."""
+
+    def __init__(self):
+        self.vectors = np.zeros((0, DIMENSIONS), dtype=np.float32)
+        self.created = np.zeros(0, dtype=np.float64)
+        self.answers: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    def nearest(self, vector: np.ndarray, cutoff: float) -> Tuple[int, float]:
+        """Row and similarity of the closest question created after ``cutoff`` (-1 if none)."""
+        count = len(self.answers)
+        if not count:
+            return -1, 0.0
+        scores = self.vectors[:count] @ vector
+        scores[self.created[:count] < cutoff] = -1.0
+        row = int(np.argmax(scores))
+        return (row, float(scores[row])) if scores[row] > 0 else (-1, 0.0)
+
+    def put(self, row: int, vector: np.ndarray, answer: str) -> None:
+        """Overwrite ``row``, or append when it is -1."""
+        if row < 0:
+            row = len(self.answers)
+            if row == len(self.created):
+                capacity = max(16, row * 2)
+                self.vectors = np.resize(self.vectors, (capacity, DIMENSIONS))
+                self.created = np.resize(self.created, capacity)
+            self.answers.append(answer)
+        self.vectors[row] = vector
+        self.created[row] = time.time()
+        self.answers[row] = answer
+
+    def remove(self, row: int) -> None:
+        last = len(self.answers) - 1
+        self.vectors[row], self.created[row], self.answers[row] = self.vectors[last], self.created[last], self.answers[last]
+        self.answers.pop()
+
+class SemanticAnswerCache:
+    """Answers with the question vectors they were given for, one matrix per scope.
+
+    A lookup is a dot product against the rows of the question's scope, ignoring
+    rows past their TTL. Once ``max_entries`` are held, adding drops the oldest.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, threshold: float, methods: Iterable[str],
+                 enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self.methods = set(methods)
+        self.enabled = enabled
+        self._scopes: Dict[Tuple, ScopeIndex] = {}
+        self._entries = 0
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.not_shared = 0
+        self.similarity_total = 0.0
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def query(self, method: str, state: Optional[str], message: str,
+              personal: Iterable[Optional[str]] = (), profile: Iterable[Optional[str]] = ()) -> Optional[SemanticQuery]:
+        """What to look up and store for ``message``, or None when the cache is off for
+        ``method`` or the message has no content words. ``profile`` holds the asker's
+        details the method's prompt uses; only askers with the same ones share answers."""
+        if not self.enabled or method not in self.methods:
+            return None
+        vector = embed(message)
+        if vector is None:
+            return None
+        scope = (method, (state or "").strip().casefold(), language_of(message), is_negated(message),
+                 qualifiers(message), tuple((term or "").strip().casefold() for term in profile))
+        return SemanticQuery(method, scope, vector, tuple(term.casefold() for term in personal if term))
+
+    def _nearest(self, query: SemanticQuery) -> Tuple[int, float]:
+        index = self._scopes.get(query.scope)
+        if index is None:
+            return -1, 0.0
+        return index.nearest(query.vector, time.time() - self.ttl_seconds)
+
+    def get(self, query: Optional[SemanticQuery]) -> Optional[CachedAnswer]:
+        if query is None:
+            return None
+        row, similarity = self._nearest(query)
+        hit = row >= 0 and similarity >= self.threshold
+        counter = self.hits if hit else self.misses
+        counter[query.method] = counter.get(query.method, 0) + 1
+        if not hit:
+            return None
+        self.similarity_total += similarity
+        return CachedAnswer(self._scopes[query.scope].answers[row])
+
+    def add(self, query: Optional[SemanticQuery], answer: str) -> None:
+        if query is None or not answer:
+            return
+        if any(term in answer.casefold() for term in query.personal):
+            self.not_shared += 1  # addressed to the asker, e.g. by name
+            return
+        row, similarity = self._nearest(query)
+        if row >= 0 and similarity >= self.threshold:
+            self._scopes[query.scope].put(row, query.vector, answer)  # same question again: refresh it
+            return
+        if self._entries >= self.max_entries:
+            self._drop_oldest()
+        self._scopes.setdefault(query.scope, ScopeIndex()).put(-1, query.vector, answer)
+        self._entries += 1
+
+    def _drop_oldest(self) -> None:
+        scope, index = min(((scope, index) for scope, index in self._scopes.items() if len(index)),
+                           key=lambda item: item[1].created[:len(item[1])].min())
+        index.remove(int(np.argmin(index.created[:len(index)])))
+        if not len(index):
+            del self._scopes[scope]
+        self._entries -= 1
+
+    def clear(self) -> None:
+        self._scopes = {}
+        self._entries = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per method, for monitoring."""
+        methods = sorted(set(self.hits) | set(self.misses))
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        return {
+            "enabled": self.enabled,
+            "methods": sorted(self.methods),
+            "threshold": self.threshold,
+            "entries": len(self),
+            "scopes": len(self._scopes),
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+            "avg_hit_similarity": round(self.similarity_total / hits, 4) if hits else None,
+            "not_shared": self.not_shared,
+            "by_method": {
+                method: {"hits": self.hits.get(method, 0), "misses": self.misses.get(method, 0)} for method in methods
+            },
+        }
+
+semantic_cache = SemanticAnswerCache(
+    settings.semantic_cache_max_entries,
+    settings.semantic_cache_ttl_seconds,
+    settings.semantic_cache_threshold,
+    methods=settings.semantic_cache_methods,
+    enabled=settings.semantic_cache_enabled,
+)
@@ -0,0 +1,55 @@
+"""
+Serialization
+orjson encoding for responses and JSON columns, and batch validation of ORM rows
+into response schemas.
+"""
+
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, List, Sequence, Type, TypeVar
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+def _default(value: Any) -> Any:
+    """Types orjson does not encode natively."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def json_dumps(value: Any) -> str:
+    """JSON column serializer: datetimes become ISO-8601 strings instead of raising."""
+    return orjson.dumps(value, default=_default, option=ORJSON_OPTIONS).decode()
+
+def json_loads(value: Any) -> Any:
+    return orjson.loads(value)
+
+class ORJSONResponse(JSONResponse):
+    """Default response class for routes without a typed response model.
+
+    Routes with one are encoded by Pydantic's core serializer directly, which
+    FastAPI only does while the response class is left as a default.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+def validate_rows(schema: Type[SchemaT], rows: Sequence[Any]) -> List[SchemaT]:
+    """Validate a page of ORM objects into ``schema`` instances in one call.
+
+    Embedded objects shared between rows (see schemas.reuse_embedded) are
+    validated once per page.
+    """
+    return _list_adapter(schema).validate_python(rows, from_attributes=True, context={"embedded": {}})
@@ -0,0 +1,229 @@
+"""
+Conversation memory service
+Loads a worker's conversation context for the chat assistant and, after each exchange,
+folds the messages that left the latest turns into the stored summary in the background.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+from sqlalchemy import and_, or_, select, true
+from sqlalchemy.exc import IntegrityError
+from app.config import settings
+from app.conversation import (
+    AI_SENDER, ConversationContext, build_context, estimate_tokens, extractive_summary, speaker, truncate_tokens
+)
+from app.database import AsyncSessionLocal
+from app.models import ChatContext, ChatMessage
+from app.services.gemini_service import gemini_service
+
+# Most messages folded into a summary at once; a longer history from before the
+# memory existed is summarized from its latest messages only, a backlog after the
+# summary in batches from its oldest
+MAX_FOLD_MESSAGES = 40
+
+class ConversationService:
+    """Keeps each conversation's prompt context within a fixed token budget.
+
+    A conversation is a worker's chat with the assistant about one contract (or
+    outside any contract). Its stored summary covers every message up to a cursor;
+    the prompt quotes the messages after it, which the update after each exchange
+    keeps to the latest ``recent_turns`` exchanges. Updates run as background tasks,
+    one at a time per conversation; an exchange made during one triggers another.
+    """
+
+    def __init__(self, recent_turns: int, token_budget: int, summary_tokens: int, message_tokens: int,
+                 enabled: bool = True):
+        self.recent_turns = recent_turns
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.message_tokens = message_tokens
+        self.enabled = enabled
+        self._tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._pending: Set[Tuple[str, str]] = set()
+        self.contexts = 0
+        self.context_tokens = 0
+        self.max_context_tokens = 0
+        self.updates = 0
+        self.messages_summarized = 0
+        self.model_summaries = 0
+        self.fallback_summaries = 0
+        self.failures = 0
+
+    @property
+    def window(self) -> int:
+        """Messages quoted after the summary."""
+        return 2 * self.recent_turns
+
+    def _conversation(self, user_id: str, contract_key: str):
+        """The worker's messages to the assistant and its replies, in one contract's chat."""
+        return and_(
+            or_(
+                and_(ChatMessage.sender_id == user_id,
+                     or_(ChatMessage.receiver_id.is_(None), ChatMessage.receiver_id == AI_SENDER)),
+                and_(ChatMessage.sender_id == AI_SENDER, ChatMessage.receiver_id == user_id),
+            ),
+            ChatMessage.contract_id == contract_key if contract_key else ChatMessage.contract_id.is_(None),
+        )
+
+    def _after(self, stored: Optional[ChatContext]):
+        if stored is None or stored.summarized_until is None:
+            return true()
+        return or_(
+            ChatMessage.timestamp > stored.summarized_until,
+            and_(ChatMessage.timestamp == stored.summarized_until, ChatMessage.id > stored.summarized_message_id),
+        )
+
+    async def _stored(self, db, user_id: str, contract_key: str) -> Optional[ChatContext]:
+        return await db.scalar(select(ChatContext).where(ChatContext.user_id == user_id,
+                                                         ChatContext.contract_key == contract_key))
+
+    async def context(self, db, user_id: str, contract_id: Optional[str],
+                      exclude_id: Optional[str] = None) -> Optional[ConversationContext]:
+        """The summary and latest messages of a conversation, within the token budget;
+        ``exclude_id`` leaves out the message being answered. None when disabled or empty."""
+        if not self.enabled:
+            return None
+        contract_key = contract_id or ""
+        stored = await self._stored(db, user_id, contract_key)
+        rows = (await db.execute(
+            select(ChatMessage.sender_id, ChatMessage.message)
+            .where(self._conversation(user_id, contract_key), self._after(stored),
+                   ChatMessage.id != (exclude_id or ""))
+            .order_by(ChatMessage.timestamp.desc(), ChatMessage.id.desc())
+            .limit(self.window)
+        )).all()
+        context = build_context(stored.summary if stored else "",
+                                [(speaker(row.sender_id), row.message) for row in reversed(rows)],
+                                self.token_budget, self.summary_tokens, self.message_tokens)
+        if not context:
+            return None
+        tokens = context.tokens
+        self.contexts += 1
+        self.context_tokens += tokens
+        self.max_context_tokens = max(self.max_context_tokens, tokens)
+        return context
+
+    def remember(self, user_id: str, contract_id: Optional[str]) -> None:
+        """Update the conversation's summary in the background after an exchange."""
+        if not self.enabled:
+            return
+        key = (user_id, contract_id or "")
+        task = self._tasks.get(key)
+        if task is not None and not task.done():
+            self._pending.add(key)  # picked up when the running update finishes
+            return
+        self._tasks[key] = asyncio.get_running_loop().create_task(self._run(key))
+
+    async def _run(self, key: Tuple[str, str]) -> None:
+        try:
+            while True:
+                self._pending.discard(key)
+                try:
+                    if await self.update(*key) == MAX_FOLD_MESSAGES:
+                        self._pending.add(key)  # there may be more waiting to be folded
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.failures += 1
+                    print(f"⚠️  Conversation summary update failed: {e}")
+                if key not in self._pending:
+                    return
+        finally:
+            if self._tasks.get(key) is asyncio.current_task():
+                del self._tasks[key]
+
+    async def _summarize(self, summary: str, messages: List[Tuple[str, str]]) -> str:
+        transcript = "\n".join(f"{who}: {' '.join(text.split())}" for who, text in messages)
+        try:
+            updated = await gemini_service.summarize_conversation(summary, transcript, self.summary_tokens * 2 // 3)
+            if updated:
+                self.model_summaries += 1
+                return truncate_tokens(updated, self.summary_tokens)
+        except Exception as e:
+            print(f"⚠️  Conversation summary falls back to extracts: {e}")
+        self.fallback_summaries += 1
+        return extractive_summary(summary, messages, self.summary_tokens)
+
+    async def update(self, user_id: str, contract_key: str = "") -> int:
+        """Fold the messages before the latest turns into the stored summary; returns how many."""
+        async with AsyncSessionLocal() as db:
+            stored = await self._stored(db, user_id, contract_key)
+            unfolded = (
+                select(ChatMessage.id, ChatMessage.sender_id, ChatMessage.message, ChatMessage.timestamp)
+                .where(self._conversation(user_id, contract_key), self._after(stored))
+            )
+            rows = (await db.execute(
+                unfolded.order_by(ChatMessage.timestamp.desc(), ChatMessage.id.desc())
+                .limit(self.window + MAX_FOLD_MESSAGES)
+            )).all()
+            fold = rows[self.window:][::-1]
+            if stored is not None and len(rows) == self.window + MAX_FOLD_MESSAGES:
+                # More came in while the last update ran than one fold takes; fold the oldest
+                # first so none is skipped, and leave the rest to the next round
+                fold = (await db.execute(
+                    unfolded.order_by(ChatMessage.timestamp, ChatMessage.id).limit(MAX_FOLD_MESSAGES)
+                )).all()
+        if not fold:
+            return 0
+        seen = stored.summarized_message_id if stored else None
+        summary = await self._summarize(stored.summary if stored else "",
+                                        [(speaker(row.sender_id), row.message) for row in fold])
+
+        async with AsyncSessionLocal() as db:
+            stored = await self._stored(db, user_id, contract_key)
+            if stored is None:
+                stored = ChatContext(user_id=user_id, contract_key=contract_key, messages_summarized=0)
+                db.add(stored)
+            elif stored.summarized_message_id != seen:
+                return 0  # another process folded these messages meanwhile
+            stored.summary = summary
+            stored.summary_tokens = estimate_tokens(summary)
+            stored.summarized_until = fold[-1].timestamp
+            stored.summarized_message_id = fold[-1].id
+            stored.messages_summarized = (stored.messages_summarized or 0) + len(fold)
+            stored.updated_at = datetime.utcnow()
+            try:
+                await db.commit()
+            except IntegrityError:
+                return 0  # created by another process meanwhile; the next exchange folds again
+        self.updates += 1
+        self.messages_summarized += len(fold)
+        return len(fold)
+
+    async def drain(self) -> None:
+        """Wait for the scheduled summary updates."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks.values()), return_exceptions=True)
+
+    async def stop(self) -> None:
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*list(self._tasks.values()), return_exceptions=True)
+        self._tasks.clear()
+        self._pending.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "recent_turns": self.recent_turns,
+            "token_budget": self.token_budget,
+            "contexts": self.contexts,
+            "avg_context_tokens": round(self.context_tokens / self.contexts, 1) if self.contexts else 0.0,
+            "max_context_tokens": self.max_context_tokens,
+            "updates_in_flight": len(self._tasks),
+            "updates": self.updates,
+            "messages_summarized": self.messages_summarized,
+            "model_summaries": self.model_summaries,
+            "fallback_summaries": self.fallback_summaries,
+            "failures": self.failures,
+        }
+
+# Global conversation memory instance
+conversation_service = ConversationService(
+    settings.conversation_recent_turns,
+    settings.conversation_token_budget,
+    settings.conversation_summary_tokens,
+    settings.conversation_message_tokens,
+    enabled=settings.conversation_memory_enabled,
+)
@@ -1,17 +1,143 @@
 import google.generativeai as genai
 from app.config import settings
-from typing import Dict, Any, List
+from app.conversation import ConversationContext, is_follow_up
+from app.job_metrics import analyze_job, format_metrics
+from app.llm_cache import CachedAnswer, llm_cache, normalize_message
+from app.semantic_cache import SemanticQuery, semantic_cache
+from typing import Dict, Any, Iterable, List, Optional, AsyncIterator
+from contextlib import aclosing, nullcontext
+from fastapi import Request
+import asyncio
 import json
+import time
 
 # Configure Gemini AI
 if settings.gemini_api_key:
     genai.configure(api_key=settings.gemini_api_key)
 
+class ClientDisconnected(Exception):
+    """The client went away before the answer was ready; the Gemini call was cancelled."""
+
+class GeminiLimiter:
+    """Caps Gemini calls in flight, globally and per user, and bounds each call by a deadline.
+
+    Waiting for a slot counts against the deadline, so a burst queues for at most
+    ``timeout_seconds`` before the caller gets its fallback answer.
+    """
+    
+    def __init__(self, max_concurrency: int, per_user: int, timeout_seconds: float):
+        self.max_concurrency = max_concurrency
+        self.per_user = per_user
+        self.timeout_seconds = timeout_seconds
+        self._loop = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._users: Dict[str, List] = {}  # user id -> [semaphore, callers holding or waiting]
+        self.in_flight = 0
+        self.waiting = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.cancelled = 0
+        self.busy_seconds = 0.0
+    
+    def _check_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._slots, self._users = loop, asyncio.Semaphore(self.max_concurrency), {}
+    
+    def _user_slots(self, user_id: Optional[str]):
+        if user_id is None:
+            return nullcontext()
+        entry = self._users.setdefault(user_id, [asyncio.Semaphore(self.per_user), 0])
+        entry[1] += 1
+        return entry[0]
+    
+    def _release_user(self, user_id: Optional[str]) -> None:
+        entry = self._users.get(user_id)
+        if entry is not None:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._users[user_id]
+    
+    async def _call(self, user_id: Optional[str], func, *args) -> Any:
+        started = time.monotonic()
+        self.waiting += 1
+        waiting = True
+        try:
+            async with self._user_slots(user_id):
+                async with self._slots:
+                    self.waiting -= 1
+                    waiting = False
+                    self.in_flight += 1
+                    self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                    try:
+                        remaining = max(0.1, self.timeout_seconds - (time.monotonic() - started))
+                        return await func(*args, remaining)
+                    finally:
+                        self.in_flight -= 1
+                        self.busy_seconds += time.monotonic() - started
+        finally:
+            if waiting:
+                self.waiting -= 1
+            self._release_user(user_id)
+    
+    async def run(self, user_id: Optional[str], func, *args) -> Any:
+        """``await func(*args, remaining_seconds)`` within the caps and the deadline."""
+        self._check_loop()
+        try:
+            result = await asyncio.wait_for(self._call(user_id, func, *args), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        self.completed += 1
+        return result
+    
+    def stats(self) -> Dict[str, Any]:
+        """Concurrency and outcome counters, for monitoring."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "per_user": self.per_user,
+            "timeout_seconds": self.timeout_seconds,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "peak_in_flight": self.peak_in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "cancelled": self.cancelled,
+            "avg_ms": round(self.busy_seconds / self.completed * 1000, 1) if self.completed else None,
+        }
+
+async def unless_disconnected(request: Request, awaitable, poll_seconds: float = 0.5) -> Any:
+    """Await ``awaitable``, cancelling it (and freeing its Gemini slot) if the client
+    disconnects first; raises ClientDisconnected then."""
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_seconds)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                raise ClientDisconnected()
+    finally:
+        if not task.done():
+            task.cancel()
+
 class GeminiAIService:
     """Service for Gemini AI integration for worker assistance."""
     
     def __init__(self):
         self.model = genai.GenerativeModel('gemini-1.5-flash')
+        self.limiter = GeminiLimiter(
+            settings.gemini_max_concurrency, settings.gemini_per_user_concurrency, settings.gemini_timeout_seconds
+        )
         
         # System prompts for different types of assistance
         self.job_recommendation_prompt = """
@@ -62,248 +188,398 @@ class GeminiAIService:
         """
         
         self.job_analysis_prompt = """
-        You are an AI assistant specialized in personalized job analysis for contract and informal workers in India.
-        Provide CONCISE, focused analysis with key metrics and actionable insights.
+        You are an AI assistant helping a contract or informal worker in India decide on a job.
+        The metrics below are already calculated and shown to the worker; do not recalculate or restate them.
         
-        Format your response as follows (keep each section brief):
+        Reply with only these sections:
         
         **🎯 Recommendation:** [Highly Recommended/Recommended/Not Recommended] - [one line reason]
         
-        **🔧 Skills Match:** [X]% ([X/Y] skills match)
-        • ✅ Matching: [list 2-3 key skills]
-        • ❌ Missing: [list main gaps]
-        
-        **💰 Wage Analysis:** ₹[amount]/[period] 
-        • [X]% of your minimum (₹[your_min])
-        • Fairness: [score]/10 - [Fair/Good/Excellent]
-        
-        **📍 Location:** [distance] from your location
-        • Commute: [Local/Moderate/Long distance]
-        • Cost impact: [Low/Medium/High]
-        
         **⚠️ Key Concerns:**
-        • [List 2-3 main issues if any]
+        • [2-3 main issues, if any]
         
         **✅ Next Steps:**
         • [2-3 specific actionable recommendations]
         
-        Keep total response under 200 words. Focus on metrics, numbers, and clear recommendations.
-        Use markdown formatting with **bold** for emphasis.
+        Keep it under 120 words. Answer the worker's question if they asked one. Use markdown with **bold** for emphasis.
         """
     
-    async def get_job_recommendations(self, user_data: Dict[str, Any], chat_message: str) -> str:
+    async def _call(self, prompt: str, timeout: float) -> str:
+        # Async client: the event loop keeps serving other requests during the call
+        response = await self.model.generate_content_async(prompt, request_options={"timeout": timeout})
+        return response.text
+    
+    async def _cached(self, cache_key: Optional[str], similar: Optional[SemanticQuery]) -> Optional[CachedAnswer]:
+        """The exact-match answer, else the answer to a near-duplicate question."""
+        cached = await llm_cache.get(cache_key)
+        if cached is None:
+            cached = semantic_cache.get(similar)
+            if cached is not None:
+                await llm_cache.set(cache_key, str(cached))
+        return cached
+    
+    async def _remember(self, cache_key: Optional[str], similar: Optional[SemanticQuery], answer: str) -> None:
+        await llm_cache.set(cache_key, answer)
+        semantic_cache.add(similar, answer)
+    
+    async def _generate(self, prompt: str, user_id: Optional[str], cache_key: Optional[str] = None,
+                        similar: Optional[SemanticQuery] = None, remember: bool = True) -> str:
+        """Generate text within the global and per-user caps and the call deadline, or
+        serve it from the answer caches (as a CachedAnswer). ``remember=False`` looks the
+        keys up but keeps a generated answer out of the caches."""
+        cached = await self._cached(cache_key, similar)
+        if cached is not None:
+            return cached
+        answer = await self.limiter.run(user_id, self._call, prompt)
+        if remember:
+            await self._remember(cache_key, similar, answer)
+        return answer
+    
+    async def _stream_into(self, prompt: str, chunks: asyncio.Queue, timeout: float) -> str:
+        response = await self.model.generate_content_async(prompt, stream=True, request_options={"timeout": timeout})
+        parts = []
+        async for chunk in response:
+            parts.append(chunk.text)
+            chunks.put_nowait(chunk.text)
+        return "".join(parts)
+    
+    async def stream(self, prompt: str, user_id: Optional[str], cache_key: Optional[str] = None,
+                     similar: Optional[SemanticQuery] = None, remember: bool = True) -> AsyncIterator[str]:
+        """Yield text as Gemini generates it, under the same caps and deadline as ``_generate``.
+        
+        The call runs as its own task feeding a queue, so the deadline covers the whole
+        answer; closing the iterator (client gone) cancels it. A cached answer comes as
+        a single CachedAnswer chunk.
+        """
+        cached = await self._cached(cache_key, similar)
+        if cached is not None:
+            yield cached
+            return
+        chunks: asyncio.Queue = asyncio.Queue()
+        call = asyncio.ensure_future(self.limiter.run(user_id, self._stream_into, prompt, chunks))
+        try:
+            while True:
+                next_chunk = asyncio.ensure_future(chunks.get())
+                await asyncio.wait({next_chunk, call}, return_when=asyncio.FIRST_COMPLETED)
+                if next_chunk.done():
+                    yield next_chunk.result()
+                    continue
+                next_chunk.cancel()
+                while not chunks.empty():
+                    yield chunks.get_nowait()
+                answer = call.result()  # raises if the call failed or ran out of time
+                if remember:
+                    await self._remember(cache_key, similar, answer)
+                return
+        finally:
+            if not call.done():
+                call.cancel()
+    
+    def stream_general_assistance(self, user_data: Dict[str, Any], chat_message: str, user_id: Optional[str] = None,
+                                  conversation: Optional[ConversationContext] = None) -> AsyncIterator[str]:
+        """``general_assistance``, streamed."""
+        return self.stream(*self._general_assistance_call(user_data, chat_message, conversation, user_id))
+    
+    def stream_job_recommendations(self, user_data: Dict[str, Any], chat_message: str,
+                                   user_id: Optional[str] = None) -> AsyncIterator[str]:
+        """``get_job_recommendations``, streamed."""
+        return self.stream(*self._job_recommendations_call(user_data, chat_message, user_id))
+    
+    def stream_rights_assistance(self, user_data: Dict[str, Any], chat_message: str,
+                                 user_id: Optional[str] = None) -> AsyncIterator[str]:
+        """``get_rights_assistance``, streamed."""
+        return self.stream(*self._rights_assistance_call(user_data, chat_message, user_id))
+    
+    def stream_contract_terms(self, contract_data: Dict[str, Any], user_data: Dict[str, Any],
+                              user_id: Optional[str] = None) -> AsyncIterator[str]:
+        """``analyze_contract_terms``, streamed."""
+        full_prompt = self._contract_terms_prompt(contract_data, user_data)
+        return self.stream(full_prompt, user_id, llm_cache.key("analyze_contract_terms", full_prompt))
+    
+    async def stream_job_analysis(self, job_data: Dict[str, Any], user_data: Dict[str, Any], user_question: str = "",
+                                  user_id: Optional[str] = None,
+                                  metrics: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """``analyze_job_opportunity``, streamed: the metrics come at once, then the narrative."""
+        metrics = metrics or analyze_job(job_data, user_data)
+        yield f"{format_metrics(metrics)}\n\n"
+        narrative = self.stream(self._job_analysis_prompt(job_data, user_data, user_question, metrics), user_id,
+                                self._job_analysis_key(job_data, user_data, user_question, metrics))
+        async with aclosing(narrative):
+            async for chunk in narrative:
+                yield chunk
+    
+    def _similar_question(self, method: str, user_data: Dict[str, Any], chat_message: str,
+                          profile: Iterable[Optional[str]] = ()) -> Optional[SemanticQuery]:
+        # Shared across workers of one state with the same ``profile``; answers that name the worker are kept to them
+        return semantic_cache.query(method, (user_data.get('location') or {}).get('state'), chat_message,
+                                    personal=[user_data.get('name')], profile=profile)
+    
+    def _job_recommendations_prompt(self, user_data: Dict[str, Any], chat_message: str) -> str:
+        """Prompt for job recommendations from the worker's profile and message."""
+        
+        # Create context from user data
+        user_context = f"""
+        Worker Profile:
+        - Name: {user_data.get('name', 'Worker')}
+        - Skills: {', '.join(user_data.get('area_of_expertise', []))}
+        - Experience: {user_data.get('experience', {}).get('years_of_experience', 0)} years
+        - Location: {user_data.get('location', {}).get('city', '')}, {user_data.get('location', {}).get('state', '')}
+        - Minimum wage preference: ₹{user_data.get('preferences', {}).get('minimum_wage', 0)}/day
+        - Max travel distance: {user_data.get('preferences', {}).get('max_travel_distance', 0)} km
+        - Previous jobs: {', '.join(user_data.get('experience', {}).get('previous_jobs', []))}
+        - Additional skills: {', '.join(user_data.get('experience', {}).get('skills', []))}
+        """
+        
+        full_prompt = f"""
+        {self.job_recommendation_prompt}
+        
+        {user_context}
+        
+        Worker's message: {chat_message}
+        
+        Please provide helpful job recommendations and guidance based on their profile and message.
+        """
+        return full_prompt
+    
+    def _job_recommendations_call(self, user_data: Dict[str, Any], chat_message: str, user_id: Optional[str]) -> tuple:
+        """Arguments of ``_generate``/``stream`` for job recommendations."""
+        cache_key = llm_cache.key("get_job_recommendations",
+                                  self._job_recommendations_prompt(user_data, normalize_message(chat_message)))
+        return self._job_recommendations_prompt(user_data, chat_message), user_id, cache_key
+    
+    async def get_job_recommendations(self, user_data: Dict[str, Any], chat_message: str,
+                                      user_id: Optional[str] = None) -> str:
         """Get job recommendations based on user profile and chat message."""
         
         try:
-            # Create context from user data
-            user_context = f"""
-            Worker Profile:
-            - Name: {user_data.get('name', 'Worker')}
-            - Skills: {', '.join(user_data.get('area_of_expertise', []))}
-            - Experience: {user_data.get('experience', {}).get('years_of_experience', 0)} years
-            - Location: {user_data.get('location', {}).get('city', '')}, {user_data.get('location', {}).get('state', '')}
-            - Minimum wage preference: ₹{user_data.get('preferences', {}).get('minimum_wage', 0)}/day
-            - Max travel distance: {user_data.get('preferences', {}).get('max_travel_distance', 0)} km
-            - Previous jobs: {', '.join(user_data.get('experience', {}).get('previous_jobs', []))}
-            - Additional skills: {', '.join(user_data.get('experience', {}).get('skills', []))}
-            """
-            
-            full_prompt = f"""
-            {self.job_recommendation_prompt}
-            
-            {user_context}
-            
-            Worker's message: {chat_message}
-            
-            Please provide helpful job recommendations and guidance based on their profile and message.
-            """
-            
-            response = self.model.generate_content(full_prompt)
-            return response.text
+            return await self._generate(*self._job_recommendations_call(user_data, chat_message, user_id))
             
         except Exception as e:
             return f"I apologize, but I'm having trouble connecting to the job recommendation service right now. Please try again later. Error: {str(e)}"
     
-    async def get_rights_assistance(self, user_data: Dict[str, Any], chat_message: str) -> str:
+    def _rights_assistance_prompt(self, user_data: Dict[str, Any], chat_message: str) -> str:
+        """Prompt for worker rights and legal questions."""
+        
+        # Create context from user data
+        user_context = f"""
+        Worker Profile:
+        - Location: {user_data.get('location', {}).get('city', '')}, {user_data.get('location', {}).get('state', '')}
+        - Work area: {', '.join(user_data.get('area_of_expertise', []))}
+        - Experience: {user_data.get('experience', {}).get('years_of_experience', 0)} years
+        - Current minimum wage: ₹{user_data.get('preferences', {}).get('minimum_wage', 0)}/day
+        """
+        
+        full_prompt = f"""
+        {self.rights_assistance_prompt}
+        
+        {user_context}
+        
+        Worker's question: {chat_message}
+        
+        Please provide helpful information about worker rights, laws, and government schemes 
+        relevant to their situation and location in India.
+        """
+        return full_prompt
+    
+    def _rights_assistance_call(self, user_data: Dict[str, Any], chat_message: str, user_id: Optional[str]) -> tuple:
+        """Arguments of ``_generate``/``stream`` for a rights question."""
+        cache_key = llm_cache.key("get_rights_assistance",
+                                  self._rights_assistance_prompt(user_data, normalize_message(chat_message)))
+        similar = self._similar_question("get_rights_assistance", user_data, chat_message)
+        return self._rights_assistance_prompt(user_data, chat_message), user_id, cache_key, similar
+    
+    async def get_rights_assistance(self, user_data: Dict[str, Any], chat_message: str,
+                                    user_id: Optional[str] = None) -> str:
         """Get worker rights and legal assistance based on user profile and query."""
         
         try:
-            # Create context from user data
-            user_context = f"""
-            Worker Profile:
-            - Location: {user_data.get('location', {}).get('city', '')}, {user_data.get('location', {}).get('state', '')}
-            - Work area: {', '.join(user_data.get('area_of_expertise', []))}
-            - Experience: {user_data.get('experience', {}).get('years_of_experience', 0)} years
-            - Current minimum wage: ₹{user_data.get('preferences', {}).get('minimum_wage', 0)}/day
-            """
-            
-            full_prompt = f"""
-            {self.rights_assistance_prompt}
-            
-            {user_context}
-            
-            Worker's question: {chat_message}
-            
-            Please provide helpful information about worker rights, laws, and government schemes 
-            relevant to their situation and location in India.
-            """
-            
-            response = self.model.generate_content(full_prompt)
-            return response.text
+            return await self._generate(*self._rights_assistance_call(user_data, chat_message, user_id))
             
         except Exception as e:
             return f"I apologize, but I'm having trouble accessing the legal information service right now. Please try again later. Error: {str(e)}"
     
-    async def general_assistance(self, user_data: Dict[str, Any], chat_message: str) -> str:
-        """General assistance for work-related queries."""
+    def _general_assistance_prompt(self, user_data: Dict[str, Any], chat_message: str, conversation: str = "") -> str:
+        """Prompt for general work-related assistance, with the conversation so far if any."""
+        
+        user_context = f"""
+        Worker Profile:
+        - Name: {user_data.get('name', 'Worker')}
+        - Skills: {', '.join(user_data.get('area_of_expertise', []))}
+        - Location: {user_data.get('location', {}).get('city', '')}, {user_data.get('location', {}).get('state', '')}
+        """
+        # Empty without a conversation, so those prompts (and their cache keys) stay as they were
+        conversation_block = f"{conversation}\n\n        " if conversation else ""
+        
+        full_prompt = f"""
+        You are an AI assistant for AI FairWork, helping contract and informal workers in India.
+        
+        Provide CONCISE, helpful responses (under 150 words) using markdown formatting.
+        Use **bold** for important points, bullet points for lists.
+        
+        You help with:
+        1. Finding jobs and work opportunities
+        2. Understanding worker rights and labor laws
+        3. Information about government welfare schemes
+        4. Work logging and payment tracking guidance
+        5. General career advice for contract workers
+        
+        {user_context}
+        
+        {conversation_block}Worker's message: {chat_message}
+        
+        Provide helpful, encouraging, and practical advice. Keep responses concise and friendly.
+        Use markdown formatting like **bold text** and bullet points.
+        """
+        return full_prompt
+    
+    def _general_assistance_key(self, user_data: Dict[str, Any], chat_message: str) -> Optional[str]:
+        return llm_cache.key("general_assistance", self._general_assistance_prompt(user_data, normalize_message(chat_message)))
+    
+    def _general_assistance_call(self, user_data: Dict[str, Any], chat_message: str,
+                                 conversation: Optional[ConversationContext], user_id: Optional[str]) -> tuple:
+        """Arguments of ``_generate``/``stream`` for a message within a conversation.
+        
+        The cached answers were written without any conversation, so a follow-up
+        ("is that legal?") never takes one, and an answer written with the conversation
+        in the prompt is not cached for anyone else.
+        """
+        context = conversation.prompt() if conversation else ""
+        if context and is_follow_up(chat_message):
+            cache_key, similar = None, None
+        else:
+            cache_key = self._general_assistance_key(user_data, chat_message)
+            # The answer is written for the worker's skills and city, so only workers with the same ones share it
+            similar = self._similar_question("general_assistance", user_data, chat_message, profile=[
+                (user_data.get('location') or {}).get('city'), *sorted(user_data.get('area_of_expertise') or [])
+            ])
+        return (self._general_assistance_prompt(user_data, chat_message, context), user_id, cache_key, similar,
+                not context)
+    
+    async def general_assistance(self, user_data: Dict[str, Any], chat_message: str, user_id: Optional[str] = None,
+                                 conversation: Optional[ConversationContext] = None) -> str:
+        """General assistance for work-related queries, remembering the conversation
+        (see app/conversation.py) when one is given."""
         
         try:
-            user_context = f"""
-            Worker Profile:
-            - Name: {user_data.get('name', 'Worker')}
-            - Skills: {', '.join(user_data.get('area_of_expertise', []))}
-            - Location: {user_data.get('location', {}).get('city', '')}, {user_data.get('location', {}).get('state', '')}
-            """
-            
-            full_prompt = f"""
-            You are an AI assistant for AI FairWork, helping contract and informal workers in India.
-            
-            Provide CONCISE, helpful responses (under 150 words) using markdown formatting.
-            Use **bold** for important points, bullet points for lists.
-            
-            You help with:
-            1. Finding jobs and work opportunities
-            2. Understanding worker rights and labor laws
-            3. Information about government welfare schemes
-            4. Work logging and payment tracking guidance
-            5. General career advice for contract workers
-            
-            {user_context}
-            
-            Worker's message: {chat_message}
-            
-            Provide helpful, encouraging, and practical advice. Keep responses concise and friendly.
-            Use markdown formatting like **bold text** and bullet points.
-            """
-            
-            response = self.model.generate_content(full_prompt)
-            return response.text
+            return await self._generate(*self._general_assistance_call(user_data, chat_message, conversation, user_id))
             
         except Exception as e:
             print(f"Gemini Error Details: {e}")
             raise e
     
-    async def analyze_contract_terms(self, contract_data: Dict[str, Any], user_data: Dict[str, Any]) -> str:
+    def _conversation_summary_prompt(self, summary: str, transcript: str, words: int) -> str:
+        """Prompt folding older chat messages into the running summary of a conversation."""
+        return f"""
+        You keep the running summary of a conversation between a worker and the AI FairWork assistant,
+        so the assistant can follow the conversation later without its full history.
+        
+        Current summary:
+        {summary or "(none yet)"}
+        
+        Messages to add, oldest first:
+        {transcript}
+        
+        Write the updated summary in under {words} words, as short plain-text bullet points.
+        Keep what the worker said about themselves and their situation (work, place, pay, employer,
+        problems), what they asked and the key advice given. Drop greetings and repetition.
+        Reply with the summary only.
+        """
+    
+    async def summarize_conversation(self, summary: str, transcript: str, words: int) -> str:
+        """Running summary with the transcript folded in. Runs in the background, so it
+        takes a global slot but not the worker's; never cached. Raises on failure."""
+        return (await self._generate(self._conversation_summary_prompt(summary, transcript, words), None)).strip()
+    
+    def _contract_terms_prompt(self, contract_data: Dict[str, Any], user_data: Dict[str, Any]) -> str:
+        """Prompt explaining a contract's terms to the worker."""
+        
+        user_location = user_data.get('location', {})
+        state = user_location.get('state', '')
+        
+        full_prompt = f"""
+        You are an AI assistant helping a contract worker understand their job contract terms.
+        
+        Contract Details:
+        - Job Title: {contract_data.get('title', '')}
+        - Description: {contract_data.get('description', '')}
+        - Payment: ₹{contract_data.get('payment', {}).get('rate', 0)} per {contract_data.get('payment', {}).get('rate_type', 'day')}
+        - Duration: {contract_data.get('work_details', {}).get('duration', '')}
+        - Working Hours: {contract_data.get('work_details', {}).get('working_hours', '')}
+        - Location: {contract_data.get('work_details', {}).get('location', {}).get('address', '')}
+        
+        Worker's State: {state}
+        
+        Please analyze this contract and provide:
+        1. A simple explanation of the terms
+        2. Whether the wage meets minimum wage requirements for {state}
+        3. Any potential concerns or red flags
+        4. Worker's rights and protections
+        5. Advice on whether this is a fair contract
+        
+        Be honest and protective of the worker's interests.
+        """
+        return full_prompt
+    
+    async def analyze_contract_terms(self, contract_data: Dict[str, Any], user_data: Dict[str, Any],
+                                     user_id: Optional[str] = None) -> str:
         """Analyze contract terms and provide worker-friendly explanation."""
         
         try:
-            user_location = user_data.get('location', {})
-            state = user_location.get('state', '')
-            
-            full_prompt = f"""
-            You are an AI assistant helping a contract worker understand their job contract terms.
-            
-            Contract Details:
-            - Job Title: {contract_data.get('title', '')}
-            - Description: {contract_data.get('description', '')}
-            - Payment: ₹{contract_data.get('payment', {}).get('rate', 0)} per {contract_data.get('payment', {}).get('rate_type', 'day')}
-            - Duration: {contract_data.get('work_details', {}).get('duration', '')}
-            - Working Hours: {contract_data.get('work_details', {}).get('working_hours', '')}
-            - Location: {contract_data.get('work_details', {}).get('location', {}).get('address', '')}
-            
-            Worker's State: {state}
-            
-            Please analyze this contract and provide:
-            1. A simple explanation of the terms
-            2. Whether the wage meets minimum wage requirements for {state}
-            3. Any potential concerns or red flags
-            4. Worker's rights and protections
-            5. Advice on whether this is a fair contract
-            
-            Be honest and protective of the worker's interests.
-            """
-            
-            response = self.model.generate_content(full_prompt)
-            return response.text
+            full_prompt = self._contract_terms_prompt(contract_data, user_data)
+            return await self._generate(full_prompt, user_id, llm_cache.key("analyze_contract_terms", full_prompt))
             
         except Exception as e:
             return "I apologize, but I'm having trouble analyzing the contract right now. Please try again later."
     
-    async def analyze_job_opportunity(self, job_data: Dict[str, Any], user_data: Dict[str, Any], user_question: str = "") -> str:
-        """Provide comprehensive analysis of a specific job opportunity against user profile."""
+    def _job_analysis_prompt(self, job_data: Dict[str, Any], user_data: Dict[str, Any], user_question: str,
+                             metrics: Dict[str, Any]) -> str:
+        """Short prompt for the narrative of a job analysis; the numbers come from ``metrics``."""
+        
+        job_payment = job_data.get('payment', {})
+        work_details = job_data.get('workDetails') or job_data.get('work_details') or {}
+        employer_info = job_data.get('employer', {})
+        shown = {key: "unknown" if value is None else value for key, value in metrics.items()}
+        
+        analysis_prompt = f"""
+        {self.job_analysis_prompt}
+        
+        JOB: {job_data.get('title', '')}
+        - Payment terms: {job_payment.get('paymentTerms') or job_payment.get('payment_terms') or 'Not specified'}
+        - Duration: {work_details.get('duration', '')}; hours: {work_details.get('workingHours') or work_details.get('working_hours', '')}
+        - Employer rating: {employer_info.get('rating', 'unknown')}/5
+        
+        METRICS:
+        - Skills match: {shown['skills_match_percentage']}% (missing: {', '.join(metrics['skills_missing']) or 'none'})
+        - Pay: ₹{shown['daily_wage']}/day, {shown['wage_percentage_of_minimum']}% of the worker's minimum
+        - Minimum-wage compliant: {'yes' if metrics['is_minimum_wage_compliant'] else 'NO'} (state minimum ₹{metrics['minimum_wage']}/day, {metrics['skill_category']})
+        - Fairness: {metrics['fairness_score']}/10 ({metrics['fairness_label']})
+        - Commute: {metrics['commute'] or 'unknown'}{f", {metrics['distance_km']} km" if metrics['distance_km'] is not None else ''}
         
+        WORKER'S QUESTION: {user_question or "Should I take this job?"}
+        """
+        return analysis_prompt
+    
+    def _job_analysis_key(self, job_data: Dict[str, Any], user_data: Dict[str, Any], user_question: str,
+                          metrics: Dict[str, Any]) -> Optional[str]:
+        return llm_cache.key("analyze_job_opportunity",
+                             self._job_analysis_prompt(job_data, user_data, normalize_message(user_question), metrics))
+    
+    async def analyze_job_opportunity(self, job_data: Dict[str, Any], user_data: Dict[str, Any], user_question: str = "",
+                                      user_id: Optional[str] = None, metrics: Optional[Dict[str, Any]] = None) -> str:
+        """Job analysis against the user profile: locally computed metrics (see app/job_metrics.py)
+        followed by Gemini's recommendation."""
+        
+        metrics = metrics or analyze_job(job_data, user_data)
         try:
-            # Extract user profile information
-            user_skills = user_data.get('area_of_expertise', []) + user_data.get('experience', {}).get('skills', [])
-            user_location = user_data.get('location', {})
-            user_preferences = user_data.get('preferences', {})
-            user_experience = user_data.get('experience', {})
-            
-            # Extract job information
-            job_title = job_data.get('title', '')
-            job_description = job_data.get('description', '')
-            required_skills = job_data.get('requirements', {}).get('skills', [])
-            job_payment = job_data.get('payment', {})
-            job_location = job_data.get('workDetails', {}).get('location', {})
-            job_duration = job_data.get('workDetails', {}).get('duration', '')
-            job_hours = job_data.get('workDetails', {}).get('workingHours', '')
-            employer_info = job_data.get('employer', {})
-            fairness_score = job_data.get('fairnessScore', 0)
-            
-            # Calculate skills match
-            matching_skills = []
-            for req_skill in required_skills:
-                for user_skill in user_skills:
-                    if req_skill.lower() in user_skill.lower() or user_skill.lower() in req_skill.lower():
-                        matching_skills.append(req_skill)
-                        break
-            
-            skills_match_percentage = (len(matching_skills) / len(required_skills) * 100) if required_skills else 0
-            
-            analysis_prompt = f"""
-            {self.job_analysis_prompt}
-            
-            **JOB OPPORTUNITY:**
-            - Title: {job_title}
-            - Description: {job_description}
-            - Required Skills: {', '.join(required_skills)}
-            - Payment: ₹{job_payment.get('rate', 0)} per {job_payment.get('rateType', 'day')}
-            - Payment Terms: {job_payment.get('paymentTerms', 'Not specified')}
-            - Duration: {job_duration}
-            - Working Hours: {job_hours}
-            - Location: {job_location.get('address', '')}, {job_location.get('city', '')}, {job_location.get('state', '')}
-            - Employer: {employer_info.get('name', 'Not specified')} (Rating: {employer_info.get('rating', 0)}/5)
-            - Fairness Score: {fairness_score}/10
-            
-            **WORKER PROFILE:**
-            - Name: {user_data.get('name', 'Worker')}
-            - Skills & Expertise: {', '.join(user_skills)}
-            - Experience: {user_experience.get('yearsOfExperience', 0)} years
-            - Previous Jobs: {', '.join(user_experience.get('previousJobs', []))}
-            - Location: {user_location.get('city', '')}, {user_location.get('state', '')}, PIN: {user_location.get('pincode', '')}
-            - Minimum Wage Expectation: ₹{user_preferences.get('minimumWage', 0)}/day
-            - Max Travel Distance: {user_preferences.get('maxTravelDistance', 0)} km
-            - Preferred Working Hours: {', '.join(user_preferences.get('preferredWorkingHours', []))}
-            
-            **CALCULATED METRICS:**
-            - Skills Match: {len(matching_skills)}/{len(required_skills)} skills ({skills_match_percentage:.1f}%)
-            - Matching Skills: {', '.join(matching_skills)}
-            - Missing Skills: {', '.join([skill for skill in required_skills if skill not in matching_skills])}
-            
-            **USER'S SPECIFIC QUESTION:**
-            {user_question if user_question else "Provide a comprehensive analysis of this job opportunity for me."}
-            
-            Please provide a thorough, personalized analysis of this job opportunity specifically for this worker.
-            Consider their skills, location, preferences, experience, and the job requirements.
-            Be honest about both opportunities and concerns.
-            """
-            
-            response = self.model.generate_content(analysis_prompt)
-            return response.text
+            analysis_prompt = self._job_analysis_prompt(job_data, user_data, user_question, metrics)
+            narrative = await self._generate(analysis_prompt, user_id,
+                                             self._job_analysis_key(job_data, user_data, user_question, metrics))
+            answer = f"{format_metrics(metrics)}\n\n{narrative}"
+            return CachedAnswer(answer) if isinstance(narrative, CachedAnswer) else answer
             
         except Exception as e:
             print(f"Job Analysis Error: {e}")
-            return f"I apologize, but I'm having trouble analyzing this job opportunity right now. Please try again later. Error details: {str(e)}"
+            return f"{format_metrics(metrics)}\n\nI apologize, but I'm having trouble writing a recommendation for this job right now. Please try again later."
 
 # Singleton instance
 gemini_service = GeminiAIService()
\ No newline at end of file
@@ -0,0 +1,328 @@
+"""
+Job matching engine
+In-memory index of published job posts (inverted skill index plus per-job feature
+arrays) with vectorized scoring against a worker's skills, wage floor, travel
+distance and preferred working hours.
+"""
+
+import asyncio
+import time
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.geo import haversine_km, resolve_pincode
+from app.job_metrics import working_hours_mask
+from app.models import JobPost, JobPostSkill
+from app.search_fields import extract_skills, extract_working_hours, to_daily_rate
+
+# Weights of the component scores in the final 0-1 match score
+WEIGHTS = {"skill": 0.45, "wage": 0.25, "distance": 0.2, "hours": 0.1}
+NEUTRAL_SCORE = 0.5  # component score when either side is unknown
+WAGE_CEILING = 1.5  # pay at 1.5x the worker's minimum scores full marks
+
+PENDING_CHANGES_KEY = "matching_changes"
+
+def worker_skills(worker: Any) -> List[str]:
+    """Normalized skills from a worker's area of expertise and listed experience."""
+    experience = worker.experience or {}
+    return extract_skills({"skills": list(worker.area_of_expertise or []) + list(experience.get("skills") or [])})
+
+def _job_entry(job_id: str, status: Optional[str], skills: List[str], latitude: Optional[float],
+               longitude: Optional[float], rate: Optional[float], rate_type: Optional[str],
+               working_hours: Optional[str]) -> Dict[str, Any]:
+    return {
+        "id": job_id,
+        "published": status == "published",
+        "skills": tuple(skills),
+        "latitude": latitude,
+        "longitude": longitude,
+        "daily_wage": to_daily_rate(rate, rate_type),
+        "hours": working_hours_mask([working_hours]),
+    }
+
+def _entry_from_job(job: JobPost) -> Dict[str, Any]:
+    return _job_entry(
+        job.id, job.status, extract_skills(job.requirements), job.latitude, job.longitude,
+        job.pay_rate, job.pay_rate_type, extract_working_hours(job.work_details)
+    )
+
+class JobIndex:
+    """Slot-based feature arrays for published jobs plus a skill -> slots inverted index."""
+
+    def __init__(self, capacity: int = 1024):
+        self.slots: Dict[str, int] = {}
+        self.job_ids: List[Optional[str]] = []
+        self.job_skills: Dict[int, Tuple[str, ...]] = {}
+        self.postings: Dict[str, Set[int]] = {}
+        self._posting_arrays: Dict[str, np.ndarray] = {}
+        self._free: List[int] = []
+        self.active = np.zeros(capacity, dtype=bool)
+        self.latitude = np.full(capacity, np.nan)
+        self.longitude = np.full(capacity, np.nan)
+        self.daily_wage = np.full(capacity, np.nan)
+        self.skill_count = np.zeros(capacity, dtype=np.int32)
+        self.hours = np.zeros((capacity, 24), dtype=bool)
+        self.hours_known = np.zeros(capacity, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def _grow(self) -> None:
+        capacity = len(self.active) * 2
+        for name in ("active", "latitude", "longitude", "daily_wage", "skill_count", "hours", "hours_known"):
+            old = getattr(self, name)
+            fill = np.nan if old.dtype.kind == "f" else 0
+            new = np.full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _allocate(self, job_id: str) -> int:
+        if self._free:
+            slot = self._free.pop()
+            self.job_ids[slot] = job_id
+        else:
+            slot = len(self.job_ids)
+            if slot == len(self.active):
+                self._grow()
+            self.job_ids.append(job_id)
+        self.slots[job_id] = slot
+        return slot
+
+    def _set_skills(self, slot: int, skills: Tuple[str, ...]) -> None:
+        previous = self.job_skills.get(slot, ())
+        for skill in set(previous) - set(skills):
+            self.postings[skill].discard(slot)
+            if not self.postings[skill]:
+                del self.postings[skill]
+            self._posting_arrays.pop(skill, None)
+        for skill in set(skills) - set(previous):
+            self.postings.setdefault(skill, set()).add(slot)
+            self._posting_arrays.pop(skill, None)
+        if skills:
+            self.job_skills[slot] = skills
+        else:
+            self.job_skills.pop(slot, None)
+        self.skill_count[slot] = len(skills)
+
+    def upsert(self, entry: Dict[str, Any]) -> None:
+        """Index a job, or drop it when it is no longer published."""
+        if not entry["published"]:
+            self.remove(entry["id"])
+            return
+        slot = self.slots.get(entry["id"])
+        if slot is None:
+            slot = self._allocate(entry["id"])
+        self.active[slot] = True
+        self.latitude[slot] = entry["latitude"] if entry["latitude"] is not None else np.nan
+        self.longitude[slot] = entry["longitude"] if entry["longitude"] is not None else np.nan
+        self.daily_wage[slot] = entry["daily_wage"] if entry["daily_wage"] is not None else np.nan
+        self.hours_known[slot] = entry["hours"] is not None
+        self.hours[slot] = entry["hours"] if entry["hours"] is not None else False
+        self._set_skills(slot, entry["skills"])
+
+    def remove(self, job_id: str) -> None:
+        slot = self.slots.pop(job_id, None)
+        if slot is None:
+            return
+        self._set_skills(slot, ())
+        self.active[slot] = False
+        self.job_ids[slot] = None
+        self._free.append(slot)
+
+    def posting(self, skill: str) -> np.ndarray:
+        """Slots of the jobs requiring a skill, as a cached array."""
+        array = self._posting_arrays.get(skill)
+        if array is None:
+            array = np.fromiter(self.postings.get(skill, ()), dtype=np.int64)
+            self._posting_arrays[skill] = array
+        return array
+
+    def candidates(self, skills: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(slots, number of the given skills each job requires) for jobs sharing any skill."""
+        arrays = [self.posting(skill) for skill in skills if skill in self.postings]
+        if not arrays:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        slots, overlap = np.unique(np.concatenate(arrays), return_counts=True)
+        return slots, overlap
+
+class JobMatchingService:
+    """Ranks published jobs for a worker without calling out to the LLM."""
+
+    def __init__(self):
+        self.index: Optional[JobIndex] = None
+        self.built_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._replay: Optional[List[Dict[str, Dict[str, Any]]]] = None
+
+    async def ensure_index(self, db) -> JobIndex:
+        """Build the index on first use and rebuild it once it is older than the refresh interval.
+
+        The periodic rebuild picks up changes made by other processes; changes
+        committed through this process are applied as they happen.
+        """
+        if self.index is not None and time.monotonic() - self.built_at < settings.matching_index_refresh_seconds:
+            return self.index
+        async with self._lock:
+            if self.index is not None and time.monotonic() - self.built_at < settings.matching_index_refresh_seconds:
+                return self.index
+            self._replay = []
+            try:
+                index = await self._build(db)
+                # Commits that landed while the snapshot was loading
+                for changes in self._replay:
+                    self._apply(index, changes)
+            finally:
+                self._replay = None
+            self.index, self.built_at = index, time.monotonic()
+            return index
+
+    async def _build(self, db) -> JobIndex:
+        started = time.perf_counter()
+        skills: Dict[str, List[str]] = {}
+        skill_rows = await db.execute(
+            select(JobPostSkill.job_id, JobPostSkill.skill)
+            .join(JobPost, JobPost.id == JobPostSkill.job_id)
+            .where(JobPost.status == "published")
+        )
+        for job_id, skill in skill_rows:
+            skills.setdefault(job_id, []).append(skill)
+
+        jobs = await db.execute(
+            select(
+                JobPost.id, JobPost.latitude, JobPost.longitude, JobPost.pay_rate,
+                JobPost.pay_rate_type, JobPost.work_details
+            ).where(JobPost.status == "published")
+        )
+        rows = jobs.all()
+        index = JobIndex(capacity=max(1024, len(rows) * 2))
+        for job_id, latitude, longitude, rate, rate_type, work_details in rows:
+            index.upsert(_job_entry(
+                job_id, "published", skills.get(job_id, []), latitude, longitude,
+                rate, rate_type, extract_working_hours(work_details)
+            ))
+        print(f"🧭 Job matching index built: {len(index):,} jobs, {len(index.postings):,} skills "
+              f"in {(time.perf_counter() - started) * 1000:.0f}ms")
+        return index
+
+    @staticmethod
+    def _apply(index: JobIndex, changes: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        for job_id, entry in changes.items():
+            if entry is None:
+                index.remove(job_id)
+            else:
+                index.upsert(entry)
+
+    def apply_changes(self, changes: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        """Apply committed job post inserts, edits and deletes (None) to the live index."""
+        if self._replay is not None:
+            self._replay.append(changes)
+        if self.index is not None:
+            self._apply(self.index, changes)
+
+    def recommend(self, worker: Any, limit: int, exclude: Iterable[str] = ()) -> List[Tuple[str, Dict[str, Any]]]:
+        """Top ``limit`` (job_id, match) pairs for a worker, best first."""
+        index = self.index
+        if index is None or not len(index):
+            return []
+
+        skills = worker_skills(worker)
+        slots, overlap = index.candidates(skills)
+        if not len(slots):
+            # No shared skills: rank every open job on wage, distance and hours alone
+            slots = np.flatnonzero(index.active)
+            overlap = np.zeros(len(slots), dtype=np.int64)
+        excluded = [index.slots[job_id] for job_id in exclude if job_id in index.slots]
+        if excluded:
+            keep = ~np.isin(slots, excluded)
+            slots, overlap = slots[keep], overlap[keep]
+        if not len(slots):
+            return []
+
+        preferences = worker.preferences or {}
+
+        # Share of the job's required skills the worker has
+        skill_count = index.skill_count[slots]
+        skill_score = np.where(skill_count > 0, overlap / np.maximum(skill_count, 1), 0.0)
+
+        # Daily pay against the worker's minimum
+        minimum_wage = float(preferences.get("minimum_wage") or 0)
+        wage = index.daily_wage[slots]
+        if minimum_wage > 0:
+            wage_score = np.clip(wage / minimum_wage, 0, WAGE_CEILING) / WAGE_CEILING
+        else:
+            wage_score = np.ones(len(slots))
+        wage_score = np.where(np.isnan(wage), NEUTRAL_SCORE, wage_score)
+
+        # Full marks nearby, zero at twice the worker's travel limit
+        distance = np.full(len(slots), np.nan)
+        origin = resolve_pincode((worker.location or {}).get("pincode"))
+        if origin is not None:
+            distance = haversine_km(origin, index.latitude[slots], index.longitude[slots])
+        max_travel = float(preferences.get("max_travel_distance") or 0)
+        if max_travel > 0:
+            distance_score = np.clip(1 - distance / (2 * max_travel), 0, 1)
+        else:
+            distance_score = np.full(len(slots), NEUTRAL_SCORE)
+        distance_score = np.where(np.isnan(distance), NEUTRAL_SCORE, distance_score)
+
+        # Share of the shift inside the worker's preferred hours
+        preferred = working_hours_mask(preferences.get("preferred_working_hours") or [])
+        hours_known = index.hours_known[slots]
+        if preferred is not None:
+            job_hours = index.hours[slots]
+            covered = (job_hours & preferred).sum(axis=1)
+            hours_score = np.where(hours_known, covered / np.maximum(job_hours.sum(axis=1), 1), NEUTRAL_SCORE)
+        else:
+            hours_score = np.full(len(slots), NEUTRAL_SCORE)
+
+        score = (
+            WEIGHTS["skill"] * skill_score + WEIGHTS["wage"] * wage_score
+            + WEIGHTS["distance"] * distance_score + WEIGHTS["hours"] * hours_score
+        )
+
+        top = np.argpartition(-score, limit - 1)[:limit] if len(score) > limit else np.arange(len(score))
+        top = top[np.argsort(-score[top], kind="stable")]
+
+        worker_skill_set = set(skills)
+        results = []
+        for i in top:
+            slot = int(slots[i])
+            results.append((index.job_ids[slot], {
+                "score": round(float(score[i]), 4),
+                "skill_match": round(float(skill_score[i]), 4),
+                "wage_match": round(float(wage_score[i]), 4),
+                "distance_match": round(float(distance_score[i]), 4),
+                "hours_match": round(float(hours_score[i]), 4),
+                "matched_skills": [s for s in index.job_skills.get(slot, ()) if s in worker_skill_set],
+                "distance_km": None if np.isnan(distance[i]) else round(float(distance[i]), 2),
+            }))
+        return results
+
+# Global matching service instance
+matching_service = JobMatchingService()
+
+@event.listens_for(Session, "after_flush")
+def collect_job_changes(session, flush_context):
+    """Snapshot flushed job posts; they reach the index only if the transaction commits."""
+    changes = None
+    for obj in chain(session.new, session.dirty):
+        if isinstance(obj, JobPost):
+            changes = session.info.setdefault(PENDING_CHANGES_KEY, {})
+            changes[obj.id] = _entry_from_job(obj)
+    for obj in session.deleted:
+        if isinstance(obj, JobPost):
+            changes = session.info.setdefault(PENDING_CHANGES_KEY, {})
+            changes[obj.id] = None
+
+@event.listens_for(Session, "after_commit")
+def apply_job_changes(session):
+    changes = session.info.pop(PENDING_CHANGES_KEY, None)
+    if changes:
+        matching_service.apply_changes(changes)
+
+@event.listens_for(Session, "after_rollback")
+def discard_job_changes(session):
+    session.info.pop(PENDING_CHANGES_KEY, None)
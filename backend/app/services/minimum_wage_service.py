@@ -0,0 +1,205 @@
+"""
+Minimum wage re-evaluation
+Reloads the notified state minimum wages and, when they change, re-checks stored
+contracts and job posts in the background, one short transaction per chunk.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import numpy as np
+from sqlalchemy import bindparam, or_, select, update
+from app.cache import entity_cache, table_versions
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.job_metrics import fairness_scores, terms_points, wage_shares
+from app.minimum_wages import (
+    MinimumWageTable, current_table, evaluate, load_minimum_wage_dataset, set_current_table, skills_category
+)
+from app.models import Contract, ContractSkill, JobPost, JobPostSkill, MinimumWageRate
+from app.search_fields import extract_working_days
+
+# (listing model, its skill rows, the skill rows' listing id)
+LISTINGS = [
+    (Contract, ContractSkill, ContractSkill.contract_id),
+    (JobPost, JobPostSkill, JobPostSkill.job_id),
+]
+
+class MinimumWageService:
+    """Keeps this process's minimum wage table current and listings checked against it.
+
+    Every listing stores the version of its state's rates it was checked with, so a
+    run walks the table by id and only re-checks listings whose state's rates moved
+    (or that were never checked). Each chunk commits on its own and the loop yields
+    between chunks, so API requests and writes interleave with a run. A row edited
+    while its chunk was being checked is left alone: its save already checked it.
+    """
+
+    def __init__(self, refresh_seconds: float, chunk_size: int, enabled: bool = True):
+        self.refresh_seconds = refresh_seconds
+        self.chunk_size = chunk_size
+        self.enabled = enabled
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.runs = 0
+        self.checked = 0
+        self.flagged = 0  # listings that became non-compliant
+        self.cleared = 0  # listings that became compliant
+        self.last_run: Optional[Dict[str, Any]] = None
+
+    async def load_table(self, db) -> MinimumWageTable:
+        """Rates in force today from the database (the bundled dataset before it is migrated)."""
+        rows = (await db.execute(select(
+            MinimumWageRate.state, MinimumWageRate.category, MinimumWageRate.rate, MinimumWageRate.rate_type,
+            MinimumWageRate.effective_from, MinimumWageRate.notification
+        ))).mappings().all()
+        return MinimumWageTable(rows or load_minimum_wage_dataset())
+
+    async def refresh(self, force: bool = False) -> Optional[Dict[str, Any]]:
+        """Reload the rates and re-check listings if they changed; always on the first
+        run (listings saved before a restart or the migration) or when forced."""
+        async with AsyncSessionLocal() as db:
+            table = await self.load_table(db)
+        previous = current_table()
+        if table.version != previous.version:
+            set_current_table(table)
+            if self.runs:
+                print(f"⚖️  Minimum wages changed for: {', '.join(table.changed_states(previous))}")
+        elif self.runs and not force:
+            return None
+        return await self.reevaluate(table)
+
+    async def reevaluate(self, table: MinimumWageTable) -> Dict[str, Any]:
+        async with self._lock:
+            started = time.perf_counter()
+            run = {"version": table.version, "checked": 0, "flagged": 0, "cleared": 0, "chunks": 0}
+            for model, skill_model, listing_id in LISTINGS:
+                await self._reevaluate(table, model, skill_model, listing_id, run)
+            run["seconds"] = round(time.perf_counter() - started, 3)
+            self.runs += 1
+            self.checked += run["checked"]
+            self.flagged += run["flagged"]
+            self.cleared += run["cleared"]
+            self.last_run = run
+            if run["checked"]:
+                print(f"⚖️  Minimum wage re-evaluation: {run['checked']:,} listings checked, {run['flagged']:,} flagged, "
+                      f"{run['cleared']:,} cleared in {run['seconds']:.1f}s")
+            return run
+
+    async def _reevaluate(self, table: MinimumWageTable, model, skill_model, listing_id, run: Dict[str, Any]) -> None:
+        columns = model.__table__.c
+        values = {
+            "is_minimum_wage_compliant": bindparam("_compliant"),
+            "minimum_wage_version": bindparam("_version"),
+            "updated_at": bindparam("_updated_at"),
+        }
+        if model is Contract:
+            values["fairness_score"] = bindparam("_score")
+        # Skips rows saved since they were read
+        statement = (
+            update(model.__table__)
+            .where(columns.id == bindparam("_id"), columns.updated_at.is_not_distinct_from(bindparam("_seen")))
+            .values(**values)
+        )
+        stale = or_(model.minimum_wage_version.is_(None), model.minimum_wage_version.not_in(sorted(set(table.versions))))
+        last_id = ""
+        while True:
+            async with AsyncSessionLocal() as db:
+                rows = (await db.execute(
+                    select(model.id, model.payment, model.work_details, model.pay_rate, model.pay_rate_type,
+                           model.location_state, model.is_minimum_wage_compliant, model.updated_at,
+                           *([model.fairness_score] if model is Contract else []))
+                    .where(model.id > last_id, stale)
+                    .order_by(model.id)
+                    .limit(self.chunk_size)
+                )).all()
+                if not rows:
+                    return
+                last_id = rows[-1].id
+                skills: Dict[str, List[str]] = {}
+                for listing, skill in await db.execute(
+                    select(listing_id, skill_model.skill).where(listing_id.in_([row.id for row in rows]))
+                ):
+                    skills.setdefault(listing, []).append(skill)
+
+                result = evaluate(
+                    table,
+                    [row.pay_rate for row in rows],
+                    [row.pay_rate_type for row in rows],
+                    [extract_working_days(row.work_details) if row.pay_rate_type == "fixed" else None for row in rows],
+                    [row.location_state for row in rows],
+                    [skills_category(skills.get(row.id, ())) for row in rows],
+                )
+                scores = None
+                if model is Contract:
+                    other = np.array([terms_points(row.payment, row.work_details)[0] for row in rows])
+                    scores = fairness_scores(wage_shares(result["daily_wage"], result["minimum_wage"]), other).tolist()
+
+                now = datetime.utcnow()
+                params, changed = [], []
+                for i, (row, compliant) in enumerate(zip(rows, result["compliant"].tolist())):
+                    moved = row.is_minimum_wage_compliant != compliant
+                    rescored = scores is not None and row.fairness_score != scores[i]
+                    if moved and not compliant:
+                        run["flagged"] += 1
+                    elif moved and row.is_minimum_wage_compliant is False:
+                        run["cleared"] += 1
+                    if moved or rescored:
+                        changed.append(row.id)
+                    params.append({
+                        "_id": row.id, "_seen": row.updated_at, "_compliant": compliant,
+                        "_version": result["version"][i], "_updated_at": now if moved or rescored else row.updated_at,
+                        **({"_score": scores[i]} if scores is not None else {}),
+                    })
+                await db.execute(statement, params)
+                await db.commit()
+            run["checked"] += len(rows)
+            run["chunks"] += 1
+            if changed:
+                await entity_cache.invalidate(model, *changed)
+                table_versions.bump([model.__tablename__])
+            await asyncio.sleep(0)  # let queued requests run between chunks
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️  Minimum wage re-evaluation failed: {e}")
+            await asyncio.sleep(self.refresh_seconds)
+
+    def start(self) -> None:
+        """Run the reload/re-evaluation loop in the background of the event loop."""
+        if self.enabled and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            **current_table().stats(),
+            "running": self._lock.locked(),
+            "runs": self.runs,
+            "checked": self.checked,
+            "flagged": self.flagged,
+            "cleared": self.cleared,
+            "last_run": self.last_run,
+        }
+
+# Global minimum wage service instance
+minimum_wage_service = MinimumWageService(
+    settings.minimum_wage_refresh_seconds,
+    settings.minimum_wage_chunk_size,
+    enabled=settings.minimum_wage_reevaluation_enabled,
+)
@@ -0,0 +1,20 @@
+"""
+Server-Sent Events
+Encoding of SSE frames and the streaming response that carries them.
+"""
+
+from typing import Any, AsyncIterator
+from fastapi.responses import StreamingResponse
+from app.serialization import json_dumps
+
+def sse_event(event: str, data: Any) -> bytes:
+    """One SSE frame; ``data`` is sent as JSON, which never contains a raw newline."""
+    return f"event: {event}\ndata: {json_dumps(data)}\n\n".encode()
+
+def event_stream_response(events: AsyncIterator[bytes]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        # Each frame must reach the client as soon as it is written, not when a proxy's buffer fills
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
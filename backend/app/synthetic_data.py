@@ -0,0 +1,610 @@
+"""
+Synthetic data generator
+Builds realistic Indian worker, employer, job, contract, application and chat rows and
+bulk-loads them with Core inserts, so millions of rows load without the ORM or per-row bcrypt.
+"""
+
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import Table
+from app.database import Base
+from app.models import (
+    User, Employer, Identity, JobPost, JobPostSkill, Contract, ContractSkill,
+    ContractApplication, ChatMessage
+)
+from app.search_fields import (
+    WORKING_DAYS_PER_WEEK, extract_daily_rate, extract_rate, extract_rate_type, extract_location, extract_skills
+)
+from app.geo import geo_columns, load_pincode_dataset
+from app.job_metrics import contract_fairness
+
+# (city, state, pincode prefix, relative population weight, wage multiplier)
+CITIES = [
+    ("Mumbai", "Maharashtra", "400", 20, 1.25),
+    ("Delhi", "Delhi", "110", 19, 1.20),
+    ("Bangalore", "Karnataka", "560", 13, 1.20),
+    ("Hyderabad", "Telangana", "500", 10, 1.10),
+    ("Ahmedabad", "Gujarat", "380", 8, 1.00),
+    ("Chennai", "Tamil Nadu", "600", 11, 1.10),
+    ("Kolkata", "West Bengal", "700", 15, 0.95),
+    ("Pune", "Maharashtra", "411", 7, 1.10),
+    ("Surat", "Gujarat", "395", 6, 0.95),
+    ("Jaipur", "Rajasthan", "302", 4, 0.90),
+    ("Lucknow", "Uttar Pradesh", "226", 4, 0.85),
+    ("Patna", "Bihar", "800", 2, 0.80),
+    ("Bhopal", "Madhya Pradesh", "462", 2, 0.85),
+    ("Indore", "Madhya Pradesh", "452", 3, 0.90),
+    ("Kochi", "Kerala", "682", 2, 1.15),
+    ("Thiruvananthapuram", "Kerala", "695", 2, 1.10),
+    ("Coimbatore", "Tamil Nadu", "641", 2, 1.00),
+    ("Mysore", "Karnataka", "570", 1, 0.95),
+    ("Chandigarh", "Chandigarh", "160", 1, 1.05),
+    ("Bhubaneswar", "Odisha", "751", 1, 0.85),
+]
+
+# GST state codes, used for business registration numbers
+STATE_CODES = {
+    "Maharashtra": "27", "Delhi": "07", "Karnataka": "29", "Telangana": "36", "Gujarat": "24",
+    "Tamil Nadu": "33", "West Bengal": "19", "Rajasthan": "08", "Uttar Pradesh": "09",
+    "Bihar": "10", "Madhya Pradesh": "23", "Kerala": "32", "Chandigarh": "04", "Odisha": "21",
+}
+
+# category -> skills, typical daily wage range (INR, before city multiplier), job titles, tools
+CATEGORIES = {
+    "Construction": {
+        "weight": 25,
+        "skills": ["Masonry", "Brick laying", "Concrete work", "Foundation work", "Shuttering", "Scaffolding"],
+        "daily_wage": (450, 800),
+        "titles": ["Construction Workers Needed", "Mason for Residential Building", "Helpers for Site Work"],
+        "tools": ["Basic construction tools"],
+    },
+    "Cleaning": {
+        "weight": 15,
+        "skills": ["Cleaning", "House keeping", "Deep cleaning", "Office maintenance", "Laundry"],
+        "daily_wage": (300, 550),
+        "titles": ["Domestic Cleaning Staff", "Office Cleaning - Daily Service", "Housekeeping Staff"],
+        "tools": ["Cleaning supplies provided"],
+    },
+    "Electrical": {
+        "weight": 8,
+        "skills": ["Electrical wiring", "Maintenance", "Motor repair", "Commercial systems", "Panel installation"],
+        "daily_wage": (600, 1100),
+        "titles": ["Electrician for Apartment Complex", "Electrical Maintenance", "Wiring Work for New Shop"],
+        "tools": ["Electrical tools required"],
+    },
+    "Plumbing": {
+        "weight": 7,
+        "skills": ["Pipe fitting", "Plumbing repairs", "Sanitary installation", "Water tank cleaning"],
+        "daily_wage": (550, 1000),
+        "titles": ["Plumber Needed", "Bathroom Fitting Work", "Pipeline Repair Work"],
+        "tools": ["Plumbing tools required"],
+    },
+    "Carpentry": {
+        "weight": 6,
+        "skills": ["Carpentry", "Furniture making", "Polishing", "Door fitting", "Modular kitchen"],
+        "daily_wage": (600, 1000),
+        "titles": ["Carpenter for Interior Work", "Furniture Repair Work", "Modular Kitchen Installation"],
+        "tools": ["Carpentry tools required"],
+    },
+    "Painting": {
+        "weight": 6,
+        "skills": ["Wall painting", "Putty work", "Texture painting", "Waterproofing"],
+        "daily_wage": (500, 900),
+        "titles": ["Painters for Apartment", "House Painting Work", "Waterproofing Work"],
+        "tools": ["Brushes and rollers provided"],
+    },
+    "Driving": {
+        "weight": 8,
+        "skills": ["Driving", "Heavy vehicle license", "Route knowledge", "Vehicle maintenance"],
+        "daily_wage": (600, 1000),
+        "titles": ["Driver for Goods Vehicle", "Personal Driver", "Delivery Van Driver"],
+        "tools": ["Vehicle provided"],
+    },
+    "Security": {
+        "weight": 6,
+        "skills": ["Security guard", "CCTV monitoring", "Night shift", "Access control"],
+        "daily_wage": (400, 700),
+        "titles": ["Security Guard for Society", "Night Watchman", "Security Staff for Warehouse"],
+        "tools": ["Uniform provided"],
+    },
+    "Cooking": {
+        "weight": 5,
+        "skills": ["Cooking", "South Indian cuisine", "North Indian cuisine", "Catering"],
+        "daily_wage": (400, 750),
+        "titles": ["Cook for Hostel Mess", "Catering Helpers", "Home Cook"],
+        "tools": ["Kitchen equipment provided"],
+    },
+    "Gardening": {
+        "weight": 3,
+        "skills": ["Gardening", "Lawn maintenance", "Plant nursery", "Landscaping"],
+        "daily_wage": (350, 600),
+        "titles": ["Gardener for Villa", "Landscaping Helpers", "Park Maintenance Staff"],
+        "tools": ["Gardening tools provided"],
+    },
+    "Delivery": {
+        "weight": 6,
+        "skills": ["Delivery", "Two-wheeler license", "Loading", "Route knowledge"],
+        "daily_wage": (450, 800),
+        "titles": ["Delivery Partners Needed", "Warehouse Loading Staff", "Courier Delivery Staff"],
+        "tools": ["Own two-wheeler required"],
+    },
+    "Factory Work": {
+        "weight": 5,
+        "skills": ["Machine operation", "Packing", "Quality checking", "Welding"],
+        "daily_wage": (450, 850),
+        "titles": ["Factory Helpers", "Machine Operators Needed", "Packing Staff for Unit"],
+        "tools": ["Safety equipment provided"],
+    },
+}
+
+# (rate type, share of listings, multiplier applied to the daily wage; None: the job's working days)
+RATE_TYPES = [
+    ("daily", 55, 1),
+    ("hourly", 20, 1 / 8),
+    ("weekly", 10, 6),
+    ("monthly", 10, 26),
+    ("fixed", 5, None),
+]
+
+WORKING_HOURS = ["Morning (6 AM - 12 PM)", "Afternoon (12 PM - 6 PM)", "Evening (6 PM - 10 PM)", "Night (10 PM - 6 AM)"]
+SHIFTS = ["8 AM - 5 PM", "9 AM - 6 PM", "7 AM - 3 PM", "6 AM - 12 PM", "2 PM - 10 PM", "10 PM - 6 AM", "Flexible"]
+DURATIONS = [(7, "1 week"), (14, "2 weeks"), (30, "1 month"), (60, "2 months"), (90, "3 months"), (180, "6 months")]
+PAYMENT_TERMS = ["Daily payment", "Weekly payment", "Bi-weekly payment", "Monthly payment"]
+URGENCY = ["low", "medium", "high"]
+AREAS = ["Main Road", "Market Area", "Industrial Estate", "Station Road", "Old City", "New Colony", "Tech Park", "Bus Stand"]
+
+FIRST_NAMES = [
+    "Rajesh", "Priya", "Suresh", "Anita", "Ramesh", "Sunita", "Mahesh", "Lakshmi", "Ganesh", "Kavita",
+    "Arjun", "Meena", "Vijay", "Rekha", "Manoj", "Pooja", "Ravi", "Geeta", "Sanjay", "Deepa",
+    "Amit", "Radha", "Prakash", "Savita", "Mohan", "Asha", "Imran", "Fatima", "Joseph", "Mary",
+    "Gurpreet", "Harpreet", "Babu", "Selvi", "Murugan", "Shankar", "Bhavna", "Dinesh", "Rani", "Kiran",
+]
+LAST_NAMES = [
+    "Kumar", "Sharma", "Reddy", "Singh", "Patel", "Yadav", "Nair", "Iyer", "Das", "Gupta",
+    "Verma", "Rao", "Khan", "Shaikh", "Pillai", "Naidu", "Mishra", "Chauhan", "Jadhav", "Gowda",
+    "Mondal", "Thomas", "Joshi", "Pandey", "Menon",
+]
+COMPANY_SUFFIXES = ["Builders", "Services", "Enterprises", "Infra", "Facility Management", "Contractors", "Traders", "Industries"]
+BUSINESS_TYPES = ["Construction Company", "Service Provider", "Facility Management", "Manufacturing Unit", "Logistics", "Hospitality", "Retail"]
+
+JOB_STATUSES = [("published", 60), ("draft", 15), ("closed", 15), ("filled", 10)]
+CONTRACT_STATUSES = [("available", 40), ("accepted", 15), ("in-progress", 25), ("completed", 15), ("cancelled", 5)]
+APPLICATION_STATUSES = [("applied", 60), ("accepted", 15), ("rejected", 25)]
+
+WORKER_QUESTIONS = [
+    "What is the minimum wage for construction workers in my state?",
+    "My employer has not paid me for two weeks. What should I do?",
+    "Find me jobs near my location",
+    "Is this contract fair?",
+    "How many hours can I be asked to work in a day?",
+    "What documents do I need to register as a worker?",
+    "Can I ask for overtime pay?",
+    "Help me find electrician work",
+]
+AI_REPLIES = [
+    "Minimum wages depend on your state and skill level. Please share your state so I can check the current rate.",
+    "You can raise a complaint with the local labour office. Keep records of the days you worked and any messages from your employer.",
+    "I found a few jobs matching your skills nearby. Would you like me to show the ones with the best pay?",
+    "I can review the contract terms for you. The pay looks fair for your area, but check the payment schedule.",
+    "Normally a working day is 8 hours. Work beyond that should be paid as overtime at twice the normal rate.",
+    "You will need an Aadhaar card and a bank account. Registering on the e-Shram portal is free.",
+]
+
+# Fixed accounts kept for the login screen and the README walkthrough
+DEMO_WORKERS = [
+    ("Demo User", "9999999999", "demo@example.com", "Bangalore", ["Construction", "Electrical", "Plumbing"]),
+    ("Rajesh Kumar", "9876543210", "rajesh.kumar@email.com", "Bangalore", ["Construction"]),
+    ("Priya Sharma", "9876543211", "priya.sharma@email.com", "Bangalore", ["Cleaning"]),
+    ("Suresh Reddy", "9876543212", "suresh.reddy@email.com", "Mysore", ["Electrical", "Plumbing"]),
+]
+DEMO_EMPLOYERS = [
+    ("Bangalore Builders", "Bangalore Builders Pvt Ltd", "9876543220", "contact@bangalorebuilders.com", "Construction Company", "Bangalore"),
+    ("Clean Home Services", "Clean Home Services", "9876543221", "contact@cleanhome.com", "Service Provider", "Bangalore"),
+    ("Tech Park Maintenance", "Tech Park Maintenance Ltd", "9876543222", "hr@techparkmaintenance.com", "Facility Management", "Bangalore"),
+]
+
+DEFAULT_PASSWORD = "password123"
+DEFAULT_COUNTS = {
+    "employers": 10,
+    "workers": 50,
+    "job_posts": 40,
+    "contracts": 25,
+    "applications": 80,
+    "chat_messages": 100,
+}
+LOAD_ORDER = ("employers", "workers", "job_posts", "contracts", "applications", "chat_messages")
+
+def _weighted_pool(options: List[Any], weights: List[int]) -> List[Any]:
+    """Options repeated by weight, so a weighted draw is a single uniform index."""
+    return [option for option, weight in zip(options, weights) for _ in range(weight)]
+
+class SyntheticDataGenerator:
+    """Deterministic (per seed) row factory for every seeded table.
+
+    Rows are produced in chunks of plain dicts keyed by column name, with the derived
+    search columns, skill rows and identity rows filled in, since Core inserts skip
+    the ORM flush hooks that normally maintain them.
+    """
+
+    def __init__(self, password_hash: str, seed: int = 42, now: Optional[datetime] = None):
+        self.rng = random.Random(seed)
+        self.password_hash = password_hash
+        self.now = now or datetime.utcnow()
+        self.city_index = {city[0]: i for i, city in enumerate(CITIES)}
+        self.city_pool = _weighted_pool(list(range(len(CITIES))), [city[3] for city in CITIES])
+        # Real pincodes per city so generated listings land on the geo index
+        self.city_pincodes: List[List[str]] = [[] for _ in CITIES]
+        for row in load_pincode_dataset():
+            if row["district"] in self.city_index:
+                self.city_pincodes[self.city_index[row["district"]]].append(row["pincode"])
+        self.category_pool = _weighted_pool(list(CATEGORIES), [spec["weight"] for spec in CATEGORIES.values()])
+        self.rate_pool = _weighted_pool(RATE_TYPES, [rate[1] for rate in RATE_TYPES])
+        self.job_status_pool = _weighted_pool(*zip(*JOB_STATUSES))
+        self.contract_status_pool = _weighted_pool(*zip(*CONTRACT_STATUSES))
+        self.application_status_pool = _weighted_pool(*zip(*APPLICATION_STATUSES))
+        # Kept for later tables to reference: ids plus the few fields they denormalize
+        self.employers: List[Tuple[str, int]] = []  # (id, city index)
+        self.workers: List[Tuple[str, str, str, int, float, int]] = []  # (id, name, category, years, rating, completed)
+        self.job_posts: List[Tuple[str, float]] = []  # (id, rate)
+        self.application_pairs = set()
+        self._chat_worker: Optional[str] = None
+        self._chat_time = self.now
+
+    def _uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    # random.choice/randint/choices are several times slower than indexing with random()
+    def _choice(self, options: List[Any]) -> Any:
+        return options[int(self.rng.random() * len(options))]
+
+    def _randint(self, low: int, high: int) -> int:
+        return low + int(self.rng.random() * (high - low + 1))
+
+    def _timestamp(self, max_days: int = 180) -> datetime:
+        return self.now - timedelta(seconds=self._randint(0, max_days * 86400))
+
+    def _name(self) -> str:
+        return f"{self._choice(FIRST_NAMES)} {self._choice(LAST_NAMES)}"
+
+    def _location(self, city_idx: int) -> Dict[str, str]:
+        city, state, prefix = CITIES[city_idx][:3]
+        pincodes = self.city_pincodes[city_idx]
+        pincode = self._choice(pincodes) if pincodes else f"{prefix}{self._randint(1, 99):03d}"
+        return {"state": state, "city": city, "pincode": pincode}
+
+    def _city(self) -> int:
+        return self._choice(self.city_pool)
+
+    def _category(self) -> str:
+        return self._choice(self.category_pool)
+
+    def _payment(self, category: str, city_idx: int, days: int) -> Dict[str, Any]:
+        """Rate in the category's daily band, scaled by city and converted to a rate type."""
+        low, high = CATEGORIES[category]["daily_wage"]
+        rate_type, _, factor = self._choice(self.rate_pool)
+        if factor is None:
+            factor = days * WORKING_DAYS_PER_WEEK / 7
+        daily = self.rng.uniform(low, high) * CITIES[city_idx][4]
+        step = 5 if rate_type == "hourly" else 10
+        return {
+            "rate_type": rate_type,
+            "rate": float(round(daily * factor / step) * step),
+            "currency": "INR",
+            "payment_terms": self._choice(PAYMENT_TERMS),
+            "negotiable": self.rng.random() < 0.3,
+        }
+
+    def _listing(self, city_idx: int) -> Dict[str, Any]:
+        """Fields shared by job posts and contracts, including the derived search columns."""
+        category = self._category()
+        spec = CATEGORIES[category]
+        location = self._location(city_idx)
+        location["address"] = f"{self._choice(AREAS)}, {location['city']}"
+        created_at = self._timestamp()
+        start = created_at + timedelta(days=self._randint(1, 21))
+        days, duration = self._choice(DURATIONS)
+        payment = self._payment(category, city_idx, days)
+        requirements = {
+            "skills": self.rng.sample(spec["skills"], self._randint(1, min(3, len(spec["skills"])))),
+            "experience": self._randint(0, 8),
+            "tools": list(spec["tools"]),
+            "certifications": [],
+        }
+        work_details = {
+            "location": location,
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=days)).isoformat(),
+            "duration": duration,
+            "working_hours": self._choice(SHIFTS),
+            "urgency": self._choice(URGENCY),
+        }
+        search_location = extract_location(work_details)
+        fairness = contract_fairness(payment, work_details, requirements)
+        return {
+            "title": f"{self._choice(spec['titles'])} - {location['city']}",
+            "description": (
+                f"{category} work at {location['address']} for {duration}. "
+                f"Looking for workers skilled in {', '.join(requirements['skills']).lower()}."
+            ),
+            "category": category,
+            "work_details": work_details,
+            "payment": payment,
+            "requirements": requirements,
+            "pay_rate": extract_rate(payment),
+            "pay_rate_type": extract_rate_type(payment),
+            "daily_rate": extract_daily_rate(payment, work_details),
+            "location_city": search_location["city"],
+            "location_state": search_location["state"],
+            "location_pincode": search_location["pincode"],
+            **geo_columns(search_location["pincode"]),
+            "is_minimum_wage_compliant": fairness["is_minimum_wage_compliant"],
+            "minimum_wage_version": fairness["minimum_wage_version"],
+            "fairness_score": fairness["fairness_score"],  # contracts only
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+    def employer_rows(self, start: int, stop: int) -> List[Tuple[Table, List[Dict[str, Any]]]]:
+        employers, identities = [], []
+        for i in range(start, stop):
+            if i < len(DEMO_EMPLOYERS):
+                name, company, phone, email, business_type, city = DEMO_EMPLOYERS[i]
+                city_idx = self.city_index[city]
+            else:
+                city_idx = self._city()
+                name = f"{self._choice(LAST_NAMES)} {self._choice(COMPANY_SUFFIXES)}"
+                company = f"{name} Pvt Ltd" if self.rng.random() < 0.6 else name
+                phone, email = f"8{i:09d}", f"employer{i}@example.in"
+                business_type = self._choice(BUSINESS_TYPES)
+            employer_id = self._uuid()
+            location = self._location(city_idx)
+            location["address"] = f"{self._randint(1, 400)} {self._choice(AREAS)}, {location['city']}"
+            created_at = self._timestamp(720)
+            employers.append({
+                "id": employer_id,
+                "name": name,
+                "company": company,
+                "phone": phone,
+                "email": email,
+                "password_hash": self.password_hash,
+                "business_id": f"{STATE_CODES[location['state']]}AABCU{self._randint(1000, 9999)}R1Z{self._choice('ABCDEFXYZ')}",
+                "business_type": business_type,
+                "location": location,
+                "is_verified": self.rng.random() < 0.7,
+                "rating": round(self.rng.uniform(3.0, 5.0), 1),
+                "posted_jobs": 0,
+                "completed_projects": self._randint(0, 50),
+                "created_at": created_at,
+                "updated_at": created_at,
+            })
+            identities.append({"id": employer_id, "account_type": "employer", "email": email, "phone": phone})
+            self.employers.append((employer_id, city_idx))
+        return [(Employer.__table__, employers), (Identity.__table__, identities)]
+
+    def worker_rows(self, start: int, stop: int) -> List[Tuple[Table, List[Dict[str, Any]]]]:
+        workers, identities = [], []
+        for i in range(start, stop):
+            if i < len(DEMO_WORKERS):
+                name, phone, email, city, expertise = DEMO_WORKERS[i]
+                city_idx = self.city_index[city]
+            else:
+                city_idx = self._city()
+                name = self._name()
+                phone, email = f"7{i:09d}", f"worker{i}@example.in"
+                expertise = list(dict.fromkeys(self._category() for _ in range(self._randint(1, 3))))
+            worker_id = self._uuid()
+            primary = expertise[0]
+            years = self._randint(0, 25)
+            rating = round(self.rng.uniform(3.0, 5.0), 1)
+            completed = self._randint(0, 80)
+            low, high = CATEGORIES[primary]["daily_wage"]
+            created_at = self._timestamp(720)
+            workers.append({
+                "id": worker_id,
+                "name": name,
+                "phone": phone,
+                "email": email,
+                "password_hash": self.password_hash,
+                "digital_id": f"{self._randint(2000, 9999)}-{self._randint(0, 9999):04d}-{self._randint(0, 9999):04d}",
+                "area_of_expertise": expertise,
+                "location": self._location(city_idx),
+                "preferences": {
+                    "max_travel_distance": self._choice([5, 10, 15, 20, 30, 50]),
+                    "preferred_working_hours": self.rng.sample(WORKING_HOURS, self._randint(1, 2)),
+                    "minimum_wage": float(round(low * CITIES[city_idx][4] / 50) * 50),
+                },
+                "experience": {
+                    "years_of_experience": years,
+                    "previous_jobs": [CATEGORIES[c]["titles"][0] for c in expertise],
+                    "skills": CATEGORIES[primary]["skills"][:3],
+                },
+                "is_verified": self.rng.random() < 0.6,
+                "profile_picture": None,
+                "rating": rating,
+                "completed_jobs": completed,
+                "created_at": created_at,
+                "updated_at": created_at,
+            })
+            identities.append({"id": worker_id, "account_type": "worker", "email": email, "phone": phone})
+            self.workers.append((worker_id, name, primary, years, rating, completed))
+        return [(User.__table__, workers), (Identity.__table__, identities)]
+
+    def job_post_rows(self, start: int, stop: int) -> List[Tuple[Table, List[Dict[str, Any]]]]:
+        job_posts, skills = [], []
+        for _ in range(start, stop):
+            employer_id, home_city = self._choice(self.employers)
+            # Most employers hire in their own city
+            listing = self._listing(home_city if self.rng.random() < 0.8 else self._city())
+            listing.pop("fairness_score")
+            job_id = self._uuid()
+            listing.update(id=job_id, employer_id=employer_id, status=self._choice(self.job_status_pool))
+            job_posts.append(listing)
+            skills.extend({"job_id": job_id, "skill": skill} for skill in extract_skills(listing["requirements"]))
+            self.job_posts.append((job_id, listing["pay_rate"]))
+        return [(JobPost.__table__, job_posts), (JobPostSkill.__table__, skills)]
+
+    def contract_rows(self, start: int, stop: int) -> List[Tuple[Table, List[Dict[str, Any]]]]:
+        contracts, skills = [], []
+        for _ in range(start, stop):
+            employer_id, home_city = self._choice(self.employers)
+            listing = self._listing(home_city if self.rng.random() < 0.8 else self._city())
+            listing.pop("category")
+            contract_id = self._uuid()
+            status = self._choice(self.contract_status_pool)
+            work_tracking = payment_tracking = None
+            if status in ("in-progress", "completed"):
+                days_worked = self._randint(1, 60)
+                total_due = round(days_worked * listing["pay_rate"], 2)
+                received = round(total_due * self.rng.uniform(0.5, 1.0), 2)
+                work_tracking = {
+                    "totalHoursWorked": days_worked * 8,
+                    "daysWorked": days_worked,
+                    "estimatedTotalHours": days_worked * 8 + self._randint(0, 200),
+                }
+                payment_tracking = {
+                    "totalDue": total_due,
+                    "totalReceived": received,
+                    "pendingAmount": round(total_due - received, 2),
+                    "lastPaymentDate": (self.now - timedelta(days=self._randint(0, 14))).isoformat(),
+                }
+            listing.update(
+                id=contract_id,
+                employer_id=employer_id,
+                status=status,
+                accepted_by=self._choice(self.workers)[0] if status != "available" and self.workers else None,
+                contract_receipt_id=None,
+                applicants_count=self._randint(0, 30),
+                work_tracking=work_tracking,
+                payment_tracking=payment_tracking,
+            )
+            contracts.append(listing)
+            skills.extend({"contract_id": contract_id, "skill": skill} for skill in extract_skills(listing["requirements"]))
+        return [(Contract.__table__, contracts), (ContractSkill.__table__, skills)]
+
+    def application_rows(self, start: int, stop: int) -> List[Tuple[Table, List[Dict[str, Any]]]]:
+        applications = []
+        job_count, worker_count = len(self.job_posts), len(self.workers)
+        for _ in range(start, stop):
+            # (job, worker) is unique; resample on collision
+            while True:
+                job_idx, worker_idx = int(self.rng.random() * job_count), int(self.rng.random() * worker_count)
+                key = job_idx * worker_count + worker_idx
+                if key not in self.application_pairs:
+                    self.application_pairs.add(key)
+                    break
+            job_id, rate = self.job_posts[job_idx]
+            worker_id, name, category, years, rating, completed = self.workers[worker_idx]
+            proposes = self.rng.random() < 0.3
+            proposed = float(round(rate * self.rng.uniform(1.05, 1.25))) if proposes else None
+            applications.append({
+                "id": self._uuid(),
+                "job_id": job_id,
+                "worker_id": worker_id,
+                "worker_name": name,
+                "status": self._choice(self.application_status_pool),
+                "applied_at": self._timestamp(90),
+                "message": f"I have {years} years of experience in {category.lower()} work and can start immediately.",
+                "proposed_wage": proposed,
+                "original_wage": rate,
+                "proposed_message": f"I would like to propose ₹{proposed:.0f} based on my experience." if proposes else None,
+                "employer_response": None,
+                "contract_id_generated": None,
+                "worker_profile": {
+                    "experience": f"{years} years",
+                    "skills": CATEGORIES[category]["skills"][:3],
+                    "rating": rating,
+                    "completedJobs": completed,
+                },
+            })
+        return [(ContractApplication.__table__, applications)]
+
+    def chat_message_rows(self, start: int, stop: int) -> List[Tuple[Table, List[Dict[str, Any]]]]:
+        messages = []
+        for i in range(start, stop):
+            # Alternate worker question / assistant reply so conversations look real
+            if i % 2 == 0:
+                self._chat_worker = self._choice(self.workers)[0]
+                self._chat_time = self._timestamp(90)
+                sender, receiver, text = self._chat_worker, None, self._choice(WORKER_QUESTIONS)
+            else:
+                self._chat_time += timedelta(seconds=self._randint(2, 20))
+                sender, receiver, text = "ai-assistant", self._chat_worker, self._choice(AI_REPLIES)
+            messages.append({
+                "id": self._uuid(),
+                "sender_id": sender,
+                "receiver_id": receiver,
+                "message": text,
+                "message_type": "text",
+                "timestamp": self._chat_time,
+                "is_read": self.rng.random() < 0.8,
+                "contract_id": None,
+            })
+        return [(ChatMessage.__table__, messages)]
+
+    def rows_for(self, table_name: str) -> Callable[[int, int], List[Tuple[Table, List[Dict[str, Any]]]]]:
+        return {
+            "employers": self.employer_rows,
+            "workers": self.worker_rows,
+            "job_posts": self.job_post_rows,
+            "contracts": self.contract_rows,
+            "applications": self.application_rows,
+            "chat_messages": self.chat_message_rows,
+        }[table_name]
+
+def validate_counts(counts: Dict[str, int]) -> Dict[str, int]:
+    """Fill in defaults and reject combinations that cannot be generated."""
+    counts = {**DEFAULT_COUNTS, **{k: v for k, v in counts.items() if v is not None}}
+    if counts["employers"] < 1 or counts["workers"] < 1:
+        raise ValueError("At least one employer and one worker are required")
+    if counts["applications"] > counts["job_posts"] * counts["workers"]:
+        raise ValueError("More applications requested than distinct (job, worker) pairs")
+    return counts
+
+# Reference data loaded by migrations, not generated
+REFERENCE_TABLES = {"pincode_locations", "minimum_wage_rates"}
+
+def clear_tables(connection) -> None:
+    """Delete every application row, children first."""
+    for table in reversed(Base.metadata.sorted_tables):
+        if table.name not in REFERENCE_TABLES:
+            connection.execute(table.delete())
+
+def bulk_load(
+    db_engine,
+    counts: Dict[str, int],
+    password_hash: str,
+    seed: int = 42,
+    batch_size: int = 5000,
+    clear: bool = True
+) -> Dict[str, int]:
+    """Generate and insert all tables in batches; returns rows inserted per table.
+
+    Each batch is one executemany of ``insert()`` per table in its own transaction,
+    which SQLAlchemy turns into multi-row INSERT ... VALUES on drivers that support it.
+    """
+    counts = validate_counts(counts)
+    generator = SyntheticDataGenerator(password_hash, seed=seed)
+    inserted: Dict[str, int] = {}
+
+    if clear:
+        with db_engine.begin() as connection:
+            clear_tables(connection)
+
+    for name in LOAD_ORDER:
+        total, started = counts[name], time.perf_counter()
+        make_rows = generator.rows_for(name)
+        for start in range(0, total, batch_size):
+            batch = make_rows(start, min(start + batch_size, total))
+            with db_engine.begin() as connection:
+                for table, rows in batch:
+                    if rows:
+                        connection.execute(table.insert(), rows)
+                        inserted[table.name] = inserted.get(table.name, 0) + len(rows)
+        elapsed = time.perf_counter() - started
+        if total:
+            print(f"   {name:<15}{total:>12,} rows in {elapsed:6.1f}s ({total / max(elapsed, 1e-9):,.0f}/s)")
+
+    return inserted
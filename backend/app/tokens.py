@@ -0,0 +1,174 @@
+"""
+Access tokens
+Short-TTL cache of verified bearer tokens and the revocation store it checks, so
+logout and password changes take effect at once without a query per request.
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.auth import ACCESS_TOKEN_LIFETIME, verify_token
+from app.cache import LRUCache, RedisBackend, shared_backend
+from app.config import settings
+from app.models import RevokedToken
+from app.schemas import TokenData
+
+ACCOUNT_PREFIX = "account:"
+
+def _to_datetime(epoch: float) -> datetime:
+    """Naive UTC, as every DateTime column is stored."""
+    return datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None)
+
+def _to_epoch(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+class RevocationStore:
+    """Revoked token ids and per-account cutoffs (every token issued before them).
+
+    Rows in revoked_tokens make revocations durable; this process keeps them in memory
+    and reloads them every ``refresh_seconds`` to pick up other processes' revocations.
+    With a shared tier they are also written there and checked on every request, so
+    they apply in every process at once.
+    """
+
+    def __init__(self, shared: Optional[RedisBackend] = None, refresh_seconds: float = 30):
+        self.shared = shared
+        self.refresh_seconds = refresh_seconds
+        self.tokens: Dict[str, float] = {}  # jti -> token expiry
+        self.accounts: Dict[str, Tuple[float, float]] = {}  # account id -> (cutoff, expiry)
+        self._refreshed_at: Optional[float] = None
+
+    def _remember(self, key: str, revoked_at: float, expires_at: float) -> None:
+        if key.startswith(ACCOUNT_PREFIX):
+            account_id = key[len(ACCOUNT_PREFIX):]
+            cutoff, _ = self.accounts.get(account_id, (0.0, 0.0))
+            self.accounts[account_id] = (max(cutoff, revoked_at), expires_at)
+        else:
+            self.tokens[key] = expires_at
+
+    def _prune(self, now: float) -> None:
+        self.tokens = {jti: expiry for jti, expiry in self.tokens.items() if expiry > now}
+        self.accounts = {key: entry for key, entry in self.accounts.items() if entry[1] > now}
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Merge in the unexpired rows; entries added meanwhile are kept."""
+        self._refreshed_at = time.monotonic()
+        rows = await db.execute(
+            select(RevokedToken.key, RevokedToken.revoked_at, RevokedToken.expires_at)
+            .where(RevokedToken.expires_at > datetime.utcnow())
+        )
+        for key, revoked_at, expires_at in rows:
+            self._remember(key, _to_epoch(revoked_at), _to_epoch(expires_at))
+        self._prune(time.time())
+
+    async def ensure_current(self, db: AsyncSession) -> None:
+        if self._refreshed_at is None or time.monotonic() - self._refreshed_at >= self.refresh_seconds:
+            await self.refresh(db)
+
+    def _revoked_locally(self, token: TokenData) -> bool:
+        expiry = self.tokens.get(token.jti)
+        if expiry is not None and expiry > time.time():
+            return True
+        cutoff, _ = self.accounts.get(token.id, (None, None))
+        return cutoff is not None and token.issued_at < cutoff
+
+    async def is_revoked(self, token: TokenData) -> bool:
+        if self._revoked_locally(token):
+            return True
+        if self.shared is None:
+            return False
+        # The shared tier failing must not lock everyone out: fall back to the local view
+        values = await self.shared.mget(f"revoked:{token.jti}", f"revoked:{ACCOUNT_PREFIX}{token.id}")
+        if not values:
+            return False
+        revoked, cutoff = values
+        return revoked is not None or (cutoff is not None and token.issued_at < float(cutoff))
+
+    async def _store(self, db: AsyncSession, key: str, revoked_at: float, expires_at: float, value: bytes) -> None:
+        await db.merge(RevokedToken(key=key, revoked_at=_to_datetime(revoked_at), expires_at=_to_datetime(expires_at)))
+        await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow()))
+        await db.commit()
+        self._remember(key, revoked_at, expires_at)
+        if self.shared is not None:
+            await self.shared.set(f"revoked:{key}", value, expires_at - revoked_at)
+
+    async def revoke_token(self, db: AsyncSession, token: TokenData) -> None:
+        """Revoke one token (logout). Commits."""
+        now = time.time()
+        expires_at = token.expires_at or now + ACCESS_TOKEN_LIFETIME.total_seconds()
+        if expires_at > now:
+            await self._store(db, token.jti, now, expires_at, b"1")
+
+    async def revoke_account(self, db: AsyncSession, account_id: str) -> float:
+        """Revoke every token issued to the account until now (password change), committing
+        any pending changes with it. Returns the cutoff."""
+        now = time.time()
+        await self._store(db, f"{ACCOUNT_PREFIX}{account_id}", now,
+                          now + ACCESS_TOKEN_LIFETIME.total_seconds(), repr(now).encode())
+        return now
+
+class TokenCache:
+    """Verified bearer tokens -> claims, so repeat requests skip signature checks and
+    claim parsing. Entries live ``ttl_seconds`` at most and never past the token's own
+    expiry; every hit is still checked against the revocation store.
+    """
+
+    def __init__(self, local: LRUCache, revocations: RevocationStore, enabled: bool = True):
+        self.local = local
+        self.revocations = revocations
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+
+    def _verified(self, token: str, credentials_exception: HTTPException) -> TokenData:
+        claims = self.local.get(token) if self.enabled else None
+        if claims is not None:
+            self.hits += 1
+            return claims
+        self.misses += 1
+        claims = verify_token(token, credentials_exception)
+        if self.enabled:
+            ttl = self.local.ttl_seconds
+            if claims.expires_at is not None:
+                ttl = min(ttl, claims.expires_at - time.time())
+            if ttl > 0:
+                self.local.set(token, claims, ttl)
+        return claims
+
+    async def verify(self, db: AsyncSession, token: str, credentials_exception: HTTPException) -> TokenData:
+        """Claims of a valid, unrevoked token; raises ``credentials_exception`` otherwise."""
+        claims = self._verified(token, credentials_exception)
+        await self.revocations.ensure_current(db)
+        if await self.revocations.is_revoked(claims):
+            self.rejected += 1
+            self.local.delete(token)
+            raise credentials_exception
+        return claims
+
+    def clear(self) -> None:
+        self.local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss and revocation counters, for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self.local),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "rejected": self.rejected,
+            "revoked_tokens": len(self.revocations.tokens),
+            "revoked_accounts": len(self.revocations.accounts),
+        }
+
+token_revocations = RevocationStore(shared_backend, refresh_seconds=settings.token_revocation_refresh_seconds)
+token_cache = TokenCache(
+    LRUCache(settings.token_cache_max_entries, settings.token_cache_ttl_seconds),
+    token_revocations,
+    enabled=settings.token_cache_enabled,
+)
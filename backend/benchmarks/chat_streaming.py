@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Chat streaming check
+Replaces the Gemini model with a stub that produces its answer in chunks, then
+compares time to first token of POST /chat/ (whole answer in one response) with
+POST /chat/stream (Server-Sent Events). Checks that the streamed text is what gets
+saved, that a failure mid-answer ends with the fallback text, and that a client
+hanging up cancels the call without saving an answer. Exits non-zero on a failed
+check.
+
+Usage:
+    python benchmarks/chat_streaming.py
+    python benchmarks/chat_streaming.py --chunks 40 --interval 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+# Throwaway database; must be set before the app modules read settings
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/chat_streaming.db"
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select
+from app.auth import create_access_token
+from app.database import SessionLocal
+from app.models import ChatMessage, User
+from app.serialization import json_dumps, json_loads
+from app.llm_cache import llm_cache
+from app.semantic_cache import semantic_cache
+from app.services.conversation_service import conversation_service
+from app.services.gemini_service import gemini_service
+from checks import Checks
+from seed_data import seed_database
+import main
+
+class StubModel:
+    """Answers in ``chunks`` pieces, one every ``interval`` seconds; ``fail_after`` raises mid-answer."""
+
+    def __init__(self, chunks: int, interval: float):
+        self.chunks = chunks
+        self.interval = interval
+        self.fail_after = None
+        self.cancelled = 0
+
+    def answer(self):
+        return "".join(f"word{i} " for i in range(self.chunks))
+
+    async def _pieces(self):
+        try:
+            for i in range(self.chunks):
+                await asyncio.sleep(self.interval)
+                if self.fail_after is not None and i == self.fail_after:
+                    raise RuntimeError("stub failure")
+                yield SimpleNamespace(text=f"word{i} ")
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+    async def generate_content_async(self, prompt, stream=False, **kwargs):
+        if stream:
+            return self._pieces()
+        await asyncio.sleep(self.interval * self.chunks)
+        return SimpleNamespace(text=self.answer())
+
+async def post(path: str, payload: dict, token: str, hang_up_after: float = None):
+    """POST straight to the ASGI app; returns (status, [(seconds since start, body chunk)])."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "server": ("test", 80), "client": ("127.0.0.1", 1),
+        "headers": [(b"host", b"test"), (b"content-type", b"application/json"),
+                    (b"authorization", f"Bearer {token}".encode())],
+    }
+    messages = [{"type": "http.request", "body": json_dumps(payload).encode(), "more_body": False}]
+    started = time.perf_counter()
+    status, chunks = None, []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        if hang_up_after is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(max(0.0, started + hang_up_after - time.perf_counter()))
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and message.get("body"):
+            chunks.append((time.perf_counter() - started, message["body"]))
+
+    await main.app(scope, receive, send)
+    return status, chunks
+
+def sse_events(chunks):
+    """[(seconds, event, data)] from raw SSE body chunks."""
+    events = []
+    for elapsed, body in chunks:
+        for frame in body.decode().split("\n\n"):
+            if frame.strip():
+                fields = dict(line.split(": ", 1) for line in frame.splitlines())
+                events.append((elapsed, fields["event"], json_loads(fields["data"])))
+    return events
+
+def ai_message_count(worker_id: str) -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(ChatMessage).where(ChatMessage.receiver_id == worker_id))
+
+async def main_async(args) -> Checks:
+    checks = Checks()
+    check = checks.check
+
+    stub = StubModel(args.chunks, args.interval)
+    gemini_service.model = stub
+    llm_cache.enabled = semantic_cache.enabled = False  # every request here must reach the model
+    conversation_service.enabled = False  # and no background summary calls share the caps
+    with SessionLocal() as db:
+        worker_id = db.scalar(select(User.id).limit(1))
+    token = create_access_token({"sub": worker_id, "type": "worker"})
+    payload = {"message": "What are my rights?", "sender_id": worker_id}
+
+    blocking, streamed, last = [], [], []
+    for _ in range(args.repeat):
+        status, chunks = await post("/api/v1/chat/", payload, token)
+        blocking.append(chunks[0][0])
+        status, chunks = await post("/api/v1/chat/stream", payload, token)
+        events = sse_events(chunks)
+        streamed.append(next(elapsed for elapsed, event, _ in events if event == "delta"))
+        last.append(events[-1][0])
+    print(f"💬 stub answer: {args.chunks} chunks, one every {args.interval * 1000:.0f} ms; {args.repeat} requests each")
+    print(f"  {'endpoint':<22} {'first token ms':>15} {'complete ms':>12}")
+    print(f"  {'POST /chat/':<22} {statistics.median(blocking) * 1000:15.0f} {statistics.median(blocking) * 1000:12.0f}")
+    print(f"  {'POST /chat/stream':<22} {statistics.median(streamed) * 1000:15.0f} {statistics.median(last) * 1000:12.0f}")
+    check("first token within a few hundred ms", statistics.median(streamed) < 0.3,
+          f"{statistics.median(streamed) * 1000:.0f} ms")
+
+    text = "".join(data["text"] for _, event, data in events if event == "delta")
+    names = [event for _, event, _ in events]
+    check("events: user_message, deltas, done", names[0] == "user_message" and names[-1] == "done" and
+          set(names[1:-1]) == {"delta"}, f"{len(names)} events")
+    check("streamed text is the whole answer", text == stub.answer())
+    check("saved answer matches the stream", events[-1][2]["ai_response"]["message"] == text)
+
+    # Failure part-way: what was streamed stays, followed by the fallback
+    stub.fail_after = args.chunks // 2
+    status, chunks = await post("/api/v1/chat/stream", payload, token)
+    events = sse_events(chunks)
+    saved = events[-1][2]["ai_response"]["message"]
+    check("failure mid-answer ends with the fallback", events[-1][1] == "done" and saved.startswith("word0 ") and
+          "trouble" in saved)
+    stub.fail_after = None
+
+    # Client hangs up part-way: call cancelled, no answer saved
+    before, cancelled = ai_message_count(worker_id), stub.cancelled
+    status, chunks = await post("/api/v1/chat/stream", payload, token, hang_up_after=args.interval * args.chunks / 3)
+    await asyncio.sleep(0.1)
+    check("hang-up cancels the call", stub.cancelled == cancelled + 1, f"{len(chunks)} frames sent")
+    check("no answer saved after a hang-up", ai_message_count(worker_id) == before)
+    check("no Gemini slots left held", gemini_service.limiter.in_flight == 0 and not gemini_service.limiter._users)
+    return checks
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Compare buffered and streamed chat answers")
+    parser.add_argument("--chunks", type=int, default=20, help="chunks in the stub answer")
+    parser.add_argument("--interval", type=float, default=0.1, help="seconds between chunks")
+    parser.add_argument("--repeat", type=int, default=3, help="requests per endpoint")
+    args = parser.parse_args()
+    seed_database({"workers": 20, "employers": 5, "job_posts": 20, "contracts": 10,
+                   "applications": 10, "chat_messages": 10})
+    asyncio.run(main_async(args)).finish()
+    print("✅ Answers stream from the first token and are saved when complete")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,27 @@
+"""
+Pass/fail checks shared by the benchmark scripts
+Each check prints one ✅/❌ line; finish() exits non-zero if any failed.
+"""
+
+import sys
+
+class Checks:
+    def __init__(self, width: int = 50):
+        self.width = width
+        self.failures = 0
+
+    def check(self, label, ok, detail=""):
+        self.failures += not ok
+        print(f"{'✅' if ok else '❌'} {label:<{self.width}} {detail}")
+        return ok
+
+    def status(self, label, response, expected):
+        """Check ``response`` has the ``expected`` status code (and no body for a 304)."""
+        self.check(label, response.status_code == expected and (expected != 304 or not response.content),
+                   response.status_code)
+        return response
+
+    def finish(self):
+        if self.failures:
+            print(f"❌ {self.failures} check(s) failed")
+            sys.exit(1)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Conditional request check
+Seeds a throwaway database and revalidates job, contract, application and
+conversation GETs with If-None-Match / If-Modified-Since: each must answer 304
+while unchanged and 200 with a new ETag after a write. Also times a full
+100-row page against its 304. Exits non-zero on a wrong status.
+
+Usage:
+    python benchmarks/conditional_requests.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Throwaway database; must be set before the app modules read settings
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/conditional_requests.db"
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from app.synthetic_data import DEFAULT_PASSWORD
+from checks import Checks
+from seed_data import seed_database
+import main
+
+WORKER_LOGIN = "demo@example.com"
+REPEAT = 100
+
+def login(client, phone_or_email: str):
+    response = client.post("/api/v1/auth/login", json={"phone_or_email": phone_or_email, "password": DEFAULT_PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def main_cli():
+    seed_database({"workers": 100, "employers": 20, "job_posts": 600, "contracts": 300,
+                   "applications": 600, "chat_messages": 300})
+    checks = Checks(52)
+    check = checks.status
+
+    with TestClient(main.app) as client:
+        worker = login(client, WORKER_LOGIN)
+        job = client.get("/api/v1/jobs/", params={"status": "published"}, headers=worker).json()["data"][0]
+        employer = login(client, job["employer"]["email"] or job["employer"]["phone"])
+        worker_id = client.get("/api/v1/auth/me", headers=worker).json()["data"]["user"]["id"]
+        client.post("/api/v1/chat/", headers=worker, json={"message": "hello", "sender_id": worker_id})
+        client.post(f"/api/v1/jobs/{job['id']}/apply", headers=worker, json={
+            "job_id": job["id"], "worker_id": worker_id, "worker_name": "Demo", "original_wage": 500, "worker_profile": {}
+        })
+        application = client.get(f"/api/v1/jobs/{job['id']}/applications", headers=employer).json()["data"][0]
+        contract = client.get("/api/v1/contracts/", headers=employer).json()["data"][0]
+
+        cases = [
+            ("job", f"/api/v1/jobs/{job['id']}", {}, worker,
+             lambda: client.put(f"/api/v1/jobs/{job['id']}", headers=employer, json={"title": "Revalidated title"})),
+            ("job list", "/api/v1/jobs/", {"limit": 100}, worker,
+             lambda: client.put(f"/api/v1/jobs/{job['id']}", headers=employer, json={"title": "Second title"})),
+            ("contract", f"/api/v1/contracts/{contract['id']}", {}, employer,
+             lambda: client.put(f"/api/v1/contracts/{contract['id']}", headers=employer, json={"title": "Revalidated"})),
+            ("contract list", "/api/v1/contracts/", {"limit": 100}, employer,
+             lambda: client.put(f"/api/v1/contracts/{contract['id']}", headers=employer, json={"title": "Second"})),
+            ("applications", f"/api/v1/jobs/{job['id']}/applications", {}, employer,
+             lambda: client.put(f"/api/v1/jobs/applications/{application['id']}", headers=employer,
+                                json={"status": "accepted", "employer_response": "See you Monday"})),
+            ("conversation", "/api/v1/chat/conversation", {}, worker,
+             lambda: client.post("/api/v1/chat/", headers=worker, json={"message": "again", "sender_id": worker_id})),
+        ]
+        for name, path, params, headers, change in cases:
+            first = check(f"{name}: first GET", client.get(path, params=params, headers=headers), 200)
+            etag, last_modified = first.headers.get("etag"), first.headers.get("last-modified")
+            check(f"{name}: If-None-Match", client.get(path, params=params, headers={**headers, "If-None-Match": etag}), 304)
+            if last_modified and "list" not in name:
+                check(f"{name}: If-Modified-Since", client.get(
+                    path, params=params, headers={**headers, "If-Modified-Since": last_modified}), 304)
+            time.sleep(1.1)  # Last-Modified has one-second resolution
+            change().raise_for_status()
+            after = check(f"{name}: If-None-Match after a write", client.get(
+                path, params=params, headers={**headers, "If-None-Match": etag}), 200)
+            if last_modified and "list" not in name:
+                check(f"{name}: If-Modified-Since after a write", client.get(
+                    path, params=params, headers={**headers, "If-Modified-Since": last_modified}), 200)
+            checks.check(f"{name}: ETag changes after a write", after.headers.get("etag") != etag)
+
+        # What a revalidating client saves on a large page
+        path, params = "/api/v1/contracts/", {"limit": 100}
+        etag = client.get(path, params=params, headers=employer).headers["etag"]
+        for label, extra in [("200 (full page)", {}), ("304 (If-None-Match)", {"If-None-Match": etag})]:
+            started = time.perf_counter()
+            for _ in range(REPEAT):
+                response = client.get(path, params=params, headers={**employer, **extra})
+            elapsed = (time.perf_counter() - started) / REPEAT * 1000
+            print(f"  {label:<22} {elapsed:7.2f} ms  {len(response.content):>7} bytes")
+
+    checks.finish()
+    print("✅ Conditional GETs answer 304 until the resource changes")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Conversation memory check
+Holds a long conversation with the chat assistant (Gemini replaced by a stub) and
+checks that every prompt carries the rolling summary plus the latest turns within
+the token budget, so its size stays flat while a full-history prompt keeps growing;
+that a fact from the first message still reaches late prompts through the summary;
+that summaries are updated in the background without slowing answers, stored per
+conversation and fall back to extracts when the model fails. Exits non-zero on a
+failed check.
+
+Usage:
+    python benchmarks/conversation_memory.py
+    python benchmarks/conversation_memory.py --exchanges 200 --summary-delay 0.3
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+# Throwaway database; must be set before the app modules read settings
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/conversation_memory.db"
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from app.auth import create_access_token
+from app.conversation import estimate_tokens, is_follow_up
+from app.database import AsyncSessionLocal, SessionLocal
+from app.llm_cache import llm_cache
+from app.models import ChatContext, ChatMessage, User
+from app.semantic_cache import semantic_cache
+from app.services.conversation_service import conversation_service
+from app.services.gemini_service import gemini_service
+from checks import Checks
+from seed_data import seed_database
+import main
+
+FACT = "I work as a mason for Sharma Builders in Pune and they owe me 12 days of wages"
+QUESTIONS = [
+    "How many hours can my employer make me work in a day?",
+    "What should I do if I get hurt on the site?",
+    "Is there a government scheme for construction workers?",
+    "How do I register for ESI?",
+    "Can I get overtime pay for Sunday work?",
+    "What documents do I need for a labour card?",
+]
+
+# Short questions that stand alone, so they still take cached answers mid-conversation
+STANDALONE = ["How do I register for ESI?", "What is PF?", "ESI kya hai", "what is minimum wage", "any jobs?",
+              "न्यूनतम मजदूरी कितनी है?"]
+
+class StubModel:
+    """Answers chat prompts with a fixed-length reply; summary prompts with the first
+    bullet it was given (the worker's situation, as a real summary keeps it) plus the
+    latest worker messages, after ``summary_delay`` seconds."""
+
+    def __init__(self, summary_delay: float):
+        self.summary_delay = summary_delay
+        self.fail_summaries = False
+        self.chat_prompts = []
+        self.summary_calls = 0
+
+    async def generate_content_async(self, prompt, stream=False, **kwargs):
+        if "running summary of a conversation" in prompt:
+            self.summary_calls += 1
+            await asyncio.sleep(self.summary_delay)
+            if self.fail_summaries:
+                raise RuntimeError("stub summary failure")
+            current = prompt.split("Current summary:")[1].split("Messages to add")[0]
+            bullets = [line.strip() for line in current.splitlines() if line.strip().startswith("- ")]
+            added = [f"- {line.strip()[len('Worker: '):][:80]}" for line in prompt.splitlines()
+                     if line.strip().startswith("Worker: ")]
+            kept = bullets[:1] + (bullets[1:] + added)[-4:]
+            return SimpleNamespace(text="\n".join(kept))
+        self.chat_prompts.append(prompt)
+        answer = ("Here is what you can do: **keep a record** of your days and pay, talk to your employer, "
+                  "and contact the labour office if it is not resolved. ") * 3
+        if stream:
+            async def pieces():
+                yield SimpleNamespace(text=answer)
+            return pieces()
+        return SimpleNamespace(text=answer)
+
+def conversation_part(prompt: str) -> str:
+    """The conversation block of a general assistance prompt ("" without one)."""
+    match = re.search(r"(Earlier in this conversation.*?|Latest messages.*?)\n\s*Worker's message:", prompt, re.S)
+    return match.group(1) if match else ""
+
+async def _context(worker_id):
+    async with AsyncSessionLocal() as db:
+        return await conversation_service.context(db, worker_id, None)
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Check the chat assistant's bounded conversation memory")
+    parser.add_argument("--exchanges", type=int, default=80, help="messages the worker sends")
+    parser.add_argument("--summary-delay", type=float, default=0.2, help="seconds the stub takes per summary")
+    args = parser.parse_args()
+    seed_database({"workers": 10, "employers": 3, "job_posts": 5, "contracts": 5, "applications": 0,
+                   "chat_messages": 0})
+    checks = Checks(58)
+    check = checks.check
+
+    stub = StubModel(args.summary_delay)
+    gemini_service.model = stub
+    llm_cache.enabled = semantic_cache.enabled = False  # every answer here must be generated
+    with SessionLocal() as db:
+        worker_id = db.scalar(select(User.id).limit(1))
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': worker_id, 'type': 'worker'})}"}
+    budget = conversation_service.token_budget
+
+    with TestClient(main.app) as client:
+        def send(text, contract_id=None, path="/api/v1/chat/"):
+            started = time.perf_counter()
+            response = client.post(path, headers=headers,
+                                   json={"message": text, "sender_id": worker_id, "contract_id": contract_id})
+            assert response.status_code == 200, response.text
+            return time.perf_counter() - started
+
+        latencies, sizes = [], []
+        for i in range(args.exchanges):
+            text = FACT if i == 0 else f"{QUESTIONS[i % len(QUESTIONS)]} (message {i})"
+            latencies.append(send(text))
+            if "Worker's message:" in stub.chat_prompts[-1]:  # standalone rights questions go to their own method
+                sizes.append(estimate_tokens(conversation_part(stub.chat_prompts[-1])))
+        client.portal.call(conversation_service.drain)
+
+        # Naive full history: every earlier message quoted as it is
+        with SessionLocal() as db:
+            lengths = [estimate_tokens(m) for m in db.scalars(
+                select(ChatMessage.message).where((ChatMessage.sender_id == worker_id) |
+                                                  (ChatMessage.receiver_id == worker_id))
+                .order_by(ChatMessage.timestamp))]
+        naive = [sum(lengths[:2 * i]) for i in range(args.exchanges)]
+        settled = sizes[conversation_service.recent_turns + 1:]
+        print(f"💬 {args.exchanges} exchanges: conversation block {min(settled)}–{max(settled)} tokens "
+              f"(budget {budget}); full history at the end {naive[-1]:,} tokens")
+        check("every prompt's conversation block within budget", max(sizes) <= budget, f"max {max(sizes)} tokens")
+        check("prompt size stays flat as the conversation grows",
+              max(settled) - min(settled) <= budget // 4 and naive[-1] > 5 * max(settled),
+              f"{statistics.mean(settled[:10]):.0f} → {statistics.mean(settled[-10:]):.0f} tokens")
+        last_prompt = stub.chat_prompts[-1]
+        previous = f"{QUESTIONS[(args.exchanges - 2) % len(QUESTIONS)]} (message {args.exchanges - 2})"
+        check("latest turns are quoted", f"Worker: {previous}" in last_prompt)
+        check("first message still reaches the prompt via the summary", "Sharma Builders" in last_prompt and
+              "Earlier in this conversation" in last_prompt)
+        check("answers do not wait for summaries", statistics.median(latencies) < args.summary_delay,
+              f"median {statistics.median(latencies) * 1000:.0f} ms, summary {args.summary_delay * 1000:.0f} ms")
+
+        with SessionLocal() as db:
+            stored = db.scalar(select(ChatContext).where(ChatContext.user_id == worker_id, ChatContext.contract_key == ""))
+        window = 2 * conversation_service.recent_turns
+        check("summary stored with the chat, covering all but the window",
+              stored is not None and stored.messages_summarized == 2 * args.exchanges - window,
+              f"{stored.messages_summarized if stored else 0} messages, {stored.summary_tokens if stored else 0} tokens")
+        check("summaries coalesce while one is running", stub.summary_calls < args.exchanges,
+              f"{stub.summary_calls} summary calls for {args.exchanges} exchanges")
+
+        # A contract's chat has a memory of its own
+        contract_id = "contract-memory-check"
+        send("Is the rate in this contract fair for a mason?", contract_id)
+        check("a contract's chat starts without the general memory", conversation_part(stub.chat_prompts[-1]) == "")
+        send("What about the working hours?", contract_id)
+        check("and remembers its own messages", "rate in this contract" in conversation_part(stub.chat_prompts[-1]))
+
+        # Streaming answers are remembered as well
+        client.post("/api/v1/chat/stream", headers=headers,
+                    json={"message": "Please remember my helper is called Ravi", "sender_id": worker_id})
+        send("What was my helper's name?")
+        check("streamed exchanges are remembered", "helper is called Ravi" in stub.chat_prompts[-1])
+
+        # Summaries without the model: extracts, still within the summary's share
+        stub.fail_summaries = True
+        for i in range(window):
+            send(f"Long message {i}: " + "the contractor keeps changing the site and the hours " * 40)
+        client.portal.call(conversation_service.drain)
+        with SessionLocal() as db:
+            stored = db.scalar(select(ChatContext).where(ChatContext.user_id == worker_id, ChatContext.contract_key == ""))
+        send("Anything else I should know?")
+        check("failed summaries fall back to extracts", conversation_service.fallback_summaries > 0 and
+              "Long message" in stored.summary and stored.summary_tokens <= conversation_service.summary_tokens,
+              f"{stored.summary_tokens} tokens")
+        check("long messages are cut to fit the budget",
+              estimate_tokens(conversation_part(stub.chat_prompts[-1])) <= budget)
+        stub.fail_summaries = False
+
+        # Follow-ups depend on the conversation, so they never take a shared cached answer
+        check("follow-ups are told from standalone questions",
+              is_follow_up("Is that legal?") and is_follow_up("What about Kerala?") and
+              is_follow_up("uska form kahan milega") and is_follow_up("What about the working hours?") and
+              not any(is_follow_up(question) for question in STANDALONE))
+        other = {"name": "Other", "location": {"state": "Kerala"}}
+        context = client.portal.call(lambda: _context(worker_id))
+        llm_cache.enabled = semantic_cache.enabled = True
+        _, _, key, similar, remember = gemini_service._general_assistance_call(other, "Is that legal?", context, None)
+        _, _, key2, _, remember2 = gemini_service._general_assistance_call(other, "How do I register for ESI?", context, None)
+        check("follow-up skips the answer caches", key is None and similar is None and not remember)
+        _, _, key3, similar3, _ = gemini_service._general_assistance_call(other, "What is PF?", context, None)
+        check("a short standalone question still looks up the caches", key3 is not None and similar3 is not None)
+        check("answers written with a conversation are not shared", key2 is not None and not remember2)
+        check("a new conversation's prompt is unchanged",
+              conversation_part(gemini_service._general_assistance_prompt(other, "Hi")) == "" and
+              gemini_service._general_assistance_call(other, "Hi", None, None)[4])
+        llm_cache.enabled = semantic_cache.enabled = False
+
+        client.portal.call(conversation_service.drain)
+        stats = client.get("/metrics").json()["conversation_memory"]
+        print(f"📈 contexts={stats['contexts']} avg={stats['avg_context_tokens']} max={stats['max_context_tokens']} "
+              f"updates={stats['updates']} summarized={stats['messages_summarized']} "
+              f"model={stats['model_summaries']} fallback={stats['fallback_summaries']}")
+        check("no updates left running", stats["updates_in_flight"] == 0 and stats["failures"] == 0)
+
+    checks.finish()
+    print("✅ Conversation memory stays within its token budget")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Entity cache check
+Seeds a throwaway database and reads job posts, contracts and the bearer account
+through the API with the entity cache in front of them: statements and latency per
+request cold and warm, then that update/accept/cancel are visible on the next read.
+With --shared the shared tier runs against an in-process Redis-protocol stand-in.
+Exits non-zero if a read returns stale data.
+
+Usage:
+    python benchmarks/entity_cache.py
+    python benchmarks/entity_cache.py --shared --reads 500
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check the entity cache")
+    parser.add_argument("--shared", action="store_true", help="serve the shared tier from a local RESP stand-in")
+    parser.add_argument("--reads", type=int, default=200, help="timed reads per endpoint")
+    return parser.parse_args()
+
+class LocalRedis:
+    """Just enough of a Redis server (GET, MGET, SET [EX], DEL, INCRBY, PING) for the shared tier."""
+
+    def __init__(self):
+        self.store = {}
+        self.commands = 0
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                header = await reader.readline()
+                if not header:
+                    break
+                args = []
+                for _ in range(int(header[1:-2])):
+                    length = int((await reader.readline())[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                writer.write(self.execute(args))
+        finally:
+            writer.close()
+
+    def execute(self, args):
+        self.commands += 1
+        command = args[0].upper()
+        if command == b"GET":
+            return self.bulk(args[1])
+        if command == b"MGET":
+            return b"*%d\r\n" % (len(args) - 1) + b"".join(self.bulk(key) for key in args[1:])
+        if command == b"SET":
+            ttl = int(args[4]) if len(args) > 4 and args[3].upper() == b"EX" else 86400
+            self.store[args[1]] = (args[2], time.monotonic() + ttl)
+            return b"+OK\r\n"
+        if command == b"INCRBY":
+            value = int((self.store.get(args[1]) or (b"0", 0))[0]) + int(args[2])
+            self.store[args[1]] = (str(value).encode(), time.monotonic() + 86400)
+            return b":%d\r\n" % value
+        if command == b"DEL":
+            removed = sum(self.store.pop(key, None) is not None for key in args[1:])
+            return b":%d\r\n" % removed
+        return b"+OK\r\n"  # PING, AUTH, SELECT
+
+    def bulk(self, key):
+        value, expires_at = self.store.get(key, (None, 0))
+        if value is None or expires_at < time.monotonic():
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def start(self) -> int:
+        """Serve on a free local port from a background thread; returns the port."""
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(asyncio.start_server(self.handle, sock=sock))
+        threading.Thread(target=loop.run_forever, daemon=True).start()
+        return sock.getsockname()[1]
+
+args = parse_args()
+stand_in = LocalRedis() if args.shared else None
+
+# Throwaway database and cache settings; must be set before the app modules read settings
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/entity_cache.db"
+if stand_in is not None:
+    os.environ["CACHE_REDIS_URL"] = f"redis://127.0.0.1:{stand_in.start()}/0"
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.cache import entity_cache
+from app.database import async_engine
+from app.synthetic_data import DEFAULT_PASSWORD
+from seed_data import seed_database
+import main
+
+WORKER_LOGIN = "demo@example.com"
+EMPLOYER_LOGIN = "contact@bangalorebuilders.com"
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+def login(client, phone_or_email: str):
+    response = client.post("/api/v1/auth/login", json={"phone_or_email": phone_or_email, "password": DEFAULT_PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def measure(client, counter, path, headers, reads):
+    """(statements cold, statements warm, ms per warm read)."""
+    entity_cache.clear()
+    counter.count = 0
+    client.get(path, headers=headers).raise_for_status()
+    cold = counter.count
+    counter.count = 0
+    started = time.perf_counter()
+    for _ in range(reads):
+        client.get(path, headers=headers).raise_for_status()
+    elapsed = (time.perf_counter() - started) / reads * 1000
+    return cold, counter.count / reads, elapsed
+
+def main_cli():
+    seed_database({"workers": 50, "employers": 10, "job_posts": 100, "contracts": 60,
+                   "applications": 100, "chat_messages": 50})
+    failures = 0
+
+    def expect(label, response, field, value):
+        nonlocal failures
+        response.raise_for_status()
+        actual = response.json()["data"][field]
+        ok = actual == value
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {label:<40} {field}={actual!r}")
+
+    counter = StatementCounter()
+    with TestClient(main.app) as client:
+        worker, employer = login(client, WORKER_LOGIN), login(client, EMPLOYER_LOGIN)
+        job_id = client.get("/api/v1/jobs/", params={"status": "published"}, headers=employer).json()["data"][0]["id"]
+        employer_id = client.get("/api/v1/auth/me", headers=employer).json()["data"]["user"]["id"]
+        contract_id = client.post("/api/v1/contracts/", headers=employer, json={
+            "employer_id": employer_id, "title": "Cache check", "description": "Entity cache invalidation check",
+            "work_details": {"location": {"state": "Karnataka", "city": "Bangalore", "pincode": "560001"},
+                             "start_date": "2025-01-01T00:00:00", "duration": "1 week", "working_hours": "9-5"},
+            "payment": {"rate_type": "daily", "rate": 800, "currency": "INR", "payment_terms": "Weekly"},
+            "requirements": {"skills": ["Plumbing"], "experience": 1},
+        }).json()["data"]["id"]
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+        print(f"🗄️  {'local + shared (RESP stand-in)' if stand_in else 'local'} tier, {args.reads} reads per endpoint")
+        print(f"{'endpoint':<28} {'cold':>5} {'warm':>5} {'ms/read':>8}")
+        for name, path, headers in [
+            ("GET /jobs/{id}", f"/api/v1/jobs/{job_id}", worker),
+            ("GET /contracts/{id}", f"/api/v1/contracts/{contract_id}", employer),
+            ("GET /auth/me", "/api/v1/auth/me", worker),
+        ]:
+            cold, warm, elapsed = measure(client, counter, path, headers, args.reads)
+            print(f"  {name:<26} {cold:>5} {warm:>5.1f} {elapsed:>8.2f}")
+        event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
+
+        # Writes must be visible on the very next read
+        client.get(f"/api/v1/jobs/{job_id}", headers=employer).raise_for_status()
+        client.put(f"/api/v1/jobs/{job_id}", headers=employer, json={"title": "Cached title updated"}).raise_for_status()
+        expect("job read after update", client.get(f"/api/v1/jobs/{job_id}", headers=employer), "title", "Cached title updated")
+
+        client.put(f"/api/v1/contracts/{contract_id}", headers=employer, json={"title": "Contract updated"}).raise_for_status()
+        expect("contract read after update", client.get(f"/api/v1/contracts/{contract_id}", headers=employer), "title", "Contract updated")
+        client.post(f"/api/v1/contracts/{contract_id}/accept", headers=worker).raise_for_status()
+        expect("contract read after accept", client.get(f"/api/v1/contracts/{contract_id}", headers=employer), "status", "accepted")
+        client.post(f"/api/v1/contracts/{contract_id}/cancel", headers=employer).raise_for_status()
+        expect("contract read after cancel", client.get(f"/api/v1/contracts/{contract_id}", headers=worker), "status", "cancelled")
+
+        stats = client.get("/metrics").json()["entity_cache"]
+        print(f"📈 hits={stats['hits']} misses={stats['misses']} hit_ratio={stats['hit_ratio']} "
+              f"entries={stats['entries']} shared_errors={stats['shared_errors']}")
+        if stand_in is not None:
+            print(f"   stand-in served {stand_in.commands} commands, holds {len(stand_in.store)} keys")
+
+    if failures:
+        print(f"❌ {failures} stale read(s)")
+        sys.exit(1)
+    print("✅ Every write was visible on the next read")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Gemini load check
+Replaces the Gemini model with a stub that answers after a fixed delay, then sends
+concurrent chats from several workers while a probe times GET /jobs/, once with
+the stub called synchronously on the event loop (the old behaviour) and once
+through the async client. Also checks the per-user cap, the call deadline and
+cancellation when the client disconnects. Exits non-zero on a failed check.
+
+Usage:
+    python benchmarks/gemini_load.py
+    python benchmarks/gemini_load.py --users 16 --delay 1.0
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+# Throwaway database; must be set before the app modules read settings
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/gemini_load.db"
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import select
+from app.auth import create_access_token
+from app.database import SessionLocal
+from app.models import User
+from app.serialization import json_dumps
+from app.llm_cache import llm_cache
+from app.semantic_cache import semantic_cache
+from app.services.conversation_service import conversation_service
+from app.services.gemini_service import gemini_service
+from checks import Checks
+from seed_data import seed_database
+import main
+
+class StubModel:
+    """Answers every prompt after ``delay`` seconds; tracks concurrency and cancellations."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.cancelled = 0
+
+    def generate_content(self, prompt, **kwargs):
+        time.sleep(self.delay)
+        return SimpleNamespace(text="Stub answer")
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.active -= 1
+        return SimpleNamespace(text="Stub answer")
+
+async def call_inline(prompt: str, timeout: float) -> str:
+    """The old path: the synchronous client directly on the event loop."""
+    return gemini_service.model.generate_content(prompt).text
+
+def worker_headers(count: int):
+    """(worker id, auth headers) for ``count`` seeded workers."""
+    with SessionLocal() as db:
+        ids = db.scalars(select(User.id).limit(count)).all()
+    return [(worker_id, {"Authorization": f"Bearer {create_access_token({'sub': worker_id, 'type': 'worker'})}"})
+            for worker_id in ids]
+
+async def chat(client, worker_id, headers, text="Any work near me?"):
+    """The AI answer, or None when the request failed."""
+    try:
+        response = await client.post("/api/v1/chat/", headers=headers, json={"message": text, "sender_id": worker_id})
+    except Exception:  # the app raised (e.g. SQLite gave up waiting for a writer stuck behind the blocked loop)
+        return None
+    if response.status_code != 200:
+        return None
+    return response.json()["data"]["ai_response"]["message"]
+
+async def probe_latency(client, headers, busy):
+    """GET /jobs/ latencies (ms) sampled until ``busy`` finishes."""
+    samples = []
+    while not busy.done():
+        started = time.perf_counter()
+        (await client.get("/api/v1/jobs/", params={"limit": 5}, headers=headers)).raise_for_status()
+        samples.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.02)
+    return samples
+
+async def disconnecting_chat(worker_id, headers, after: float) -> int:
+    """POST a chat straight to the ASGI app and hang up after ``after`` seconds; returns the status sent."""
+    body = json_dumps({"message": "Explain my rights", "sender_id": worker_id}).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/api/v1/chat/", "raw_path": b"/api/v1/chat/", "root_path": "",
+        "query_string": b"", "server": ("test", 80), "client": ("127.0.0.1", 1),
+        "headers": [(b"host", b"test"), (b"content-type", b"application/json"),
+                    (b"authorization", headers["Authorization"].encode())],
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = {}
+    hang_up_at = time.monotonic() + after
+
+    async def receive():
+        # Like a server: the disconnect is available at once after the client hangs up
+        if messages:
+            return messages.pop(0)
+        if time.monotonic() < hang_up_at:
+            await asyncio.sleep(hang_up_at - time.monotonic())
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            sent["status"] = message["status"]
+
+    await main.app(scope, receive, send)
+    return sent.get("status")
+
+async def main_async(args) -> Checks:
+    checks = Checks()
+    check = checks.check
+
+    stub = StubModel(args.delay)
+    gemini_service.model = stub
+    llm_cache.enabled = semantic_cache.enabled = False  # every request here must reach the model
+    conversation_service.enabled = False  # and no background summary calls share the caps
+    limiter = gemini_service.limiter
+    accounts = worker_headers(args.users + 1)
+    probe_headers = accounts[-1][1]
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+        baseline = []
+        for _ in range(20):
+            started = time.perf_counter()
+            (await client.get("/api/v1/jobs/", params={"limit": 5}, headers=probe_headers)).raise_for_status()
+            baseline.append((time.perf_counter() - started) * 1000)
+        print(f"🤖 {args.users} concurrent chats, stub answers in {args.delay:.1f}s, "
+              f"cap {limiter.max_concurrency} global / {limiter.per_user} per user")
+        print(f"  {'mode':<10} {'chats s':>8} {'/jobs/ p50 ms':>14} {'/jobs/ max ms':>14} {'failed':>7}")
+        print(f"  {'idle':<10} {'':>8} {statistics.median(baseline):14.1f} {max(baseline):14.1f}")
+
+        async_call = gemini_service._call
+        results = {}
+        for mode in ("blocking", "async"):
+            gemini_service._call = call_inline if mode == "blocking" else async_call
+            started = time.perf_counter()
+            chats = asyncio.ensure_future(asyncio.gather(*(chat(client, worker_id, headers)
+                                                           for worker_id, headers in accounts[:args.users])))
+            samples = await probe_latency(client, probe_headers, chats)
+            answers = await chats
+            elapsed = time.perf_counter() - started
+            results[mode] = max(samples, default=float("nan"))
+            print(f"  {mode:<10} {elapsed:8.2f} {statistics.median(samples) if samples else float('nan'):14.1f} "
+                  f"{results[mode]:14.1f} {answers.count(None):7d}")
+        gemini_service._call = async_call
+        check("/jobs/ stays fast while chats are in flight", results["async"] < args.delay * 1000 / 4,
+              f"max {results['async']:.1f} ms")
+        check("every chat answered", None not in answers)
+        check("global cap respected", stub.peak <= limiter.max_concurrency, f"peak {stub.peak}")
+
+        # One user's chats run one at a time
+        stub.peak = 0
+        worker_id, headers = accounts[0]
+        started = time.perf_counter()
+        await asyncio.gather(*(chat(client, worker_id, headers) for _ in range(3)))
+        elapsed = time.perf_counter() - started
+        check("per-user cap serializes one user's chats", stub.peak == 1 and elapsed >= 3 * args.delay * 0.9,
+              f"peak {stub.peak}, {elapsed:.2f}s for 3")
+
+        # A call past its deadline gets the fallback answer instead of hanging
+        timeout, limiter.timeout_seconds = limiter.timeout_seconds, args.delay / 4
+        timed_out = limiter.timed_out
+        started = time.perf_counter()
+        answer = await chat(client, worker_id, headers)
+        elapsed = time.perf_counter() - started
+        limiter.timeout_seconds = timeout
+        check("deadline returns the fallback answer", limiter.timed_out == timed_out + 1 and answer != "Stub answer"
+              and elapsed < args.delay, f"{elapsed:.2f}s")
+
+        # The client hanging up cancels the Gemini call and frees its slot
+        cancelled = stub.cancelled
+        started = time.perf_counter()
+        status = await disconnecting_chat(worker_id, headers, after=args.delay / 4)
+        elapsed = time.perf_counter() - started
+        check("disconnect cancels the call", stub.cancelled == cancelled + 1 and elapsed < args.delay,
+              f"status {status}, {elapsed:.2f}s")
+        check("no slots left held", limiter.in_flight == 0 and limiter.waiting == 0 and not limiter._users)
+
+        stats = (await client.get("/metrics")).json()["gemini"]
+        print(f"📈 completed={stats['completed']} timed_out={stats['timed_out']} cancelled={stats['cancelled']} "
+              f"peak_in_flight={stats['peak_in_flight']}")
+    return checks
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Load test the chat endpoints against a stubbed Gemini")
+    parser.add_argument("--users", type=int, default=8, help="workers chatting at once")
+    parser.add_argument("--delay", type=float, default=1.0, help="stub answer time in seconds")
+    args = parser.parse_args()
+    seed_database({"workers": max(20, args.users + 1), "employers": 5, "job_posts": 50, "contracts": 10,
+                   "applications": 10, "chat_messages": 10})
+    asyncio.run(main_async(args)).finish()
+    print("✅ Chats no longer hold up other requests")
+
+if __name__ == "__main__":
+    main_cli()
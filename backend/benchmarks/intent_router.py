@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Chat intent router check
+Classifies labelled English, Hindi and transliterated messages, times the compiled
+classifier against scanning keyword lists, then sends chat messages to the app
+with Gemini replaced by a counting stub: greetings, help and the menu must be
+answered from templates with no model call, and other messages must reach the
+GeminiAIService method for their intent. Exits non-zero on a failed check.
+
+Usage:
+    python benchmarks/intent_router.py
+    python benchmarks/intent_router.py --messages 500000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+# Throwaway database; must be set before the app modules read settings
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/intent_router.db"
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from app.auth import create_access_token
+from app.database import SessionLocal
+from app.intents import classify
+from app.llm_cache import llm_cache
+from app.models import Contract, User
+from app.semantic_cache import semantic_cache
+from app.serialization import json_loads
+from app.services.gemini_service import gemini_service
+from checks import Checks
+from seed_data import seed_database
+import main
+
+LABELLED = [
+    ("hi", "greeting"), ("Hello!", "greeting"), ("namaste ji", "greeting"), ("नमस्ते", "greeting"),
+    ("good morning", "greeting"), ("ram ram bhai", "greeting"),
+    ("thank you so much", "thanks"), ("dhanyavad", "thanks"), ("धन्यवाद", "thanks"),
+    ("help", "help"), ("I need help", "help"), ("what can you do?", "help"), ("madad chahiye", "help"),
+    ("मदद", "help"), ("menu", "menu"), ("hi, show me the menu", "menu"), ("मेनू दिखाओ", "menu"),
+    ("Find carpentry jobs near me", "jobs"), ("mujhe naukri chahiye", "jobs"), ("काम चाहिए", "jobs"),
+    ("good morning, any plumber jobs?", "jobs"), ("koi vacancy hai kya", "jobs"),
+    ("What is the minimum wage in Kerala?", "rights"), ("PF kaise milega", "rights"),
+    ("मेरा वेतन नहीं मिला", "rights"), ("hi, my employer has not paid me", "rights"),
+    ("How do I register for ESI?", "rights"), ("overtime ka paisa nahi diya", "rights"),
+    ("Is this contract fair?", "contract"), ("anubandh ki shartein samjhao", "contract"),
+    ("what is this", "general"), ("Which designer should I ask about this?", "general"),
+    ("ok", "general"), ("tell me about the weather", "general"),
+]
+
+# The keyword lists generate_ai_response used to scan, for the timing comparison
+OLD_KEYWORDS = [
+    ["contract", "agreement", "terms", "conditions", "fair", "analyze", "understand", "explain", "review"],
+    ["job", "work", "employment", "opportunity", "hiring", "looking for work", "find job", "job search",
+     "employment opportunity", "work available", "jobs near me", "construction work", "carpenter", "plumber",
+     "electrician"],
+    ["rights", "law", "legal", "minimum wage", "payment", "salary", "wage", "government scheme", "subsidy", "mgnrega",
+     "esi", "pf", "provident fund", "labor law", "working hours", "overtime", "safety", "compensation", "dispute",
+     "complaint", "exploitation", "unfair"],
+]
+
+class StubModel:
+    """Counts calls and remembers the chat prompts; conversation summaries, which run in
+    the background after an exchange, are counted apart so they cannot land in between."""
+
+    def __init__(self):
+        self.prompts = []
+        self.summary_calls = 0
+
+    async def generate_content_async(self, prompt, stream=False, **kwargs):
+        if "running summary of a conversation" in prompt:
+            self.summary_calls += 1
+            return SimpleNamespace(text="- Stub summary")
+        self.prompts.append(prompt)
+        if stream:
+            async def pieces():
+                yield SimpleNamespace(text="Stub answer")
+            return pieces()
+        return SimpleNamespace(text="Stub answer")
+
+def sse_events(body: str):
+    events = []
+    for frame in body.split("\n\n"):
+        if frame.strip():
+            fields = dict(line.split(": ", 1) for line in frame.splitlines())
+            events.append((fields["event"], json_loads(fields["data"])))
+    return events
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Check the chat intent router")
+    parser.add_argument("--messages", type=int, default=200000, help="messages in the timed classification")
+    args = parser.parse_args()
+    seed_database({"workers": 10, "employers": 3, "job_posts": 5, "contracts": 5, "applications": 0,
+                   "chat_messages": 0})
+    checks = Checks(52)
+    check = checks.check
+
+    wrong = [(message, expected, classify(message, has_contract=True).name) for message, expected in LABELLED
+             if classify(message, has_contract=True).name != expected]
+    check("labelled messages classified", not wrong, f"{len(LABELLED) - len(wrong)}/{len(LABELLED)} {wrong[:3]}")
+    check("contract intent only in a contract's chat", classify("Is this contract fair?").name == "general")
+    check("keywords match whole words only", classify("Which designer should I ask about this?").keywords == [],
+          "no \"esi\" in designer, no \"hi\" in this")
+
+    messages = [message for message, _ in LABELLED] * (args.messages // len(LABELLED))
+    started = time.perf_counter()
+    for message in messages:
+        classify(message)
+    compiled = (time.perf_counter() - started) / len(messages) * 1e6
+    started = time.perf_counter()
+    for message in messages:
+        lower = message.lower()
+        [any(keyword in lower for keyword in keywords) for keywords in OLD_KEYWORDS]
+    scanned = (time.perf_counter() - started) / len(messages) * 1e6
+    print(f"⚡ classify {compiled:.1f} µs per message (keyword-list scan {scanned:.1f} µs, "
+          f"{len(messages):,} messages)")
+    check("classification in microseconds", compiled < 100, f"{compiled:.1f} µs")
+
+    stub = StubModel()
+    gemini_service.model = stub
+    llm_cache.enabled = semantic_cache.enabled = False  # every routed message must reach the model
+    with SessionLocal() as db:
+        worker_id = db.scalar(select(User.id).limit(1))
+        contract_id = db.scalar(select(Contract.id).limit(1))
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': worker_id, 'type': 'worker'})}"}
+
+    with TestClient(main.app) as client:
+        def send(text, contract_id=None):
+            started = time.perf_counter()
+            response = client.post("/api/v1/chat/", headers=headers,
+                                   json={"message": text, "sender_id": worker_id, "contract_id": contract_id})
+            return response.json()["data"], time.perf_counter() - started
+
+        calls = len(stub.prompts)
+        latencies = []
+        for text in ("hi", "namaste ji", "help", "menu", "thank you", "नमस्ते") * 5:
+            data, elapsed = send(text)
+            latencies.append(elapsed)
+        check("greetings, help and menu make no model call", len(stub.prompts) == calls,
+              f"{len(stub.prompts) - calls} calls for {len(latencies)} messages")
+        check("template answers are immediate", statistics.median(latencies) < 0.05,
+              f"median {statistics.median(latencies) * 1000:.1f} ms")
+        data, _ = send("नमस्ते")
+        check("Hindi greeting gets a Hindi answer", data["intent"] == "greeting" and
+              "नमस्ते" in data["ai_response"]["message"])
+
+        response = client.post("/api/v1/chat/stream", headers=headers, json={"message": "menu", "sender_id": worker_id})
+        events = sse_events(response.text)
+        check("streamed menu comes from the template", events[-1][0] == "done" and
+              events[-1][1]["intent"] == "menu" and len(stub.prompts) == calls and
+              "Job Search" in events[-1][1]["ai_response"]["message"])
+
+        routes = [
+            ("Find carpentry jobs near me", None, "jobs", "job recommendation"),
+            ("What is the minimum wage in Kerala?", None, "rights", "Worker's question:"),
+            ("Is this contract fair?", contract_id, "contract", "Contract Details:"),
+            ("tell me about the weather", None, "general", "Worker's message:"),
+        ]
+        for text, chat_contract, intent, marker in routes:
+            data, _ = send(text, chat_contract)
+            check(f"{intent} messages reach their method", data["intent"] == intent and marker in stub.prompts[-1],
+                  f"{text!r}")
+        data, _ = send("Is that legal?")
+        check("a follow-up stays with the conversation", data["intent"] == "general" and
+              "Latest messages" in stub.prompts[-1])
+        # Standalone questions asked mid-conversation still reach their method
+        mid = [("What is minimum wage?", None, "rights", "Worker's question:"),
+               ("any jobs?", None, "jobs", "job recommendation"),
+               ("PF kya hai", None, "rights", "Worker's question:"),
+               ("Is this contract fair?", contract_id, "contract", "Contract Details:")]
+        for text, chat_contract, intent, marker in mid:
+            data, _ = send(text, chat_contract)
+            check(f"mid-conversation {intent} question reaches its method",
+                  data["intent"] == intent and marker in stub.prompts[-1], f"{text!r}")
+        data, _ = send("Is this contract fair?", "no-such-contract")
+        check("a missing contract falls back to general", data["intent"] == "general")
+
+        stats = client.get("/metrics").json()["intents"]
+        print(f"📈 messages={stats['messages']} templated={stats['templated']} ({stats['templated_ratio']:.0%}) "
+              f"by_intent={stats['by_intent']}")
+
+    checks.finish()
+    print("✅ Chat messages are routed by intent")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Job metrics check
+Times the local job-analysis metrics (skills match, pay against the worker's
+minimum, fairness score, commute), checks them on a known job, and checks that
+contracts get their fairness score and minimum-wage flag on save and that the
+job-analysis chat returns the metrics with a short prompt holding the computed
+numbers. Exits non-zero on a failed check.
+
+Usage:
+    python benchmarks/job_metrics.py
+    python benchmarks/job_metrics.py --iterations 100000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+# Throwaway database; must be set before the app modules read settings
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/job_metrics.db"
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from app.database import SessionLocal
+from app.job_metrics import analyze_job, contract_fairness
+from app.llm_cache import llm_cache
+from app.models import Contract, Employer
+from app.semantic_cache import semantic_cache
+from app.services.gemini_service import gemini_service
+from app.synthetic_data import DEFAULT_PASSWORD
+from checks import Checks
+from seed_data import seed_database
+import main
+
+WORKER_LOGIN = "demo@example.com"
+
+# Frontend (camelCase) job shape, as sent to /chat/job-analysis
+JOB = {
+    "title": "Mason - Mysuru",
+    "description": "Masonry work at Market Area for 1 month.",
+    "requirements": {"skills": ["Masonry", "Plastering", "Tiling"]},
+    "payment": {"rate": 90, "rateType": "hourly", "paymentTerms": "Weekly payment"},
+    "workDetails": {"location": {"city": "Mysuru", "state": "Karnataka", "pincode": "570001"},
+                    "duration": "1 month", "workingHours": "8 AM - 4 PM"},
+    "employer": {"name": "Acme", "rating": 4.2},
+}
+WORKER = {"name": "Ravi", "area_of_expertise": ["Mason"], "experience": {"skills": ["tiling"]},
+          "location": {"city": "Mysuru", "state": "Karnataka", "pincode": "570001"},
+          "preferences": {"minimum_wage": 600, "max_travel_distance": 20}}
+
+class StubModel:
+    def __init__(self):
+        self.prompts = []
+
+    async def generate_content_async(self, prompt, stream=False, **kwargs):
+        self.prompts.append(prompt)
+        if stream:
+            async def pieces():
+                for text in ("**🎯 Recommendation:** Recommended", " - fair pay nearby"):
+                    await asyncio.sleep(0.05)
+                    yield SimpleNamespace(text=text)
+            return pieces()
+        return SimpleNamespace(text="**🎯 Recommendation:** Recommended - fair pay nearby")
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Check the local job-analysis metrics")
+    parser.add_argument("--iterations", type=int, default=20000, help="timed metric computations")
+    args = parser.parse_args()
+    seed_database({"workers": 20, "employers": 5, "job_posts": 20, "contracts": 200,
+                   "applications": 10, "chat_messages": 10})
+    checks = Checks()
+    check = checks.check
+
+    metrics = analyze_job(JOB, WORKER)
+    check("skills match", metrics["skills_matched"] == ["masonry", "tiling"] and
+          metrics["skills_match_percentage"] == 66.7, f"{metrics['skills_match_percentage']}%")
+    check("wage against the worker's minimum", metrics["daily_wage"] == 720 and
+          metrics["wage_percentage_of_minimum"] == 120.0, f"₹{metrics['daily_wage']}/day")
+    # ₹720 is 110% of Karnataka's skilled minimum (₹653.85): a fifth of the wage points, plus all hours and terms points
+    check("fairness score", metrics["fairness_score"] == 5.2 and metrics["is_minimum_wage_compliant"] and
+          metrics["skill_category"] == "skilled", f"{metrics['fairness_score']}/10")
+    check("commute", metrics["commute"] == "Local" and metrics["distance_km"] == 0.0, metrics["commute"])
+    low = contract_fairness({"rate": 150, "rate_type": "daily", "payment_terms": "Monthly payment"},
+                            {"working_hours": "7 AM - 7 PM"})
+    check("underpaid long shift scores low", not low["is_minimum_wage_compliant"] and low["fairness_score"] == 1.0,
+          f"{low['fairness_score']}/10")
+
+    started = time.perf_counter()
+    for _ in range(args.iterations):
+        analyze_job(JOB, WORKER)
+    per_call = (time.perf_counter() - started) / args.iterations * 1e6
+    print(f"⚡ analyze_job: {per_call:.1f} µs per job")
+    check("metrics in microseconds", per_call < 1000, f"{per_call:.1f} µs")
+
+    # Seeded and saved contracts carry the computed score
+    with SessionLocal() as db:
+        contracts = db.scalars(select(Contract)).all()
+        mismatched = sum(
+            (contract.fairness_score, contract.is_minimum_wage_compliant) !=
+            tuple(contract_fairness(contract.payment, contract.work_details, contract.requirements)[key]
+                  for key in ("fairness_score", "is_minimum_wage_compliant"))
+            for contract in contracts
+        )
+        check("seeded contracts carry the computed score", not mismatched, f"{len(contracts)} contracts")
+        employer = db.scalar(select(Employer).limit(1))
+
+    stub = StubModel()
+    gemini_service.model = stub
+    llm_cache.enabled = semantic_cache.enabled = False
+    with TestClient(main.app) as client:
+        response = client.post("/api/v1/auth/login", json={"phone_or_email": employer.email, "password": DEFAULT_PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        body = {
+            "title": "Helper", "description": "Site helper", "employer_id": employer.id,
+            "work_details": {"location": {"city": "Mysuru", "state": "Karnataka", "pincode": "570001"},
+                             "start_date": "2026-01-01T00:00:00", "duration": "1 week", "working_hours": "7 AM - 7 PM"},
+            "payment": {"rate_type": "daily", "rate": 150, "payment_terms": "Monthly payment"},
+            "requirements": {"skills": ["Helper"], "experience": 0},
+        }
+        created = client.post("/api/v1/contracts/", headers=headers, json=body).json()["data"]
+        check("new contract gets score and wage flag", created["fairness_score"] == 1.0 and
+              not created["is_minimum_wage_compliant"], f"{created['fairness_score']}/10")
+        updated = client.put(f"/api/v1/contracts/{created['id']}", headers=headers,
+                             json={"payment": {"rate_type": "daily", "rate": 700, "payment_terms": "Daily payment"}})
+        updated = updated.json()["data"]
+        check("edited pay updates them", updated["is_minimum_wage_compliant"] and updated["fairness_score"] > 5,
+              f"{updated['fairness_score']}/10")
+
+        response = client.post("/api/v1/auth/login", json={"phone_or_email": WORKER_LOGIN, "password": DEFAULT_PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        worker_id = client.get("/api/v1/auth/me", headers=headers).json()["data"]["user"]["id"]
+        payload = {"message": "Is this a good job?", "sender_id": worker_id, "job_data": JOB, "user_data": WORKER}
+        data = client.post("/api/v1/chat/job-analysis", headers=headers, json=payload).json()["data"]
+        answer = data["ai_response"]["message"]
+        check("job analysis returns the metrics", data["metrics"] == metrics)
+        check("answer shows computed numbers and the narrative", "67% (2/3 skills match)" in answer and
+              "120% of your minimum" in answer and "Recommended" in answer)
+        prompt = stub.prompts[-1]
+        check("prompt carries the numbers, not the profile", "66.7%" in prompt and "720" in prompt and
+              "Previous Jobs" not in prompt, f"{len(prompt)} chars")
+        text = client.post("/api/v1/chat/job-analysis/stream", headers=headers, json=payload).text
+        first_delta = text.split("event: delta\n", 1)[1]
+        check("stream sends the metrics first", first_delta.startswith('data: {"text":"**🔧 Skills Match:**') and
+              '"metrics":' in text.split("event: done\n", 1)[1])
+    checks.finish()
+    print("✅ Job metrics are computed locally")
+
+if __name__ == "__main__":
+    main_cli()
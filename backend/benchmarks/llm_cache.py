@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+LLM answer cache check
+Replaces the Gemini model with a stub that answers after a fixed delay and asks
+the same questions again: a repeat with different case, spacing or punctuation
+must be served from the cache (timed in microseconds), a different profile field
+must not, and answers must survive a restart through the SQLite tier. Also checks
+the TTL, size bound, per-method switch and the "cached" flag in chat responses.
+Exits non-zero on a failed check.
+
+Usage:
+    python benchmarks/llm_cache.py
+    python benchmarks/llm_cache.py --delay 2 --lookups 50000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+# Throwaway database (the SQLite answer file goes next to it); must be set before the app modules read settings
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/llm_cache.db"
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from app.cache import LRUCache
+from app.llm_cache import CachedAnswer, LLMResponseCache, SQLiteAnswerStore, llm_cache
+from app.services import gemini_service as gemini_module
+from app.services.gemini_service import gemini_service
+from app.synthetic_data import DEFAULT_PASSWORD
+from checks import Checks
+from seed_data import seed_database
+import main
+
+WORKER_LOGIN = "demo@example.com"
+PROFILE = {"name": "Ravi", "area_of_expertise": ["Masonry"], "location": {"city": "Mysuru", "state": "Karnataka"},
+           "experience": {"years_of_experience": 4}, "preferences": {"minimum_wage": 600}}
+
+class StubModel:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(text=f"Answer #{self.calls}")
+
+async def service_checks(args, check, stub):
+    started = time.perf_counter()
+    first = await gemini_service.get_rights_assistance(PROFILE, "What is the minimum wage in Karnataka?")
+    generated_ms = (time.perf_counter() - started) * 1000
+    repeat = await gemini_service.get_rights_assistance(PROFILE, "  what is the MINIMUM wage in karnataka ")
+    check("rephrased case/spacing/punctuation is a hit", isinstance(repeat, CachedAnswer) and repeat == first,
+          f"model calls {stub.calls}")
+
+    started = time.perf_counter()
+    for _ in range(args.lookups):
+        await gemini_service.get_rights_assistance(PROFILE, "What is the minimum wage in Karnataka?")
+    cached_us = (time.perf_counter() - started) / args.lookups * 1e6
+    print(f"⚡ generated {generated_ms:8.1f} ms   cached {cached_us:6.1f} µs per answer (incl. key hashing)")
+    check("cached answers in microseconds", cached_us < 1000, f"{cached_us:.1f} µs")
+
+    other_state = {**PROFILE, "location": {"city": "Chennai", "state": "Tamil Nadu"}}
+    answer = await gemini_service.get_rights_assistance(other_state, "What is the minimum wage in Karnataka?")
+    check("a different profile field is a miss", not isinstance(answer, CachedAnswer), f"model calls {stub.calls}")
+
+    # Per-method switch
+    llm_cache.methods.discard("analyze_job_opportunity")
+    job = {"title": "Mason", "requirements": {"skills": ["Masonry"]}, "payment": {"rate": 700}}
+    calls = stub.calls
+    for _ in range(2):
+        await gemini_service.analyze_job_opportunity(job, PROFILE, "Is this fair?")
+    check("disabled method always reaches the model", stub.calls == calls + 2)
+    llm_cache.methods.add("analyze_job_opportunity")
+
+    # Restart: a new process has an empty memory tier but the same SQLite file
+    restarted = LLMResponseCache(LRUCache(100, 3600), SQLiteAnswerStore(llm_cache.store.path, 1000),
+                                 ttl_seconds=3600, methods=llm_cache.methods)
+    gemini_module.llm_cache = restarted
+    calls = stub.calls
+    answer = await gemini_service.get_rights_assistance(PROFILE, "What is the minimum wage in Karnataka?")
+    check("answer survives a restart (SQLite tier)", isinstance(answer, CachedAnswer) and stub.calls == calls,
+          f"persistent hits {restarted.store_hits}")
+    gemini_module.llm_cache = llm_cache
+
+    # TTL and size bound
+    short = LLMResponseCache(LRUCache(2, 0.2), SQLiteAnswerStore(os.path.join(tempfile.mkdtemp(), "ttl.db"), 10),
+                             ttl_seconds=0.2, methods=["m"])
+    await short.set(short.key("m", "a"), "A")
+    await asyncio.sleep(0.3)
+    check("entries expire after the TTL", await short.get(short.key("m", "a")) is None)
+    for prompt in "bcd":
+        short.local.set(short.key("m", prompt), prompt.upper())
+    check("memory tier keeps at most max_entries", len(short.local) == 2 and short.local.get(short.key("m", "b")) is None)
+
+def api_checks(check):
+    with TestClient(main.app) as client:
+        response = client.post("/api/v1/auth/login", json={"phone_or_email": WORKER_LOGIN, "password": DEFAULT_PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        worker_id = client.get("/api/v1/auth/me", headers=headers).json()["data"]["user"]["id"]
+        payload = {"message": "How do I register for ESI?", "sender_id": worker_id}
+        first = client.post("/api/v1/chat/", headers=headers, json=payload).json()["data"]
+        started = time.perf_counter()
+        second = client.post("/api/v1/chat/", headers=headers, json={**payload, "message": "how do i register for esi"})
+        elapsed = (time.perf_counter() - started) * 1000
+        second = second.json()["data"]
+        check("POST /chat/ marks a cached answer", not first["cached"] and second["cached"] and
+              second["ai_response"]["message"] == first["ai_response"]["message"], f"{elapsed:.1f} ms")
+        body = client.post("/api/v1/chat/stream", headers=headers, json=payload).text
+        check("POST /chat/stream marks a cached answer", '"cached":true' in body)
+        stats = client.get("/metrics").json()["llm_cache"]
+        print(f"📈 hits={stats['hits']} misses={stats['misses']} persistent_hits={stats['persistent_hits']} "
+              f"entries={stats['entries']}")
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Check the LLM answer cache")
+    parser.add_argument("--delay", type=float, default=1.0, help="stub answer time in seconds")
+    parser.add_argument("--lookups", type=int, default=20000, help="timed cached answers")
+    args = parser.parse_args()
+    seed_database({"workers": 20, "employers": 5, "job_posts": 20, "contracts": 10,
+                   "applications": 10, "chat_messages": 10})
+    checks = Checks()
+    check = checks.check
+
+    stub = StubModel(args.delay)
+    gemini_service.model = stub
+    asyncio.run(service_checks(args, check, stub))
+    api_checks(check)
+    checks.finish()
+    print("✅ Repeated questions are answered from the cache")
+
+if __name__ == "__main__":
+    main_cli()
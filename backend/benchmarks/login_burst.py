@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Login burst benchmark
+Fires concurrent logins at the app in one event loop while a ticker measures how
+long the loop stalls, with bcrypt run inline (the old behaviour) and on the
+bounded pool. Then checks that a hash stored at another cost factor is upgraded
+on login.
+
+Usage:
+    python benchmarks/login_burst.py
+    python benchmarks/login_burst.py --logins 32
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# Throwaway database; must be set before the app modules read settings
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/login_burst.db"
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import select
+from app.database import SessionLocal
+from app.hashing import create_crypt_context, password_hasher
+from app.models import User
+from app.synthetic_data import DEFAULT_PASSWORD
+from seed_data import seed_database
+import main
+
+WORKER_LOGIN = "demo@example.com"
+
+async def run_inline(func, *args):
+    """The old path: bcrypt directly on the event loop."""
+    return func(*args)
+
+async def burst(client, logins: int):
+    """(wall seconds, max loop stall ms, slowest /health ms) for ``logins`` concurrent logins."""
+    stalls, health = [], []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            stalls.append((time.perf_counter() - started - 0.005) * 1000)
+
+    async def probe():
+        while not done.is_set():
+            started = time.perf_counter()
+            await client.get("/health")
+            health.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0.02)
+
+    async def login():
+        response = await client.post("/api/v1/auth/login", json={"phone_or_email": WORKER_LOGIN, "password": DEFAULT_PASSWORD})
+        response.raise_for_status()
+
+    background = [asyncio.create_task(ticker()), asyncio.create_task(probe())]
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await asyncio.gather(*background)
+    return elapsed, max(stalls), max(health, default=float("nan"))
+
+async def main_async(args):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        print(f"🔐 {args.logins} concurrent logins, bcrypt cost {password_hasher.stats()['rounds']}, "
+              f"{password_hasher.workers} pool thread(s)")
+        print(f"  {'mode':<10} {'wall s':>7} {'max stall ms':>13} {'/health max ms':>15}")
+        pooled_run = password_hasher._run
+        for mode in ("inline", "pool"):
+            password_hasher._run = run_inline if mode == "inline" else pooled_run
+            elapsed, stall, health = await burst(client, args.logins)
+            print(f"  {mode:<10} {elapsed:7.2f} {stall:13.0f} {health:15.1f}")
+        password_hasher._run = pooled_run
+        print(f"  queue: peak {password_hasher.peak_queued}, completed {password_hasher.completed}")
+
+        # A hash at another cost factor is upgraded on the next successful login
+        old_context = create_crypt_context(4)
+        with SessionLocal() as db:
+            user = db.scalar(select(User).where(User.email == WORKER_LOGIN))
+            user.password_hash = old_context.hash(DEFAULT_PASSWORD)
+            db.commit()
+        response = await client.post("/api/v1/auth/login", json={"phone_or_email": WORKER_LOGIN, "password": DEFAULT_PASSWORD})
+        response.raise_for_status()
+        with SessionLocal() as db:
+            stored = db.scalar(select(User.password_hash).where(User.email == WORKER_LOGIN))
+        expected = f"$2b${password_hasher.stats()['rounds']:02d}$"
+        ok = stored.startswith(expected)
+        print(f"{'✅' if ok else '❌'} cost-4 hash rehashed on login: {stored[:7]} (rehashed={password_hasher.rehashed})")
+        return ok
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark a login burst")
+    parser.add_argument("--logins", type=int, default=16, help="concurrent logins per mode")
+    args = parser.parse_args()
+    seed_database({"workers": 20, "employers": 5, "job_posts": 20, "contracts": 10,
+                   "applications": 10, "chat_messages": 10})
+    if not asyncio.run(main_async(args)):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Minimum wage compliance check
+Times the vectorized evaluator against per-listing checks and checks the rate
+conversions and effective dates. Then loads a raised Karnataka notification into
+a running app and checks that the background re-evaluation flags exactly the
+affected contracts and job posts, leaves other states' rows alone, keeps API
+requests fast while it runs and never overwrites a listing edited meanwhile.
+Exits non-zero on a failed check.
+
+Usage:
+    python benchmarks/minimum_wages.py
+    python benchmarks/minimum_wages.py --contracts 100000 --listings 2000000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Throwaway database; must be set before the app modules read settings
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/minimum_wages.db"
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from app.database import SessionLocal
+from app.job_metrics import contract_fairness
+from app.minimum_wages import (
+    SKILL_CATEGORIES, MinimumWageTable, check_listing, current_table, evaluate, load_minimum_wage_dataset
+)
+from app.models import Contract, Employer, JobPost, MinimumWageRate
+from app.services.minimum_wage_service import minimum_wage_service
+from app.synthetic_data import DEFAULT_PASSWORD
+from checks import Checks
+from seed_data import seed_database
+import main
+
+RAISE = 1.25  # the new Karnataka notification raises every category by 25%
+
+def pure_checks(args, check):
+    karnataka = {"location": {"state": "Karnataka"}}
+    masonry = {"skills": ["Masonry"]}
+    daily = check_listing({"rate": 720, "rate_type": "daily"}, karnataka, masonry)
+    same = [check_listing(payment, {**karnataka, "duration": "2 weeks"}, masonry)["daily_wage"] for payment in (
+        {"rate": 90, "rate_type": "hourly"}, {"rate": 4320, "rate_type": "weekly"},
+        {"rate": 18720, "rate_type": "monthly"}, {"rate": 8640, "rate_type": "fixed"},
+    )]
+    check("hourly/weekly/monthly/fixed convert to daily", same == [720.0] * 4, f"₹{daily['daily_wage']:.0f}/day")
+    check("monthly notification read per day", daily["minimum_wage"] == round(17000 / 26, 2) and
+          daily["skill_category"] == "skilled", f"₹{daily['minimum_wage']}/day skilled")
+    helper = check_listing({"rate": 500, "rate_type": "daily"}, karnataka, {"skills": ["Helper"]})
+    check("unknown skills are unskilled", helper["skill_category"] == "unskilled" and
+          not helper["is_minimum_wage_compliant"], f"₹{helper['minimum_wage']}/day")
+    floor = check_listing({"rate": 200, "rate_type": "daily"}, {"location": {"state": "Goa"}}, masonry)
+    check("states without a notification use the national floor", floor["minimum_wage"] == 178.0 and
+          floor["is_minimum_wage_compliant"])
+    unknown = check_listing({"rate": 5000, "rate_type": "fixed"}, karnataka, masonry)
+    check("fixed pay without a duration is not flagged", unknown["daily_wage"] is None and unknown["is_minimum_wage_compliant"])
+
+    rows = load_minimum_wage_dataset()
+    future = [{**row, "rate": row["rate"] * 2, "effective_from": date.today() + timedelta(days=30), "notification": "next"}
+              for row in rows if row["state"] == "kerala"]
+    today, later = MinimumWageTable(rows + future), MinimumWageTable(rows + future, on=date.today() + timedelta(days=31))
+    check("notifications apply from their effective date", today.version == current_table().version and
+          later.changed_states(today) == ["kerala"])
+
+    # One vectorized pass against the same checks one listing at a time
+    rng = np.random.default_rng(7)
+    states = list(current_table().states) + ["goa"]
+    n = args.listings
+    rate_types = rng.choice(["hourly", "daily", "weekly", "monthly", "fixed"], n, p=[0.2, 0.55, 0.1, 0.1, 0.05]).tolist()
+    rates = rng.uniform(100, 1200, n) * np.array([{"hourly": 1 / 8, "weekly": 6, "monthly": 26, "fixed": 40}.get(t, 1)
+                                                  for t in rate_types])
+    listing_states = rng.choice(states, n).tolist()
+    categories = rng.integers(0, len(SKILL_CATEGORIES), n)
+    working_days = np.where(np.array(rate_types) == "fixed", 40.0, np.nan)
+    started = time.perf_counter()
+    result = evaluate(current_table(), rates, rate_types, working_days, listing_states, categories)
+    vectorized = (time.perf_counter() - started) / n * 1e9
+    sample = 20000
+    started = time.perf_counter()
+    for i in range(sample):
+        check_listing({"rate": rates[i], "rate_type": rate_types[i]},
+                      {"location": {"state": listing_states[i]}, "duration": "40 days"},
+                      {"skills": [("helper", "plastering", "masonry", "welding")[categories[i]]]})
+    single = (time.perf_counter() - started) / sample * 1e9
+    agree = all(check_listing({"rate": rates[i], "rate_type": rate_types[i]},
+                              {"location": {"state": listing_states[i]}, "duration": "40 days"},
+                              {"skills": [("helper", "plastering", "masonry", "welding")[categories[i]]]}
+                              )["is_minimum_wage_compliant"] == result["compliant"][i] for i in range(2000))
+    print(f"⚡ vectorized {vectorized:8.0f} ns per listing ({n:,} listings)   one at a time {single:8.0f} ns")
+    check("vectorized pass agrees with single checks", agree, f"{single / vectorized:.0f}x faster")
+    check("compliance of a million listings in seconds", vectorized * 1e6 / 1e9 < 5, f"{vectorized * 1e6 / 1e9:.2f} s")
+
+def snapshot(model):
+    with SessionLocal() as db:
+        return {row.id: (row.location_state, row.minimum_wage_version, row.updated_at) for row in db.execute(
+            select(model.id, model.location_state, model.minimum_wage_version, model.updated_at))}
+
+def reevaluation_checks(args, check):
+    minimum_wage_service.chunk_size = args.chunk_size
+    with SessionLocal() as db:
+        employer_id, = db.execute(select(Contract.employer_id).where(Contract.location_state == "karnataka",
+                                                                     Contract.status == "available").limit(1)).one()
+        edited_id = db.scalar(select(Contract.id).where(Contract.employer_id == employer_id,
+                                                        Contract.location_state == "karnataka").order_by(Contract.id.desc()))
+        employer = db.get(Employer, employer_id)
+
+    with TestClient(main.app) as client:
+        while minimum_wage_service.runs < 1:  # the startup run
+            time.sleep(0.05)
+        check("startup run finds nothing stale", minimum_wage_service.last_run["checked"] == 0)
+        token = client.post("/api/v1/auth/login", json={"phone_or_email": employer.email, "password": DEFAULT_PASSWORD})
+        headers = {"Authorization": f"Bearer {token.json()['access_token']}"}
+        before_get = client.get(f"/api/v1/contracts/{edited_id}", headers=headers)
+        contracts_before, jobs_before = snapshot(Contract), snapshot(JobPost)
+        idle = []
+        for page in range(20):
+            started = time.perf_counter()
+            client.get(f"/api/v1/contracts/?limit=20&page={page + 51}", headers=headers)
+            idle.append((time.perf_counter() - started) * 1000)
+
+        # The state notifies new rates
+        with SessionLocal() as db:
+            db.add_all(MinimumWageRate(**{**row, "rate": round(row["rate"] * RAISE), "notification": "KA/raised",
+                                          "effective_from": date.today()})
+                       for row in load_minimum_wage_dataset() if row["state"] == "karnataka")
+            db.commit()
+
+        run = client.portal.start_task_soon(minimum_wage_service.refresh)
+        edit = client.put(f"/api/v1/contracts/{edited_id}", headers=headers,
+                          json={"payment": {"rate_type": "daily", "rate": 2000, "payment_terms": "Daily payment"}})
+        latencies = []
+        page = 0
+        while not run.done():
+            page += 1
+            started = time.perf_counter()
+            response = client.get(f"/api/v1/contracts/?limit=20&page={page % 50 + 1}", headers=headers)
+            latencies.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200
+        result = run.result()
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+        print(f"⚖️  {result['checked']:,} listings checked in {result['chunks']} chunks, {result['seconds']:.2f}s; "
+              f"flagged {result['flagged']:,}, cleared {result['cleared']:,}")
+        print(f"🌐 {len(latencies)} API requests during the run: median {statistics.median(latencies or [0]):.1f} ms, "
+              f"p95 {p95:.1f} ms (idle median {statistics.median(idle):.1f} ms)")
+        check("API stays responsive during the run", len(latencies) >= 3 and p95 < args.max_latency_ms,
+              f"p95 {p95:.1f} ms")
+        check("edit during the run succeeds", edit.status_code == 200)
+
+        with SessionLocal() as db:
+            wrong = {"contracts": 0, "job_posts": 0}
+            for name, model in (("contracts", Contract), ("job_posts", JobPost)):
+                for listing in db.scalars(select(model).where(model.location_state == "karnataka")):
+                    expected = contract_fairness(listing.payment, listing.work_details, listing.requirements)
+                    actual = (listing.is_minimum_wage_compliant, listing.minimum_wage_version,
+                              getattr(listing, "fairness_score", expected["fairness_score"]))
+                    wrong[name] += actual != (expected["is_minimum_wage_compliant"], expected["minimum_wage_version"],
+                                              expected["fairness_score"])
+            edited = db.get(Contract, edited_id)
+        check("Karnataka listings match the new rates", not any(wrong.values()) and result["flagged"] > 0, str(wrong))
+        check("edited contract keeps its own check", edited.is_minimum_wage_compliant and edited.pay_rate == 2000)
+
+        contracts_after, jobs_after = snapshot(Contract), snapshot(JobPost)
+        untouched = all(contracts_after[key] == value for key, value in contracts_before.items() if value[0] != "karnataka") \
+            and all(jobs_after[key] == value for key, value in jobs_before.items() if value[0] != "karnataka")
+        only = sum(value[0] == "karnataka" for value in contracts_before.values()) + \
+            sum(value[0] == "karnataka" for value in jobs_before.values())
+        # The contract edited during the run may have been checked by its save first
+        check("only the notified state's listings are checked", untouched and only - 1 <= result["checked"] <= only,
+              f"{result['checked']:,} of {len(contracts_before) + len(jobs_before):,}")
+
+        after_get = client.get(f"/api/v1/contracts/{edited_id}", headers=headers)
+        check("cached contract shows the new check", after_get.headers["etag"] != before_get.headers["etag"] and
+              after_get.json()["data"]["is_minimum_wage_compliant"])
+        again = client.portal.call(minimum_wage_service.refresh)
+        check("unchanged rates do not start a run", again is None)
+        stats = client.get("/metrics").json()["minimum_wages"]
+        print(f"📈 runs={stats['runs']} checked={stats['checked']} flagged={stats['flagged']} version={stats['version']}")
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Check state minimum-wage compliance")
+    parser.add_argument("--contracts", type=int, default=20000, help="seeded contracts")
+    parser.add_argument("--listings", type=int, default=1000000, help="listings in the timed vectorized pass")
+    parser.add_argument("--chunk-size", type=int, default=200, help="rows per re-evaluation transaction")
+    parser.add_argument("--max-latency-ms", type=float, default=250, help="allowed p95 API latency during a run")
+    args = parser.parse_args()
+    seed_database({"workers": 50, "employers": 20, "job_posts": args.contracts // 10, "contracts": args.contracts,
+                   "applications": 10, "chat_messages": 10})
+    checks = Checks()
+    check = checks.check
+
+    pure_checks(args, check)
+    reevaluation_checks(args, check)
+    checks.finish()
+    print("✅ Listings are checked against the state minimum wages")
+
+if __name__ == "__main__":
+    main_cli()
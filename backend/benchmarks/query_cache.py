@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Job listing query cache check
+Seeds a throwaway database and requests the same GET /jobs/ pages as several
+workers: latency and statements for a cold and a cached page, that cached bytes
+match a fresh render, and that a job post write retires the cached pages.
+Exits non-zero on a stale or mismatched page.
+
+Usage:
+    python benchmarks/query_cache.py
+    python benchmarks/query_cache.py --reads 500 --limit 50
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Throwaway database; must be set before the app modules read settings
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/query_cache.db"
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.cache import query_cache
+from app.database import async_engine
+from app.synthetic_data import DEFAULT_PASSWORD
+from checks import Checks
+from seed_data import seed_database
+import main
+
+WORKER_LOGINS = ["demo@example.com", "9876543210"]
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+def login(client, phone_or_email: str):
+    response = client.post("/api/v1/auth/login", json={"phone_or_email": phone_or_email, "password": DEFAULT_PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def timed_reads(client, counter, params, headers, reads):
+    """(ms per request, statements per request, X-Cache of the last response)."""
+    counter.count = 0
+    started = time.perf_counter()
+    for _ in range(reads):
+        response = client.get("/api/v1/jobs/", params=params, headers=headers)
+        response.raise_for_status()
+    return (time.perf_counter() - started) / reads * 1000, counter.count / reads, response.headers.get("x-cache")
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Check the job listing query cache")
+    parser.add_argument("--reads", type=int, default=200, help="timed requests per mode")
+    parser.add_argument("--limit", type=int, default=20, help="page size")
+    args = parser.parse_args()
+
+    seed_database({"workers": 200, "employers": 40, "job_posts": 2000, "contracts": 100,
+                   "applications": 200, "chat_messages": 50})
+    checks = Checks(44)
+    check = checks.check
+
+    counter = StatementCounter()
+    with TestClient(main.app) as client:
+        workers = [login(client, account) for account in WORKER_LOGINS]
+        category = client.get("/api/v1/jobs/", params={"status": "published"}, headers=workers[0]).json()["data"][0]["category"]
+        params = {"status": "published", "category": category, "page": 1, "limit": args.limit, "include_total": True}
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+        query_cache.enabled = False
+        uncached_ms, uncached_statements, _ = timed_reads(client, counter, params, workers[0], args.reads)
+        fresh = client.get("/api/v1/jobs/", params=params, headers=workers[0]).content
+        query_cache.enabled = True
+        client.get("/api/v1/jobs/", params=params, headers=workers[0]).raise_for_status()
+        cached_ms, cached_statements, state = timed_reads(client, counter, params, workers[1], args.reads)
+        event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
+
+        print(f"📄 GET /jobs/ category={category!r} limit={args.limit}, {args.reads} requests each")
+        print(f"  uncached  {uncached_ms:8.2f} ms  {uncached_statements:4.1f} statements")
+        print(f"  cached    {cached_ms:8.2f} ms  {cached_statements:4.1f} statements  ({uncached_ms / cached_ms:.1f}x)")
+        check("another worker is served the cached page", state == "HIT", f"X-Cache={state}")
+        cached = client.get("/api/v1/jobs/", params=params, headers=workers[1]).content
+        check("cached bytes match a fresh render", cached == fresh)
+
+        # Any job post write retires every cached listing: close a job shown on the cached page
+        job = client.get("/api/v1/jobs/", params=params, headers=workers[0]).json()["data"][0]
+        job_id, employer = job["id"], login(client, job["employer"]["email"] or job["employer"]["phone"])
+        client.put(f"/api/v1/jobs/{job_id}", headers=employer, json={"status": "closed"}).raise_for_status()
+        response = client.get("/api/v1/jobs/", params=params, headers=workers[0])
+        check("job post write bumps the version", response.headers.get("x-cache") == "MISS", f"X-Cache={response.headers.get('x-cache')}")
+        check("closed job drops out of the listing", all(item["id"] != job_id for item in response.json()["data"]))
+
+        stats = client.get("/metrics").json()["query_cache"]
+        print(f"📈 hits={stats['hits']} misses={stats['misses']} entries={stats['entries']} versions={stats['versions']}")
+
+    checks.finish()
+    print("✅ Cached listings are exact and retired on write")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+List endpoint query counts
+Seeds a throwaway database, calls every list endpoint at a small and a large page
+size and checks that each issues the same number of SQL statements regardless of
+page size (nothing is loaded per row), within its budget. Exits non-zero otherwise.
+
+Usage:
+    python benchmarks/query_counts.py
+    python benchmarks/query_counts.py --verbose   # print every statement
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+# Throwaway database; must be set before the app modules read settings
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/query_counts.db"
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.cache import query_cache
+from app.database import async_engine
+from app.synthetic_data import DEFAULT_PASSWORD
+from seed_data import seed_database
+import main
+
+PAGE_SIZES = (1, 50)
+WORKER_LOGIN = "demo@example.com"
+EMPLOYER_LOGIN = "contact@bangalorebuilders.com"
+
+# (name, account, path, params, max statements per request).
+# Counted with a warm entity cache, so the bearer token's account and single job or
+# contract lookups (app/cache.py) cost no statement.
+CASES = [
+    ("jobs list", "worker", "/api/v1/jobs/", {}, 2),  # page, employers
+    ("jobs list by distance", "worker", "/api/v1/jobs/", {"near_pincode": "560001", "max_distance": 25, "sort_by": "distance"}, 2),
+    ("jobs search", "worker", "/api/v1/jobs/search", {"keywords": "work"}, 2),
+    ("jobs recommended", "worker", "/api/v1/jobs/recommended", {}, 3),  # applications, jobs, employers
+    ("job applications", "employer", "/api/v1/jobs/{job_id}/applications", {}, 1),  # page
+    # Contracts embed employer and worker; the caller's own side comes from the session
+    ("contracts list (worker)", "worker", "/api/v1/contracts/", {}, 2),  # page, employers
+    ("contracts list (employer)", "employer", "/api/v1/contracts/", {}, 2),  # page, workers
+    ("contracts search", "worker", "/api/v1/contracts/search", {"sort_by": "date"}, 2),
+    ("chat messages", "worker", "/api/v1/chat/", {}, 1),
+    ("chat conversation", "worker", "/api/v1/chat/conversation", {}, 1),
+]
+
+class StatementCounter:
+    def __init__(self, verbose: bool = False):
+        self.statements = []
+        self.verbose = verbose
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def measure(self, call):
+        self.statements = []
+        response = call()
+        if self.verbose:
+            for statement in self.statements:
+                print("    " + " ".join(statement.split())[:160])
+        return response, len(self.statements)
+
+def login(client, phone_or_email: str):
+    response = client.post("/api/v1/auth/login", json={"phone_or_email": phone_or_email, "password": DEFAULT_PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Check the SQL statement count of list endpoints")
+    parser.add_argument("--verbose", action="store_true", help="print every statement")
+    args = parser.parse_args()
+
+    seed_database({"workers": 200, "employers": 40, "job_posts": 400, "contracts": 250,
+                   "applications": 800, "chat_messages": 400})
+
+    query_cache.enabled = False  # count the queries behind each page, not cached bytes
+    counter = StatementCounter(args.verbose)
+    failures = 0
+    with TestClient(main.app) as client:
+        headers = {"worker": login(client, WORKER_LOGIN), "employer": login(client, EMPLOYER_LOGIN)}
+        job_id = client.get("/api/v1/jobs/", headers=headers["employer"]).json()["data"][0]["id"]
+        # Build the matching index up front so its one-off load is not counted
+        client.get("/api/v1/jobs/recommended", headers=headers["worker"]).raise_for_status()
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+        print(f"{'endpoint':<28} " + " ".join(f"{f'limit={size}':>10}" for size in PAGE_SIZES) + f" {'budget':>7}")
+        for name, account, path, params, budget in CASES:
+            client.get(path.format(job_id=job_id), params=params, headers=headers[account])  # warm the entity cache
+            counts = []
+            for size in PAGE_SIZES:
+                response, count = counter.measure(lambda: client.get(
+                    path.format(job_id=job_id), params={**params, "limit": size}, headers=headers[account]
+                ))
+                if response.status_code != 200:
+                    print(f"❌ {name}: HTTP {response.status_code} {response.text[:200]}")
+                    failures += 1
+                counts.append((count, len(response.json().get("data") or [])))
+            ok = len({count for count, _ in counts}) == 1 and counts[0][0] <= budget
+            failures += not ok
+            cells = " ".join(f"{f'{count} ({rows})':>10}" for count, rows in counts)
+            print(f"{'✅' if ok else '❌'} {name:<25} {cells} {budget:>7}")
+        event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
+
+    print("statements per request (rows returned)")
+    if failures:
+        print(f"❌ {failures} endpoint(s) off budget")
+        sys.exit(1)
+    print("✅ Every list endpoint runs a fixed number of queries")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Semantic answer cache check
+Replaces the Gemini model with a stub and asks the rights and general assistants
+paraphrases of the usual questions (minimum wage, PF, ESI, MGNREGA) in English,
+transliterated Hindi and Hindi. Paraphrases must be answered without a model
+call; different questions, other states and the other language must not. Also
+times a lookup against a full index. Exits non-zero on a failed check.
+
+Usage:
+    python benchmarks/semantic_cache.py
+    python benchmarks/semantic_cache.py --entries 5000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+# Throwaway database; must be set before the app modules read settings
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/semantic_cache.db"
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from app.llm_cache import CachedAnswer, llm_cache
+from app.semantic_cache import SemanticAnswerCache, semantic_cache
+from app.services.gemini_service import gemini_service
+from app.synthetic_data import DEFAULT_PASSWORD
+from checks import Checks
+from seed_data import seed_database
+import main
+
+WORKER_LOGIN = "demo@example.com"
+
+def profile(name, state):
+    return {"name": name, "area_of_expertise": ["Masonry"], "location": {"city": "", "state": state},
+            "experience": {"years_of_experience": 3}, "preferences": {"minimum_wage": 500}}
+
+# (first question, paraphrases that should reuse its answer)
+PARAPHRASES = [
+    ("What is the minimum wage in Karnataka?", ["minimum wages karnataka", "Tell me the min wage for Karnataka"]),
+    ("How do I register for ESI?", ["how to apply for esi", "ESI registration kaise kare"]),
+    ("What is PF?", ["what is provident fund", "PF kya hai", "Explain EPF"]),
+    ("What is MGNREGA?", ["mgnrega kya hai", "what is nrega"]),
+    ("न्यूनतम मजदूरी कितनी है?", ["न्यूनतम वेतन क्या है"]),
+    ("मनरेगा क्या है?", ["नरेगा क्या है"]),
+]
+# Questions that must not reuse any answer above
+DIFFERENT = ["How do I withdraw my PF?", "What are ESI hospital benefits?", "how to apply for mgnrega",
+             "minimum wage in Kerala", "My employer did not pay me overtime"]
+# Negated questions that must not reuse the answer to the plain one, nor it theirs
+NEGATED = [
+    ("My employer did pay my wages", "My employer did not pay my wages"),
+    ("Is PF mandatory for construction workers?", "Is PF not mandatory for construction workers?"),
+    ("malik ne vetan diya", "malik ne vetan nahi diya"),
+    ("मालिक ने वेतन दिया", "मालिक ने वेतन नहीं दिया"),
+]
+# Questions that differ in a number or skill category, whose answers must not be shared
+QUALIFIED = [
+    ("What is the minimum wage for skilled workers?", "What is the minimum wage for unskilled workers?"),
+    ("What is the minimum wage for semi-skilled workers?", "What is the minimum wage for highly skilled workers?"),
+    ("What is the overtime rate for 10 hours?", "What is the overtime rate for 12 hours?"),
+]
+
+class StubModel:
+    def __init__(self):
+        self.calls = 0
+        self.reply = None
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return SimpleNamespace(text=self.reply or f"Answer #{self.calls}")
+
+async def service_checks(args, check, stub):
+    worker = profile("Ravi", "Karnataka")
+    answers, misses = {}, 0
+    for first, _ in PARAPHRASES:
+        answers[first] = await gemini_service.get_rights_assistance(worker, first)
+    calls = stub.calls
+    for first, paraphrases in PARAPHRASES:
+        for question in paraphrases:
+            answer = await gemini_service.get_rights_assistance(profile("Asha", "Karnataka"), question)
+            if not isinstance(answer, CachedAnswer) or answer != answers[first]:
+                misses += 1
+                print(f"   missed: {question!r} (for {first!r})")
+    total = sum(len(paraphrases) for _, paraphrases in PARAPHRASES)
+    check("paraphrases reuse the answer without a call", misses == 0 and stub.calls == calls,
+          f"{total - misses}/{total}, model calls +{stub.calls - calls}")
+
+    calls = stub.calls
+    for question in DIFFERENT:
+        answer = await gemini_service.get_rights_assistance(worker, question)
+        if isinstance(answer, CachedAnswer):
+            print(f"   false hit: {question!r}")
+    check("different questions still reach the model", stub.calls == calls + len(DIFFERENT))
+
+    calls, false_hits = stub.calls, 0
+    for plain, negated in NEGATED:
+        for question in (plain, negated):
+            if isinstance(await gemini_service.get_rights_assistance(worker, question), CachedAnswer):
+                false_hits += 1
+                print(f"   false hit: {question!r}")
+    check("negated questions never take the plain answer", false_hits == 0 and stub.calls == calls + 2 * len(NEGATED),
+          f"{len(NEGATED)} pairs")
+
+    calls, false_hits = stub.calls, 0
+    for first, second in QUALIFIED:
+        for question in (first, second):
+            if isinstance(await gemini_service.get_rights_assistance(worker, question), CachedAnswer):
+                false_hits += 1
+                print(f"   false hit: {question!r}")
+    check("other numbers or skill categories never share", false_hits == 0 and stub.calls == calls + 2 * len(QUALIFIED),
+          f"{len(QUALIFIED)} pairs")
+
+    calls = stub.calls
+    await gemini_service.get_rights_assistance(profile("Ravi", "Tamil Nadu"), "minimum wages karnataka")
+    check("another state is a separate scope", stub.calls == calls + 1)
+
+    calls = stub.calls
+    await gemini_service.get_rights_assistance(worker, "पीएफ क्या है")
+    check("Hindi and English are separate scopes", stub.calls == calls + 1)
+
+    # An answer that names the worker stays theirs
+    stub.reply = "Namaste Ravi! Here is how overtime works."
+    await gemini_service.general_assistance(worker, "How is overtime calculated?")
+    stub.reply = None
+    calls = stub.calls
+    answer = await gemini_service.general_assistance(profile("Asha", "Karnataka"), "how is overtime calculated")
+    check("answers naming the worker are not shared", stub.calls == calls + 1 and "Ravi" not in answer,
+          f"not_shared {semantic_cache.not_shared}")
+
+    # General advice is written for the asker's skills and city
+    mason = {**profile("Ravi", "Karnataka"), "location": {"city": "Mysore", "state": "Karnataka"}}
+    await gemini_service.general_assistance(mason, "How can I find more work this month?")
+    calls = stub.calls
+    electrician = {**mason, "name": "Asha", "area_of_expertise": ["Electrical"]}
+    other_city = {**mason, "name": "Asha", "location": {"city": "Bangalore", "state": "Karnataka"}}
+    same = {**mason, "name": "Asha"}
+    other_skill = await gemini_service.general_assistance(electrician, "how can I find more work this month")
+    other_place = await gemini_service.general_assistance(other_city, "how can I find more work this month")
+    shared = await gemini_service.general_assistance(same, "how can I find more work this month")
+    check("general answers shared only with the same skills and city",
+          not isinstance(other_skill, CachedAnswer) and not isinstance(other_place, CachedAnswer) and
+          isinstance(shared, CachedAnswer) and stub.calls == calls + 2)
+
+    # Lookup time with every entry in one scope (the worst case)
+    rng = random.Random(7)
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(6)) for _ in range(500)]
+    questions = [" ".join(rng.sample(words, 4)) for _ in range(args.entries)]
+    full = SemanticAnswerCache(args.entries, 3600, semantic_cache.threshold, ["m"])
+    for i, question in enumerate(questions):
+        full.add(full.query("m", "Karnataka", question), f"a{i}")
+    probe = full.query("m", "Karnataka", questions[3])
+    started = time.perf_counter()
+    for _ in range(args.lookups):
+        hit = full.get(probe)
+    lookup_us = (time.perf_counter() - started) / args.lookups * 1e6
+    started = time.perf_counter()
+    for _ in range(args.lookups):
+        full.query("m", "Karnataka", questions[3])
+    embed_us = (time.perf_counter() - started) / args.lookups * 1e6
+    check(f"lookup among {args.entries} entries in one scope", hit == "a3" and len(full) == args.entries,
+          f"embed {embed_us:.0f} µs + search {lookup_us:.0f} µs")
+
+    # Size bound: the oldest entries go first
+    full.add(full.query("m", "Kerala", "one more question"), "newest")
+    check("size bound drops the oldest entry", len(full) == args.entries and
+          full.get(full.query("m", "Karnataka", questions[0])) is None)
+
+def api_checks(check):
+    with TestClient(main.app) as client:
+        response = client.post("/api/v1/auth/login", json={"phone_or_email": WORKER_LOGIN, "password": DEFAULT_PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        worker_id = client.get("/api/v1/auth/me", headers=headers).json()["data"]["user"]["id"]
+        first = client.post("/api/v1/chat/", headers=headers,
+                            json={"message": "What is the procedure for PF registration?", "sender_id": worker_id})
+        second = client.post("/api/v1/chat/", headers=headers,
+                             json={"message": "procedure for provident fund registration", "sender_id": worker_id})
+        first, second = first.json()["data"], second.json()["data"]
+        check("POST /chat/ reuses a paraphrase's answer", not first["cached"] and second["cached"])
+        stats = client.get("/metrics").json()["semantic_cache"]
+        print(f"📈 hits={stats['hits']} misses={stats['misses']} entries={stats['entries']} scopes={stats['scopes']} "
+              f"avg_hit_similarity={stats['avg_hit_similarity']}")
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Check the semantic answer cache")
+    parser.add_argument("--entries", type=int, default=2000, help="entries in the timed index")
+    parser.add_argument("--lookups", type=int, default=2000, help="timed lookups")
+    args = parser.parse_args()
+    seed_database({"workers": 20, "employers": 5, "job_posts": 20, "contracts": 10,
+                   "applications": 10, "chat_messages": 10})
+    checks = Checks()
+    check = checks.check
+
+    stub = StubModel()
+    gemini_service.model = stub
+    llm_cache.enabled = False  # only the semantic cache may answer
+    print(f"🧭 threshold {semantic_cache.threshold}")
+    asyncio.run(service_checks(args, check, stub))
+    api_checks(check)
+    checks.finish()
+    print("✅ Paraphrased questions are answered from the cache")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Response serialization benchmark
+Times turning a page of contract rows (with their embedded employer and worker)
+into response JSON: the per-row from_orm path with an untyped envelope against
+batch TypeAdapter validation with a typed envelope. Also times encoding the
+rows' JSON columns with the stdlib encoder and with orjson.
+
+Usage:
+    python benchmarks/serialization.py
+    python benchmarks/serialization.py --rows 100 --repeat 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import warnings
+from datetime import datetime, timedelta
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from app.models import Contract, Employer, User
+from app.schemas import ContractResponse, PaginatedResponse
+from app.serialization import json_dumps, validate_rows
+
+def build_rows(count: int):
+    """Detached contracts shaped like a real page, each with its employer and worker."""
+    now = datetime(2025, 1, 1)
+    employer = Employer(
+        id="employer-1", name="Bangalore Builders", company="Bangalore Builders Pvt Ltd", phone="9876543220",
+        email="contact@bangalorebuilders.com", business_id="BB-001", business_type="Construction Company",
+        location={"state": "Karnataka", "city": "Bangalore", "pincode": "560001", "address": "MG Road"},
+        is_verified=True, rating=4.5, posted_jobs=12, completed_projects=30, created_at=now, updated_at=now,
+    )
+    rows = []
+    for i in range(count):
+        worker = User(
+            id=f"worker-{i}", name=f"Worker {i}", phone=f"90000{i:05d}", email=f"worker{i}@example.com",
+            digital_id=f"DIG{i:06d}", area_of_expertise=["Construction", "Masonry"],
+            location={"state": "Karnataka", "city": "Bangalore", "pincode": "560025"},
+            preferences={"max_travel_distance": 20, "preferred_working_hours": ["Morning (6 AM - 12 PM)"], "minimum_wage": 600},
+            experience={"years_of_experience": 4, "previous_jobs": ["Site helper"], "skills": ["Brick laying"]},
+            is_verified=True, rating=4.2, completed_jobs=8, created_at=now, updated_at=now,
+        )
+        start = now + timedelta(days=i)
+        rows.append(Contract(
+            id=f"contract-{i}", employer_id=employer.id, title=f"Mason for Residential Building {i}",
+            description="Brick laying and plastering for a two-storey residential building. " * 3,
+            work_details={
+                "location": {"state": "Karnataka", "city": "Bangalore", "pincode": "560025", "address": "Koramangala"},
+                "start_date": start, "end_date": start + timedelta(days=30),
+                "duration": "1 month", "working_hours": "8 AM - 5 PM",
+            },
+            payment={"rate_type": "daily", "rate": 850.0, "currency": "INR", "payment_terms": "Weekly payment"},
+            requirements={"skills": ["Brick laying", "Plastering"], "experience": 2, "tools": ["Trowel", "Level"]},
+            status="accepted", accepted_by=worker.id, fairness_score=8.5, is_minimum_wage_compliant=True,
+            applicants_count=4, work_tracking={"totalHoursWorked": 40, "daysWorked": 5},
+            payment_tracking={"totalDue": 4250, "totalReceived": 3400, "pendingAmount": 850},
+            created_at=now, updated_at=now, employer=employer, worker=worker,
+        ))
+    return rows
+
+def per_row_untyped(rows, adapter):
+    """from_orm per row, Any-typed envelope, then FastAPI's response_model validation + dump."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        page = PaginatedResponse(
+            success=True, data=[ContractResponse.from_orm(row) for row in rows], pagination={"limit": len(rows)}
+        )
+    return adapter.dump_json(adapter.validate_python(page, from_attributes=True))
+
+def per_row_jsonable(rows):
+    """from_orm per row through jsonable_encoder and json.dumps (untyped routes)."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        page = PaginatedResponse(
+            success=True, data=[ContractResponse.from_orm(row) for row in rows], pagination={"limit": len(rows)}
+        )
+    return json.dumps(jsonable_encoder(page)).encode()
+
+def batch_typed(rows, adapter):
+    """One TypeAdapter call for the page, typed envelope, then the same response_model step."""
+    page = PaginatedResponse[ContractResponse](
+        success=True, data=validate_rows(ContractResponse, rows), pagination={"limit": len(rows)}
+    )
+    return adapter.dump_json(adapter.validate_python(page, from_attributes=True))
+
+def timed(label: str, func, repeat: int, baseline: float = None) -> float:
+    func()  # warm up caches and schema builds
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    per_call = (time.perf_counter() - started) / repeat * 1000
+    speedup = f"  {baseline / per_call:.1f}x" if baseline else ""
+    print(f"  {label:<44} {per_call:8.3f} ms{speedup}")
+    return per_call
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response serialization")
+    parser.add_argument("--rows", type=int, default=100, help="rows per page")
+    parser.add_argument("--repeat", type=int, default=200, help="timed iterations per path")
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    untyped_adapter = TypeAdapter(PaginatedResponse)
+    typed_adapter = TypeAdapter(PaginatedResponse[ContractResponse])
+
+    before = per_row_untyped(rows, untyped_adapter)
+    after = batch_typed(rows, typed_adapter)
+    assert json.loads(before) == json.loads(after), "fast path changed the response body"
+
+    print(f"📦 {args.rows}-row contract page ({len(after) / 1024:.0f} KB of JSON)")
+    baseline = timed("from_orm per row + untyped envelope", lambda: per_row_untyped(rows, untyped_adapter), args.repeat)
+    timed("from_orm per row + jsonable_encoder", lambda: per_row_jsonable(rows), args.repeat, baseline)
+    timed("TypeAdapter batch + typed envelope", lambda: batch_typed(rows, typed_adapter), args.repeat, baseline)
+
+    columns = [
+        {"work_details": row.work_details, "payment": row.payment, "requirements": row.requirements,
+         "work_tracking": row.work_tracking, "payment_tracking": row.payment_tracking}
+        for row in rows
+    ]
+    print(f"🗃️  JSON columns of {args.rows} rows")
+    baseline = timed("json.dumps (datetimes pre-converted)", lambda: [
+        json.dumps(value, default=str) for row in columns for value in row.values()
+    ], args.repeat)
+    timed("orjson", lambda: [json_dumps(value) for row in columns for value in row.values()], args.repeat, baseline)
+
+if __name__ == "__main__":
+    main()
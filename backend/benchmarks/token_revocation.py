@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Token revocation check
+Seeds a throwaway database and checks that logout and password changes reject the
+affected tokens on the very next request, also after the in-memory store is lost
+(restart) and for tokens issued before they carried a jti. Then times an
+authenticated request with and without the verified-token cache and counts its
+statements. Exits non-zero if a revoked token is accepted or a valid one refused.
+
+Usage:
+    python benchmarks/token_revocation.py
+    python benchmarks/token_revocation.py --reads 1000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Throwaway database; must be set before the app modules read settings
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/token_revocation.db"
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy import event
+from app.config import settings
+from app.database import async_engine
+from app.synthetic_data import DEFAULT_PASSWORD
+from app.tokens import token_cache, token_revocations
+from checks import Checks
+from seed_data import seed_database
+import main
+
+WORKER_LOGIN = "demo@example.com"
+EMPLOYER_LOGIN = "contact@bangalorebuilders.com"
+NEW_PASSWORD = "a-new-password-456"
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+def login(client, phone_or_email: str, password: str = DEFAULT_PASSWORD):
+    response = client.post("/api/v1/auth/login", json={"phone_or_email": phone_or_email, "password": password})
+    response.raise_for_status()
+    return bearer(response.json()["access_token"])
+
+def bearer(token: str):
+    return {"Authorization": f"Bearer {token}"}
+
+def forget_revocations():
+    """What a restarted process (or one that never saw the revocation) starts from."""
+    token_cache.clear()
+    token_revocations.tokens.clear()
+    token_revocations.accounts.clear()
+    token_revocations._refreshed_at = None
+
+def timed_reads(client, counter, headers, reads):
+    """(ms per request, statements per request)."""
+    client.get("/api/v1/auth/me", headers=headers).raise_for_status()
+    counter.count = 0
+    started = time.perf_counter()
+    for _ in range(reads):
+        client.get("/api/v1/auth/me", headers=headers).raise_for_status()
+    return (time.perf_counter() - started) / reads * 1000, counter.count / reads
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Check token revocation")
+    parser.add_argument("--reads", type=int, default=300, help="timed requests per mode")
+    args = parser.parse_args()
+
+    seed_database({"workers": 20, "employers": 5, "job_posts": 20, "contracts": 10,
+                   "applications": 10, "chat_messages": 10})
+    checks = Checks(56)
+    check = checks.status
+
+    with TestClient(main.app) as client:
+        me = lambda headers: client.get("/api/v1/auth/me", headers=headers)
+
+        # Logout revokes only the token it was called with
+        first, second = login(client, WORKER_LOGIN), login(client, WORKER_LOGIN)
+        check("token works before logout", me(first), 200)
+        check("logout", client.post("/api/v1/auth/logout", headers=first), 200)
+        check("logged-out token is refused", me(first), 401)
+        check("another session of the same account still works", me(second), 200)
+        forget_revocations()
+        check("logged-out token is refused after a restart", me(first), 401)
+
+        # Tokens issued before they carried a jti / iat can be revoked too
+        worker_id = me(second).json()["data"]["user"]["id"]
+        legacy = bearer(jwt.encode({"sub": worker_id, "type": "worker", "exp": datetime.utcnow() + timedelta(days=7)},
+                                   settings.secret_key, algorithm=settings.algorithm))
+        check("token without jti works", me(legacy), 200)
+        client.post("/api/v1/auth/logout", headers=legacy).raise_for_status()
+        check("token without jti is refused after logout", me(legacy), 401)
+
+        # A password change signs out every session issued before it
+        employer, other_session = login(client, EMPLOYER_LOGIN), login(client, EMPLOYER_LOGIN)
+        check("wrong current password is rejected", client.post("/api/v1/auth/change-password", headers=employer, json={
+            "current_password": "not-it", "new_password": NEW_PASSWORD}), 400)
+        changed = check("change password", client.post("/api/v1/auth/change-password", headers=employer, json={
+            "current_password": DEFAULT_PASSWORD, "new_password": NEW_PASSWORD}), 200)
+        fresh = bearer(changed.json()["data"]["access_token"])
+        check("token used for the change is refused", me(employer), 401)
+        check("other session is refused", me(other_session), 401)
+        check("token returned by the change works", me(fresh), 200)
+        check("old password no longer logs in", client.post("/api/v1/auth/login", json={
+            "phone_or_email": EMPLOYER_LOGIN, "password": DEFAULT_PASSWORD}), 401)
+        check("login with the new password works", me(login(client, EMPLOYER_LOGIN, NEW_PASSWORD)), 200)
+        forget_revocations()
+        check("pre-change session is refused after a restart", me(other_session), 401)
+        check("post-change token works after a restart", me(fresh), 200)
+
+        # Cost of an authenticated request: decode every time vs the verified-token cache
+        counter = StatementCounter()
+        event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+        print(f"🔑 GET /auth/me, {args.reads} requests each")
+        for enabled in (False, True):
+            token_cache.enabled = enabled
+            elapsed, statements = timed_reads(client, counter, second, args.reads)
+            print(f"  {'cached' if enabled else 'decoded':<8} {elapsed:7.3f} ms  {statements:4.2f} statements")
+        event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
+
+        stats = client.get("/metrics").json()["token_cache"]
+        print(f"📈 hits={stats['hits']} misses={stats['misses']} rejected={stats['rejected']} "
+              f"revoked_tokens={stats['revoked_tokens']} revoked_accounts={stats['revoked_accounts']}")
+
+    checks.finish()
+    print("✅ Revoked tokens are refused on the next request")
+
+if __name__ == "__main__":
+    main_cli()
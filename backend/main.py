@@ -1,15 +1,29 @@
 from fastapi import FastAPI
+from fastapi.datastructures import Default
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.database import engine, Base
+from app.migrations import upgrade_database
 from app.api.v1.api import api_router
+from app.serialization import ORJSONResponse
+from app.cache import entity_cache, query_cache
+from app.hashing import password_hasher
+from app.tokens import token_cache
+from app.services.gemini_service import gemini_service
+from app.llm_cache import llm_cache
+from app.semantic_cache import semantic_cache
+from app.services.minimum_wage_service import minimum_wage_service
+from app.services.conversation_service import conversation_service
+from app.intents import intent_router
+from starlette.concurrency import run_in_threadpool
 import os
 
 # Create FastAPI app
 app = FastAPI(
     title="AI FairWork API",
     description="Empowering Contract & Informal Workers with AI",
-    version="1.0.0"
+    version="1.0.0",
+    # Kept a default so typed routes still use Pydantic's direct JSON serialization
+    default_response_class=Default(ORJSONResponse)
 )
 
 @app.on_event("startup")
@@ -23,12 +37,20 @@ async def startup_event():
             if db_dir and not os.path.exists(db_dir):
                 os.makedirs(db_dir, exist_ok=True)
         
-        # Create database tables
-        Base.metadata.create_all(bind=engine)
-        print("✅ Database tables created/verified successfully!")
+        # Apply pending migrations (no-op when the stored schema version is current)
+        await run_in_threadpool(upgrade_database)
+        print("✅ Database schema verified successfully!")
     except Exception as e:
         print(f"⚠️  Database startup warning: {e}")
         print("Continuing with server startup...")
+    
+    # Loads the notified minimum wages, then re-checks listings in the background
+    minimum_wage_service.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await minimum_wage_service.stop()
+    await conversation_service.stop()
 
 # Set up CORS
 app.add_middleware(
@@ -37,6 +59,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", "X-Cache"],
 )
 
 # Include API router
@@ -50,6 +73,22 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "KararAI API"}
 
+@app.get("/metrics")
+async def metrics():
+    """Cache, token, bcrypt pool, Gemini, answer cache, minimum wage, conversation memory and chat intent counters for monitoring."""
+    return {
+        "entity_cache": entity_cache.stats(),
+        "query_cache": query_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "password_hashing": password_hasher.stats(),
+        "gemini": gemini_service.limiter.stats(),
+        "llm_cache": llm_cache.stats(),
+        "semantic_cache": semantic_cache.stats(),
+        "minimum_wages": minimum_wage_service.stats(),
+        "conversation_memory": conversation_service.stats(),
+        "intents": intent_router.stats(),
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
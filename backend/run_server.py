@@ -7,7 +7,6 @@ Run this script to start the FastAPI server
 import uvicorn
 import sys
 import os
-import subprocess
 
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -16,8 +15,8 @@ def initialize_database():
     """Initialize database with mock data if it doesn't exist."""
     try:
         from app.config import settings
-        from app.database import engine
-        from app.models import Base
+        from app.migrations import upgrade_database
+        from seed_data import seed_database
         import sqlite3
         from urllib.parse import urlparse
 
@@ -36,13 +35,13 @@ def initialize_database():
         if not os.path.exists(db_path):
             print(f"🗃️  Database not found at {db_path}. Creating and seeding database...")
             # Create tables
-            Base.metadata.create_all(bind=engine)
+            upgrade_database()
             # Seed with mock data
-            subprocess.run([sys.executable, "seed_data.py"], check=True)
+            seed_database()
             print("✅ Database initialized successfully!")
         else:
-            # Always ensure tables exist (in case schema changed)
-            Base.metadata.create_all(bind=engine)
+            # Apply any pending schema migrations
+            upgrade_database()
             
             # Check if database has any data
             conn = sqlite3.connect(db_path)
@@ -54,7 +53,7 @@ def initialize_database():
 
                 if user_count == 0:
                     print("🌱 Database exists but is empty. Seeding with mock data...")
-                    subprocess.run([sys.executable, "seed_data.py"], check=True)
+                    seed_database()
                     print("✅ Database seeded successfully!")
                 else:
                     print(f"📊 Database found with {user_count} users")
@@ -62,7 +61,7 @@ def initialize_database():
                 # Table doesn't exist, seed the database
                 conn.close()
                 print("🌱 Database exists but tables missing. Seeding with mock data...")
-                subprocess.run([sys.executable, "seed_data.py"], check=True)
+                seed_database()
                 print("✅ Database seeded successfully!")
                 
     except Exception as e:
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Minimum wage notification loader
+Adds a state's minimum wage notification (a CSV with the columns of
+app/reference/minimum_wages.csv) and re-checks the stored contracts and job posts.
+A running server picks the new rates up within MINIMUM_WAGE_REFRESH_SECONDS and
+re-checks them in the background on its own.
+
+Usage:
+    python update_minimum_wages.py notification.csv
+    python update_minimum_wages.py notification.csv --no-reevaluate
+    python update_minimum_wages.py --reevaluate-only
+"""
+
+import argparse
+import asyncio
+import csv
+from datetime import date
+from typing import Any, Dict, List
+from app.database import SessionLocal
+from app.migrations import upgrade_database
+from app.minimum_wages import SKILL_CATEGORIES
+from app.models import MinimumWageRate
+from app.search_fields import DAYS_PER_RATE, normalize_text
+from app.services.minimum_wage_service import minimum_wage_service
+
+def read_notification(path: str) -> List[Dict[str, Any]]:
+    """Validated rows of a notification CSV; raises ValueError naming the bad line."""
+    rows = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                rate = float(row["rate"])
+                parsed = {
+                    "state": normalize_text(row["state"]),
+                    "category": normalize_text(row["category"]),
+                    "rate": rate,
+                    "rate_type": normalize_text(row["rate_type"]),
+                    "effective_from": date.fromisoformat(row["effective_from"].strip()),
+                    "notification": row["notification"].strip(),
+                }
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                raise ValueError(f"{path}:{line}: {e}")
+            if not parsed["state"] or not parsed["notification"] or rate <= 0:
+                raise ValueError(f"{path}:{line}: state, notification and a positive rate are required")
+            if parsed["category"] not in SKILL_CATEGORIES:
+                raise ValueError(f"{path}:{line}: category must be one of {', '.join(SKILL_CATEGORIES)}")
+            if parsed["rate_type"] not in DAYS_PER_RATE:
+                raise ValueError(f"{path}:{line}: rate_type must be one of {', '.join(DAYS_PER_RATE)}")
+            rows.append(parsed)
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Load a state minimum wage notification")
+    parser.add_argument("csv", nargs="?", help="notification rows (state,category,rate,rate_type,effective_from,notification)")
+    parser.add_argument("--no-reevaluate", action="store_true", help="only store the rates; the server re-checks listings")
+    parser.add_argument("--reevaluate-only", action="store_true", help="re-check listings against the stored rates")
+    args = parser.parse_args()
+    if not args.csv and not args.reevaluate_only:
+        parser.error("a notification CSV is required (or --reevaluate-only)")
+
+    upgrade_database()
+    if args.csv:
+        try:
+            rows = read_notification(args.csv)
+        except ValueError as e:
+            parser.error(str(e))
+        with SessionLocal() as db:
+            db.add_all(MinimumWageRate(**row) for row in rows)
+            db.commit()
+        states = sorted({row["state"] for row in rows})
+        print(f"✅ Stored {len(rows)} rates for {', '.join(states)}")
+    if args.no_reevaluate:
+        return
+
+    run = asyncio.run(minimum_wage_service.refresh(force=True))
+    print(f"⚖️  {run['checked']:,} listings re-checked: {run['flagged']:,} newly below the minimum, "
+          f"{run['cleared']:,} no longer below it ({run['seconds']:.1f}s)")
+
+if __name__ == "__main__":
+    main()